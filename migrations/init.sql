@@ -8,7 +8,9 @@ CREATE TABLE IF NOT EXISTS users (
     password_hash VARCHAR(255) NOT NULL,
     display_name VARCHAR(100),
     created_at TIMESTAMPTZ DEFAULT NOW(),
-    settings JSONB DEFAULT '{}'::jsonb
+    settings JSONB DEFAULT '{}'::jsonb,
+    token_version INTEGER NOT NULL DEFAULT 0,
+    tokens_revoked_at TIMESTAMPTZ
 );
 
 -- Default user for Phase 1 (password: "localdev")
@@ -68,8 +70,8 @@ CREATE TABLE IF NOT EXISTS messages (
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
-CREATE INDEX IF NOT EXISTS idx_messages_session_id ON messages(session_id);
-CREATE INDEX IF NOT EXISTS idx_messages_created_at ON messages(session_id, created_at DESC);
+-- Keyset pagination: (created_at, id) cursor per session, read newest-first
+CREATE INDEX IF NOT EXISTS idx_messages_session_keyset ON messages(session_id, created_at, id);
 
 -- LLM Context table (Layer 1: For Agent SDK)
 -- NOTE: seq column preserves insertion order - critical for reasoning model item associations
@@ -96,6 +98,7 @@ CREATE TABLE IF NOT EXISTS files (
     content_type VARCHAR(100),
     size_bytes BIGINT,
     folder VARCHAR(20) DEFAULT 'sources',
+    content_hash CHAR(64),               -- SHA-256 hex of the content (upload dedupe)
     uploaded_at TIMESTAMPTZ DEFAULT NOW()
 );
 
@@ -115,16 +118,21 @@ CREATE TABLE IF NOT EXISTS context_chunks (
     embedding vector(1536),              -- text-embedding-3-small dimension
     token_count INT,
     metadata JSONB,
-    created_at TIMESTAMPTZ DEFAULT NOW()
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    -- Full-text search vector for hybrid retrieval (exact terms, IDs, error codes)
+    content_tsv tsvector GENERATED ALWAYS AS (to_tsvector('simple', content)) STORED
 );
 
 -- HNSW index for fast approximate nearest neighbor search
-CREATE INDEX IF NOT EXISTS idx_context_chunks_embedding ON context_chunks
-    USING hnsw (embedding vector_cosine_ops)
+-- Indexes half-precision vectors (about half the size of float32); candidates are
+-- re-ranked against the full-precision embedding column (requires pgvector >= 0.7)
+CREATE INDEX IF NOT EXISTS idx_context_chunks_embedding_half ON context_chunks
+    USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops)
     WITH (m = 16, ef_construction = 64);
 
 CREATE INDEX IF NOT EXISTS idx_context_chunks_project ON context_chunks(project_id);
 CREATE INDEX IF NOT EXISTS idx_context_chunks_source ON context_chunks(source_type, source_id);
+CREATE INDEX IF NOT EXISTS idx_context_chunks_content_tsv ON context_chunks USING gin (content_tsv);
 
 -- Deduplication: same content in same project = skip
 CREATE UNIQUE INDEX IF NOT EXISTS idx_context_chunks_dedupe
@@ -134,3 +142,35 @@ ON context_chunks (project_id, source_type, content_hash);
 CREATE UNIQUE INDEX IF NOT EXISTS idx_context_chunks_session_summary
 ON context_chunks (project_id, source_type, source_id)
 WHERE source_type = 'session_summary';
+
+-- Shared cache tier (Settings.cache_shared_backend = 'postgres')
+-- UNLOGGED: disposable contents, no WAL overhead
+CREATE UNLOGGED TABLE IF NOT EXISTS cache_entries (
+    namespace VARCHAR(50) NOT NULL,
+    key TEXT NOT NULL,
+    value JSONB NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at ON cache_entries(expires_at);
+
+-- Revoked JWTs (logout); rows are purged once the token has expired
+CREATE TABLE IF NOT EXISTS token_denylist (
+    jti VARCHAR(64) PRIMARY KEY,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_token_denylist_expires_at ON token_denylist(expires_at);
+CREATE INDEX IF NOT EXISTS idx_users_tokens_revoked_at ON users(tokens_revoked_at)
+    WHERE tokens_revoked_at IS NOT NULL;
+
+-- Shared rate limit state (Settings.rate_limit_backend = 'postgres')
+-- GCRA theoretical arrival time per client/tier, epoch seconds
+CREATE UNLOGGED TABLE IF NOT EXISTS rate_limits (
+    key TEXT PRIMARY KEY,
+    tat DOUBLE PRECISION NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_rate_limits_tat ON rate_limits(tat);
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+"""add full-text search column to context_chunks for hybrid retrieval
+
+Revision ID: 0006_add_context_chunks_fts
+Revises: 0005_add_context_chunks
+Create Date: 2026-02-01
+
+Adds a generated tsvector column over context_chunks.content with a GIN index.
+ContextService combines full-text hits with HNSW vector hits through reciprocal
+rank fusion, so exact-term queries (IDs, error codes, identifiers) are recalled
+even when their embeddings are not close to the query embedding.
+"""
+
+from alembic import op
+
+
+revision = "0006_add_context_chunks_fts"
+down_revision = "0005_add_context_chunks"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Generated column keeps the tsvector in sync with content on every write
+    op.execute("""
+        ALTER TABLE context_chunks
+        ADD COLUMN content_tsv tsvector
+        GENERATED ALWAYS AS (to_tsvector('simple', content)) STORED
+    """)
+
+    # GIN index for full-text candidate retrieval
+    op.execute("CREATE INDEX idx_context_chunks_content_tsv ON context_chunks USING gin (content_tsv)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_context_chunks_content_tsv")
+    op.execute("ALTER TABLE context_chunks DROP COLUMN IF EXISTS content_tsv")
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+"""index context_chunks embeddings as halfvec with full-precision re-ranking
+
+Revision ID: 0007_compact_ann_index
+Revises: 0006_add_context_chunks_fts
+Create Date: 2026-02-08
+
+Replaces the float32 HNSW index with an expression index over
+embedding::halfvec(1536), roughly halving the index size. The embedding column
+stays vector(1536) so ContextService can re-rank the oversampled ANN candidates
+with full-precision distance. Requires pgvector >= 0.7.0 (halfvec, bit ops).
+
+Binary-quantized indexes (Settings.context_ann_storage = "binary") are built
+by the vector index maintenance command rather than this migration.
+"""
+
+from alembic import op
+
+
+revision = "0007_compact_ann_index"
+down_revision = "0006_add_context_chunks_fts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_context_chunks_embedding_half ON context_chunks
+        USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+    """)
+    op.execute("DROP INDEX IF EXISTS idx_context_chunks_embedding")
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_context_chunks_embedding ON context_chunks
+        USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+    """)
+    op.execute("DROP INDEX IF EXISTS idx_context_chunks_embedding_half")
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+"""index messages for keyset pagination and backfill sessions.message_count
+
+Revision ID: 0008_messages_keyset_index
+Revises: 0007_compact_ann_index
+Create Date: 2026-02-10
+
+Message history is paged with a (created_at, id) cursor instead of OFFSET.
+idx_messages_session_keyset (session_id, created_at, id) serves both the
+newest page and every older page as a bounded backwards index scan, and its
+leading column still covers session_id lookups, so the two older indexes are
+dropped.
+
+Message totals are now read from sessions.message_count instead of
+COUNT(*). The summarize endpoint used to insert a message without bumping the
+counter, so counts are recomputed once here.
+"""
+
+from alembic import op
+
+
+revision = "0008_messages_keyset_index"
+down_revision = "0007_compact_ann_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_messages_session_keyset ON messages (session_id, created_at, id)")
+    op.execute("DROP INDEX IF EXISTS idx_messages_created_at")
+    op.execute("DROP INDEX IF EXISTS idx_messages_session_id")
+    op.execute("""
+        UPDATE sessions s
+        SET message_count = counts.total
+        FROM (
+            SELECT s2.id, COUNT(m.id) AS total
+            FROM sessions s2
+            LEFT JOIN messages m ON m.session_id = s2.id
+            GROUP BY s2.id
+        ) counts
+        WHERE s.id = counts.id AND s.message_count IS DISTINCT FROM counts.total
+    """)
+
+
+def downgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_messages_session_id ON messages (session_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_messages_created_at ON messages (session_id, created_at)")
+    op.execute("DROP INDEX IF EXISTS idx_messages_session_keyset")
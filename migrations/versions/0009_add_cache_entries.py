@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+"""add UNLOGGED cache_entries table for the shared cache tier
+
+Revision ID: 0009_add_cache_entries
+Revises: 0008_messages_keyset_index
+Create Date: 2026-02-12
+
+Backs the optional shared L2 behind the in-process caches
+(Settings.cache_shared_backend = "postgres"). UNLOGGED skips WAL: the contents
+are disposable and are lost on crash recovery, which is acceptable for a cache.
+"""
+
+from alembic import op
+
+
+revision = "0009_add_cache_entries"
+down_revision = "0008_messages_keyset_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE UNLOGGED TABLE IF NOT EXISTS cache_entries (
+            namespace VARCHAR(50) NOT NULL,
+            key TEXT NOT NULL,
+            value JSONB NOT NULL,
+            expires_at TIMESTAMPTZ NOT NULL,
+            PRIMARY KEY (namespace, key)
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at ON cache_entries (expires_at)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS cache_entries")
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+"""add token versions and the token denylist
+
+Revision ID: 0010_add_token_revocation
+Revises: 0009_add_cache_entries
+Create Date: 2026-02-14
+
+users.token_version is embedded in issued JWTs; bumping it revokes every token
+of a user. token_denylist holds individually revoked tokens (logout) until
+they expire. Both are synced into process memory so authentication can skip
+the users lookup.
+"""
+
+from alembic import op
+
+
+revision = "0010_add_token_revocation"
+down_revision = "0009_add_cache_entries"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS tokens_revoked_at TIMESTAMPTZ")
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS token_denylist (
+            jti VARCHAR(64) PRIMARY KEY,
+            user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            expires_at TIMESTAMPTZ NOT NULL
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_token_denylist_expires_at ON token_denylist (expires_at)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_users_tokens_revoked_at ON users (tokens_revoked_at) "
+        "WHERE tokens_revoked_at IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS token_denylist")
+    op.execute("DROP INDEX IF EXISTS idx_users_tokens_revoked_at")
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS tokens_revoked_at")
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS token_version")
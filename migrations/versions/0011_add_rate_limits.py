@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+"""add UNLOGGED rate_limits table for shared GCRA state
+
+Revision ID: 0011_add_rate_limits
+Revises: 0010_add_token_revocation
+Create Date: 2026-02-16
+
+Backs the optional shared rate limit backend
+(Settings.rate_limit_backend = "postgres"). One row per client and tier holds
+the GCRA theoretical arrival time as epoch seconds. UNLOGGED: losing the rows
+on crash recovery only resets limits.
+"""
+
+from alembic import op
+
+
+revision = "0011_add_rate_limits"
+down_revision = "0010_add_token_revocation"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE UNLOGGED TABLE IF NOT EXISTS rate_limits (
+            key TEXT PRIMARY KEY,
+            tat DOUBLE PRECISION NOT NULL
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_rate_limits_tat ON rate_limits (tat)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS rate_limits")
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+"""add files.content_hash for upload dedupe
+
+Revision ID: 0012_add_files_content_hash
+Revises: 0011_add_rate_limits
+Create Date: 2026-02-18
+
+SHA-256 (hex) of the stored content, computed while uploads stream to disk.
+Re-uploading identical content to the same path skips the write and the S3
+upload. NULL for rows written before this migration.
+"""
+
+from alembic import op
+
+
+revision = "0012_add_files_content_hash"
+down_revision = "0011_add_rate_limits"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE files ADD COLUMN IF NOT EXISTS content_hash CHAR(64)")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE files DROP COLUMN IF EXISTS content_hash")
@@ -9,6 +9,7 @@ from fastapi import Depends, Request
 from api.services.context_service import ContextService
 from api.services.file_service import FileService, LocalFileService
 from api.services.project_service import ProjectService
+from api.services.s3_sync_service import S3SyncService
 from api.services.session_service import SessionService
 from api.websocket.manager import WebSocketManager
 from core.constants import DATA_FILES_PATH, Settings, get_settings
@@ -38,21 +39,21 @@ async def get_db(request: Request) -> asyncpg.Pool:
     return request.app.state.db_pool
 
 
+def get_s3_sync(request: Request) -> S3SyncService | None:
+    """Get the shared S3 sync service from application state (None unless FILE_STORAGE=s3)."""
+    return getattr(request.app.state, "s3_sync", None)
+
+
 def get_file_service(
     db: Annotated[asyncpg.Pool, Depends(get_db)],
-    settings: Annotated[Settings, Depends(get_app_settings)],
+    s3_sync: Annotated[S3SyncService | None, Depends(get_s3_sync)],
 ) -> FileService:
     """Provide file service with optional S3 sync (Phase 2).
 
-    When FILE_STORAGE=s3, creates S3SyncService for background uploads.
-    Tools still use local files, but writes are synced to S3 in background.
+    When FILE_STORAGE=s3, writes are synced to S3 in background through the
+    process-wide S3SyncService created at startup, which owns the pooled
+    client, the S3 thread pool and the upload queue. Tools still use local files.
     """
-    s3_sync = None
-    if settings.file_storage == "s3":
-        from api.services.s3_sync_service import S3SyncService
-
-        s3_sync = S3SyncService(settings=settings, local_base_path=DATA_FILES_PATH)
-
     return LocalFileService(base_path=DATA_FILES_PATH, pool=db, s3_sync=s3_sync)
 
 
@@ -11,19 +11,26 @@ from fastapi.middleware.cors import CORSMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from api.middleware.exception_handlers import register_exception_handlers
-from api.middleware.rate_limiter import RateLimitMiddleware, get_rate_limiter
+from api.middleware.rate_limiter import PostgresRateLimitBackend, RateLimitMiddleware, get_rate_limiter
 from api.middleware.request_context import RequestContextMiddleware
 from api.middleware.request_limits import RequestSizeLimitMiddleware
 from api.middleware.security_headers import SecurityHeadersMiddleware
 from api.routes import chat
 from api.routes.v1 import router as v1_router
+from api.services.file_index import get_directory_index
+from api.services.health_prober import HealthProber
+from api.services.token_denylist import get_token_denylist
 from api.websocket.manager import WebSocketManager
-from core.constants import get_settings
+from core.constants import DATA_FILES_PATH, get_settings
 from integrations.mcp_manager import initialize_mcp_manager
 from integrations.sdk_token_tracker import patch_sdk_for_auto_tracking
+from tools.schema_fetch import get_connection_pools
+from utils.cache import get_tiered_caches, start_cache_sweeper, stop_cache_sweeper
 from utils.client_factory import create_http_client, create_openai_client
 from utils.db_utils import check_pool_health, create_database_pool, graceful_pool_close
 from utils.logger import configure_uvicorn_logging, logger
+from utils.password_hasher import get_password_hasher
+from utils.shared_cache import SharedCacheCoordinator
 
 # Settings are loaded via Pydantic Settings with environment-specific file support
 # (.env, .env.{APP_ENV}, .env.local) - no manual dotenv loading needed
@@ -112,11 +119,27 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         raise RuntimeError("Database connection failed")
     logger.info(f"Database pool healthy: {health}")
 
+    # Shared cache tier and cross-process cache invalidation
+    app.state.cache_coordinator = SharedCacheCoordinator(
+        app.state.db_pool,
+        settings.database_url,
+        get_tiered_caches(),
+        shared_backend=settings.cache_shared_backend,
+        invalidation=settings.cache_invalidation_enabled,
+    )
+    await app.state.cache_coordinator.start()
+    start_cache_sweeper()
+
+    # Token revocation state for cached/stateless authentication
+    await get_token_denylist().start(app.state.db_pool)
+
+    # Directory listings for list_files, invalidated by a filesystem watcher
+    await get_directory_index().start(DATA_FILES_PATH)
+
     # Create S3 sync service if S3 storage is enabled
     s3_sync = None
     if settings.file_storage == "s3":
         from api.services.s3_sync_service import S3SyncService
-        from core.constants import DATA_FILES_PATH
 
         s3_sync = S3SyncService(
             settings=settings,
@@ -142,6 +165,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
                 try:
                     loop = asyncio.get_event_loop()
                     await loop.run_in_executor(None, s3_sync.cleanup_session_files, session_id)
+                    get_directory_index().invalidate(s3_sync.local_base_path / session_id)
                 except Exception as e:
                     logger.error(f"Background cleanup failed for session {session_id}: {e}")
                 finally:
@@ -173,8 +197,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await pool.initialize()
     app.state.sandbox_pool = pool
 
-    # Start rate limiter cleanup task
+    # Start rate limiter cleanup task (shared state across replicas if configured)
     rate_limiter = get_rate_limiter()
+    if settings.rate_limit_backend == "postgres":
+        rate_limiter.backend = PostgresRateLimitBackend(app.state.db_pool)
     await rate_limiter.start()
     app.state.rate_limiter = rate_limiter
 
@@ -183,6 +209,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     app.state.embedding_worker = await start_embedding_worker(app.state.db_pool)
 
+    # Probe database, MCP and S3 connectivity in the background for /health
+    app.state.health_prober = HealthProber(app.state.db_pool, app.state.mcp_manager, s3_sync)
+    app.state.health_prober.start()
+
     try:
         yield
     finally:
@@ -190,6 +220,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
         # Signal shutdown to any waiting tasks
         shutdown_event.set()
+        await app.state.health_prober.stop()
 
         # Phase 1: Stop accepting new WebSocket connections and drain existing
         if app.state.ws_manager:
@@ -205,19 +236,33 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             await app.state.sandbox_pool.shutdown()
             logger.info("Sandbox pool shutdown complete")
 
-        # Phase 4: Stop rate limiter cleanup task
+        # Phase 4: Stop rate limiter cleanup task and password hashing pool
         if hasattr(app.state, "rate_limiter") and app.state.rate_limiter:
             await app.state.rate_limiter.stop()
             logger.info("Rate limiter shutdown complete")
+        get_password_hasher().shutdown()
 
-        # Phase 5: Stop embedding worker
+        # Phase 5: Stop embedding worker and finish queued S3 uploads
         if hasattr(app.state, "embedding_worker") and app.state.embedding_worker:
             from workers.embedding_worker import stop_embedding_worker
 
             await stop_embedding_worker()
             logger.info("Embedding worker shutdown complete")
-
-        # Phase 6: Gracefully close database pool
+        if getattr(app.state, "s3_sync", None):
+            await app.state.s3_sync.drain_uploads(timeout=settings.shutdown_timeout)
+            app.state.s3_sync.close()
+            logger.info("S3 upload queue drained")
+
+        # Phase 6: Stop cache invalidation listener, sweeper, denylist sync, file watcher
+        # and schema fetch connection pools
+        if hasattr(app.state, "cache_coordinator") and app.state.cache_coordinator:
+            await app.state.cache_coordinator.stop()
+        await stop_cache_sweeper()
+        await get_token_denylist().stop()
+        await get_directory_index().stop()
+        await get_connection_pools().close_all()
+
+        # Phase 7: Gracefully close database pool
         await graceful_pool_close(app.state.db_pool, timeout=settings.shutdown_timeout)
 
 
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from typing import Annotated
-from uuid import UUID
 
 import asyncpg
 
@@ -29,57 +28,43 @@ async def get_current_user(
 
     if credentials is None:
         if settings.allow_localhost_noauth and _is_localhost(request):
-            user = await auth.get_default_user()
-            if not user:
+            payload = await auth.get_default_user_info()
+            if not payload:
                 raise AuthenticationError(
                     message="Default user not found",
                     code=ErrorCode.AUTH_USER_NOT_FOUND,
                 )
-            payload = auth.user_payload(user)
             return UserInfo(**payload)
         raise AuthenticationError(
             message="Authentication required",
             code=ErrorCode.AUTH_REQUIRED,
         )
 
-    token = credentials.credentials
-    try:
-        payload = auth.decode_access_token(token)
-        user = await auth.get_user_by_id(UUID(payload["sub"]))
-    except ValueError as exc:
-        raise AuthenticationError(
-            message="Invalid token",
-            code=ErrorCode.AUTH_INVALID_TOKEN,
-        ) from exc
-
-    if not user:
-        raise AuthenticationError(
-            message="User not found",
-            code=ErrorCode.AUTH_USER_NOT_FOUND,
-        )
-
-    return UserInfo(**auth.user_payload(user))
+    return await _authenticate(auth, credentials.credentials)
 
 
 async def get_current_user_from_token(token: str, db: asyncpg.Pool) -> UserInfo:
     """Authenticate WebSocket connections via query token."""
-    auth = AuthService(db)
+    return await _authenticate(AuthService(db), token)
+
+
+async def _authenticate(auth: AuthService, token: str) -> UserInfo:
+    """Resolve a bearer token to a user (cached or stateless, see AuthService)."""
     try:
-        payload = auth.decode_access_token(token)
-        user = await auth.get_user_by_id(UUID(payload["sub"]))
+        payload = await auth.authenticate(token)
     except ValueError as exc:
         raise AuthenticationError(
             message="Invalid token",
             code=ErrorCode.AUTH_INVALID_TOKEN,
         ) from exc
 
-    if not user:
+    if not payload:
         raise AuthenticationError(
             message="User not found",
             code=ErrorCode.AUTH_USER_NOT_FOUND,
         )
 
-    return UserInfo(**auth.user_payload(user))
+    return UserInfo(**payload)
 
 
 def _is_localhost(request: Request) -> bool:
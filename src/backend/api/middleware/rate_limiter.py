@@ -1,30 +1,38 @@
-"""Rate limiting middleware with sliding window algorithm.
+"""Rate limiting middleware with GCRA (generic cell rate algorithm).
 
 Provides configurable rate limiting with:
-- Sliding window + burst for smoother limits
+- GCRA: one float of state per client and tier, O(1) per request
+- Burst capacity on top of the sustained per-minute rate
 - Per-user (authenticated) and per-IP (unauthenticated) tracking
 - Route-specific limits (auth, uploads, general API)
 - Health endpoint exemption
-- Automatic cleanup of expired entries
+- Load shedding (503) for tiers whose backing resource is saturated
+- Pluggable state backend: sharded in-process state (default) or a shared
+  Postgres table so limits hold across workers/replicas
+- Automatic cleanup of idle entries
 """
 
 from __future__ import annotations
 
 import asyncio
 import contextlib
+import math
+import threading
 import time
 
-from collections import defaultdict
 from collections.abc import Callable
-from dataclasses import dataclass, field as dataclass_field
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, NamedTuple, Protocol
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+import asyncpg
+
+from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from core.constants import get_settings
 from utils.logger import logger
+from utils.password_hasher import get_password_hasher
 
 
 @dataclass
@@ -33,22 +41,57 @@ class RateLimitConfig:
 
     requests_per_minute: int
     burst_size: int = 0  # Additional burst allowance (0 = no burst)
+    shed_when: Callable[[], bool] | None = None  # Reject with 503 while this returns True
+    shed_paths: tuple[str, ...] | None = None  # Only shed paths matching these (None = whole tier)
 
+    def sheds(self, path: str) -> bool:
+        """True if a request for ``path`` should be rejected right now."""
+        if self.shed_when is None:
+            return False
+        if self.shed_paths is not None and not any(pattern in path for pattern in self.shed_paths):
+            return False
+        return self.shed_when()
+
+    @property
+    def capacity(self) -> int:
+        """Requests allowed back to back from an idle client."""
+        return self.requests_per_minute + self.burst_size
+
+    @property
+    def emission_interval(self) -> float:
+        """Seconds of capacity one request consumes."""
+        return 60.0 / self.requests_per_minute
 
-@dataclass
-class RateLimitEntry:
-    """Tracks request counts for sliding window algorithm."""
 
-    window_start: float
-    request_count: int = 0
-    burst_used: int = 0
-    timestamps: list[float] = dataclass_field(default_factory=list)
+class RateLimitDecision(NamedTuple):
+    """Outcome of one rate limit check."""
 
+    allowed: bool
+    remaining: int
+    reset_after: float  # Seconds until the client is back to full capacity
+    retry_after: float = 0.0  # Seconds until the next request would be allowed
+
+
+def _password_pool_saturated() -> bool:
+    return get_password_hasher().saturated
+
+
+# Auth routes that hash or verify passwords (refresh only decodes tokens)
+PASSWORD_PATTERNS: tuple[str, ...] = (
+    "/api/v1/auth/login",
+    "/api/v1/auth/register",
+)
 
 # Route patterns and their rate limit configurations
 RATE_LIMIT_TIERS: dict[str, RateLimitConfig] = {
-    # Auth endpoints: stricter limits with burst allowance
-    "auth": RateLimitConfig(requests_per_minute=10, burst_size=5),
+    # Auth endpoints: stricter limits with burst allowance; password routes are
+    # shed while bcrypt workers are saturated
+    "auth": RateLimitConfig(
+        requests_per_minute=10,
+        burst_size=5,
+        shed_when=_password_pool_saturated,
+        shed_paths=PASSWORD_PATTERNS,
+    ),
     # File upload endpoints
     "upload": RateLimitConfig(requests_per_minute=10, burst_size=0),
     # Regular API endpoints
@@ -64,11 +107,7 @@ EXEMPT_PATHS: set[str] = {
 }
 
 # Route pattern matching
-AUTH_PATTERNS: tuple[str, ...] = (
-    "/api/v1/auth/login",
-    "/api/v1/auth/register",
-    "/api/v1/auth/refresh",
-)
+AUTH_PATTERNS: tuple[str, ...] = (*PASSWORD_PATTERNS, "/api/v1/auth/refresh")
 UPLOAD_PATTERNS: tuple[str, ...] = ("/upload",)
 
 
@@ -102,26 +141,155 @@ def _get_client_identifier(request: Request) -> str:
     return f"ip:{client_ip}"
 
 
-class SlidingWindowRateLimiter:
-    """In-memory sliding window rate limiter with burst support.
+def gcra(tat: float | None, now: float, interval: float, capacity: int) -> tuple[float | None, RateLimitDecision]:
+    """Apply one request to a GCRA state.
+
+    The state is the theoretical arrival time (TAT): when the client would be
+    back to full capacity. Each request pushes it ``interval`` seconds further;
+    a request is allowed while the TAT stays within ``capacity * interval`` of
+    now.
 
-    Uses a sliding window algorithm for smoother rate limiting compared
-    to fixed windows. Burst allowance lets users make quick initial
-    requests before sustained rate limiting kicks in.
+    Args:
+        tat: Current TAT, or None for an idle client
+        now: Current time (same clock as tat)
+        interval: Emission interval (seconds per request)
+        capacity: Maximum back-to-back requests
+
+    Returns:
+        Tuple of (new TAT, or None if the request was denied; decision)
+    """
+    current = max(tat, now) if tat is not None else now
+    new_tat = current + interval
+    horizon = capacity * interval
+    if new_tat - now > horizon:
+        return None, RateLimitDecision(False, 0, current - now, new_tat - now - horizon)
+    remaining = int((horizon - (new_tat - now)) / interval + 1e-9)
+    return new_tat, RateLimitDecision(True, remaining, new_tat - now)
+
+
+class RateLimitBackend(Protocol):
+    """Storage for per-key GCRA state."""
+
+    async def acquire(self, key: str, interval: float, capacity: int) -> RateLimitDecision: ...
+
+    async def purge_expired(self) -> int: ...
+
+
+class LocalRateLimitBackend:
+    """In-process GCRA state, sharded by key.
+
+    Each shard is a dict of key -> TAT guarded by its own ``threading.Lock``
+    (uncontended on the event loop thread; safe if threads share the limiter).
+    Cleanup walks one shard at a time, so it never stalls every client at once.
+    """
+
+    def __init__(self, shards: int = 16, clock: Callable[[], float] = time.monotonic) -> None:
+        self._shards: list[dict[str, float]] = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._clock = clock
+
+    def acquire_sync(self, key: str, interval: float, capacity: int) -> RateLimitDecision:
+        i = hash(key) % len(self._shards)
+        shard = self._shards[i]
+        with self._locks[i]:
+            new_tat, decision = gcra(shard.get(key), self._clock(), interval, capacity)
+            if new_tat is not None:
+                shard[key] = new_tat
+        return decision
+
+    async def acquire(self, key: str, interval: float, capacity: int) -> RateLimitDecision:
+        return self.acquire_sync(key, interval, capacity)
+
+    async def purge_expired(self) -> int:
+        """Drop clients back at full capacity (their state equals no state)."""
+        removed = 0
+        for lock, shard in zip(self._locks, self._shards, strict=True):
+            now = self._clock()
+            with lock:
+                idle = [key for key, tat in shard.items() if tat <= now]
+                for key in idle:
+                    del shard[key]
+            removed += len(idle)
+            await asyncio.sleep(0)  # Yield between shards
+        return removed
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+class PostgresRateLimitBackend:
+    """GCRA state in an UNLOGGED table, shared by every worker and replica.
+
+    One upsert per request applies GCRA atomically (the row lock serializes
+    concurrent requests for the same key) using the database clock, so
+    replicas with skewed clocks agree. Denied requests leave the row untouched.
     """
 
-    def __init__(self, cleanup_interval: float = 60.0) -> None:
+    def __init__(self, pool: asyncpg.Pool) -> None:
+        self.pool = pool
+
+    async def acquire(self, key: str, interval: float, capacity: int) -> RateLimitDecision:
+        horizon = capacity * interval
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                WITH clock AS (SELECT extract(epoch FROM clock_timestamp())::float8 AS now)
+                INSERT INTO rate_limits AS r (key, tat)
+                SELECT $1, clock.now + $2 FROM clock
+                ON CONFLICT (key) DO UPDATE
+                SET tat = GREATEST(r.tat, EXCLUDED.tat - $2) + $2
+                WHERE GREATEST(r.tat, EXCLUDED.tat - $2) + $2 - (EXCLUDED.tat - $2) <= $3
+                RETURNING r.tat, (SELECT now FROM clock) AS now
+                """,
+                key,
+                interval,
+                horizon,
+            )
+            if row is not None:
+                remaining = int((horizon - (row["tat"] - row["now"])) / interval + 1e-9)
+                return RateLimitDecision(True, remaining, row["tat"] - row["now"])
+
+            row = await conn.fetchrow(
+                "SELECT tat, extract(epoch FROM clock_timestamp())::float8 AS now FROM rate_limits WHERE key = $1",
+                key,
+            )
+        tat, now = (row["tat"], row["now"]) if row is not None else (0.0, 0.0)
+        return RateLimitDecision(False, 0, tat - now, max(tat, now) + interval - now - horizon)
+
+    async def purge_expired(self) -> int:
+        async with self.pool.acquire() as conn:
+            result: str = await conn.execute(
+                "DELETE FROM rate_limits WHERE tat <= extract(epoch FROM clock_timestamp())"
+            )
+        return int(result.split()[-1])
+
+
+class GCRARateLimiter:
+    """Rate limiter applying GCRA per client and tier.
+
+    State lives in ``backend``; when a shared backend fails, decisions fall
+    back to the local backend so requests are still limited per process.
+    """
+
+    def __init__(
+        self,
+        cleanup_interval: float = 60.0,
+        backend: RateLimitBackend | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         """Initialize the rate limiter.
 
         Args:
-            cleanup_interval: How often to clean up expired entries (seconds)
+            cleanup_interval: How often to clean up idle entries (seconds)
+            backend: Shared state backend (defaults to the local backend)
+            clock: Monotonic clock for the local backend
         """
-        # Dict[tier][identifier] -> RateLimitEntry
-        self._entries: dict[str, dict[str, RateLimitEntry]] = defaultdict(dict)
-        self._lock = asyncio.Lock()
+        self.local = LocalRateLimitBackend(clock=clock)
+        self.backend: RateLimitBackend = backend or self.local
         self._cleanup_task: asyncio.Task[None] | None = None
         self._cleanup_interval = cleanup_interval
         self._shutting_down = False
+        self._backend_errors = 0
 
     async def start(self) -> None:
         """Start the background cleanup task."""
@@ -151,159 +319,155 @@ class SlidingWindowRateLimiter:
             rate limit info for response headers.
         """
         config = RATE_LIMIT_TIERS.get(tier, RATE_LIMIT_TIERS["api"])
-        now = time.monotonic()
-        window_size = 60.0  # 1 minute window
-
-        async with self._lock:
-            entries = self._entries[tier]
-
-            if identifier not in entries:
-                entries[identifier] = RateLimitEntry(
-                    window_start=now,
-                    timestamps=[now],
-                    request_count=1,
-                )
-                return True, self._build_headers(config, 1, now, window_size)
-
-            entry = entries[identifier]
-
-            # Remove timestamps outside the sliding window
-            cutoff = now - window_size
-            entry.timestamps = [ts for ts in entry.timestamps if ts > cutoff]
-            entry.request_count = len(entry.timestamps)
-
-            # Calculate effective limit (base + burst if available)
-            effective_limit = config.requests_per_minute
-            if config.burst_size > 0:
-                # Burst is a one-time allowance that regenerates when window is empty
-                if entry.request_count == 0:
-                    entry.burst_used = 0
-                remaining_burst = config.burst_size - entry.burst_used
-                effective_limit += remaining_burst
-
-            if entry.request_count >= effective_limit:
-                return False, self._build_headers(config, entry.request_count, now, window_size)
-
-            # Request allowed - record it
-            entry.timestamps.append(now)
-            # Capture pre-increment count for burst tracking
-            pre_increment_count = entry.request_count
-            entry.request_count += 1
-
-            # Track burst usage (use pre-increment count to correctly identify burst window)
-            if pre_increment_count < config.burst_size:
-                entry.burst_used = min(entry.request_count, config.burst_size)
-
-            return True, self._build_headers(config, entry.request_count, now, window_size)
-
-    def _build_headers(
-        self, config: RateLimitConfig, current_count: int, now: float, window_size: float
-    ) -> dict[str, int]:
-        """Build rate limit response headers."""
-        total_limit = config.requests_per_minute + config.burst_size
-        remaining = max(0, total_limit - current_count)
-        reset_seconds = int(window_size)
+        key = f"{tier}:{identifier}"
 
-        return {
-            "X-RateLimit-Limit": total_limit,
-            "X-RateLimit-Remaining": remaining,
-            "X-RateLimit-Reset": reset_seconds,
+        if self.backend is self.local:
+            decision = self.local.acquire_sync(key, config.emission_interval, config.capacity)
+        else:
+            try:
+                decision = await self.backend.acquire(key, config.emission_interval, config.capacity)
+            except Exception as e:
+                self._backend_errors += 1
+                logger.warning(f"Shared rate limit backend failed, using local limits: {e}")
+                decision = self.local.acquire_sync(key, config.emission_interval, config.capacity)
+
+        return decision.allowed, self._build_headers(config, decision)
+
+    def _build_headers(self, config: RateLimitConfig, decision: RateLimitDecision) -> dict[str, int]:
+        """Build rate limit response headers."""
+        headers = {
+            "X-RateLimit-Limit": config.capacity,
+            "X-RateLimit-Remaining": decision.remaining,
+            "X-RateLimit-Reset": math.ceil(decision.reset_after),
         }
+        if not decision.allowed:
+            headers["Retry-After"] = max(1, math.ceil(decision.retry_after))
+        return headers
 
     async def _cleanup_loop(self) -> None:
-        """Periodically clean up expired entries."""
+        """Periodically clean up idle entries."""
         while not self._shutting_down:
             await asyncio.sleep(self._cleanup_interval)
             await self._cleanup_expired()
 
     async def _cleanup_expired(self) -> None:
-        """Remove entries with no recent requests."""
-        now = time.monotonic()
-        cutoff = now - 120.0  # Keep entries for 2 minutes after last request
-
-        async with self._lock:
-            for tier in list(self._entries.keys()):
-                entries = self._entries[tier]
-                expired = [
-                    identifier
-                    for identifier, entry in entries.items()
-                    if not entry.timestamps or max(entry.timestamps) < cutoff
-                ]
-                for identifier in expired:
-                    del entries[identifier]
-
-                if expired:
-                    logger.debug(f"Rate limiter cleanup: removed {len(expired)} expired entries from {tier}")
+        """Remove entries of clients back at full capacity."""
+        backends: list[RateLimitBackend] = [self.local]
+        if self.backend is not self.local:
+            backends.append(self.backend)
+        for backend in backends:
+            try:
+                removed = await backend.purge_expired()
+            except Exception as e:
+                logger.warning(f"Rate limiter cleanup failed: {e}")
+                continue
+            if removed:
+                logger.debug(f"Rate limiter cleanup: removed {removed} idle entries ({type(backend).__name__})")
+
+    def stats(self) -> dict[str, Any]:
+        """Limiter statistics."""
+        return {
+            "backend": "local" if self.backend is self.local else type(self.backend).__name__,
+            "local_entries": len(self.local),
+            "backend_errors": self._backend_errors,
+        }
 
 
 # Module-level singleton
-_rate_limiter: SlidingWindowRateLimiter | None = None
+_rate_limiter: GCRARateLimiter | None = None
 
 
-def get_rate_limiter() -> SlidingWindowRateLimiter:
+def get_rate_limiter() -> GCRARateLimiter:
     """Get or create the singleton rate limiter."""
     global _rate_limiter  # noqa: PLW0603
     if _rate_limiter is None:
-        _rate_limiter = SlidingWindowRateLimiter()
+        _rate_limiter = GCRARateLimiter()
     return _rate_limiter
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """FastAPI middleware for rate limiting requests."""
+class RateLimitMiddleware:
+    """ASGI middleware for rate limiting requests.
+
+    Pure ASGI rather than ``BaseHTTPMiddleware``: allowed requests go straight
+    to the app with only ``send`` wrapped to attach the rate limit headers, so
+    no extra task or response body stream is created per request.
+    """
 
     def __init__(
         self,
-        app: Callable[..., Any],
-        rate_limiter: SlidingWindowRateLimiter | None = None,
+        app: ASGIApp,
+        rate_limiter: GCRARateLimiter | None = None,
     ) -> None:
-        super().__init__(app)
+        self.app = app
         self._rate_limiter = rate_limiter or get_rate_limiter()
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request through rate limiter."""
-        path = request.url.path
-        settings = get_settings()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Skip rate limiting for exempt paths
-        if path in EXEMPT_PATHS:
-            return await call_next(request)
+        path = scope["path"]
 
-        # Skip rate limiting if disabled via settings (for load testing)
-        if not settings.rate_limit_enabled:
-            return await call_next(request)
+        # Skip rate limiting for exempt paths, or entirely if disabled via settings (for load testing)
+        if path in EXEMPT_PATHS or not get_settings().rate_limit_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
 
         # Skip WebSocket upgrades (connection limits handled separately)
         if request.headers.get("upgrade", "").lower() == "websocket":
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # Get rate limit tier and client identifier
         tier = _get_tier_for_path(path)
         identifier = _get_client_identifier(request)
 
+        # Shed load before it queues on a saturated resource
+        config = RATE_LIMIT_TIERS.get(tier, RATE_LIMIT_TIERS["api"])
+        if config.sheds(path):
+            logger.warning(f"Shedding {tier} request from {identifier} (path: {path}): capacity saturated")
+            response = JSONResponse(
+                status_code=503,
+                content={
+                    "error": "overloaded",
+                    "message": "Server is busy. Please try again shortly.",
+                    "retry_after": 1,
+                },
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
         # Check rate limit
         allowed, headers = await self._rate_limiter.is_allowed(identifier, tier)
 
         if not allowed:
             logger.warning(f"Rate limit exceeded for {identifier} on {tier} tier (path: {path})")
+            retry_after = headers.get("Retry-After", headers.get("X-RateLimit-Reset", 60))
             response = JSONResponse(
                 status_code=429,
                 content={
                     "error": "rate_limit_exceeded",
                     "message": "Too many requests. Please try again later.",
-                    "retry_after": headers.get("X-RateLimit-Reset", 60),
+                    "retry_after": retry_after,
                 },
             )
             # Add rate limit headers to 429 response
             for header, value in headers.items():
                 response.headers[header] = str(value)
-            response.headers["Retry-After"] = str(headers.get("X-RateLimit-Reset", 60))
-            return response
+            response.headers["Retry-After"] = str(retry_after)
+            await response(scope, receive, send)
+            return
 
-        # Process request
-        result = await call_next(request)
+        # Add rate limit headers to the response once it starts
+        raw_headers = [(name.lower().encode(), str(value).encode()) for name, value in headers.items()]
 
-        # Add rate limit headers to successful responses
-        for header, value in headers.items():
-            result.headers[header] = str(value)
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *raw_headers]
+            await send(message)
 
-        return result
+        await self.app(scope, receive, send_with_headers)
@@ -16,9 +16,8 @@ from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from utils.metrics import request_duration_seconds
 
@@ -29,6 +28,10 @@ _request_context: ContextVar[RequestContext | None] = ContextVar("request_contex
 REQUEST_ID_PREFIX = "req_"
 WEBSOCKET_ID_PREFIX = "ws_"
 
+# Session ID extraction: REST routes and the chat WebSocket
+_SESSION_PATH_RE = re.compile(r"/api/v\d+/sessions/([^/]+)")
+_WS_PATH_RE = re.compile(r"/ws/chat/([^/]+)")
+
 
 @dataclass
 class RequestContext:
@@ -125,59 +128,74 @@ def update_request_context(**kwargs: Any) -> None:
                 ctx.extra[key] = value
 
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    """Middleware to initialize request context for each request.
+class RequestContextMiddleware:
+    """ASGI middleware to initialize request context for each request.
 
-    Adds request ID to response headers and initializes context vars.
+    Adds request ID to response headers and initializes context vars. The
+    context var is set in the same task that runs the app, so handlers see it
+    without ``BaseHTTPMiddleware``'s per-request task and body stream.
     """
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+
         # Check for existing request ID header (for distributed tracing)
-        request_id = request.headers.get("X-Request-ID")
+        request_id = headers.get("X-Request-ID")
         if not request_id:
             request_id = generate_request_id()
 
         # Get client IP (handle proxied requests)
-        client_ip = request.headers.get("X-Forwarded-For")
+        client_ip = headers.get("X-Forwarded-For")
         if client_ip:
             # Take first IP in chain (original client)
             client_ip = client_ip.split(",")[0].strip()
-        elif request.client:
-            client_ip = request.client.host
+        elif scope.get("client"):
+            client_ip = scope["client"][0]
 
         # Extract session_id from path using explicit patterns
         session_id = None
-        path = request.url.path
+        path = scope["path"]
 
         # REST routes: /api/v1/sessions/{session_id}...
-        if (match := re.search(r"/api/v\d+/sessions/([^/]+)", path)) or (match := re.search(r"/ws/chat/([^/]+)", path)):
+        if (match := _SESSION_PATH_RE.search(path)) or (match := _WS_PATH_RE.search(path)):
             session_id = match.group(1)
 
         # Create and set context
         context = RequestContext(
             request_id=request_id,
-            path=request.url.path,
-            method=request.method,
+            path=path,
+            method=scope["method"],
             client_ip=client_ip,
             session_id=session_id,
         )
         set_request_context(context)
 
-        try:
-            response = await call_next(request)
+        async def send_with_context(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed_ms = context.elapsed_ms
+                response_headers = MutableHeaders(scope=message)
 
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
+                # Add request ID to response headers
+                response_headers["X-Request-ID"] = request_id
 
-            # Add timing header in development
-            response.headers["X-Response-Time"] = f"{context.elapsed_ms:.2f}ms"
+                # Add timing header in development
+                response_headers["X-Response-Time"] = f"{elapsed_ms:.2f}ms"
 
-            # Record metrics
-            request_duration_seconds.labels(
-                method=request.method, path=request.url.path, status=response.status_code
-            ).observe(context.elapsed_ms / 1000)
+                # Record metrics
+                request_duration_seconds.labels(method=context.method, path=path, status=message["status"]).observe(
+                    elapsed_ms / 1000
+                )
+            await send(message)
 
-            return response
+        try:
+            await self.app(scope, receive, send_with_context)
         finally:
             clear_request_context()
 
@@ -10,12 +10,9 @@ Size limits vary by endpoint type:
 
 from __future__ import annotations
 
-from collections.abc import AsyncIterator, Callable
-from typing import Any
-
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.datastructures import Headers
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from core.constants import get_settings
 from utils.logger import logger
@@ -45,48 +42,40 @@ class BodySizeLimitExceeded(Exception):
         super().__init__(f"Body size {bytes_read} exceeds limit {max_size}")
 
 
-class SizeLimitedBodyStream:
-    """Wraps request body stream with size tracking for chunked transfers."""
-
-    def __init__(self, stream: AsyncIterator[bytes], max_size: int, path: str) -> None:
-        self._stream = stream
-        self._max_size = max_size
-        self._path = path
-        self._bytes_read = 0
-
-    async def __aiter__(self) -> AsyncIterator[bytes]:
-        async for chunk in self._stream:
-            self._bytes_read += len(chunk)
-            if self._bytes_read > self._max_size:
-                logger.warning(
-                    f"Chunked request body too large: {self._bytes_read} bytes > "
-                    f"{self._max_size} bytes (path: {self._path})"
-                )
-                raise BodySizeLimitExceeded(self._bytes_read, self._max_size)
-            yield chunk
+def _too_large_response(max_size: int) -> JSONResponse:
+    return JSONResponse(
+        status_code=413,
+        content={
+            "error": "request_too_large",
+            "message": f"Request body exceeds maximum size of {max_size} bytes",
+            "max_size": max_size,
+        },
+    )
 
 
-class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware to enforce request body size limits.
+class RequestSizeLimitMiddleware:
+    """ASGI middleware to enforce request body size limits.
 
     Checks Content-Length header before processing. For chunked transfers
-    without Content-Length, the body is read incrementally with size tracking.
+    without Content-Length, ``receive`` is wrapped to count body bytes as the
+    app reads them; once over the limit the read fails and a 413 replaces
+    whatever response the app would have produced.
     """
 
     def __init__(
         self,
-        app: Callable[..., Any],
+        app: ASGIApp,
         max_body_size: int | None = None,
         max_upload_size: int | None = None,
     ) -> None:
         """Initialize middleware with size limits.
 
         Args:
-            app: FastAPI application
+            app: ASGI application
             max_body_size: Max size for regular requests (bytes)
             max_upload_size: Max size for upload requests (bytes)
         """
-        super().__init__(app)
+        self.app = app
         settings = get_settings()
 
         # Get settings with proper type handling
@@ -100,52 +89,70 @@ class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
             settings_upload_size if isinstance(settings_upload_size, int) else DEFAULT_MAX_UPLOAD_SIZE
         )
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Check request size before processing."""
-        # Skip size check for requests without bodies
-        if request.method in ("GET", "HEAD", "OPTIONS", "DELETE"):
-            return await call_next(request)
+        # Skip size check for non-HTTP scopes and requests without bodies
+        if scope["type"] != "http" or scope["method"] in ("GET", "HEAD", "OPTIONS", "DELETE"):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
 
         # Skip WebSocket upgrades
-        if request.headers.get("upgrade", "").lower() == "websocket":
-            return await call_next(request)
+        if headers.get("upgrade", "").lower() == "websocket":
+            await self.app(scope, receive, send)
+            return
 
         # Determine size limit based on path
-        path = request.url.path
+        path = scope["path"]
         max_size = self._max_upload_size if _is_upload_path(path) else self._max_body_size
 
         # Check Content-Length header if present
-        content_length = request.headers.get("content-length")
+        content_length = headers.get("content-length")
         if content_length:
             try:
                 size = int(content_length)
-                if size > max_size:
-                    logger.warning(f"Request body too large: {size} bytes > {max_size} bytes (path: {path})")
-                    return JSONResponse(
-                        status_code=413,
-                        content={
-                            "error": "request_too_large",
-                            "message": f"Request body exceeds maximum size of {max_size} bytes",
-                            "max_size": max_size,
-                        },
-                    )
             except ValueError:
                 # Invalid Content-Length header
-                pass
-        else:
-            # For chunked transfers without Content-Length, wrap the body stream
-            # to track size incrementally and enforce limits
-            original_stream = request.stream()
-            request._stream = SizeLimitedBodyStream(original_stream, max_size, path).__aiter__()  # type: ignore[attr-defined]
+                size = 0
+            if size > max_size:
+                logger.warning(f"Request body too large: {size} bytes > {max_size} bytes (path: {path})")
+                await _too_large_response(max_size)(scope, receive, send)
+                return
+            await self.app(scope, receive, send)
+            return
+
+        # For chunked transfers without Content-Length, count body bytes as
+        # they are received and enforce the limit incrementally
+        bytes_read = 0
+        exceeded: BodySizeLimitExceeded | None = None
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal bytes_read, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                bytes_read += len(message.get("body", b""))
+                if bytes_read > max_size:
+                    logger.warning(
+                        f"Chunked request body too large: {bytes_read} bytes > {max_size} bytes (path: {path})"
+                    )
+                    exceeded = BodySizeLimitExceeded(bytes_read, max_size)
+                    raise exceeded
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if exceeded is not None and not response_started:
+                return  # The app's error response for the failed read; replaced by 413
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
         try:
-            return await call_next(request)
-        except BodySizeLimitExceeded as e:
-            return JSONResponse(
-                status_code=413,
-                content={
-                    "error": "request_too_large",
-                    "message": f"Request body exceeds maximum size of {e.max_size} bytes",
-                    "max_size": e.max_size,
-                },
-            )
+            await self.app(scope, limited_receive, guarded_send)
+        except BodySizeLimitExceeded:
+            if response_started:
+                raise
+        if exceeded is not None and not response_started:
+            await _too_large_response(exceeded.max_size)(scope, receive, send)
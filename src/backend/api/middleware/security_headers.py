@@ -10,11 +10,7 @@ Adds standard security headers to all HTTP responses for defense in depth:
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from typing import Any
-
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from core.constants import get_settings
 
@@ -22,28 +18,28 @@ from core.constants import get_settings
 DEFAULT_HSTS_MAX_AGE = 31536000
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware to add security headers to all responses.
+class SecurityHeadersMiddleware:
+    """ASGI middleware to add security headers to all responses.
 
-    Headers are added after the response is generated but before
-    it's sent to the client. HSTS is only added in production to
-    avoid breaking local development over HTTP.
+    Headers are added to the ``http.response.start`` message, before the
+    response is sent to the client, replacing any the app already set. HSTS
+    is only added in production to avoid breaking local development over HTTP.
     """
 
     def __init__(
         self,
-        app: Callable[..., Any],
+        app: ASGIApp,
         hsts_max_age: int = DEFAULT_HSTS_MAX_AGE,
         enable_hsts: bool | None = None,
     ) -> None:
         """Initialize middleware.
 
         Args:
-            app: FastAPI application
+            app: ASGI application
             hsts_max_age: HSTS max-age in seconds (default 1 year)
             enable_hsts: Whether to enable HSTS (default: auto based on environment)
         """
-        super().__init__(app)
+        self.app = app
         self._hsts_max_age = hsts_max_age
 
         # Determine HSTS setting
@@ -53,35 +49,53 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             settings = get_settings()
             self._enable_hsts = settings.is_production
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        """Add security headers to response."""
-        response = await call_next(request)
+        headers: dict[str, str] = {}
 
         # HSTS - only in production (requires HTTPS)
         if self._enable_hsts:
-            response.headers["Strict-Transport-Security"] = f"max-age={self._hsts_max_age}"
+            headers["Strict-Transport-Security"] = f"max-age={self._hsts_max_age}"
 
         # Content Security Policy - restrictive for API-only backend
         # APIs don't serve HTML, so a strict policy is appropriate
-        response.headers["Content-Security-Policy"] = "default-src 'none'; frame-ancestors 'none'"
+        headers["Content-Security-Policy"] = "default-src 'none'; frame-ancestors 'none'"
 
         # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
+        headers["X-Content-Type-Options"] = "nosniff"
 
         # Prevent clickjacking (redundant with CSP frame-ancestors but good for older browsers)
-        response.headers["X-Frame-Options"] = "DENY"
+        headers["X-Frame-Options"] = "DENY"
 
         # Control referrer information sent to other origins
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
 
         # X-XSS-Protection is deprecated and can cause issues in modern browsers
         # Explicitly disable it as recommended by OWASP
-        response.headers["X-XSS-Protection"] = "0"
+        headers["X-XSS-Protection"] = "0"
 
         # Permissions-Policy - disable browser features not needed by API
-        response.headers["Permissions-Policy"] = (
+        headers["Permissions-Policy"] = (
             "accelerometer=(), camera=(), geolocation=(), gyroscope=(), "
             "magnetometer=(), microphone=(), payment=(), usb=()"
         )
 
-        return response
+        # Encoded once; every response reuses the same header list
+        self._raw_headers = [
+            (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()
+        ]
+        self._header_names = frozenset(name for name, _ in self._raw_headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Add security headers to the response."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *(header for header in message.get("headers", ()) if header[0].lower() not in self._header_names),
+                    *self._raw_headers,
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
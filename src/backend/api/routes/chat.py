@@ -37,10 +37,9 @@ async def _get_user_for_websocket(token: str | None, db: asyncpg.Pool, client_ip
 
     # Allow localhost connections without auth (for local development)
     if settings.allow_localhost_noauth and client_ip in {"127.0.0.1", "localhost", "::1"}:
-        auth = AuthService(db)
-        default_user = await auth.get_default_user()
+        default_user = await AuthService(db).get_default_user_info()
         if default_user:
-            return UserInfo(**auth.user_payload(default_user))
+            return UserInfo(**default_user)
 
     raise WebSocketDisconnect(code=4401)
 
@@ -98,14 +97,12 @@ async def chat_websocket(
         await websocket.close(code=4503, reason="Service unavailable - connection limit reached")
         return
 
-    # Ensure files are synced from S3 (Rehydration)
-    # This prevents missing files if the session idled out and was cleaned up
-    try:
-        s3_sync = getattr(websocket.app.state, "s3_sync", None)
-        if s3_sync:
-            await s3_sync.sync_from_s3(session_id)
-    except Exception as e:
-        logger.warning(f"Failed to sync S3 files on connect for {session_id}: {e}")
+    # Rehydrate the local cache from S3 in the background (the session may have
+    # idled out and been cleaned up). ChatService waits for the eager input/
+    # downloads before building the prompt; other files hydrate on first access.
+    s3_sync = getattr(websocket.app.state, "s3_sync", None)
+    if s3_sync:
+        s3_sync.start_rehydration(session_id)
 
     chat_service = ChatService(
         db,
@@ -8,21 +8,27 @@ response patterns and comprehensive OpenAPI documentation.
 from __future__ import annotations
 
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import APIRouter, Depends
+from fastapi.security import HTTPAuthorizationCredentials
 
 from api.dependencies import DB
-from api.middleware.auth import get_current_user
-from api.middleware.exception_handlers import AuthenticationError
+from api.middleware.auth import bearer_scheme, get_current_user
+from api.middleware.exception_handlers import AppException, AuthenticationError
 from api.services.auth_service import AuthService
+from models.api_models import UserInfo as AuthenticatedUser
 from models.error_models import ErrorCode
 from models.schemas.auth import (
     LoginRequest,
+    LogoutRequest,
     RefreshRequest,
     RegisterRequest,
     TokenResponse,
     UserInfo,
 )
+from models.schemas.base import SuccessResponse
+from utils.password_hasher import PasswordHasherSaturatedError
 
 router = APIRouter()
 
@@ -53,11 +59,11 @@ router = APIRouter()
             },
         },
         409: {"description": "Email already registered"},
+        503: {"description": "Password hashing pool saturated"},
     },
 )
 async def register(body: RegisterRequest, db: DB) -> TokenResponse:
     """Register new user and issue tokens."""
-    from api.middleware.exception_handlers import AppException
     from core.constants import get_settings
 
     settings = get_settings()
@@ -93,6 +99,11 @@ async def register(body: RegisterRequest, db: DB) -> TokenResponse:
             code=ErrorCode.RESOURCE_ALREADY_EXISTS,
             message=str(exc),
         ) from exc
+    except PasswordHasherSaturatedError as exc:
+        raise AppException(
+            code=ErrorCode.INTERNAL_OVERLOADED,
+            message="Authentication is temporarily overloaded; retry shortly",
+        ) from exc
 
 
 @router.post(
@@ -119,6 +130,7 @@ async def register(body: RegisterRequest, db: DB) -> TokenResponse:
             },
         },
         401: {"description": "Invalid credentials"},
+        503: {"description": "Password hashing pool saturated"},
     },
 )
 async def login(body: LoginRequest, db: DB) -> TokenResponse:
@@ -145,6 +157,11 @@ async def login(body: LoginRequest, db: DB) -> TokenResponse:
             message=str(exc),
             code=ErrorCode.AUTH_INVALID_CREDENTIALS,
         ) from exc
+    except PasswordHasherSaturatedError as exc:
+        raise AppException(
+            code=ErrorCode.INTERNAL_OVERLOADED,
+            message="Authentication is temporarily overloaded; retry shortly",
+        ) from exc
 
 
 @router.post(
@@ -217,3 +234,56 @@ async def refresh(body: RefreshRequest, db: DB) -> TokenResponse:
 async def me(user: Annotated[UserInfo, Depends(get_current_user)]) -> UserInfo:
     """Get current user information."""
     return user
+
+
+@router.post(
+    "/logout",
+    response_model=SuccessResponse,
+    summary="Logout",
+    description="Revoke the current access token and, optionally, a refresh token.",
+    responses={
+        200: {
+            "description": "Tokens revoked",
+            "content": {"application/json": {"example": {"success": True, "message": "Logged out"}}},
+        },
+        401: {"description": "Not authenticated or invalid token"},
+    },
+)
+async def logout(
+    db: DB,
+    user: Annotated[UserInfo, Depends(get_current_user)],
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer_scheme)],
+    body: LogoutRequest | None = None,
+) -> SuccessResponse:
+    """Revoke tokens until they expire."""
+    auth = AuthService(db)
+    try:
+        if credentials is not None:
+            await auth.revoke_token(credentials.credentials)
+        if body and body.refresh_token:
+            await auth.revoke_token(body.refresh_token, "refresh")
+    except ValueError as exc:
+        raise AuthenticationError(
+            message="Invalid token",
+            code=ErrorCode.AUTH_INVALID_TOKEN,
+        ) from exc
+    return SuccessResponse(message="Logged out")
+
+
+@router.post(
+    "/logout-all",
+    response_model=SuccessResponse,
+    summary="Logout everywhere",
+    description="Revoke every access and refresh token issued to the current user, on all devices.",
+    responses={
+        200: {
+            "description": "Tokens revoked",
+            "content": {"application/json": {"example": {"success": True, "message": "Logged out everywhere"}}},
+        },
+        401: {"description": "Not authenticated or invalid token"},
+    },
+)
+async def logout_all(db: DB, user: Annotated[AuthenticatedUser, Depends(get_current_user)]) -> SuccessResponse:
+    """Revoke all of the user's tokens by bumping their token version."""
+    await AuthService(db).revoke_user_tokens(UUID(user.id))
+    return SuccessResponse(message="Logged out everywhere")
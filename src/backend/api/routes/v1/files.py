@@ -9,16 +9,23 @@ from __future__ import annotations
 
 import mimetypes
 
+from collections.abc import AsyncIterator
+from email.utils import parsedate
 from typing import Annotated
+from urllib.parse import quote
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File as FastAPIFile, HTTPException, Path, Query, UploadFile
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, File as FastAPIFile, HTTPException, Path, Query, Request, UploadFile
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse
 
 from api.dependencies import DB, AppSettings, Files
 from api.middleware.auth import get_current_user
 from api.middleware.exception_handlers import ApiFileNotFoundError, SessionNotFoundError
 from api.middleware.request_context import update_request_context
+from core.constants import FILE_DOWNLOAD_CHUNK_SIZE, FILE_UPLOAD_CHUNK_SIZE
 from models.api_models import UserInfo
 from models.schemas.files import (
     DeleteFileResponse,
@@ -105,6 +112,33 @@ async def verify_session_ownership(
         raise HTTPException(status_code=403, detail="Access denied to this session")
 
 
+def _is_not_modified(response_headers: Headers, request_headers: Headers) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against a file response."""
+    if if_none_match := request_headers.get("if-none-match"):
+        etag = response_headers.get("etag")
+        return etag is not None and (
+            if_none_match.strip() == "*" or etag in [tag.strip(" W/") for tag in if_none_match.split(",")]
+        )
+
+    if_modified_since = parsedate(request_headers.get("if-modified-since", ""))
+    last_modified = parsedate(response_headers.get("last-modified", ""))
+    return if_modified_since is not None and last_modified is not None and if_modified_since >= last_modified
+
+
+async def _iter_upload(file: UploadFile) -> AsyncIterator[bytes]:
+    """Read an upload in bounded chunks."""
+    while chunk := await file.read(FILE_UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+def _content_disposition(filename: str) -> str:
+    """Attachment Content-Disposition, RFC 5987-encoded for non-ASCII names."""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
 # =============================================================================
 # Endpoints
 # =============================================================================
@@ -190,17 +224,20 @@ async def upload_file(
     file: Annotated[UploadFile, FastAPIFile(description="File to upload")],
     folder: FolderQuery = "input",
 ) -> FileUploadResponse:
-    """Upload file to session folder."""
+    """Upload file to session folder.
+
+    The upload is copied to the workspace in FILE_UPLOAD_CHUNK_SIZE chunks
+    (never held in memory whole), hashed on the way, and deduplicated when
+    identical content is already stored under the same name.
+    """
     update_request_context(session_id=session_id)
     await verify_session_ownership(session_id, user, db)
 
-    content = await file.read()
-
-    result = await files.save_file(
+    result = await files.save_stream(
         session_id=session_id,
         folder=folder,
         filename=file.filename,
-        content=content,
+        chunks=_iter_upload(file),
         content_type=file.content_type,
     )
 
@@ -210,22 +247,31 @@ async def upload_file(
         modified=result.get("modified"),
         extension=result.get("extension"),
         path=f"{folder}/{result['name']}",
+        content_hash=result.get("content_hash"),
+        deduplicated=result.get("deduplicated", False),
     )
 
 
 @router.get(
     "/{session_id}/files/{filename}/download",
     summary="Download file",
-    description="Download a file from a session folder.",
+    description=(
+        "Download a file from a session folder. Supports Range requests (resumable downloads) "
+        "and conditional GET via ETag / Last-Modified."
+    ),
     responses={
         200: {
             "description": "File content",
             "content": {"application/octet-stream": {}},
         },
+        206: {"description": "Partial content for a Range request"},
+        304: {"description": "Not modified (If-None-Match / If-Modified-Since matched)"},
         404: {"description": "File not found"},
+        416: {"description": "Requested range not satisfiable"},
     },
 )
 async def download_file(
+    request: Request,
     session_id: SessionIdPath,
     filename: FilenamePath,
     user: CurrentUser,
@@ -233,21 +279,57 @@ async def download_file(
     files: Files,
     folder: FolderQuery = "input",
 ) -> Response:
-    """Download file content."""
+    """Stream file content with Range and conditional GET support.
+
+    Files in the local cache are sent with FileResponse (sendfile/pathsend
+    where the server supports it, never read into memory). When the local
+    copy is missing or still pending S3 hydration and S3 storage is enabled,
+    the object is streamed from the bucket instead.
+    """
     update_request_context(session_id=session_id)
     await verify_session_ownership(session_id, user, db)
 
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    # A local copy still pending S3 hydration is missing or stale: stream from S3
+    pending = files.s3_sync is not None and files.s3_sync.is_pending(session_id, folder, filename)
+    stat_result = None if pending else await files.stat_file(session_id, folder, filename)
+    if stat_result is not None:
+        response = FileResponse(
+            files.get_file_path(session_id, folder, filename),
+            stat_result=stat_result,
+            media_type=content_type,
+            filename=filename,
+        )
+        if _is_not_modified(response.headers, request.headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    if files.s3_sync is None:
+        raise ApiFileNotFoundError(filename)
+
     try:
-        content = await files.get_file_content(session_id, folder, filename)
+        download = await files.s3_sync.open_download(
+            session_id,
+            folder,
+            filename,
+            # S3 cannot evaluate If-Range; ignoring Range then is allowed (full 200)
+            byte_range=None if "if-range" in request.headers else request.headers.get("range"),
+            if_none_match=request.headers.get("if-none-match"),
+            if_modified_since=request.headers.get("if-modified-since"),
+        )
     except FileNotFoundError as exc:
         raise ApiFileNotFoundError(filename) from exc
 
-    content_type, _ = mimetypes.guess_type(filename)
+    if download.body is None:
+        return Response(status_code=download.status_code, headers=download.headers)
 
-    return Response(
-        content=content,
-        media_type=content_type or "application/octet-stream",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    return StreamingResponse(
+        download.iter_chunks(FILE_DOWNLOAD_CHUNK_SIZE),
+        status_code=download.status_code,
+        headers={**download.headers, "Content-Disposition": _content_disposition(filename)},
+        media_type=content_type,
+        background=BackgroundTask(download.close),
     )
 
 
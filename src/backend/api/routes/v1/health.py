@@ -13,7 +13,10 @@ from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 
 from api.dependencies import DB
+from api.services.health_prober import HealthProber, probe_dependencies
+from core.constants import HEALTH_PROBE_MAX_AGE
 from models.schemas.health import (
+    CacheStats,
     DatabaseHealth,
     HealthResponse,
     LivenessResponse,
@@ -22,7 +25,7 @@ from models.schemas.health import (
     S3Health,
     WebSocketHealth,
 )
-from utils.db_utils import check_pool_health
+from utils.cache import get_tiered_caches
 
 router = APIRouter()
 
@@ -31,7 +34,8 @@ router = APIRouter()
     "/health",
     response_model=HealthResponse,
     summary="Health check",
-    description="Comprehensive health check with all subsystem statuses.",
+    description="Comprehensive health check with all subsystem statuses. Database, MCP and S3 "
+    "connectivity come from a background prober; checked_at and check_age_seconds tell how fresh they are.",
     responses={
         200: {
             "description": "System health status",
@@ -40,6 +44,9 @@ router = APIRouter()
                     "example": {
                         "status": "healthy",
                         "version": "1.0.0-local",
+                        "checked_at": "2024-01-01T12:00:00+00:00",
+                        "check_age_seconds": 4.2,
+                        "stale": False,
                         "database": {
                             "healthy": True,
                             "pool_size": 10,
@@ -64,7 +71,12 @@ router = APIRouter()
     tags=["Health"],
 )
 async def health_check(db: DB, request: Request) -> HealthResponse:
-    """Comprehensive health check endpoint."""
+    """Comprehensive health check endpoint.
+
+    Database, MCP and S3 connectivity come from the background health prober's
+    latest snapshot (probed inline only until its first round completes);
+    in-process statistics are read live.
+    """
     from datetime import datetime
 
     # Calculate uptime
@@ -77,8 +89,21 @@ async def health_check(db: DB, request: Request) -> HealthResponse:
         uptime = 0.0
         startup_str = now_utc.isoformat()
 
-    # Database health with pool statistics
-    db_health_data = await check_pool_health(db)
+    mcp_manager = request.app.state.mcp_manager
+    s3_service = getattr(request.app.state, "s3_sync", None)
+
+    # Dependency connectivity from the prober's snapshot
+    prober: HealthProber | None = getattr(request.app.state, "health_prober", None)
+    snapshot = prober.snapshot if prober else None
+    if snapshot is None:
+        snapshot = await probe_dependencies(db, mcp_manager, s3_service)
+    age = snapshot.age_seconds
+    stale = age > HEALTH_PROBE_MAX_AGE
+
+    # Database health with live pool statistics
+    db_health_data = snapshot.database
+    pool_size = db.get_size()
+    pool_free = db.get_idle_size()
 
     # WebSocket statistics
     ws_manager = request.app.state.ws_manager
@@ -93,29 +118,27 @@ async def health_check(db: DB, request: Request) -> HealthResponse:
         ws_health = WebSocketHealth(error="not initialized")
 
     # MCP manager statistics & health
-    mcp_manager = request.app.state.mcp_manager
-    mcp_ping_data = {}
+    mcp_ping_data = snapshot.mcp or {}
     if mcp_manager:
         stats = mcp_manager.get_stats()
-        # Perform deep check
-        mcp_ping_data = await mcp_manager.check_connectivity()
-
         server_count = stats.get("server_count", 0)
+        mcp_error = None
+        if not mcp_ping_data.get("healthy", True):
+            mcp_error = mcp_ping_data.get("error") or str(mcp_ping_data.get("details"))
         mcp_health = MCPHealth(
             initialized=stats.get("initialized", True),
             pool_size=server_count,
             available=server_count,
             ping_latency_ms=mcp_ping_data.get("latency_ms"),
-            error=str(mcp_ping_data.get("details")) if not mcp_ping_data.get("healthy") else None,
+            error=mcp_error,
         )
     else:
         mcp_health = MCPHealth(initialized=False, pool_size=0, available=0)
 
     # S3 health
     s3_health = None
-    s3_service = getattr(request.app.state, "s3_sync", None)
     if s3_service:
-        s3_data = await s3_service.check_connectivity()
+        s3_data = snapshot.s3 or {"connected": False, "error": "not probed yet"}
         s3_health = S3Health(
             bucket=s3_service.bucket,
             connected=s3_data.get("connected", False),
@@ -129,10 +152,10 @@ async def health_check(db: DB, request: Request) -> HealthResponse:
     mcp_healthy = mcp_ping_data.get("healthy", True)  # Default true if no manager (not critical)
     s3_healthy = s3_health.connected if s3_health else True
 
-    if db_healthy and ws_healthy and mcp_healthy and s3_healthy:
+    if db_healthy and ws_healthy and mcp_healthy and s3_healthy and not stale:
         status = "healthy"
     elif db_healthy:
-        # DB is critical, others might mean degraded
+        # DB is critical, others (or results the prober stopped refreshing) might mean degraded
         status = "degraded"
     else:
         status = "unhealthy"
@@ -142,16 +165,20 @@ async def health_check(db: DB, request: Request) -> HealthResponse:
         version="1.0.0-local",
         uptime_seconds=uptime,
         startup_time=startup_str,
+        checked_at=snapshot.checked_at.isoformat(),
+        check_age_seconds=round(age, 3),
+        stale=stale,
         database=DatabaseHealth(
             healthy=db_healthy,
-            pool_size=db_health_data.get("pool_size", 0),
-            pool_free=db_health_data.get("pool_free", 0),
-            pool_used=db_health_data.get("pool_used", 0),
+            pool_size=pool_size,
+            pool_free=pool_free,
+            pool_used=max(pool_size - pool_free, 0),
             error=db_health_data.get("error"),
         ),
         websocket=ws_health,
         mcp=mcp_health,
         s3=s3_health,
+        caches={name: CacheStats(**cache.stats()) for name, cache in get_tiered_caches().items()},
     )
 
 
@@ -172,8 +199,15 @@ async def health_check(db: DB, request: Request) -> HealthResponse:
     },
     tags=["Health"],
 )
-async def readiness_check(db: DB) -> ReadinessResponse | JSONResponse:
-    """Kubernetes-style readiness probe."""
+async def readiness_check(db: DB, request: Request) -> ReadinessResponse | JSONResponse:
+    """Kubernetes-style readiness probe.
+
+    Kept cheap: one ``SELECT 1`` on a pooled connection, never MCP or S3.
+    Reports not ready once shutdown has begun so traffic drains first.
+    """
+    shutdown_event = getattr(request.app.state, "shutdown_event", None)
+    if shutdown_event is not None and shutdown_event.is_set():
+        return JSONResponse(status_code=503, content={"ready": False, "error": "Shutting down"})
     try:
         async with db.acquire(timeout=5.0) as conn:
             await conn.fetchval("SELECT 1")
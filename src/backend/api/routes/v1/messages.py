@@ -18,10 +18,17 @@ from pydantic import BaseModel, ConfigDict, Field
 
 from api.dependencies import DB
 from api.middleware.auth import get_current_user
-from api.middleware.exception_handlers import SessionNotFoundError
+from api.middleware.exception_handlers import SessionNotFoundError, ValidationException
 from api.middleware.request_context import update_request_context
-from api.services.message_utils import _extract_display_content, calculate_tool_status
+from api.services.message_utils import (
+    MESSAGE_COLUMNS,
+    _extract_display_content,
+    calculate_tool_status,
+    decode_message_cursor,
+    fetch_message_page,
+)
 from models.api_models import UserInfo
+from models.error_models import ErrorDetail
 from models.schemas.base import PaginationMeta
 from models.schemas.sessions import MessageResponse
 
@@ -60,7 +67,8 @@ class MessageListResponse(BaseModel):
                     "total_count": 24,
                     "offset": 0,
                     "limit": 50,
-                    "has_more": False,
+                    "has_more": True,
+                    "next_cursor": "MjAyNS0wMS0xNVQxMDozMDowMCswMDowMHxtc2dfMTIz",
                 },
             }
         }
@@ -99,7 +107,12 @@ SessionIdPath = Annotated[
     "/{session_id}/messages",
     response_model=MessageListResponse,
     summary="List messages",
-    description="Retrieve paginated messages for a session. Uses offset/limit for pagination. Messages are returned in chronological order (oldest first within the batch).",
+    description=(
+        "Retrieve paginated messages for a session, newest page first. Pass `next_cursor` from the "
+        "previous response as `cursor` to load the next older page. Messages are returned in "
+        "chronological order (oldest first within the batch). `offset` is deprecated; it pages "
+        "from the oldest message and is only used when no cursor is given."
+    ),
     responses={
         200: {
             "description": "Messages retrieved successfully",
@@ -112,6 +125,7 @@ SessionIdPath = Annotated[
                             "offset": 0,
                             "limit": 50,
                             "has_more": False,
+                            "next_cursor": None,
                         },
                     }
                 }
@@ -119,30 +133,45 @@ SessionIdPath = Annotated[
         },
         403: {"description": "Access denied - user does not own this session"},
         404: {"description": "Session not found"},
+        422: {"description": "Invalid pagination cursor"},
     },
 )
 async def list_messages(
     session_id: SessionIdPath,
     user: CurrentUser,
     db: DB,
+    cursor: Annotated[
+        str | None,
+        Query(description="Cursor from a previous page's next_cursor; returns older messages"),
+    ] = None,
     offset: Annotated[
-        int,
-        Query(ge=0, description="Number of messages to skip (from oldest)", examples=[0]),
-    ] = 0,
+        int | None,
+        Query(ge=0, description="Number of messages to skip (from oldest)", examples=[0], deprecated=True),
+    ] = None,
     limit: Annotated[
         int,
         Query(ge=1, le=100, description="Maximum messages to return", examples=[50]),
     ] = 50,
 ) -> MessageListResponse:
-    """List messages with offset/limit pagination."""
+    """List messages with keyset (cursor) pagination, newest page first."""
     update_request_context(session_id=session_id)
 
     user_id = UUID(user.id)
 
+    before = None
+    if cursor is not None:
+        try:
+            before = decode_message_cursor(cursor)
+        except ValueError:
+            raise ValidationException(
+                "Invalid pagination cursor",
+                [ErrorDetail(field="cursor", message="Cursor is malformed or expired")],
+            ) from None
+
     async with db.acquire() as conn:
-        # Get session UUID and verify ownership
+        # Get session UUID, verify ownership and read the maintained message counter
         session_row = await conn.fetchrow(
-            "SELECT id, user_id FROM sessions WHERE session_id = $1",
+            "SELECT id, user_id, message_count FROM sessions WHERE session_id = $1",
             session_id,
         )
 
@@ -154,27 +183,26 @@ async def list_messages(
             raise HTTPException(status_code=403, detail="Access denied to this session")
 
         session_uuid = session_row["id"]
-
-        # Get total count
-        total_count = await conn.fetchval(
-            "SELECT COUNT(*) FROM messages WHERE session_id = $1",
-            session_uuid,
-        )
-
-        # Get paginated messages (chronological order with offset from oldest)
-        rows = await conn.fetch(
-            """
-            SELECT id, role, content, created_at,
-                   tool_call_id, tool_name, tool_arguments, tool_result, tool_success, metadata
-            FROM messages
-            WHERE session_id = $1
-            ORDER BY created_at ASC
-            LIMIT $2 OFFSET $3
-            """,
-            session_uuid,
-            limit,
-            offset,
-        )
+        total_count = session_row["message_count"] or 0
+        next_cursor = None
+
+        if offset is not None and cursor is None:
+            # Legacy offset pagination (chronological from oldest); cost grows with offset
+            rows = await conn.fetch(
+                f"""
+                SELECT {MESSAGE_COLUMNS} FROM messages
+                WHERE session_id = $1
+                ORDER BY created_at ASC, id ASC
+                LIMIT $2 OFFSET $3
+                """,
+                session_uuid,
+                limit,
+                offset,
+            )
+            has_more = offset + len(rows) < total_count
+        else:
+            rows, next_cursor = await fetch_message_page(conn, session_uuid, limit, before)
+            has_more = next_cursor is not None
 
     messages = []
     for row in rows:  # Already in chronological order
@@ -215,9 +243,10 @@ async def list_messages(
     return MessageListResponse(
         messages=messages,
         pagination=PaginationMeta(
-            total_count=total_count,
-            offset=offset,
+            total_count=max(total_count, len(messages)),
+            offset=offset or 0,
             limit=limit,
-            has_more=offset + limit < total_count,
+            has_more=has_more,
+            next_cursor=next_cursor,
         ),
     )
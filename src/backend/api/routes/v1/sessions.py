@@ -7,7 +7,6 @@ response patterns and comprehensive OpenAPI documentation.
 
 from __future__ import annotations
 
-import json
 import secrets
 
 from typing import Annotated
@@ -32,6 +31,7 @@ from models.schemas.sessions import (
     SummarizeResponse,
     UpdateSessionRequest,
 )
+from utils.cache import invalidate_session_caches
 
 router = APIRouter()
 
@@ -195,15 +195,16 @@ async def get_session(
     if not result:
         raise SessionNotFoundError(session_id)
 
-    # Sync files from S3 if S3 sync is enabled (Phase 2)
+    # Rehydrate the local cache from S3 in the background (Phase 2)
     if files.s3_sync:
-        await files.s3_sync.sync_from_s3(session_id)
+        files.s3_sync.start_rehydration(session_id)
 
     return SessionWithHistoryResponse(
         session=SessionResponse(**result["session"]),
         messages=[MessageResponse(**m) for m in result["full_history"]],
         files=[FileInfoResponse(**f) for f in result["files"]],
         has_more=result["has_more"],
+        next_cursor=result["next_cursor"],
         loaded_count=result["loaded_count"],
         message_count=result["message_count"],
     )
@@ -352,19 +353,18 @@ async def summarize_session(
     call_id = f"sum_{secrets.token_hex(4)}"
 
     # Persist summarization as tool_call to messages table
-    args_json = json.dumps(
-        {
-            "tokens_before": tokens_before,
-            "tokens_after": session.total_tokens,
-        }
-    )
+    tool_arguments = {
+        "tokens_before": tokens_before,
+        "tokens_after": session.total_tokens,
+    }
 
     # Persist token count and message atomically
     async with db.acquire() as conn, conn.transaction():
         await conn.execute(
             """
                 UPDATE sessions
-                SET total_tokens = $1, accumulated_tool_tokens = $2
+                SET total_tokens = $1, accumulated_tool_tokens = $2,
+                    message_count = message_count + 1
                 WHERE id = $3
                 """,
             session.total_tokens,
@@ -383,11 +383,14 @@ async def summarize_session(
             "Summarized conversation",
             call_id,
             "summarize_conversation",
-            args_json,
+            tool_arguments,
             summary,
             True,
         )
 
+    # Token and message counts changed
+    await invalidate_session_caches(user_id, session_id)
+
     return SummarizeResponse(
         success=True,
         message="Conversation summarized successfully",
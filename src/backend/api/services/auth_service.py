@@ -2,27 +2,41 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 from typing import Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import asyncpg
-import bcrypt
 
 from jose import JWTError, jwt
 
+from api.services.token_denylist import get_token_denylist
 from core.constants import Settings, get_settings
+from utils.cache import get_user_cache, user_cache_key
+from utils.password_hasher import get_password_hasher
 
 
 class AuthService:
-    """Authentication service for issuing and validating JWT tokens."""
+    """Authentication service for issuing and validating JWT tokens.
+
+    Tokens carry a ``jti`` and the user's ``token_version`` (``ver``). Access
+    token authentication resolves users through a short-TTL cache keyed by
+    ``sub`` + ``ver``, or straight from the token claims when
+    ``auth_stateless_tokens`` is enabled; revocation is enforced by the synced
+    in-memory denylist in both modes.
+    """
 
     def __init__(self, pool: asyncpg.Pool, settings: Settings | None = None):
         self.pool = pool
         self.settings = settings or get_settings()
 
     async def login(self, email: str, password: str) -> dict[str, Any]:
-        """Validate credentials and return access/refresh tokens."""
+        """Validate credentials and return access/refresh tokens.
+
+        Raises:
+            ValueError: If the credentials are invalid
+            PasswordHasherSaturatedError: If the hashing pool is saturated
+        """
         user = await self.get_user_by_email(email)
-        if not user or not bcrypt.checkpw(password.encode(), user["password_hash"].encode()):
+        if not user or not await get_password_hasher().verify(password, user["password_hash"]):
             raise ValueError("Invalid credentials")
 
         tokens = self._issue_tokens(user)
@@ -39,8 +53,8 @@ class AuthService:
         if existing:
             raise ValueError("Email already registered")
 
-        # Hash password
-        password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+        # Hash password (off the event loop)
+        password_hash = await get_password_hasher().hash(password)
 
         # Insert new user
         async with self.pool.acquire() as conn:
@@ -69,8 +83,10 @@ class AuthService:
     async def refresh(self, refresh_token: str) -> dict[str, Any]:
         """Validate refresh token and return new access and refresh tokens (rotation)."""
         payload = self._decode_token(refresh_token, "refresh")
+        if get_token_denylist().is_revoked(payload):
+            raise ValueError("Invalid refresh token")
         user = await self.get_user_by_id(UUID(payload["sub"]))
-        if not user:
+        if not user or payload.get("ver", 0) != user.get("token_version", 0):
             raise ValueError("Invalid refresh token")
         tokens = self._issue_tokens(user, include_refresh=True)
         tokens["user"] = self.user_payload(user)
@@ -80,10 +96,86 @@ class AuthService:
         """Retrieve the default seeded user for Phase 1."""
         return await self.get_user_by_email(self.settings.default_user_email)
 
+    async def get_default_user_info(self) -> dict[str, Any] | None:
+        """Public payload of the default user, cached."""
+
+        async def load() -> dict[str, Any] | None:
+            user = await self.get_default_user()
+            return self.user_payload(user) if user else None
+
+        result: dict[str, Any] | None = await get_user_cache().get_or_load(
+            f"default:{self.settings.default_user_email}", load
+        )
+        return result
+
     def decode_access_token(self, token: str) -> dict[str, Any]:
         """Decode and validate an access token."""
         return self._decode_token(token, "access")
 
+    async def authenticate(self, token: str) -> dict[str, Any] | None:
+        """Resolve an access token to the public user payload.
+
+        Raises:
+            ValueError: If the token is invalid, expired or revoked
+
+        Returns:
+            User payload, or None if the user no longer exists
+        """
+        payload = self.decode_access_token(token)
+        if get_token_denylist().is_revoked(payload):
+            raise ValueError("Token revoked")
+
+        # Tokens issued before claims were added fall back to the lookup
+        if self.settings.auth_stateless_tokens and "ver" in payload and "email" in payload:
+            return {"id": payload["sub"], "email": payload["email"], "display_name": payload.get("name")}
+
+        user_id = UUID(payload["sub"])
+        version = payload.get("ver", 0)
+
+        async def load() -> dict[str, Any] | None:
+            user = await self.get_user_by_id(user_id)
+            if not user or user.get("token_version", 0) != version:
+                return None
+            return self.user_payload(user)
+
+        result: dict[str, Any] | None = await get_user_cache().get_or_load(user_cache_key(user_id, version), load)
+        return result
+
+    async def revoke_token(self, token: str, token_type: str = "access") -> None:
+        """Revoke a single token until it expires (logout)."""
+        payload = self._decode_token(token, token_type)
+        jti = payload.get("jti")
+        if jti is None:
+            return  # Issued before revocation support; expires on its own
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                """
+                INSERT INTO token_denylist (jti, user_id, expires_at)
+                VALUES ($1, $2, to_timestamp($3))
+                ON CONFLICT (jti) DO NOTHING
+                """,
+                jti,
+                UUID(payload["sub"]),
+                payload["exp"],
+            )
+        get_token_denylist().add_token(jti, payload["exp"])
+
+    async def revoke_user_tokens(self, user_id: UUID) -> None:
+        """Revoke every token issued to a user so far."""
+        async with self.pool.acquire() as conn:
+            version: int | None = await conn.fetchval(
+                """
+                UPDATE users SET token_version = token_version + 1, tokens_revoked_at = now()
+                WHERE id = $1
+                RETURNING token_version
+                """,
+                user_id,
+            )
+        if version is None:
+            return
+        get_token_denylist().set_min_version(str(user_id), version)
+        await get_user_cache().delete(user_cache_key(user_id, version - 1))
+
     async def get_user_by_email(self, email: str) -> asyncpg.Record | None:
         async with self.pool.acquire() as conn:
             return await conn.fetchrow(
@@ -117,7 +209,12 @@ class AuthService:
             "email": user["email"],
             "type": token_type,
             "exp": expires_at,
+            "jti": uuid4().hex,
+            "ver": user.get("token_version", 0),
         }
+        if token_type == "access":
+            # Lets stateless authentication build the user without a lookup
+            payload["name"] = user.get("display_name")
         token: str = jwt.encode(payload, self.settings.jwt_secret, algorithm=self.settings.jwt_algorithm)
         return token
 
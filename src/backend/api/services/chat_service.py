@@ -5,6 +5,7 @@ import contextlib
 import inspect
 import json
 
+from functools import partial
 from typing import TYPE_CHECKING, Any, ClassVar
 from uuid import UUID
 
@@ -25,6 +26,7 @@ if TYPE_CHECKING:
     from api.websocket.task_manager import CancellationToken
 from core.agent import create_agent
 from core.constants import (
+    CONTEXT_SEARCH_MMR_LAMBDA,
     MAX_CONVERSATION_TURNS,
     MSG_TYPE_FUNCTION_COMPLETED,
     MSG_TYPE_FUNCTION_DETECTED,
@@ -39,6 +41,7 @@ from integrations.mcp_manager import MCPServerManager
 from integrations.mcp_registry import DEFAULT_MCP_SERVERS
 from integrations.sdk_token_tracker import connect_session, disconnect_session
 from tools.wrappers import create_session_aware_tools
+from utils.cache import invalidate_session_caches
 from utils.client_factory import create_openai_client
 from utils.logger import logger
 
@@ -128,13 +131,16 @@ class ChatService:
         # Ensure session workspace exists (defensive - handles old sessions)
         self.file_service.init_session_workspace(session_id)
 
+        # Input files rehydrating from S3 (started on connect) must be local first
+        if self.file_service.s3_sync:
+            await self.file_service.s3_sync.wait_for_rehydration(session_id)
+
         # Build system instructions with session file context (Phase 1: local)
         session_files = await self.file_service.list_files(session_id, "input")
         file_names = [f["name"] for f in session_files if f.get("type") == "file"]
 
-        # Parse mcp_config from JSON string (stored as JSONB in PostgreSQL)
-        mcp_config_raw = session_row.get("mcp_config")
-        session_mcp_config = json.loads(mcp_config_raw) if mcp_config_raw else None
+        # mcp_config is JSONB, decoded to a list by the connection codec
+        session_mcp_config = session_row.get("mcp_config") or None
 
         instructions = build_dynamic_instructions(
             base_instructions=SYSTEM_INSTRUCTIONS,
@@ -170,6 +176,7 @@ class ChatService:
                 s3_sync=self.file_service.s3_sync,
                 pool=self.pool,
                 project_id=project_id_str,
+                on_progress=partial(self.ws_manager.send, session_id),
             )
 
             # Create a fresh client for this request to avoid stream mixing
@@ -622,9 +629,7 @@ class ChatService:
             partial: If True, marks this as an interrupted/partial response
         """
         # Use metadata JSONB for partial flag
-        import json as _json
-
-        metadata = _json.dumps({"partial": True}) if partial else "{}"
+        metadata = {"partial": True} if partial else {}
 
         if partial:
             logger.info(f"Saving partial/interrupted message for session {session_uuid}")
@@ -633,7 +638,7 @@ class ChatService:
             await conn.execute(
                 """
                 INSERT INTO messages (session_id, role, content, metadata)
-                VALUES ($1, $2, $3, $4::jsonb)
+                VALUES ($1, $2, $3, $4)
                 """,
                 session_uuid,
                 role,
@@ -641,17 +646,28 @@ class ChatService:
                 metadata,
             )
             # Increment message_count for all messages, turn_count only for user messages
-            await conn.execute(
+            session_row = await conn.fetchrow(
                 """
                 UPDATE sessions
                 SET message_count = message_count + 1,
                     turn_count = turn_count + CASE WHEN $2 = 'user' THEN 1 ELSE 0 END,
                     last_used_at = NOW()
                 WHERE id = $1
+                RETURNING user_id, session_id
                 """,
                 session_uuid,
                 role,
             )
+        await self._invalidate_session_caches(session_row)
+
+    async def _invalidate_session_caches(self, session_row: asyncpg.Record | None) -> None:
+        """Invalidate cached metadata and list pages after a session row update.
+
+        Args:
+            session_row: ``RETURNING user_id, session_id`` row of the update
+        """
+        if session_row:
+            await invalidate_session_caches(session_row["user_id"], session_row["session_id"])
 
     async def _add_tool_call_to_history(
         self,
@@ -664,13 +680,11 @@ class ChatService:
         interrupted: bool = False,
     ) -> None:
         """Add tool call to Layer 2 (full history) with rich metadata."""
-        # Serialize arguments/result to JSON if needed
-        args_json = json.dumps(arguments) if arguments else None
+        # Arguments go to JSONB as-is (the connection codec serializes them)
         result_str = str(result) if result is not None else None
 
         # Store interrupted flag in metadata
         metadata = {"interrupted": True} if interrupted else {}
-        metadata_json = json.dumps(metadata)
 
         async with self.pool.acquire() as conn:
             await conn.execute(
@@ -685,19 +699,21 @@ class ChatService:
                 f"Called {name}",  # Human-readable content
                 call_id,
                 name,
-                args_json,
+                arguments or None,
                 result_str,
                 success,
-                metadata_json,
+                metadata,
             )
-            await conn.execute(
+            session_row = await conn.fetchrow(
                 """
                 UPDATE sessions
                 SET message_count = message_count + 1, last_used_at = NOW()
                 WHERE id = $1
+                RETURNING user_id, session_id
                 """,
                 session_uuid,
             )
+        await self._invalidate_session_caches(session_row)
         logger.info(f"Persisted tool call {name} (call_id={call_id}, success={success})")
 
     async def _inject_project_context(
@@ -813,17 +829,14 @@ class ChatService:
             },
         )
         # Persist to messages table
-        args_json = json.dumps(
-            {
-                "tokens_before": tokens_before,
-                "tokens_after": session.total_tokens,
-            }
-        )
         await self._add_tool_call_to_history(
             session_uuid=session_uuid,
             call_id=call_id,
             name="summarize_conversation",
-            arguments=args_json,
+            arguments={
+                "tokens_before": tokens_before,
+                "tokens_after": session.total_tokens,
+            },
             result=summary,
             success=True,
         )
@@ -982,28 +995,18 @@ class ChatService:
 
             # Update database
             async with self.pool.acquire() as conn:
-                await conn.execute(
+                session_row = await conn.fetchrow(
                     """
                     UPDATE sessions SET title = $1, is_named = true
                     WHERE id = $2
+                    RETURNING user_id, session_id
                     """,
                     generated_title,
                     session_uuid,
                 )
 
-            # Invalidate session cache so REST API returns updated title
-            from utils.cache import get_session_cache, get_session_list_cache
-
-            session_cache = get_session_cache()
-            list_cache = get_session_list_cache()
-            # Use user_id from the session if available, otherwise use a wildcard approach
-            # Since we're in ChatService, we need to look up the user_id from the session
-            async with self.pool.acquire() as conn:
-                row = await conn.fetchrow("SELECT user_id FROM sessions WHERE id = $1", session_uuid)
-            if row:
-                user_id = row["user_id"]
-                await session_cache.delete(f"session:{user_id}:{session_id}")
-                await list_cache.delete(f"sessions:{user_id}:0:50")
+            # Invalidate session caches so REST API returns updated title
+            await self._invalidate_session_caches(session_row)
 
             # Notify frontend via WebSocket
             await self.ws_manager.send(
@@ -1049,12 +1052,14 @@ class ChatService:
         # Generate query embedding
         query_embedding = await embedding_service.embed_text(query)
 
-        # Search for matching chunks
+        # Hybrid search with MMR so injected chunks don't repeat each other
         results = await context_service.search_chunks(
             project_id=project_uuid,
             query_embedding=query_embedding,
             top_k=top_k,
             score_threshold=min_score,
+            query_text=query,
+            mmr_lambda=CONTEXT_SEARCH_MMR_LAMBDA,
         )
 
         return results  # type: ignore[no-any-return]
@@ -1,13 +1,21 @@
 """
 Context service for managing context_chunks table.
 
-Provides CRUD operations for embeddings and vector similarity search.
+Provides CRUD operations for embeddings, vector similarity search, and hybrid
+vector + full-text search with reciprocal rank fusion.
+
+Embeddings (float lists) and metadata (dicts) are passed to asyncpg as native
+objects; the binary ``vector`` and ``jsonb`` codecs registered on pool
+connections (utils/pg_codecs.py) handle the wire format.
 """
 
 from __future__ import annotations
 
-import json
+import math
+import operator
+import time
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
@@ -15,24 +23,62 @@ from uuid import UUID
 
 import asyncpg
 
+from api.services.vector_index_service import VectorIndexManager
+from core.constants import (
+    CONTEXT_SEARCH_CANDIDATE_MULTIPLIER,
+    CONTEXT_SEARCH_MMR_LAMBDA,
+    CONTEXT_SEARCH_RRF_K,
+)
+from utils.metrics import context_search_duration_seconds
+
+
+def _rrf_score(ranks: Sequence[int | None], k: int = CONTEXT_SEARCH_RRF_K) -> float:
+    """Reciprocal rank fusion score for one candidate across retrievers.
 
-def _embedding_to_pgvector(embedding: list[float]) -> str:
-    """Convert embedding list to pgvector string format."""
-    return "[" + ",".join(str(x) for x in embedding) + "]"
+    Args:
+        ranks: 1-based rank from each retriever, None if that retriever missed it
+        k: Smoothing constant
+
+    Returns:
+        Sum of 1 / (k + rank) over the retrievers that returned the candidate
+    """
+    return sum(1.0 / (k + rank) for rank in ranks if rank is not None)
 
 
-def _metadata_to_json(metadata: dict[str, Any] | None) -> str | None:
-    """Convert metadata dict to JSON string for asyncpg."""
-    if metadata is None:
-        return None
+def _mmr_select(
+    embeddings: Sequence[Sequence[float]],
+    relevance: Sequence[float],
+    top_k: int,
+    mmr_lambda: float = CONTEXT_SEARCH_MMR_LAMBDA,
+) -> list[int]:
+    """Pick a diverse subset of candidates with maximal marginal relevance.
+
+    Redundancy is tracked incrementally, so each step only computes similarities
+    against the most recently selected candidate.
+
+    Args:
+        embeddings: Candidate embeddings
+        relevance: Relevance per candidate, normalized to 0-1
+        top_k: Number of candidates to select
+        mmr_lambda: Relevance/diversity trade-off (1.0 = pure relevance)
+
+    Returns:
+        Indices into the candidate list, in selection order
+    """
+    norms = [math.sqrt(sum(x * x for x in emb)) or 1.0 for emb in embeddings]
+    redundancy = [0.0] * len(embeddings)
+    remaining = set(range(len(embeddings)))
+    selected: list[int] = []
 
-    # Convert UUIDs to strings for JSON serialization
-    def serialize(obj: Any) -> Any:
-        if isinstance(obj, UUID):
-            return str(obj)
-        raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+    while remaining and len(selected) < top_k:
+        best = max(remaining, key=lambda i: mmr_lambda * relevance[i] - (1 - mmr_lambda) * redundancy[i])
+        selected.append(best)
+        remaining.discard(best)
+        for i in remaining:
+            sim = sum(map(operator.mul, embeddings[i], embeddings[best])) / (norms[i] * norms[best])
+            redundancy[i] = max(redundancy[i], sim)
 
-    return json.dumps(metadata, default=serialize)
+    return selected
 
 
 @dataclass
@@ -47,6 +93,22 @@ class ChunkResult:
     score: float
     metadata: dict[str, Any] | None
     created_at: datetime
+    fused_score: float | None = None  # RRF score (hybrid search only)
+
+
+def _row_to_chunk(row: Any, fused_score: float | None = None) -> ChunkResult:
+    """Build a ChunkResult from a search result row."""
+    return ChunkResult(
+        chunk_id=row["id"],
+        source_type=row["source_type"],
+        source_id=row["source_id"],
+        chunk_index=row["chunk_index"],
+        content=row["content"],
+        score=float(row["score"]),
+        metadata=row["metadata"],
+        created_at=row["created_at"],
+        fused_score=fused_score,
+    )
 
 
 class ContextService:
@@ -56,12 +118,14 @@ class ContextService:
     - Session summary upsert (one per session, updated in-place)
     - Message/file chunk insertion with deduplication
     - Vector similarity search with score threshold
+    - Hybrid vector + full-text search with RRF and optional MMR diversity
     - Chunk deletion when sources are removed
     """
 
     def __init__(self, pool: asyncpg.Pool) -> None:
         """Initialize with database connection pool."""
         self.pool = pool
+        self.index_manager = VectorIndexManager(pool)
 
     async def upsert_session_summary(
         self,
@@ -112,9 +176,9 @@ class ContextService:
                 session_id,
                 content,
                 content_hash,
-                _embedding_to_pgvector(embedding),
+                embedding,
                 token_count,
-                _metadata_to_json(metadata),
+                metadata,
             )
             return row["id"] if row else None
 
@@ -165,9 +229,9 @@ class ContextService:
                 chunk_index,
                 content,
                 content_hash,
-                _embedding_to_pgvector(embedding),
+                embedding,
                 token_count,
-                _metadata_to_json(metadata),
+                metadata,
             )
             return row["id"] if row else None
 
@@ -177,55 +241,177 @@ class ContextService:
         query_embedding: list[float],
         top_k: int = 5,
         score_threshold: float = 0.5,
+        query_text: str | None = None,
+        mmr_lambda: float | None = None,
     ) -> list[ChunkResult]:
         """Search for similar chunks using cosine similarity.
 
+        Vector candidates come from the HNSW index (which may store halfvec or
+        binary-quantized vectors) and are re-ranked with full-precision distance.
+
+        When ``query_text`` is given, runs a hybrid search: HNSW vector candidates
+        and full-text (GIN) candidates are fused with reciprocal rank fusion, so
+        exact-term queries such as IDs and error codes are recalled even when their
+        embeddings are not close to the query.
+
         Args:
             project_id: Project to search within
             query_embedding: Query vector (1536 dimensions)
             top_k: Maximum results to return
-            score_threshold: Minimum similarity score (0-1)
+            score_threshold: Minimum similarity score (0-1). In hybrid mode,
+                full-text matches are kept regardless of their vector score.
+            query_text: Raw query text; enables hybrid retrieval when set
+            mmr_lambda: Enables MMR diversity re-ranking of hybrid results when set
 
         Returns:
-            List of matching chunks ordered by similarity
+            List of matching chunks ordered by similarity (or fused score in hybrid mode)
         """
-        async with self.pool.acquire() as conn:
+        if query_text and query_text.strip():
+            return await self._search_chunks_hybrid(
+                project_id, query_embedding, query_text, top_k, score_threshold, mmr_lambda
+            )
+
+        # The ANN scan orders by the (possibly compact) indexed distance so HNSW
+        # can serve it, then candidates are re-ranked by full-precision distance.
+        # Filtering the top-k afterwards is equivalent to filtering first because
+        # the threshold is monotonic in distance.
+        start_time = time.perf_counter()
+        async with self.pool.acquire() as conn, conn.transaction():
+            plan = await self.index_manager.prepare_search(conn, project_id, top_k)
             rows = await conn.fetch(
-                """
+                f"""
                 SELECT
                     id,
                     source_type,
                     source_id,
                     chunk_index,
                     content,
-                    1 - (embedding <=> $2) as score,
+                    1 - distance as score,
                     metadata,
                     created_at
-                FROM context_chunks
-                WHERE project_id = $1
-                  AND 1 - (embedding <=> $2) >= $3
-                ORDER BY embedding <=> $2
-                LIMIT $4
+                FROM (
+                    SELECT
+                        id, source_type, source_id, chunk_index, content, metadata, created_at,
+                        embedding <=> $2 AS distance
+                    FROM (
+                        SELECT id, source_type, source_id, chunk_index, content, metadata, created_at, embedding
+                        FROM context_chunks
+                        WHERE project_id = $1 {plan.predicate}
+                        ORDER BY {plan.distance}
+                        LIMIT $5
+                    ) candidates
+                    ORDER BY distance
+                    LIMIT $4
+                ) hits
+                WHERE 1 - distance >= $3
+                ORDER BY distance
                 """,
                 project_id,
-                _embedding_to_pgvector(query_embedding),
+                query_embedding,
                 score_threshold,
                 top_k,
+                plan.scan_limit,
             )
+        context_search_duration_seconds.labels(strategy=plan.strategy, mode="vector").observe(
+            time.perf_counter() - start_time
+        )
+
+        return [_row_to_chunk(row) for row in rows]
+
+    async def _search_chunks_hybrid(
+        self,
+        project_id: UUID,
+        query_embedding: list[float],
+        query_text: str,
+        top_k: int,
+        score_threshold: float,
+        mmr_lambda: float | None,
+    ) -> list[ChunkResult]:
+        """Hybrid vector + full-text search fused with reciprocal rank fusion.
+
+        Both candidate lists come back in one round trip; fusion and the optional
+        MMR pass run in Python over at most 2 × top_k × multiplier rows.
+        """
+        candidate_limit = top_k * CONTEXT_SEARCH_CANDIDATE_MULTIPLIER
+        # Embeddings are only needed for MMR redundancy checks
+        embedding_column = ",\n                    c.embedding AS embedding" if mmr_lambda is not None else ""
 
-        return [
-            ChunkResult(
-                chunk_id=row["id"],
-                source_type=row["source_type"],
-                source_id=row["source_id"],
-                chunk_index=row["chunk_index"],
-                content=row["content"],
-                score=float(row["score"]),
-                metadata=row["metadata"],
-                created_at=row["created_at"],
+        start_time = time.perf_counter()
+        async with self.pool.acquire() as conn, conn.transaction():
+            plan = await self.index_manager.prepare_search(conn, project_id, candidate_limit)
+            rows = await conn.fetch(
+                f"""
+                WITH vector_hits AS (
+                    SELECT id, row_number() OVER (ORDER BY distance) AS v_rank
+                    FROM (
+                        SELECT id, embedding <=> $2 AS distance
+                        FROM (
+                            SELECT id, embedding
+                            FROM context_chunks
+                            WHERE project_id = $1 {plan.predicate}
+                            ORDER BY {plan.distance}
+                            LIMIT $5
+                        ) candidates
+                        ORDER BY distance
+                        LIMIT $4
+                    ) v
+                ),
+                text_hits AS (
+                    SELECT id, row_number() OVER (ORDER BY rank DESC) AS t_rank
+                    FROM (
+                        SELECT id, ts_rank_cd(content_tsv, q) AS rank
+                        FROM context_chunks,
+                             replace(plainto_tsquery('simple', $3)::text, '&', '|')::tsquery AS q
+                        WHERE project_id = $1 AND content_tsv @@ q
+                        ORDER BY rank DESC
+                        LIMIT $4
+                    ) t
+                )
+                SELECT
+                    c.id,
+                    c.source_type,
+                    c.source_id,
+                    c.chunk_index,
+                    c.content,
+                    1 - (c.embedding <=> $2) AS score,
+                    c.metadata,
+                    c.created_at,
+                    h.v_rank,
+                    h.t_rank{embedding_column}
+                FROM (
+                    SELECT id, v.v_rank, t.t_rank
+                    FROM vector_hits v
+                    FULL OUTER JOIN text_hits t USING (id)
+                ) h
+                JOIN context_chunks c ON c.id = h.id
+                """,
+                project_id,
+                query_embedding,
+                query_text,
+                candidate_limit,
+                plan.scan_limit,
+            )
+        context_search_duration_seconds.labels(strategy=plan.strategy, mode="hybrid").observe(
+            time.perf_counter() - start_time
+        )
+
+        # Full-text matches bypass the threshold; vector-only hits must clear it
+        candidates = [row for row in rows if row["t_rank"] is not None or float(row["score"]) >= score_threshold]
+        fused = [_rrf_score((row["v_rank"], row["t_rank"])) for row in candidates]
+        order = sorted(range(len(candidates)), key=lambda i: fused[i], reverse=True)
+
+        if mmr_lambda is not None and len(order) > top_k:
+            # Diversify within a bounded window of the best fused candidates
+            window = order[: top_k * 2]
+            picked = _mmr_select(
+                [candidates[i]["embedding"] for i in window],
+                [fused[i] / fused[window[0]] for i in window],
+                top_k,
+                mmr_lambda,
             )
-            for row in rows
-        ]
+            order = [window[i] for i in picked]
+
+        return [_row_to_chunk(candidates[i], fused_score=fused[i]) for i in order[:top_k]]
 
     async def delete_chunks_for_source(self, source_type: str, source_id: UUID) -> int:
         """Delete all chunks for a source (e.g., when session/file deleted).
@@ -0,0 +1,250 @@
+"""In-memory index of session workspace directory listings.
+
+``list_files`` runs on every chat turn (to build the prompt's file list) and on
+every file-browser refresh. Scanning the directory there meant an ``iterdir``,
+a ``stat`` per entry and a full ``iterdir`` per subfolder on the event loop.
+
+The index serves listings from memory instead:
+
+- A miss scans the directory once on a worker thread (``os.scandir``)
+- ``LocalFileService`` writes and deletes update cached listings in place
+- A watchfiles watcher (inotify where available) on the workspace root drops
+  listings that changed behind the service's back (tools, S3 sync, cleanup)
+- Listings expire after ``FILE_INDEX_TTL`` when no watcher is running, or
+  ``FILE_INDEX_WATCHED_TTL`` as a safety net for dropped events
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from stat import S_ISDIR
+from typing import Any
+
+from core.constants import FILE_INDEX_MAX_DIRS, FILE_INDEX_TTL, FILE_INDEX_WATCHED_TTL
+from utils.cache import TTLCache
+from utils.logger import logger
+
+try:
+    from watchfiles import Change, awatch
+except ImportError:  # pragma: no cover - optional dependency
+    Change = None  # type: ignore[assignment,misc]
+    awatch = None  # type: ignore[assignment]
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    name: str
+    is_dir: bool
+    size: int = 0
+    mtime: float = 0.0
+    file_count: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        if self.is_dir:
+            return {"name": self.name, "type": "folder", "size": 0, "file_count": self.file_count}
+        return {
+            "name": self.name,
+            "type": "file",
+            "size": self.size,
+            "modified": datetime.fromtimestamp(self.mtime).isoformat(),
+        }
+
+
+def _count_entries(path: str) -> int:
+    try:
+        with os.scandir(path) as it:
+            return sum(1 for _ in it)
+    except OSError:
+        return 0
+
+
+def _to_entry(entry: os.DirEntry[str]) -> _Entry | None:
+    try:
+        if entry.is_dir():
+            return _Entry(entry.name, True, file_count=_count_entries(entry.path))
+        if entry.is_file() and not entry.name.startswith("."):
+            stat = entry.stat()
+            return _Entry(entry.name, False, stat.st_size, stat.st_mtime)
+    except OSError:
+        pass  # Removed while scanning
+    return None
+
+
+def _scan_directory(dir_path: Path) -> dict[str, _Entry] | None:
+    """Read one directory (worker thread). Returns None if it does not exist."""
+    try:
+        it = os.scandir(dir_path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    with it:
+        entries = [_to_entry(entry) for entry in it]
+    return {entry.name: entry for entry in entries if entry is not None}
+
+
+def _stat_unchanged(paths: list[tuple[str, _Entry]]) -> set[str]:
+    """Return the paths whose size/mtime still match the indexed entry (worker thread)."""
+    unchanged = set()
+    for path, entry in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        if not S_ISDIR(stat.st_mode) and stat.st_size == entry.size and stat.st_mtime == entry.mtime:
+            unchanged.add(path)
+    return unchanged
+
+
+class DirectoryIndex:
+    """Process-wide cache of directory listings keyed by absolute path."""
+
+    def __init__(self, max_dirs: int = FILE_INDEX_MAX_DIRS) -> None:
+        self._listings = TTLCache(max_size=max_dirs, default_ttl=FILE_INDEX_TTL)
+        self._workspaces: set[str] = set()
+        # Bumped on every mutation; scans that raced a mutation are not cached
+        self._generation = 0
+        self._task: asyncio.Task[None] | None = None
+        self._stop: asyncio.Event | None = None
+        self._events = 0
+
+    @property
+    def watching(self) -> bool:
+        """True while the filesystem watcher is running."""
+        return self._task is not None and not self._task.done()
+
+    @staticmethod
+    def _key(path: Path | str) -> str:
+        return os.path.abspath(path)
+
+    async def list_dir(self, dir_path: Path) -> list[dict[str, Any]]:
+        """List a directory: folders first, then files, case-insensitively by name."""
+        key = self._key(dir_path)
+        entries: dict[str, _Entry] | None = self._listings.get_sync(key)
+        if entries is None:
+            generation = self._generation
+            entries = await asyncio.to_thread(_scan_directory, dir_path)
+            if entries is None:
+                return []
+            if generation == self._generation:
+                ttl = FILE_INDEX_WATCHED_TTL if self.watching else FILE_INDEX_TTL
+                self._listings.set_sync(key, entries, ttl)
+
+        ordered = sorted(entries.values(), key=lambda e: (not e.is_dir, e.name.lower()))
+        return [entry.to_dict() for entry in ordered]
+
+    def record_file(self, file_path: Path, stat: os.stat_result) -> None:
+        """Apply a file write to the cached listing of its directory."""
+        self._generation += 1
+        if file_path.name.startswith("."):
+            return
+        parent = self._key(file_path.parent)
+        entries = self._listings.get_sync(parent)
+        if entries is not None:
+            entries[file_path.name] = _Entry(file_path.name, False, stat.st_size, stat.st_mtime)
+        # The parent's folder entry (file count) in the grandparent listing is stale
+        self._listings.evict(self._key(file_path.parent.parent))
+
+    def remove(self, file_path: Path) -> None:
+        """Apply a file deletion to the cached listing of its directory."""
+        self._generation += 1
+        entries = self._listings.get_sync(self._key(file_path.parent))
+        if entries is not None:
+            entries.pop(file_path.name, None)
+        self._listings.evict(self._key(file_path.parent.parent))
+
+    def invalidate(self, path: Path | str) -> None:
+        """Drop cached listings for a directory and everything below it."""
+        self._generation += 1
+        key = self._key(path)
+        self._listings.evict(key)
+        self._listings.evict(os.path.dirname(key))
+        self._listings.evict_prefix(key + os.sep)
+        self._workspaces = {ws for ws in self._workspaces if ws != key and not ws.startswith(key + os.sep)}
+
+    def workspace_ready(self, session_dir: Path) -> bool:
+        """True if ``mark_workspace`` was called for this directory since it was last invalidated."""
+        return self._key(session_dir) in self._workspaces
+
+    def mark_workspace(self, session_dir: Path) -> None:
+        """Remember that a session workspace's directories exist."""
+        self._workspaces.add(self._key(session_dir))
+
+    async def start(self, root: Path) -> bool:
+        """Watch ``root`` recursively and invalidate listings on change.
+
+        Returns False (TTL expiry only) when watchfiles is not installed.
+        """
+        if awatch is None:
+            logger.info("watchfiles not installed; file index relies on TTL expiry")
+            return False
+        if self.watching:
+            return True
+        await asyncio.to_thread(root.mkdir, parents=True, exist_ok=True)
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._watch(root, self._stop))
+        # Listings cached before the watcher existed carry the short TTL
+        self._listings.evict(None)
+        return True
+
+    async def stop(self) -> None:
+        """Stop the watcher."""
+        if self._task is None:
+            return
+        assert self._stop is not None
+        self._stop.set()
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        self._stop = None
+
+    async def _watch(self, root: Path, stop: asyncio.Event) -> None:
+        try:
+            async for changes in awatch(root, watch_filter=None, debounce=200, stop_event=stop, recursive=True):
+                self._events += len(changes)
+                await self._apply_changes(changes)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"File index watcher stopped: {e}; falling back to TTL expiry")
+            self._listings.evict(None)
+
+    async def _apply_changes(self, changes: set[tuple[Change, str]]) -> None:
+        # Writes made through record_file already match the cached entry; stat
+        # those (off the loop) instead of throwing the listing away.
+        candidates: list[tuple[str, _Entry]] = []
+        dropped: list[str] = []
+        for change, path in changes:
+            if os.path.basename(path).startswith("."):
+                continue  # Temp files and other hidden entries are never listed
+            if change != Change.deleted:
+                entries = self._listings.get_sync(os.path.dirname(path))
+                entry = entries.get(os.path.basename(path)) if entries is not None else None
+                if entry is not None and not entry.is_dir:
+                    candidates.append((path, entry))
+                    continue
+            dropped.append(path)
+
+        if candidates:
+            unchanged = await asyncio.to_thread(_stat_unchanged, candidates)
+            dropped.extend(path for path, _ in candidates if path not in unchanged)
+        for path in dropped:
+            # Also drops everything below path, in case it was a directory
+            self.invalidate(os.path.dirname(path))
+
+    def stats(self) -> dict[str, Any]:
+        """Index statistics."""
+        return {**self._listings.stats(), "watching": self.watching, "watch_events": self._events}
+
+
+_index = DirectoryIndex()
+
+
+def get_directory_index() -> DirectoryIndex:
+    """Get the process-wide directory index."""
+    return _index
@@ -1,20 +1,80 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import contextlib
+import hashlib
 import mimetypes
+import os
+import tempfile
 
+from collections.abc import AsyncIterable, AsyncIterator
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Protocol, cast
+from stat import S_ISREG
+from typing import TYPE_CHECKING, Any, BinaryIO, Protocol, cast
 from uuid import UUID
 
 import asyncpg
 
+from api.services.file_index import DirectoryIndex, get_directory_index
+from utils.content_index import get_content_index
+from utils.conversion_cache import get_conversion_cache
 from utils.logger import logger
 
 if TYPE_CHECKING:
     from api.services.s3_sync_service import S3SyncService
 
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+async def _single_chunk(content: bytes) -> AsyncIterator[bytes]:
+    yield content
+
+
+def _create_temp_file(file_path: Path) -> tuple[int, str]:
+    """Create a hidden temp file next to ``file_path`` (hidden from list_files)."""
+    fd, tmp_name = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".part")
+    os.fchmod(fd, 0o644)  # mkstemp creates 0600; match files written by write_bytes
+    return fd, tmp_name
+
+
+def _replace(tmp_name: str, file_path: Path) -> os.stat_result:
+    """Move a finished temp file into place and stat the result (worker thread)."""
+    os.replace(tmp_name, file_path)
+    return file_path.stat()
+
+
+def _unlink(file_path: Path) -> bool:
+    try:
+        file_path.unlink()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _init_workspace(session_dir: Path) -> None:
+    (session_dir / "input").mkdir(parents=True, exist_ok=True)
+    (session_dir / "output").mkdir(parents=True, exist_ok=True)
+
+
+def _write_chunk(out: BinaryIO, hasher: hashlib._Hash, chunk: bytes) -> None:
+    """Write and hash one chunk (worker thread; hashlib releases the GIL)."""
+    out.write(chunk)
+    hasher.update(chunk)
+
+
+def _hash_file(path: Path) -> str | None:
+    """SHA-256 of a file on disk (worker thread); None if it cannot be read."""
+    hasher = hashlib.sha256()
+    try:
+        with path.open("rb") as f:
+            while chunk := f.read(_HASH_CHUNK_SIZE):
+                hasher.update(chunk)
+    except OSError:
+        return None
+    return hasher.hexdigest()
+
 
 class FileService(Protocol):
     """Abstract file service protocol."""
@@ -30,8 +90,19 @@ class FileService(Protocol):
         content_type: str | None = None,
     ) -> dict[str, Any]: ...
 
+    async def save_stream(
+        self,
+        session_id: str,
+        folder: str,
+        filename: str,
+        chunks: AsyncIterable[bytes],
+        content_type: str | None = None,
+    ) -> dict[str, Any]: ...
+
     async def get_file_content(self, session_id: str, folder: str, filename: str) -> bytes: ...
 
+    async def stat_file(self, session_id: str, folder: str, filename: str) -> os.stat_result | None: ...
+
     async def read_image_as_base64(self, session_id: str, folder: str, filename: str) -> tuple[str, str] | None: ...
 
     async def delete_file(self, session_id: str, folder: str, filename: str) -> bool: ...
@@ -52,10 +123,12 @@ class LocalFileService:
         base_path: Path | None = None,
         pool: asyncpg.Pool | None = None,
         s3_sync: S3SyncService | None = None,
+        index: DirectoryIndex | None = None,
     ):
         self.base_path = base_path or Path("data/files")
         self.pool = pool
         self._s3_sync = s3_sync
+        self._index = index or get_directory_index()
 
     @property
     def s3_sync(self) -> S3SyncService | None:
@@ -71,40 +144,21 @@ class LocalFileService:
         return self._get_dir(session_id, folder) / filename
 
     async def list_files(self, session_id: str, folder: str) -> list[dict[str, Any]]:
-        """List files in session folder."""
-        dir_path = self._get_dir(session_id, folder)
-
-        if not dir_path.exists():
-            return []
-
-        files = []
-        for entry in dir_path.iterdir():
-            if entry.is_file() and not entry.name.startswith("."):
-                stat = entry.stat()
-                files.append(
-                    {
-                        "name": entry.name,
-                        "type": "file",
-                        "size": stat.st_size,
-                        "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    }
-                )
-            elif entry.is_dir():
-                try:
-                    count = len(list(entry.iterdir()))
-                except OSError:
-                    count = 0
-                files.append(
-                    {
-                        "name": entry.name,
-                        "type": "folder",
-                        "size": 0,
-                        "file_count": count,
-                    }
-                )
-
-        files.sort(key=lambda f: (f["type"] != "folder", str(f["name"]).lower()))
-        return files
+        """List files in session folder (served from the directory index).
+
+        With S3 sync, waits for a running rehydration of the session and merges
+        in files that are in S3 but not hydrated locally yet.
+        """
+        if self._s3_sync is None:
+            return await self._index.list_dir(self._get_dir(session_id, folder))
+
+        await self._s3_sync.wait_for_rehydration(session_id)
+        entries = {entry["name"]: entry for entry in await self._index.list_dir(self._get_dir(session_id, folder))}
+        for entry in self._s3_sync.pending_entries(session_id, folder):
+            # A pending file's S3 version is what will be served; local folders keep their counts
+            if entry["type"] == "file" or entry["name"] not in entries:
+                entries[entry["name"]] = entry
+        return sorted(entries.values(), key=lambda e: (e["type"] != "folder", e["name"].lower()))
 
     async def save_file(
         self,
@@ -115,27 +169,93 @@ class LocalFileService:
         content_type: str | None = None,
     ) -> dict[str, Any]:
         """Save file to local filesystem and persist metadata."""
-        dir_path = self._get_dir(session_id, folder)
-        dir_path.mkdir(parents=True, exist_ok=True)
+        return await self.save_stream(session_id, folder, filename, _single_chunk(content), content_type)
 
-        file_path = dir_path / filename
-        file_path.write_bytes(content)
+    async def save_stream(
+        self,
+        session_id: str,
+        folder: str,
+        filename: str,
+        chunks: AsyncIterable[bytes],
+        content_type: str | None = None,
+    ) -> dict[str, Any]:
+        """Stream content to the session workspace and persist metadata.
+
+        Chunks are written to a hidden temp file next to the destination on a
+        worker thread, hashing (SHA-256) in the same call, then atomically
+        renamed into place so readers never see a partial file. If the
+        destination already holds identical content, the temp file is
+        discarded and neither the rename nor the S3 upload is repeated. The
+        existing file is hashed on disk rather than trusting the recorded
+        ``content_hash``, since tools write session files without updating it.
+        """
+        file_path = self.get_file_path(session_id, folder, filename)
+        await asyncio.to_thread(file_path.parent.mkdir, parents=True, exist_ok=True)
 
-        if self.pool:
+        fd, tmp_name = await asyncio.to_thread(_create_temp_file, file_path)
+        hasher = hashlib.sha256()
+        size = 0
+        try:
+            out = os.fdopen(fd, "wb")
+            try:
+                async for chunk in chunks:
+                    await asyncio.to_thread(_write_chunk, out, hasher, chunk)
+                    size += len(chunk)
+            finally:
+                await asyncio.to_thread(out.close)
+
+            content_hash = hasher.hexdigest()
             session_uuid = await self._get_session_uuid(session_id)
-            if session_uuid:
-                await self._upsert_file_record(session_uuid, filename, file_path, folder, content_type, len(content))
+
+            existing = await self.stat_file(session_id, folder, filename)
+            if (
+                existing is not None
+                and existing.st_size == size
+                # A pending local copy is older than S3; the upload must go through
+                and not (self._s3_sync and self._s3_sync.is_pending(session_id, folder, filename))
+                and await asyncio.to_thread(_hash_file, file_path) == content_hash
+            ):
+                await asyncio.to_thread(os.unlink, tmp_name)
+                logger.debug(f"Upload unchanged, skipped write: {session_id}/{folder}/{filename}")
+                if session_uuid and not await self._has_identical_file(session_uuid, folder, filename, content_hash):
+                    # Written by a tool, which leaves no (or a stale) record
+                    await self._upsert_file_record(
+                        session_uuid, filename, file_path, folder, content_type, size, content_hash
+                    )
+                return {
+                    "name": filename,
+                    "type": "file",
+                    "size": size,
+                    "modified": datetime.fromtimestamp(existing.st_mtime).isoformat(),
+                    "content_hash": content_hash,
+                    "deduplicated": True,
+                }
+
+            stat_result = await asyncio.to_thread(_replace, tmp_name, file_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+            raise
+        self._index.record_file(file_path, stat_result)
+        get_content_index().invalidate(file_path)
+        # Convert PDFs, Office documents, images, ... now so read_file hits the cache
+        get_conversion_cache().prefetch(file_path, content_hash, stat_result)
+
+        if session_uuid:
+            await self._upsert_file_record(session_uuid, filename, file_path, folder, content_type, size, content_hash)
 
         result = {
             "name": filename,
             "type": "file",
-            "size": len(content),
-            "modified": datetime.now().isoformat(),
+            "size": size,
+            "modified": datetime.fromtimestamp(stat_result.st_mtime).isoformat(),
+            "content_hash": content_hash,
+            "deduplicated": False,
         }
 
         # Trigger background S3 upload if sync service is configured
         if self._s3_sync:
-            self._s3_sync.upload_to_s3_background(session_id, folder, filename)
+            self._s3_sync.upload_to_s3_background(session_id, folder, filename, content_hash=content_hash)
 
         return result
 
@@ -143,10 +263,22 @@ class LocalFileService:
         """Get file content."""
         file_path = self.get_file_path(session_id, folder, filename)
 
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {filename}")
+        try:
+            return await asyncio.to_thread(file_path.read_bytes)
+        except (FileNotFoundError, IsADirectoryError):
+            raise FileNotFoundError(f"File not found: {filename}") from None
 
-        return file_path.read_bytes()
+    async def stat_file(self, session_id: str, folder: str, filename: str) -> os.stat_result | None:
+        """Stat a file in the local cache.
+
+        Returns None when the file is not cached locally (or is not a regular
+        file), so callers can fall back to S3.
+        """
+        try:
+            stat_result = await asyncio.to_thread(self.get_file_path(session_id, folder, filename).stat)
+        except OSError:
+            return None
+        return stat_result if S_ISREG(stat_result.st_mode) else None
 
     async def read_image_as_base64(self, session_id: str, folder: str, filename: str) -> tuple[str, str] | None:
         """Read image from session workspace and return (mime_type, base64_data).
@@ -163,10 +295,6 @@ class LocalFileService:
 
         file_path = self.get_file_path(session_id, folder, filename)
 
-        if not file_path.exists():
-            logger.warning(f"Image file not found: {file_path}")
-            return None
-
         # Determine MIME type from extension
         extension = file_path.suffix.lower()
         mime_type = mimetypes.guess_type(filename)[0]
@@ -187,7 +315,15 @@ class LocalFileService:
             return None
 
         try:
-            image_bytes = file_path.read_bytes()
+            image_bytes = await asyncio.to_thread(file_path.read_bytes)
+        except FileNotFoundError:
+            logger.warning(f"Image file not found: {file_path}")
+            return None
+        except Exception as e:
+            logger.error(f"Failed to read/encode image {filename}: {e}")
+            return None
+
+        try:
             base64_data = base64.b64encode(image_bytes).decode("utf-8")
             logger.debug(f"Encoded image {filename} to base64 ({len(base64_data)} chars)")
             return (mime_type, base64_data)
@@ -199,10 +335,10 @@ class LocalFileService:
         """Delete file and metadata record."""
         file_path = self.get_file_path(session_id, folder, filename)
 
-        if not file_path.exists():
+        if not await asyncio.to_thread(_unlink, file_path):
             return False
-
-        file_path.unlink()
+        self._index.remove(file_path)
+        get_content_index().invalidate(file_path)
 
         if self.pool:
             session_uuid = await self._get_session_uuid(session_id)
@@ -226,6 +362,22 @@ class LocalFileService:
             )
             return cast(UUID | None, result)
 
+    async def _has_identical_file(self, session_uuid: UUID, folder: str, filename: str, content_hash: str) -> bool:
+        if not self.pool:
+            return False
+        async with self.pool.acquire() as conn:
+            found = await conn.fetchval(
+                """
+                SELECT 1 FROM files
+                WHERE session_id = $1 AND folder = $2 AND filename = $3 AND content_hash = $4
+                """,
+                session_uuid,
+                folder,
+                filename,
+                content_hash,
+            )
+        return found is not None
+
     async def _upsert_file_record(
         self,
         session_uuid: UUID,
@@ -234,6 +386,7 @@ class LocalFileService:
         folder: str,
         content_type: str | None,
         size_bytes: int,
+        content_hash: str | None = None,
     ) -> None:
         if not self.pool:
             return None
@@ -246,8 +399,8 @@ class LocalFileService:
             )
             await conn.execute(
                 """
-                INSERT INTO files (session_id, filename, file_path, content_type, size_bytes, folder)
-                VALUES ($1, $2, $3, $4, $5, $6)
+                INSERT INTO files (session_id, filename, file_path, content_type, size_bytes, folder, content_hash)
+                VALUES ($1, $2, $3, $4, $5, $6, $7)
                 """,
                 session_uuid,
                 filename,
@@ -255,6 +408,7 @@ class LocalFileService:
                 content_type,
                 size_bytes,
                 folder,
+                content_hash,
             )
 
     def init_session_workspace(self, session_id: str) -> None:
@@ -266,6 +420,9 @@ class LocalFileService:
         """
         session_dir = self.base_path / session_id
 
-        # Create input and output directories
-        (session_dir / "input").mkdir(parents=True, exist_ok=True)
-        (session_dir / "output").mkdir(parents=True, exist_ok=True)
+        # Called on every chat turn; only touch the filesystem once per session
+        # (the index forgets the workspace when its directory changes or is removed)
+        if self._index.workspace_ready(session_dir):
+            return
+        _init_workspace(session_dir)
+        self._index.mark_workspace(session_dir)
@@ -0,0 +1,151 @@
+"""Background probing of external dependencies for the health endpoint.
+
+``/health`` used to check the database, every MCP server (a ``list_tools``
+call each) and S3 inline, so every load balancer poll turned into MCP and S3
+traffic and a slow dependency made the endpoint itself slow. The prober checks
+them every ``HEALTH_PROBE_INTERVAL`` seconds instead, each bounded by
+``HEALTH_PROBE_TIMEOUT``, and ``/health`` serves the latest snapshot along with
+its age. Only the probes hit the network; in-process statistics (WebSocket
+counts, pool sizes, caches) are still read per request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import asyncpg
+
+from core.constants import HEALTH_PROBE_INTERVAL, HEALTH_PROBE_TIMEOUT
+from utils.db_utils import check_pool_health
+from utils.logger import logger
+
+
+@dataclass(frozen=True, slots=True)
+class HealthSnapshot:
+    """Results of one probe round; ``mcp``/``s3`` are None when not configured."""
+
+    database: dict[str, Any]
+    mcp: dict[str, Any] | None
+    s3: dict[str, Any] | None
+    checked_at: datetime
+    checked_monotonic: float
+    duration_ms: float
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since the probe round started."""
+        return time.monotonic() - self.checked_monotonic
+
+    def healthy_components(self) -> dict[str, bool]:
+        """Healthy flag per probed component."""
+        result = {"database": bool(self.database.get("healthy"))}
+        if self.mcp is not None:
+            result["mcp"] = bool(self.mcp.get("healthy"))
+        if self.s3 is not None:
+            result["s3"] = bool(self.s3.get("connected"))
+        return result
+
+
+async def _bounded(check: Awaitable[dict[str, Any]], timeout: float, failure: dict[str, Any]) -> dict[str, Any]:
+    """Run one check, turning a timeout or exception into ``failure`` plus an error message."""
+    try:
+        return await asyncio.wait_for(check, timeout=timeout)
+    except asyncio.TimeoutError:
+        return {**failure, "error": f"Timed out after {timeout:g}s"}
+    except Exception as e:
+        return {**failure, "error": str(e)}
+
+
+async def probe_dependencies(
+    db_pool: asyncpg.Pool,
+    mcp_manager: Any = None,
+    s3_sync: Any = None,
+    timeout: float = HEALTH_PROBE_TIMEOUT,
+) -> HealthSnapshot:
+    """Check the database, MCP servers and S3 concurrently."""
+    checked_at = datetime.now(timezone.utc)
+    start = time.monotonic()
+
+    async def none() -> None:
+        return None
+
+    database, mcp, s3 = await asyncio.gather(
+        _bounded(check_pool_health(db_pool), timeout, {"healthy": False}),
+        _bounded(mcp_manager.check_connectivity(), timeout, {"healthy": False}) if mcp_manager else none(),
+        _bounded(s3_sync.check_connectivity(), timeout, {"connected": False}) if s3_sync else none(),
+    )
+    return HealthSnapshot(
+        database=database,
+        mcp=mcp,
+        s3=s3,
+        checked_at=checked_at,
+        checked_monotonic=start,
+        duration_ms=(time.monotonic() - start) * 1000,
+    )
+
+
+class HealthProber:
+    """Refreshes a HealthSnapshot of the app's dependencies in the background."""
+
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        mcp_manager: Any = None,
+        s3_sync: Any = None,
+        interval: float = HEALTH_PROBE_INTERVAL,
+        timeout: float = HEALTH_PROBE_TIMEOUT,
+    ) -> None:
+        self.db_pool = db_pool
+        self.mcp_manager = mcp_manager
+        self.s3_sync = s3_sync
+        self.interval = interval
+        self.timeout = timeout
+        self._snapshot: HealthSnapshot | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def snapshot(self) -> HealthSnapshot | None:
+        """Latest probe results (None until the first round completes)."""
+        return self._snapshot
+
+    async def probe(self) -> HealthSnapshot:
+        """Run one probe round and publish its results."""
+        snapshot = await probe_dependencies(self.db_pool, self.mcp_manager, self.s3_sync, self.timeout)
+        previous = self._snapshot.healthy_components() if self._snapshot else {}
+        for component, healthy in snapshot.healthy_components().items():
+            if previous.get(component, True) != healthy:
+                if healthy:
+                    logger.info(f"Health probe: {component} recovered")
+                else:
+                    logger.warning(f"Health probe: {component} unhealthy")
+        self._snapshot = snapshot
+        return snapshot
+
+    def start(self) -> None:
+        """Start probing in the background; the first round runs immediately."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._probe_loop())
+            logger.info(f"Health prober started (interval: {self.interval}s)")
+
+    async def stop(self) -> None:
+        """Stop background probing."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _probe_loop(self) -> None:
+        while True:
+            try:
+                await self.probe()
+            except Exception as e:
+                logger.error(f"Health probe round failed: {e}")
+            await asyncio.sleep(self.interval)
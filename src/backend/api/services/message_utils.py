@@ -1,14 +1,25 @@
 """Shared message utilities for API services.
 
-Provides common functions for converting database rows to API response formats.
+Provides common functions for converting database rows to API response formats,
+and keyset pagination over a session's messages.
 """
 
 from __future__ import annotations
 
+import base64
 import contextlib
 import json
 
+from datetime import datetime
 from typing import Any, Protocol
+from uuid import UUID
+
+import asyncpg
+
+#: Columns needed to render a message (row_to_message / MessageResponse)
+MESSAGE_COLUMNS = (
+    "id, role, content, created_at, tool_call_id, tool_name, tool_arguments, tool_result, tool_success, metadata"
+)
 
 
 class MessageRow(Protocol):
@@ -141,3 +152,73 @@ def calculate_tool_status(metadata: dict[str, Any], tool_success: bool | None) -
     if tool_success is False:
         return "failed"
     return "pending"
+
+
+def encode_message_cursor(created_at: datetime, message_id: UUID) -> str:
+    """Encode a message's keyset position as an opaque URL-safe cursor."""
+    raw = f"{created_at.isoformat()}|{message_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_message_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a cursor from encode_message_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    created_at, message_id = raw.split("|", 1)
+    return datetime.fromisoformat(created_at), UUID(message_id)
+
+
+async def fetch_message_page(
+    conn: asyncpg.Connection,
+    session_uuid: UUID,
+    limit: int,
+    before: tuple[datetime, UUID] | None = None,
+) -> tuple[list[asyncpg.Record], str | None]:
+    """Fetch the newest ``limit`` messages older than ``before`` (keyset pagination).
+
+    Walks idx_messages_session_keyset (session_id, created_at, id) backwards, so
+    every page costs O(limit) no matter how far back it is. One extra row is
+    fetched to detect whether older messages remain.
+
+    Args:
+        conn: Database connection
+        session_uuid: Session's UUID
+        limit: Page size
+        before: (created_at, id) position to page back from; None for the newest page
+
+    Returns:
+        Tuple of (rows in chronological order, cursor for the next older page or
+        None when this page reaches the first message)
+    """
+    if before is None:
+        rows = await conn.fetch(
+            f"""
+            SELECT {MESSAGE_COLUMNS} FROM messages
+            WHERE session_id = $1
+            ORDER BY created_at DESC, id DESC
+            LIMIT $2
+            """,
+            session_uuid,
+            limit + 1,
+        )
+    else:
+        rows = await conn.fetch(
+            f"""
+            SELECT {MESSAGE_COLUMNS} FROM messages
+            WHERE session_id = $1 AND (created_at, id) < ($2, $3)
+            ORDER BY created_at DESC, id DESC
+            LIMIT $4
+            """,
+            session_uuid,
+            before[0],
+            before[1],
+            limit + 1,
+        )
+
+    page = rows[:limit]
+    next_cursor = encode_message_cursor(page[-1]["created_at"], page[-1]["id"]) if len(rows) > limit else None
+    page.reverse()
+    return page, next_cursor
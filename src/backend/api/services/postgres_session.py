@@ -5,11 +5,14 @@ Simple implementation that mirrors the SDK's SQLiteSession:
 - Load items as-is without filtering or validation
 
 The SDK knows how to handle its own item formats (reasoning, messages, etc.)
+
+llm_context.content is TEXT, not JSONB: items are stored byte-for-byte as
+serialized (no key reordering, no server-side JSON parse on insert). orjson does
+the per-row encode/decode, which dominates history load time for long sessions.
 """
 
 from __future__ import annotations
 
-import json
 import logging
 import time
 
@@ -17,6 +20,7 @@ from typing import Any
 from uuid import UUID
 
 import asyncpg
+import orjson
 
 from utils.metrics import db_query_duration_seconds
 
@@ -26,13 +30,22 @@ logger = logging.getLogger(__name__)
 def _parse_json_item(content: str, session_id: str) -> dict[str, Any] | None:
     """Parse JSON content from database row, returning None on failure."""
     try:
-        result: dict[str, Any] = json.loads(content)
+        result: dict[str, Any] = orjson.loads(content)
         return result
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         logger.warning(f"Skipping invalid JSON in llm_context for session {session_id}")
         return None
 
 
+def _serialize_item(item: Any) -> str | None:
+    """Serialize an SDK item to JSON text, returning None on failure."""
+    try:
+        return orjson.dumps(item, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError as e:  # orjson.JSONEncodeError subclasses TypeError
+        logger.warning(f"Failed to serialize item: {e}")
+        return None
+
+
 class PostgresSession:
     """PostgreSQL-backed session adapter for OpenAI Agents SDK.
 
@@ -94,26 +107,24 @@ class PostgresSession:
         if not items:
             return
 
+        # Serialize items exactly as provided ("item" role is a simple marker,
+        # not used for filtering)
+        serialized = [_serialize_item(item) for item in items]
+        records = [(self.session_uuid, "item", content) for content in serialized if content is not None]
+        if not records:
+            return
+
         start_time = time.perf_counter()
         try:
+            # executemany pipelines the batch; seq still follows item order
             async with self.pool.acquire() as conn, conn.transaction():
-                for item in items:
-                    # Serialize the item exactly as provided
-                    try:
-                        content = json.dumps(item)
-                    except (TypeError, ValueError) as e:
-                        logger.warning(f"Failed to serialize item: {e}")
-                        continue
-
-                    await conn.execute(
-                        """
-                        INSERT INTO llm_context (session_id, role, content)
-                        VALUES ($1, $2, $3)
-                        """,
-                        self.session_uuid,
-                        "item",  # Simple marker - not used for filtering
-                        content,
-                    )
+                await conn.executemany(
+                    """
+                    INSERT INTO llm_context (session_id, role, content)
+                    VALUES ($1, $2, $3)
+                    """,
+                    records,
+                )
         except asyncpg.ForeignKeyViolationError:
             # Session was deleted during streaming - skip silently
             logger.debug(f"Session {self.session_id} deleted, skipping llm_context insert")
@@ -145,7 +156,7 @@ class PostgresSession:
             return None
 
         try:
-            result: dict[str, Any] = json.loads(row["content"])
+            result: dict[str, Any] = orjson.loads(row["content"])
             return result
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             return None
@@ -2,43 +2,212 @@
 S3 Sync Service for session file synchronization.
 
 Provides session-load sync pattern:
-- Download files from S3 → local on session load
-- Upload files to S3 in background after local writes
+- Rehydrate the local cache from S3 on session load/connect: one listing,
+  compared against a per-session ETag manifest, finds missing or changed files
+- ``input/`` files (listed in the prompt) download eagerly, concurrently on a
+  dedicated thread pool; everything else hydrates lazily on first access,
+  and file listings include pending files until then (``pending_entries``)
+- Upload files to S3 in background after local writes, through a coalescing
+  queue with bounded concurrency and retries (``S3UploadQueue``)
+
+One botocore client (thread-safe, with a connection pool sized by
+``S3_MAX_POOL_CONNECTIONS``) and one dedicated thread pool serve every S3
+call of the process: listing, transfers, health checks and bucket setup.
 """
 
 from __future__ import annotations
 
 import asyncio
-
+import contextlib
+import json
+import os
+import posixpath
+import tempfile
+
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC
+from email.utils import format_datetime, parsedate_to_datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
-
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from api.services.file_index import get_directory_index
+from api.services.s3_upload_queue import S3UploadQueue, UploadJob
+from core.constants import (
+    FILE_DOWNLOAD_CHUNK_SIZE,
+    S3_IO_THREADS,
+    S3_MAX_POOL_CONNECTIONS,
+    S3_SYNC_CONCURRENCY,
+    S3_SYNC_MANIFEST,
+    S3_UPLOAD_MULTIPART_THRESHOLD,
+    S3_UPLOAD_PART_CONCURRENCY,
+    S3_UPLOAD_PART_SIZE,
+    S3_UPLOAD_WORKERS,
+)
+from utils.json_utils import json_compact
 from utils.logger import logger
 
 if TYPE_CHECKING:
     from core.constants import Settings
 
+T = TypeVar("T")
+
+#: Folders downloaded eagerly on rehydration (their files are listed in the prompt)
+EAGER_FOLDERS = ("input/",)
+
+
+@dataclass
+class S3Download:
+    """Result of a streamed S3 GET: the status and headers to relay, plus the body.
+
+    ``body`` is the botocore ``StreamingBody`` for 200/206 responses and None
+    for 304/416. The caller must ``close()`` it once the stream is consumed.
+    """
+
+    status_code: int
+    headers: dict[str, str] = field(default_factory=dict)
+    body: Any | None = None
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        """Iterate the body in chunks (blocking reads; run in a threadpool)."""
+        if self.body is None:
+            return iter(())
+        return iter(self.body.iter_chunks(chunk_size))
+
+    def close(self) -> None:
+        """Release the underlying HTTP connection."""
+        if self.body is not None:
+            self.body.close()
+
+
+def _client_error_code(error: Exception) -> str | None:
+    """Extract the S3 error code from a botocore ClientError (None otherwise)."""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return None
+    return response.get("Error", {}).get("Code")
+
+
+@dataclass(frozen=True, slots=True)
+class RemoteObject:
+    """An S3 object under a session prefix (``key`` is ``folder/filename``)."""
+
+    key: str
+    etag: str
+    size: int
+
+
+def _load_manifest(path: Path) -> dict[str, str]:
+    try:
+        manifest = json.loads(path.read_bytes())
+    except (FileNotFoundError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _write_manifest(path: Path, data: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.part")
+    tmp.write_text(data)
+    os.replace(tmp, path)
+
+
+def _local_size(path: Path) -> int | None:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return None
+
+
+def _plan_sync(
+    session_path: Path, manifest: dict[str, str], objects: list[RemoteObject]
+) -> tuple[list[RemoteObject], dict[str, str]]:
+    """Split one listing page into stale objects and adopted local copies (worker thread).
+
+    An object is current when its local copy exists and the manifest holds the
+    same ETag. Local copies without a manifest entry (synced before manifests
+    existed) are adopted when the size matches, as the old size check did.
+    """
+    stale: list[RemoteObject] = []
+    adopted: dict[str, str] = {}
+    for obj in objects:
+        size = _local_size(session_path / obj.key)
+        known = manifest.get(obj.key)
+        if size is None or (known is not None and known != obj.etag):
+            stale.append(obj)
+        elif known is None:
+            if size == obj.size:
+                adopted[obj.key] = obj.etag
+            else:
+                stale.append(obj)
+    return stale, adopted
+
+
+def _download_object(client: Any, bucket: str, s3_key: str, local_path: Path) -> tuple[str, os.stat_result]:
+    """Stream an object into place via a hidden temp file (worker thread).
+
+    Returns the ETag of the downloaded version and the stat of the local copy.
+    """
+    local_path.parent.mkdir(parents=True, exist_ok=True)
+    response = client.get_object(Bucket=bucket, Key=s3_key)
+    body = response["Body"]
+    fd, tmp_name = tempfile.mkstemp(dir=local_path.parent, prefix=f".{local_path.name}.", suffix=".part")
+    try:
+        os.fchmod(fd, 0o644)
+        with os.fdopen(fd, "wb") as out:
+            for chunk in body.iter_chunks(FILE_DOWNLOAD_CHUNK_SIZE):
+                out.write(chunk)
+        os.replace(tmp_name, local_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+    finally:
+        body.close()
+    return str(response["ETag"]), local_path.stat()
+
+
+def _list_session_files(session_path: Path) -> list[tuple[str, str]]:
+    """(folder, filename relative to folder) of every visible input/output file (worker thread)."""
+    return [
+        (folder, str(file_path.relative_to(session_path / folder)))
+        for folder in ("input", "output")
+        for file_path in (session_path / folder).rglob("*")
+        if file_path.is_file() and not file_path.name.startswith(".")
+    ]
+
 
 class S3SyncService:
     """Syncs session files between S3 and local cache."""
 
-    # Store background task references to prevent garbage collection
-    _background_tasks: set[asyncio.Task[None]]
-
     def __init__(self, settings: Settings, local_base_path: Path):
         self.settings = settings
         self.local_base_path = local_base_path
         self._client: Any = None
-        self._background_tasks: set[asyncio.Task[None]] = set()
+        self._transfer_config: Any = None
+        # Every blocking S3 call runs here, never on the default executor;
+        # downloads and uploads are bounded below the pool size
+        self._executor = ThreadPoolExecutor(max_workers=S3_IO_THREADS, thread_name_prefix="s3-io")
+        self._download_slots = asyncio.Semaphore(S3_SYNC_CONCURRENCY)
+        self._manifests: dict[str, dict[str, str]] = {}
+        self._manifest_locks: dict[str, asyncio.Lock] = {}
+        self._pending: dict[str, dict[str, RemoteObject]] = {}
+        self._hydrating: dict[tuple[str, str], asyncio.Task[bool]] = {}
+        self._rehydrations: dict[str, asyncio.Task[int]] = {}
+        self._uploads = S3UploadQueue(self._upload_file, workers=S3_UPLOAD_WORKERS)
 
     def _get_client(self) -> Any:
-        """Lazy-initialize boto3 client."""
+        """Lazy-initialize the shared boto3 client (thread-safe once created)."""
         if self._client is None:
             import boto3
 
+            from botocore.config import Config
+
             client_kwargs: dict[str, Any] = {
                 "service_name": "s3",
                 "region_name": self.settings.s3_region,
+                "config": Config(max_pool_connections=S3_MAX_POOL_CONNECTIONS, tcp_keepalive=True),
             }
 
             # Only pass explicit credentials if configured (allows fallback to AWS profile/SSO)
@@ -71,6 +240,7 @@ class S3SyncService:
         """
         import shutil
 
+        self._forget_session(session_id)
         session_path = self.local_base_path / session_id
         if not session_path.exists():
             return 0
@@ -92,107 +262,243 @@ class S3SyncService:
 
         return file_count
 
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run blocking S3/filesystem work on the dedicated S3 thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _forget_session(self, session_id: str) -> None:
+        """Drop in-memory sync state once the local copy is removed."""
+        self._manifests.pop(session_id, None)
+        self._pending.pop(session_id, None)
+
+    async def _get_manifest(self, session_id: str) -> dict[str, str]:
+        manifest = self._manifests.get(session_id)
+        if manifest is None:
+            loaded = await self._run(_load_manifest, self.local_base_path / session_id / S3_SYNC_MANIFEST)
+            manifest = self._manifests.setdefault(session_id, loaded)
+        return manifest
+
+    async def _save_manifest(self, session_id: str) -> None:
+        lock = self._manifest_locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            manifest = self._manifests.get(session_id)
+            if manifest is None:
+                return
+            path = self.local_base_path / session_id / S3_SYNC_MANIFEST
+            try:
+                await self._run(_write_manifest, path, json_compact(manifest))
+            except OSError as e:
+                logger.warning(f"Failed to save S3 manifest for session {session_id}: {e}")
+
+    async def _download(self, session_id: str, obj: RemoteObject) -> bool:
+        """Download one object into the local cache and record its ETag."""
+        local_path = self.local_base_path / session_id / obj.key
+        async with self._download_slots:
+            try:
+                etag, stat = await self._run(
+                    _download_object, self._get_client(), self.bucket, f"{session_id}/{obj.key}", local_path
+                )
+            except Exception as e:
+                logger.warning(f"S3 download failed for {session_id}/{obj.key}: {e}")
+                return False
+        (await self._get_manifest(session_id))[obj.key] = etag
+        self._pending.get(session_id, {}).pop(obj.key, None)
+        get_directory_index().record_file(local_path, stat)
+        return True
+
     async def sync_from_s3(self, session_id: str) -> int:
-        """Download all session files from S3 → local.
+        """Bring the local cache up to date with S3.
 
-        Called on session load to ensure local cache has all files.
+        Lists the session prefix page by page on the sync thread pool and
+        compares each object's ETag with the manifest. Missing or changed
+        ``input/`` files are downloaded concurrently before returning; other
+        stale files are recorded as pending and hydrate on first access
+        (``hydrate``/``hydrate_all``).
 
         Args:
             session_id: Session identifier
 
         Returns:
-            Number of files synced
+            Number of files downloaded
         """
         client = self._get_client()
         prefix = f"{session_id}/"
-
-        # Run blocking S3 calls in thread pool
-        loop = asyncio.get_event_loop()
+        session_path = self.local_base_path / session_id
+        downloads: list[asyncio.Task[bool]] = []
 
         try:
-            # List all objects with session prefix using paginator
-            paginator = client.get_paginator("list_objects_v2")
-
-            # Run pagination in executor to avoid blocking
-            pages = await loop.run_in_executor(
-                None, lambda: list(paginator.paginate(Bucket=self.bucket, Prefix=prefix))
-            )
-
-            synced = 0
-            for page in pages:
-                contents = page.get("Contents", [])
-                if not contents:
-                    continue
-
-                for obj in contents:
-                    s3_key = obj["Key"]
-                    # Convert S3 key to local path: session_id/folder/filename
-                    relative_path = s3_key  # Already has session_id prefix
-                    local_path = self.local_base_path / relative_path
-
-                    # Skip if local file exists and is same size
-                    if local_path.exists() and local_path.stat().st_size == obj["Size"]:
-                        continue
-
-                    # Download file
-                    local_path.parent.mkdir(parents=True, exist_ok=True)
-                    key, path = s3_key, local_path
-                    await loop.run_in_executor(
-                        None,
-                        lambda k=key, p=path: client.download_file(self.bucket, k, str(p)),  # type: ignore[misc]
-                    )
-                    synced += 1
-
-            if synced > 0:
-                logger.info(f"Synced {synced} files from S3 for session {session_id}")
-            return synced
-
+            manifest = await self._get_manifest(session_id)
+            pages = iter(client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=prefix))
+            pending: dict[str, RemoteObject] = {}
+            while (page := await self._run(next, pages, None)) is not None:
+                objects = [
+                    RemoteObject(obj["Key"][len(prefix) :], obj["ETag"], obj["Size"])
+                    for obj in page.get("Contents", [])
+                    if not obj["Key"].endswith("/")
+                ]
+                stale, adopted = await self._run(_plan_sync, session_path, dict(manifest), objects)
+                manifest.update(adopted)
+                for obj in stale:
+                    if obj.key.startswith(EAGER_FOLDERS):
+                        downloads.append(asyncio.create_task(self._download(session_id, obj)))
+                    else:
+                        pending[obj.key] = obj
+            self._pending[session_id] = pending
         except Exception as e:
             # Log but don't fail - local files may still work
             logger.warning(f"S3 sync failed for session {session_id}: {e}")
+
+        synced = sum(await asyncio.gather(*downloads))
+        await self._save_manifest(session_id)
+        if synced > 0:
+            logger.info(f"Synced {synced} files from S3 for session {session_id}")
+        if pending_count := len(self._pending.get(session_id, ())):
+            logger.debug(f"{pending_count} files pending lazy S3 hydration for session {session_id}")
+        return synced
+
+    def start_rehydration(self, session_id: str) -> asyncio.Task[int]:
+        """Run ``sync_from_s3`` in the background (one run per session at a time).
+
+        Callers that need the eagerly synced ``input/`` files await
+        ``wait_for_rehydration`` first.
+        """
+        task = self._rehydrations.get(session_id)
+        if task is None:
+            task = asyncio.create_task(self.sync_from_s3(session_id), name=f"s3_rehydrate_{session_id}")
+            self._rehydrations[session_id] = task
+            task.add_done_callback(lambda _: self._rehydrations.pop(session_id, None))
+        return task
+
+    async def wait_for_rehydration(self, session_id: str) -> None:
+        """Wait for an in-progress rehydration of the session, if any."""
+        task = self._rehydrations.get(session_id)
+        if task is not None:
+            await asyncio.shield(task)
+
+    def is_pending(self, session_id: str, folder: str, filename: str) -> bool:
+        """True if the local copy is missing or stale and has not been hydrated yet."""
+        return f"{folder}/{filename}" in self._pending.get(session_id, {})
+
+    async def hydrate(self, session_id: str, relative_path: str) -> bool:
+        """Download a pending file (path relative to the session) before first use.
+
+        Concurrent callers share one download. Returns True if a download ran
+        and succeeded, False when the file was not pending or failed.
+        """
+        key = posixpath.normpath(relative_path).lstrip("/")
+        obj = self._pending.get(session_id, {}).get(key)
+        if obj is None:
+            return False
+        task = self._hydrating.get((session_id, key))
+        if task is None:
+            task = asyncio.create_task(self._download(session_id, obj))
+            self._hydrating[(session_id, key)] = task
+            task.add_done_callback(lambda _: self._hydrating.pop((session_id, key), None))
+        downloaded = await asyncio.shield(task)
+        await self._save_manifest(session_id)
+        return downloaded
+
+    def pending_entries(self, session_id: str, folder: str) -> list[dict[str, Any]]:
+        """Listing entries for pending objects directly under ``folder``.
+
+        Pending files are missing from (or stale in) the local directory until
+        they hydrate, so listings merge these in: files with their S3 size and
+        subfolders that so far only exist in S3.
+        """
+        prefix = f"{folder.strip('/')}/"
+        files: dict[str, dict[str, Any]] = {}
+        folders: dict[str, int] = {}
+        for key, obj in self._pending.get(session_id, {}).items():
+            if not key.startswith(prefix):
+                continue
+            name, nested, _ = key[len(prefix) :].partition("/")
+            if nested:
+                folders[name] = folders.get(name, 0) + 1
+            else:
+                files[name] = {"name": name, "type": "file", "size": obj.size}
+        return [
+            *({"name": name, "type": "folder", "size": 0, "file_count": count} for name, count in folders.items()),
+            *files.values(),
+        ]
+
+    async def hydrate_all(self, session_id: str, prefix: str = "") -> int:
+        """Download every pending file of the session (e.g. before a sandbox copy).
+
+        With ``prefix`` (a path relative to the session), only pending files
+        under that directory are downloaded.
+        """
+        keys = list(self._pending.get(session_id, {}))
+        prefix = posixpath.normpath(prefix).strip("/")
+        if prefix not in ("", "."):
+            keys = [key for key in keys if key == prefix or key.startswith(f"{prefix}/")]
+        if not keys:
             return 0
+        results = await asyncio.gather(*(self.hydrate(session_id, key) for key in keys))
+        return sum(results)
 
-    def upload_to_s3_background(self, session_id: str, folder: str, filename: str) -> None:
-        """Schedule background upload of local file → S3.
+    def upload_to_s3_background(
+        self, session_id: str, folder: str, filename: str, content_hash: str | None = None
+    ) -> None:
+        """Queue a background upload of local file → S3.
 
-        Non-blocking, fire-and-forget. Creates an async task.
+        Non-blocking, fire-and-forget. Repeated writes to the same file before
+        its upload starts are coalesced into one upload.
 
         Args:
             session_id: Session identifier
             folder: Folder within session (input, output)
             filename: File name
+            content_hash: SHA-256 hex computed while the file was written,
+                stored as ``sha256`` object metadata
         """
-        task = asyncio.create_task(
-            self._upload_file(session_id, folder, filename),
-            name=f"s3_upload_{session_id}_{filename}",
-        )
-        self._background_tasks.add(task)
-        task.add_done_callback(self._background_tasks.discard)
-
-    async def _upload_file(self, session_id: str, folder: str, filename: str) -> None:
-        """Upload single file to S3."""
-        client = self._get_client()
-        local_path = self.local_base_path / session_id / folder / filename
-        s3_key = f"{session_id}/{folder}/{filename}"
+        # The local write supersedes the S3 object: never hydrate over it
+        self._pending.get(session_id, {}).pop(f"{folder}/{filename}", None)
+        self._uploads.enqueue(session_id, folder, filename, content_hash)
+
+    def _get_transfer_config(self) -> Any:
+        """Multipart settings for upload_file (large files upload in parallel parts)."""
+        if self._transfer_config is None:
+            from boto3.s3.transfer import TransferConfig
+
+            self._transfer_config = TransferConfig(
+                multipart_threshold=S3_UPLOAD_MULTIPART_THRESHOLD,
+                multipart_chunksize=S3_UPLOAD_PART_SIZE,
+                max_concurrency=S3_UPLOAD_PART_CONCURRENCY,
+            )
+        return self._transfer_config
 
-        if not local_path.exists():
-            logger.warning(f"Cannot upload missing file: {local_path}")
-            return
+    async def _upload_file(self, job: UploadJob) -> int:
+        """Upload one queued file to S3 and record its ETag.
 
-        loop = asyncio.get_event_loop()
-        try:
-            await loop.run_in_executor(
-                None,
-                lambda: client.upload_file(str(local_path), self.bucket, s3_key),
-            )
-            logger.debug(f"Uploaded to S3: {s3_key}")
-        except Exception as e:
-            logger.error(f"S3 upload failed for {s3_key}: {e}")
+        Raises on failure so the queue can retry; FileNotFoundError when the
+        local file no longer exists. Returns the number of bytes uploaded.
+        """
+        client = self._get_client()
+        local_path = self.local_base_path / job.key
+        extra_args = {"Metadata": {"sha256": job.content_hash}} if job.content_hash else None
+        config = self._get_transfer_config()
+
+        def upload() -> tuple[int, str]:
+            size = local_path.stat().st_size
+            client.upload_file(str(local_path), self.bucket, job.key, ExtraArgs=extra_args, Config=config)
+            return size, str(client.head_object(Bucket=self.bucket, Key=job.key)["ETag"])
+
+        size, etag = await self._run(upload)
+        logger.debug(f"Uploaded to S3: {job.key}")
+
+        # The local copy is now the current version; record it so the next
+        # rehydration does not download it back
+        key = f"{job.folder}/{job.filename}"
+        (await self._get_manifest(job.session_id))[key] = etag
+        self._pending.get(job.session_id, {}).pop(key, None)
+        await self._save_manifest(job.session_id)
+        return size
 
     async def upload_all_to_s3(self, session_id: str) -> int:
         """Upload all local session files → S3.
 
-        Used for migration and ensuring S3 has all files.
+        Used for migration and ensuring S3 has all files. Files go through the
+        upload queue, so they upload concurrently.
 
         Args:
             session_id: Session identifier
@@ -201,45 +507,45 @@ class S3SyncService:
             Number of files uploaded
         """
         session_path = self.local_base_path / session_id
-        if not session_path.exists():
-            return 0
-
-        uploaded = 0
-        for folder in ["input", "output"]:
-            folder_path = session_path / folder
-            if not folder_path.exists():
-                continue
-
-            # Recursively find all files
-            for file_path in folder_path.rglob("*"):
-                if file_path.is_file() and not file_path.name.startswith("."):
-                    # Calculate relative path from folder root (e.g. code/script.py)
-                    # upload_to_s3_background expects filename relative to folder
-                    relative_filename = str(file_path.relative_to(folder_path))
-                    await self._upload_file(session_id, folder, relative_filename)
-                    uploaded += 1
+        files = await self._run(_list_session_files, session_path)
+        results = await asyncio.gather(
+            *(self._uploads.enqueue(session_id, folder, filename) for folder, filename in files)
+        )
+        uploaded = sum(results)
 
         if uploaded > 0:
             logger.info(f"Uploaded {uploaded} files to S3 for session {session_id}")
         return uploaded
 
+    async def drain_uploads(self, timeout: float) -> bool:
+        """Finish queued uploads (shutdown); False if some were still pending at the timeout."""
+        return await self._uploads.drain(timeout)
+
+    def upload_stats(self) -> dict[str, Any]:
+        """Upload queue statistics."""
+        return self._uploads.stats()
+
+    def close(self) -> None:
+        """Release the thread pool and pooled connections (after ``drain_uploads``)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
     async def ensure_bucket_exists(self) -> None:
-        """Create bucket if it doesn't exist (for MinIO)."""
-        client = self._get_client()
-        loop = asyncio.get_event_loop()
+        """Create bucket if it doesn't exist (for MinIO).
+
+        Called at startup; also builds the shared client off the event loop
+        (loading the service model takes tens of milliseconds).
+        """
+        client = await self._run(self._get_client)
 
         try:
-            await loop.run_in_executor(
-                None,
-                lambda: client.head_bucket(Bucket=self.bucket),
-            )
+            await self._run(lambda: client.head_bucket(Bucket=self.bucket))
         except Exception:
             # Bucket doesn't exist, create it
             try:
-                await loop.run_in_executor(
-                    None,
-                    lambda: client.create_bucket(Bucket=self.bucket),
-                )
+                await self._run(lambda: client.create_bucket(Bucket=self.bucket))
                 logger.info(f"Created S3 bucket: {self.bucket}")
             except Exception as e:
                 logger.error(f"Failed to create S3 bucket {self.bucket}: {e}")
@@ -254,18 +560,85 @@ class S3SyncService:
         import time
 
         client = self._get_client()
-        loop = asyncio.get_event_loop()
         start = time.monotonic()
 
         try:
-            await loop.run_in_executor(
-                None,
-                lambda: client.head_bucket(Bucket=self.bucket),
-            )
+            await self._run(lambda: client.head_bucket(Bucket=self.bucket))
             return {"connected": True, "latency_ms": (time.monotonic() - start) * 1000}
         except Exception as e:
             return {"connected": False, "error": str(e), "latency_ms": (time.monotonic() - start) * 1000}
 
+    async def open_download(
+        self,
+        session_id: str,
+        folder: str,
+        filename: str,
+        *,
+        byte_range: str | None = None,
+        if_none_match: str | None = None,
+        if_modified_since: str | None = None,
+    ) -> S3Download:
+        """Open a file in S3 for streaming, for downloads when the local cache is cold.
+
+        Range and conditional request headers are passed through to S3, so
+        partial content (206) and not-modified (304) are evaluated by S3 against
+        the object itself.
+
+        Args:
+            session_id: Session identifier
+            folder: Folder within session (input, output)
+            filename: File name
+            byte_range: HTTP Range header value
+            if_none_match: HTTP If-None-Match header value
+            if_modified_since: HTTP If-Modified-Since header value
+
+        Returns:
+            S3Download with an open body for 200/206, or without one for 304/416
+
+        Raises:
+            FileNotFoundError: If the object does not exist
+        """
+        client = self._get_client()
+        s3_key = f"{session_id}/{folder}/{filename}"
+
+        params: dict[str, Any] = {"Bucket": self.bucket, "Key": s3_key}
+        if byte_range:
+            params["Range"] = byte_range
+        if if_none_match:
+            params["IfNoneMatch"] = if_none_match
+        elif if_modified_since:
+            # Invalid dates are ignored, as for local files
+            with contextlib.suppress(TypeError, ValueError):
+                params["IfModifiedSince"] = parsedate_to_datetime(if_modified_since)
+
+        try:
+            obj = await self._run(lambda: client.get_object(**params))
+        except Exception as e:
+            code = _client_error_code(e)
+            if code in ("304", "NotModified"):
+                return S3Download(status_code=304)
+            if code in ("404", "NoSuchKey"):
+                raise FileNotFoundError(f"File not found: {filename}") from e
+            if code == "InvalidRange":
+                return S3Download(status_code=416)
+            raise
+
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Content-Length": str(obj["ContentLength"]),
+        }
+        if obj.get("ETag"):
+            headers["ETag"] = obj["ETag"]
+        if obj.get("LastModified"):
+            headers["Last-Modified"] = format_datetime(obj["LastModified"].astimezone(UTC), usegmt=True)
+        status_code = 200
+        if obj.get("ContentRange"):
+            headers["Content-Range"] = obj["ContentRange"]
+            status_code = 206
+
+        logger.debug(f"Streaming from S3 (local cache cold): {s3_key} [{status_code}]")
+        return S3Download(status_code=status_code, headers=headers, body=obj["Body"])
+
     def generate_presigned_upload_url(
         self, session_id: str, folder: str, filename: str, content_type: str | None = None
     ) -> tuple[str, str]:
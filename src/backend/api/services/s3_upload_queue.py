@@ -0,0 +1,201 @@
+"""Per-process queue for background S3 uploads.
+
+Local writes (uploads, tool edits, generated documents) enqueue the object key
+instead of starting an upload task each:
+
+- Coalescing: a key written again while still queued is uploaded once; written
+  again while uploading, it is re-queued to run after the current upload
+- A fixed set of worker tasks uploads concurrently (each upload may itself
+  run as a multipart transfer)
+- Failures are retried with capped exponential backoff and jitter
+- ``drain`` finishes queued uploads on shutdown, bounded by a timeout
+
+Queue depth, uploaded bytes (bytes/sec via ``rate()``), outcomes and durations
+are exported as Prometheus metrics.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+import time
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from core.constants import (
+    S3_UPLOAD_MAX_ATTEMPTS,
+    S3_UPLOAD_RETRY_BASE_DELAY,
+    S3_UPLOAD_RETRY_MAX_DELAY,
+    S3_UPLOAD_WORKERS,
+)
+from utils.logger import logger
+from utils.metrics import (
+    s3_upload_bytes_total,
+    s3_upload_duration_seconds,
+    s3_upload_queue_depth,
+    s3_uploads_total,
+)
+
+
+@dataclass
+class UploadJob:
+    """One pending upload of a session file (latest write wins)."""
+
+    session_id: str
+    folder: str
+    filename: str
+    content_hash: str | None = None
+    waiters: list[asyncio.Future[bool]] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return f"{self.session_id}/{self.folder}/{self.filename}"
+
+
+#: Uploads one job and returns the bytes sent; raises on failure
+#: (FileNotFoundError when the local file is gone, which is not retried)
+UploadFunc = Callable[[UploadJob], Awaitable[int]]
+
+
+class S3UploadQueue:
+    """Coalescing upload queue with bounded workers and retries."""
+
+    def __init__(
+        self,
+        upload: UploadFunc,
+        workers: int = S3_UPLOAD_WORKERS,
+        max_attempts: int = S3_UPLOAD_MAX_ATTEMPTS,
+        base_delay: float = S3_UPLOAD_RETRY_BASE_DELAY,
+        max_delay: float = S3_UPLOAD_RETRY_MAX_DELAY,
+    ) -> None:
+        self._upload = upload
+        self._worker_count = workers
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._queued: dict[str, UploadJob] = {}  # key -> job waiting for a worker
+        self._active: dict[str, UploadJob] = {}  # key -> job being uploaded
+        self._ready: asyncio.Queue[str] = asyncio.Queue()
+        self._workers: list[asyncio.Task[None]] = []
+        self._uploaded = 0
+        self._coalesced = 0
+        self._retried = 0
+        self._failed = 0
+
+    @property
+    def depth(self) -> int:
+        """Uploads queued or in progress."""
+        return len(self._queued) + len(self._active)
+
+    def enqueue(
+        self, session_id: str, folder: str, filename: str, content_hash: str | None = None
+    ) -> asyncio.Future[bool]:
+        """Schedule an upload; the future resolves to True once the key is in S3."""
+        self._ensure_workers()
+        waiter: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        job = UploadJob(session_id, folder, filename, content_hash)
+        queued = self._queued.get(job.key)
+        if queued is not None:
+            queued.content_hash = content_hash
+            queued.waiters.append(waiter)
+            self._coalesced += 1
+            s3_uploads_total.labels(status="coalesced").inc()
+            return waiter
+
+        job.waiters.append(waiter)
+        self._queued[job.key] = job
+        if job.key not in self._active:
+            self._ready.put_nowait(job.key)
+        # else: the worker uploading this key re-queues it when done
+        s3_upload_queue_depth.set(self.depth)
+        return waiter
+
+    def _ensure_workers(self) -> None:
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(), name=f"s3_upload_worker_{i}") for i in range(self._worker_count)
+            ]
+
+    async def _worker(self) -> None:
+        while True:
+            key = await self._ready.get()
+            job = self._queued.pop(key, None)
+            succeeded = False
+            try:
+                if job is None:
+                    continue
+                self._active[key] = job
+                s3_upload_queue_depth.set(self.depth)
+                succeeded = await self._upload_with_retries(job)
+            finally:
+                if job is not None:
+                    for waiter in job.waiters:
+                        if not waiter.done():
+                            waiter.set_result(succeeded)
+                    self._active.pop(key, None)
+                    if key in self._queued:
+                        self._ready.put_nowait(key)  # Written again while uploading
+                    s3_upload_queue_depth.set(self.depth)
+                self._ready.task_done()
+
+    async def _upload_with_retries(self, job: UploadJob) -> bool:
+        for attempt in range(1, self._max_attempts + 1):
+            started = time.perf_counter()
+            try:
+                size = await self._upload(job)
+            except FileNotFoundError:
+                logger.warning(f"Skipping S3 upload of missing file: {job.key}")
+                s3_uploads_total.labels(status="skipped").inc()
+                return False
+            except Exception as e:
+                if attempt == self._max_attempts:
+                    logger.error(f"S3 upload failed for {job.key} after {attempt} attempts: {e}")
+                    self._failed += 1
+                    s3_uploads_total.labels(status="failed").inc()
+                    return False
+                delay = min(self._max_delay, self._base_delay * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+                logger.warning(f"S3 upload failed for {job.key} (attempt {attempt}): {e}; retrying in {delay:.1f}s")
+                self._retried += 1
+                s3_uploads_total.labels(status="retried").inc()
+                await asyncio.sleep(delay)
+            else:
+                s3_upload_duration_seconds.observe(time.perf_counter() - started)
+                s3_upload_bytes_total.inc(size)
+                s3_uploads_total.labels(status="uploaded").inc()
+                self._uploaded += 1
+                return True
+        return False
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for queued uploads, then stop the workers.
+
+        Returns False if uploads were still pending when the timeout expired.
+        """
+        drained = True
+        if self._workers:
+            try:
+                await asyncio.wait_for(self._ready.join(), timeout)
+            except TimeoutError:
+                drained = False
+                logger.warning(f"S3 upload queue drain timed out with {self.depth} uploads pending")
+        for worker in self._workers:
+            worker.cancel()
+        for worker in self._workers:
+            with contextlib.suppress(asyncio.CancelledError):
+                await worker
+        self._workers = []
+        return drained
+
+    def stats(self) -> dict[str, Any]:
+        """Queue statistics."""
+        return {
+            "depth": self.depth,
+            "workers": len(self._workers),
+            "uploaded": self._uploaded,
+            "coalesced": self._coalesced,
+            "retried": self._retried,
+            "failed": self._failed,
+        }
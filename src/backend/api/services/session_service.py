@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import secrets
 import shutil
 
@@ -10,9 +10,15 @@ from uuid import UUID
 
 import asyncpg
 
-from api.services.message_utils import row_to_message
+from api.services.file_index import get_directory_index
+from api.services.message_utils import fetch_message_page, row_to_message
 from core.constants import DATA_FILES_PATH, DEFAULT_MODEL, MODEL_TOKEN_LIMITS
-from utils.cache import get_session_cache, get_session_list_cache
+from utils.cache import (
+    get_session_cache,
+    get_session_list_cache,
+    invalidate_session_caches,
+    session_cache_key,
+)
 from utils.logger import logger
 
 
@@ -51,39 +57,35 @@ class SessionService:
                 session_id,
                 title,
                 model or DEFAULT_MODEL,
-                json.dumps(mcp_config or ["sequential-thinking", "fetch"]),
+                mcp_config or ["sequential-thinking", "fetch"],
                 reasoning_effort or "medium",
                 project_id,
             )
+
+        # New session must appear in the user's cached list pages
+        await invalidate_session_caches(user_id)
         return self._row_to_session(row)
 
     async def get_session(self, user_id: UUID, session_id: str) -> dict[str, Any] | None:
-        """Get session by ID (with caching)."""
-        cache_key = f"session:{user_id}:{session_id}"
-        cache = get_session_cache()
-
-        # Try cache first
-        cached = await cache.get(cache_key)
-        if cached is not None:
-            return dict(cached)  # Explicit dict() to satisfy mypy
+        """Get session by ID (cached; concurrent misses share one query)."""
 
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                """
-                SELECT s.*, p.name as project_name
-                FROM sessions s
-                LEFT JOIN projects p ON s.project_id = p.id
-                WHERE s.user_id = $1 AND s.session_id = $2
-                """,
-                user_id,
-                session_id,
-            )
-        if not row:
-            return None
+        async def load() -> dict[str, Any] | None:
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    SELECT s.*, p.name as project_name
+                    FROM sessions s
+                    LEFT JOIN projects p ON s.project_id = p.id
+                    WHERE s.user_id = $1 AND s.session_id = $2
+                    """,
+                    user_id,
+                    session_id,
+                )
+            return self._row_to_session(row) if row else None
 
-        session = self._row_to_session(row)
-        await cache.set(cache_key, session, ttl=60.0)  # Cache for 60s
-        return session
+        cache_key = session_cache_key(user_id, session_id)
+        session = await get_session_cache().get_or_load(cache_key, load, ttl=60.0)  # Cache for 60s
+        return dict(session) if session is not None else None  # Explicit dict() to satisfy mypy
 
     async def get_session_with_history(
         self,
@@ -100,16 +102,8 @@ class SessionService:
         session_uuid = UUID(session["id"])
 
         async with self.pool.acquire() as conn:
-            message_rows = await conn.fetch(
-                """
-                SELECT * FROM messages
-                WHERE session_id = $1
-                ORDER BY created_at DESC
-                LIMIT $2
-                """,
-                session_uuid,
-                message_limit,
-            )
+            # Newest page; older pages are fetched via next_cursor
+            message_rows, next_cursor = await fetch_message_page(conn, session_uuid, message_limit)
 
             file_rows = await conn.fetch(
                 """
@@ -120,21 +114,21 @@ class SessionService:
                 session_uuid,
             )
 
-            total = await conn.fetchval(
-                "SELECT COUNT(*) FROM messages WHERE session_id = $1",
-                session_uuid,
-            )
+            # Maintained counter (PK lookup) instead of COUNT(*); the cached
+            # session dict may be up to a minute stale
+            total = await conn.fetchval("SELECT message_count FROM sessions WHERE id = $1", session_uuid)
 
-        messages = [row_to_message(r) for r in reversed(message_rows)]
+        messages = [row_to_message(r) for r in message_rows]
         files = [self._row_to_file(r) for r in file_rows]
 
         return {
             "session": session,
             "full_history": messages,
             "files": files,
-            "has_more": total > message_limit,
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor,
             "loaded_count": len(messages),
-            "message_count": total,
+            "message_count": max(total or 0, len(messages)),
         }
 
     async def list_sessions(
@@ -143,49 +137,50 @@ class SessionService:
         offset: int = 0,
         limit: int = 50,
     ) -> dict[str, Any]:
-        """List all sessions for user (with caching for first page)."""
-        # Only cache first page (most common request)
-        use_cache = offset == 0 and limit == 50
-        cache_key = f"sessions:{user_id}:0:50"
-        cache = get_session_list_cache()
-
-        if use_cache:
-            cached = await cache.get(cache_key)
-            if cached is not None:
-                return dict(cached)  # Explicit dict() to satisfy mypy
+        """List sessions for user.
 
-        async with self.pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT s.*, p.name as project_name
-                FROM sessions s
-                LEFT JOIN projects p ON s.project_id = p.id
-                WHERE s.user_id = $1
-                ORDER BY s.pinned DESC, s.last_used_at DESC
-                LIMIT $2 OFFSET $3
-                """,
-                user_id,
-                limit,
-                offset,
-            )
+        Every page is cached under the user's list generation, as is the total
+        count shared by all pages; session mutations bump the generation.
+        """
+        cache = get_session_list_cache()
+        generation = await cache.generation(str(user_id))
 
-            total = await conn.fetchval(
-                "SELECT COUNT(*) FROM sessions WHERE user_id = $1",
-                user_id,
-            )
+        async def load_total() -> int:
+            async with self.pool.acquire() as conn:
+                total: int = await conn.fetchval(
+                    "SELECT COUNT(*) FROM sessions WHERE user_id = $1",
+                    user_id,
+                )
+            return total
 
-        sessions = [self._row_to_session(r) for r in rows]
+        async def load() -> dict[str, Any]:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(
+                    """
+                    SELECT s.*, p.name as project_name
+                    FROM sessions s
+                    LEFT JOIN projects p ON s.project_id = p.id
+                    WHERE s.user_id = $1
+                    ORDER BY s.pinned DESC, s.last_used_at DESC
+                    LIMIT $2 OFFSET $3
+                    """,
+                    user_id,
+                    limit,
+                    offset,
+                )
 
-        result = {
-            "sessions": sessions,
-            "total_count": total,
-            "has_more": offset + len(sessions) < total,
-        }
+            total = await cache.get_or_load(f"sessions_total:{user_id}:{generation}", load_total, ttl=30.0)
+            sessions = [self._row_to_session(r) for r in rows]
 
-        if use_cache:
-            await cache.set(cache_key, result, ttl=30.0)  # Cache for 30s
+            return {
+                "sessions": sessions,
+                "total_count": total,
+                "has_more": offset + len(sessions) < total,
+            }
 
-        return result
+        cache_key = f"sessions:{user_id}:{generation}:{offset}:{limit}"
+        result = await cache.get_or_load(cache_key, load, ttl=30.0)  # Cache for 30s
+        return dict(result)  # Explicit dict() to satisfy mypy
 
     async def update_session(
         self,
@@ -202,9 +197,8 @@ class SessionService:
 
         for field, val in updates.items():
             if field in allowed_fields and val is not None:
-                to_store = json.dumps(val) if field == "mcp_config" else val
                 set_clauses.append(f"{field} = ${idx}")
-                values.append(to_store)
+                values.append(val)
                 idx += 1
 
         if not set_clauses:
@@ -225,11 +219,7 @@ class SessionService:
         if not row:
             return None
 
-        # Invalidate caches
-        session_cache = get_session_cache()
-        list_cache = get_session_list_cache()
-        await session_cache.delete(f"session:{user_id}:{session_id}")
-        await list_cache.delete(f"sessions:{user_id}:0:50")
+        await invalidate_session_caches(user_id, session_id)
 
         return self._row_to_session(row)
 
@@ -260,10 +250,7 @@ class SessionService:
 
         # Invalidate caches
         if deleted:
-            session_cache = get_session_cache()
-            list_cache = get_session_list_cache()
-            await session_cache.delete(f"session:{user_id}:{session_id}")
-            await list_cache.delete(f"sessions:{user_id}:0:50")
+            await invalidate_session_caches(user_id, session_id)
 
         # Clean up context chunks (session summary + message chunks)
         if deleted and session_uuid:
@@ -287,10 +274,11 @@ class SessionService:
             session_dir = DATA_FILES_PATH / session_id
             if session_dir.exists():
                 try:
-                    shutil.rmtree(session_dir)
+                    await asyncio.to_thread(shutil.rmtree, session_dir)
                     logger.info(f"Deleted session files: {session_dir}")
                 except Exception as e:
                     logger.warning(f"Failed to delete session files: {e}")
+            get_directory_index().invalidate(session_dir)
 
         return deleted
 
@@ -319,7 +307,7 @@ class SessionService:
             "title": row["title"],
             "model": model,
             "reasoning_effort": row["reasoning_effort"],
-            "mcp_config": json.loads(row["mcp_config"]) if row["mcp_config"] else [],
+            "mcp_config": row["mcp_config"] or [],
             "pinned": row["pinned"],
             "is_named": row["is_named"],
             "message_count": row["message_count"],
@@ -0,0 +1,124 @@
+"""In-memory JWT revocation state, synced periodically from the database.
+
+Two kinds of revocation are tracked:
+
+- Individual tokens (logout): ``token_denylist`` rows keyed by the JWT ``jti``,
+  kept until the token would have expired anyway
+- Every token of a user: ``users.token_version`` bumps; tokens carrying an older
+  ``ver`` claim are rejected
+
+Only users revoked within the refresh token lifetime are loaded (older tokens
+have expired), so the synced state stays small. Checks are dict lookups and
+never touch the database, which lets stateless authentication skip the users
+query entirely.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+
+from typing import Any
+
+import asyncpg
+
+from core.constants import AUTH_DENYLIST_SYNC_INTERVAL, get_settings
+from utils.logger import logger
+
+
+class TokenDenylist:
+    """Revoked token IDs and minimum token versions per user."""
+
+    def __init__(self) -> None:
+        self._jtis: dict[str, float] = {}  # jti -> expiry (epoch seconds)
+        self._min_versions: dict[str, int] = {}  # user id -> current token version
+        self._pool: asyncpg.Pool | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._last_sync: float | None = None
+
+    def is_revoked(self, payload: dict[str, Any]) -> bool:
+        """Check decoded JWT claims against the denylist."""
+        jti = payload.get("jti")
+        if jti is not None and jti in self._jtis:
+            return True
+        min_version = self._min_versions.get(str(payload.get("sub")))
+        return min_version is not None and int(payload.get("ver", 0)) < min_version
+
+    def add_token(self, jti: str, expires_at: float) -> None:
+        """Record a revoked token locally (applied before the next sync)."""
+        self._jtis[jti] = expires_at
+
+    def set_min_version(self, user_id: str, version: int) -> None:
+        """Record a user-wide revocation locally (applied before the next sync)."""
+        if version > self._min_versions.get(user_id, 0):
+            self._min_versions[user_id] = version
+
+    async def sync(self) -> None:
+        """Replace local state with the database denylist and purge expired rows."""
+        if self._pool is None:
+            return
+        window_minutes = get_settings().refresh_token_expires_days * 24 * 60
+        async with self._pool.acquire() as conn:
+            await conn.execute("DELETE FROM token_denylist WHERE expires_at <= now()")
+            tokens = await conn.fetch("SELECT jti, extract(epoch FROM expires_at)::float8 AS exp FROM token_denylist")
+            users = await conn.fetch(
+                """
+                SELECT id, token_version FROM users
+                WHERE tokens_revoked_at > now() - make_interval(mins => $1)
+                """,
+                window_minutes,
+            )
+
+        now = time.time()
+        jtis = {row["jti"]: row["exp"] for row in tokens}
+        # Keep local revocations that have not reached the database yet
+        for jti, exp in self._jtis.items():
+            if exp > now:
+                jtis.setdefault(jti, exp)
+        self._jtis = jtis
+        self._min_versions = {str(row["id"]): row["token_version"] for row in users}
+        self._last_sync = time.monotonic()
+
+    async def start(self, pool: asyncpg.Pool, interval: float = AUTH_DENYLIST_SYNC_INTERVAL) -> None:
+        """Load the denylist and keep it synced in the background."""
+        self._pool = pool
+        try:
+            await self.sync()
+        except Exception as e:
+            logger.error(f"Token denylist initial sync failed: {e}")
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sync_loop(interval))
+
+    async def stop(self) -> None:
+        """Stop background syncing."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self._pool = None
+
+    async def _sync_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.warning(f"Token denylist sync failed: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        """Denylist status for health reporting."""
+        return {
+            "revoked_tokens": len(self._jtis),
+            "revoked_users": len(self._min_versions),
+            "last_sync_age": round(time.monotonic() - self._last_sync, 1) if self._last_sync is not None else None,
+        }
+
+
+_denylist = TokenDenylist()
+
+
+def get_token_denylist() -> TokenDenylist:
+    """Get the process-wide token denylist."""
+    return _denylist
@@ -0,0 +1,280 @@
+"""
+Vector index strategy management for context_chunks.
+
+The global HNSW index is shared by every project, and the project filter is
+applied after the graph scan. That wastes candidates for large tenants and can
+drop recall for small ones. This module picks a per-project search strategy:
+
+- exact: tiny projects are scanned exhaustively (perfect recall, cheap)
+- global: mid-sized projects use the shared HNSW index
+- partial: large projects get a dedicated partial HNSW index
+
+The HNSW indexes can store a compact form of the embedding (halfvec or
+binary-quantized bits, see ``Settings.context_ann_storage``). Scans then
+oversample candidates from the compact index and the caller re-ranks them
+with the full-precision ``embedding`` column.
+
+Partial indexes (and the global index for the configured storage) are created
+and dropped by a maintenance command (``scripts/maintain_vector_indexes.py``),
+never on the request path.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+from uuid import UUID
+
+import asyncpg
+
+from core.constants import (
+    CONTEXT_BINARY_OVERSAMPLE,
+    CONTEXT_EXACT_SCAN_MAX_CHUNKS,
+    CONTEXT_HALFVEC_OVERSAMPLE,
+    CONTEXT_INDEX_STRATEGY_TTL,
+    CONTEXT_PARTIAL_INDEX_MIN_CHUNKS,
+    HNSW_EF_SEARCH_MAX,
+    HNSW_EF_SEARCH_MIN,
+    get_settings,
+)
+from utils.cache import TTLCache
+from utils.logger import logger
+from utils.metrics import context_index_maintenance_actions_total, context_partial_indexes
+
+SearchStrategy = Literal["exact", "global", "partial"]
+AnnStorage = Literal["full", "halfvec", "binary"]
+
+#: Prefix for per-project partial index names (prefix + project UUID hex = 57 chars)
+PARTIAL_INDEX_PREFIX = "idx_context_chunks_emb_p_"
+
+# Strategy per project, shared across ContextService instances
+_strategy_cache = TTLCache(max_size=1000, default_ttl=CONTEXT_INDEX_STRATEGY_TTL)
+
+
+def partial_index_name(project_id: UUID) -> str:
+    """Name of the partial HNSW index for a project."""
+    return f"{PARTIAL_INDEX_PREFIX}{project_id.hex}"
+
+
+def ef_search_for(candidate_limit: int) -> int:
+    """hnsw.ef_search for a scan returning ``candidate_limit`` rows."""
+    return max(HNSW_EF_SEARCH_MIN, min(candidate_limit * 2, HNSW_EF_SEARCH_MAX))
+
+
+@dataclass(frozen=True)
+class AnnIndexSpec:
+    """How an HNSW index stores embeddings and how a scan must address it."""
+
+    index_name: str  # global (all projects) index
+    expression: str  # indexed expression over the embedding column
+    opclass: str
+    distance: str  # ORDER BY expression matching the index, query vector is $2
+    oversample: int  # candidates scanned per row kept after re-ranking
+
+
+#: Full-precision distance used for exact scans and re-ranking
+FULL_DISTANCE = "embedding <=> $2"
+
+ANN_INDEX_SPECS: dict[AnnStorage, AnnIndexSpec] = {
+    "full": AnnIndexSpec("idx_context_chunks_embedding", "embedding", "vector_cosine_ops", FULL_DISTANCE, 1),
+    "halfvec": AnnIndexSpec(
+        "idx_context_chunks_embedding_half",
+        "(embedding::halfvec(1536))",
+        "halfvec_cosine_ops",
+        "embedding::halfvec(1536) <=> $2::vector::halfvec(1536)",
+        CONTEXT_HALFVEC_OVERSAMPLE,
+    ),
+    "binary": AnnIndexSpec(
+        "idx_context_chunks_embedding_bit",
+        "(binary_quantize(embedding)::bit(1536))",
+        "bit_hamming_ops",
+        "binary_quantize(embedding)::bit(1536) <~> binary_quantize($2::vector)",
+        CONTEXT_BINARY_OVERSAMPLE,
+    ),
+}
+
+
+@dataclass
+class ScanPlan:
+    """How to run the ANN candidate scan for one search."""
+
+    strategy: SearchStrategy
+    predicate: str  # extra SQL predicate for the scan
+    distance: str  # ORDER BY expression for the scan
+    scan_limit: int  # rows the scan returns before full-precision re-ranking
+
+
+@dataclass
+class IndexAction:
+    """A partial index create/drop planned or performed by maintenance."""
+
+    action: Literal["create", "drop"]
+    project_id: UUID | None
+    index_name: str
+    chunk_count: int
+
+
+class VectorIndexManager:
+    """Per-project vector search strategy and HNSW index maintenance."""
+
+    def __init__(self, pool: asyncpg.Pool, ann_storage: AnnStorage | None = None) -> None:
+        """Initialize with database connection pool.
+
+        Args:
+            pool: Database connection pool
+            ann_storage: Index storage mode, defaults to ``Settings.context_ann_storage``
+        """
+        self.pool = pool
+        self.spec = ANN_INDEX_SPECS[ann_storage or get_settings().context_ann_storage]
+
+    async def project_strategy(self, conn: asyncpg.Connection, project_id: UUID) -> SearchStrategy:
+        """Get the search strategy for a project (cached).
+
+        The chunk count is capped at the exact-scan threshold so the lookup stays
+        cheap for large projects.
+        """
+        key = f"vector_strategy:{project_id}"
+        cached = await _strategy_cache.get(key)
+        if cached is not None:
+            return cached  # type: ignore[no-any-return]
+
+        row = await conn.fetchrow(
+            """
+            SELECT
+                (SELECT count(*) FROM (
+                    SELECT 1 FROM context_chunks WHERE project_id = $1 LIMIT $2
+                ) s) AS chunk_count,
+                to_regclass($3) IS NOT NULL AS has_partial_index
+            """,
+            project_id,
+            CONTEXT_EXACT_SCAN_MAX_CHUNKS,
+            partial_index_name(project_id),
+        )
+        strategy: SearchStrategy = "global"
+        if row and row["has_partial_index"]:
+            strategy = "partial"
+        elif row and row["chunk_count"] < CONTEXT_EXACT_SCAN_MAX_CHUNKS:
+            strategy = "exact"
+
+        await _strategy_cache.set(key, strategy)
+        return strategy
+
+    async def prepare_search(
+        self,
+        conn: asyncpg.Connection,
+        project_id: UUID,
+        candidate_limit: int,
+    ) -> ScanPlan:
+        """Configure the current transaction for a vector scan.
+
+        Must be called inside ``conn.transaction()`` since settings are SET LOCAL.
+
+        Args:
+            conn: Connection with an open transaction
+            project_id: Project being searched
+            candidate_limit: Rows wanted after full-precision re-ranking
+
+        Returns:
+            Scan plan. For the partial strategy the predicate repeats the project
+            ID as a literal so the planner can match the partial index even with
+            a generic plan.
+        """
+        strategy = await self.project_strategy(conn, project_id)
+
+        if strategy == "exact":
+            # Force the full-precision distance sort instead of the shared HNSW graph
+            await conn.execute("SET LOCAL enable_indexscan = off")
+            return ScanPlan(strategy, "", FULL_DISTANCE, candidate_limit)
+
+        scan_limit = candidate_limit * self.spec.oversample
+        await conn.execute(f"SET LOCAL hnsw.ef_search = {ef_search_for(scan_limit)}")
+        predicate = f"AND project_id = '{project_id}'::uuid" if strategy == "partial" else ""
+        return ScanPlan(strategy, predicate, self.spec.distance, scan_limit)
+
+    async def plan_maintenance(self) -> list[IndexAction]:
+        """Compute partial index creates/drops needed for current project sizes.
+
+        Indexes are dropped only once a project falls below half the creation
+        threshold, so projects hovering around the threshold don't churn. The
+        global index for the configured storage is created if it is missing.
+        """
+        async with self.pool.acquire() as conn:
+            has_global_index = await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", self.spec.index_name)
+            sizes = await conn.fetch(
+                """
+                SELECT project_id, count(*) AS chunk_count
+                FROM context_chunks
+                GROUP BY project_id
+                HAVING count(*) >= $1
+                """,
+                CONTEXT_PARTIAL_INDEX_MIN_CHUNKS // 2,
+            )
+            existing = await conn.fetch(
+                """
+                SELECT indexname FROM pg_indexes
+                WHERE tablename = 'context_chunks' AND indexname LIKE $1
+                """,
+                f"{PARTIAL_INDEX_PREFIX}%",
+            )
+
+        counts = {row["project_id"]: row["chunk_count"] for row in sizes}
+        existing_names = {row["indexname"] for row in existing}
+        actions: list[IndexAction] = []
+
+        if not has_global_index:
+            actions.append(IndexAction("create", None, self.spec.index_name, 0))
+
+        for project_id, count in counts.items():
+            name = partial_index_name(project_id)
+            if count >= CONTEXT_PARTIAL_INDEX_MIN_CHUNKS and name not in existing_names:
+                actions.append(IndexAction("create", project_id, name, count))
+
+        wanted = {partial_index_name(pid) for pid in counts}
+        for name in sorted(existing_names - wanted):
+            project_hex = name.removeprefix(PARTIAL_INDEX_PREFIX)
+            actions.append(IndexAction("drop", UUID(hex=project_hex) if len(project_hex) == 32 else None, name, 0))
+
+        return actions
+
+    async def run_maintenance(self, dry_run: bool = False) -> list[IndexAction]:
+        """Create and drop partial HNSW indexes to match project sizes.
+
+        Uses CREATE/DROP INDEX CONCURRENTLY so writes are not blocked.
+
+        Args:
+            dry_run: Only plan, don't execute
+
+        Returns:
+            Actions planned (dry run) or performed
+        """
+        actions = await self.plan_maintenance()
+        if dry_run:
+            return actions
+
+        async with self.pool.acquire() as conn:
+            for action in actions:
+                if action.action == "create":
+                    logger.info(f"Creating HNSW index {action.index_name} ({action.chunk_count or 'all'} chunks)")
+                    where = f"WHERE project_id = '{action.project_id}'::uuid" if action.project_id else ""
+                    await conn.execute(
+                        f"""
+                        CREATE INDEX CONCURRENTLY IF NOT EXISTS {action.index_name}
+                        ON context_chunks USING hnsw ({self.spec.expression} {self.spec.opclass})
+                        WITH (m = 16, ef_construction = 64)
+                        {where}
+                        """
+                    )
+                else:
+                    logger.info(f"Dropping partial HNSW index {action.index_name}")
+                    await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {action.index_name}")
+                context_index_maintenance_actions_total.labels(action=action.action).inc()
+
+            total = await conn.fetchval(
+                "SELECT count(*) FROM pg_indexes WHERE tablename = 'context_chunks' AND indexname LIKE $1",
+                f"{PARTIAL_INDEX_PREFIX}%",
+            )
+        context_partial_indexes.set(total or 0)
+
+        # Strategies may have changed for any project touched above
+        await _strategy_cache.clear()
+        return actions
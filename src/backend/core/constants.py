@@ -36,6 +36,9 @@ DATA_FILES_PATH = PROJECT_ROOT / "data" / "files"
 #: Global templates directory
 TEMPLATES_PATH = PROJECT_ROOT / "templates"
 
+#: Content-addressed cache of document conversions, shared by all sessions
+CONVERSION_CACHE_PATH = PROJECT_ROOT / "data" / "conversions"
+
 # ============================================================================
 # Model Configuration - Single Source of Truth
 # ============================================================================
@@ -140,6 +143,107 @@ MAX_FILE_SIZE = 100 * 1024 * 1024
 #: enough results for typical search scenarios. Can be overridden per-call.
 DEFAULT_SEARCH_MAX_RESULTS = 100
 
+#: Block size in bytes for head/tail reads. Tail reads seek to the end of the
+#: file and read blocks backwards until enough lines are found, so a tail of a
+#: large log costs a few blocks rather than the whole file.
+TEXT_READ_BLOCK_SIZE = 64 * 1024
+
+#: Spacing in bytes between checkpoints of the line index used for
+#: offset/limit reads. A lookup scans at most one stride for newlines.
+LINE_INDEX_STRIDE = 64 * 1024
+
+#: Maximum number of files whose line index is kept in memory.
+LINE_INDEX_CACHE_SIZE = 128
+
+#: Default number of matching lines returned by grep_files, and the most a
+#: call may ask for.
+DEFAULT_GREP_MAX_RESULTS = 50
+MAX_GREP_RESULTS = 500
+
+#: Most context lines grep_files returns on each side of a match.
+MAX_GREP_CONTEXT_LINES = 10
+
+#: Matched and context lines longer than this are clipped in grep_files results.
+GREP_MAX_LINE_CHARS = 500
+
+#: Files visited per grep_files call; larger workspaces return truncated results.
+GREP_MAX_FILES = 10_000
+
+#: Files (or document conversions) up to this size get a trigram index entry.
+#: Larger text files are still searched, just without the index prefilter.
+CONTENT_INDEX_MAX_FILE_SIZE = 4 * 1024 * 1024
+
+#: Memory budget for the content index (trigram sets, least recently used
+#: evicted first) and how long an entry is kept without being searched.
+CONTENT_INDEX_MAX_BYTES = 128 * 1024 * 1024
+CONTENT_INDEX_TTL = 3600.0
+
+#: Connections per registered database for schema fetches. Pools (and the
+#: Salesforce session) are opened on first use and closed after sitting unused
+#: for SCHEMA_POOL_IDLE_TIMEOUT seconds.
+SCHEMA_POOL_MAX_SIZE = 4
+SCHEMA_POOL_IDLE_TIMEOUT = 300.0
+
+#: How long a fetched table schema is reused, and how many tables are kept.
+SCHEMA_CACHE_TTL = 600.0
+SCHEMA_CACHE_SIZE = 2048
+
+#: Most tables get_table_schemas fetches in one call.
+MAX_SCHEMA_BATCH_TABLES = 100
+
+#: Chunk size in bytes for downloads streamed from S3 when the local cache is
+#: cold. Each chunk is one read on a worker thread, so larger chunks mean fewer
+#: thread hops; local files go through sendfile/pathsend and are not chunked here.
+FILE_DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+#: Chunk size in bytes for streaming uploads to disk. Each chunk is written and
+#: hashed in one worker-thread call, bounding upload memory to one chunk.
+FILE_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+#: Maximum number of directory listings held by the in-memory file index.
+FILE_INDEX_MAX_DIRS = 4096
+
+#: Seconds a cached directory listing is trusted when no filesystem watcher is
+#: running. Writes through LocalFileService update the index immediately; this
+#: only bounds how long changes made behind its back (tools, S3 sync) go unseen.
+FILE_INDEX_TTL = 10.0
+
+#: Listing TTL while the watcher (inotify via watchfiles) invalidates changed
+#: directories; a safety net for dropped events only.
+FILE_INDEX_WATCHED_TTL = 600.0
+
+#: Concurrent object downloads when rehydrating a session's local cache from S3.
+S3_SYNC_CONCURRENCY = 8
+
+#: Hidden per-session file mapping each synced object (folder/filename) to the
+#: S3 ETag of its local copy, so rehydration spots remote changes from a single
+#: listing instead of comparing sizes or issuing a HEAD per object.
+S3_SYNC_MANIFEST = ".s3-manifest.json"
+
+#: Background S3 upload workers per process. Each worker runs one upload at a
+#: time; files over S3_UPLOAD_MULTIPART_THRESHOLD are sent as multipart uploads
+#: with S3_UPLOAD_PART_CONCURRENCY parts in flight.
+S3_UPLOAD_WORKERS = 4
+S3_UPLOAD_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+S3_UPLOAD_PART_SIZE = 8 * 1024 * 1024
+S3_UPLOAD_PART_CONCURRENCY = 2
+
+#: Attempts per upload before giving up, with exponential backoff (full jitter
+#: over the upper half) starting at the base delay and capped at the max delay.
+S3_UPLOAD_MAX_ATTEMPTS = 5
+S3_UPLOAD_RETRY_BASE_DELAY = 0.5
+S3_UPLOAD_RETRY_MAX_DELAY = 15.0
+
+#: Threads of the dedicated pool running blocking S3 calls (listing, transfers,
+#: health checks), so S3 never competes with the default executor. Sized for
+#: concurrent downloads and upload workers plus headroom for control calls.
+S3_IO_THREADS = S3_SYNC_CONCURRENCY + S3_UPLOAD_WORKERS + 4
+
+#: HTTP connections pooled by the shared S3 client (botocore defaults to 10).
+#: Covers every pool thread, multipart parts in flight and responses streamed
+#: to the browser by the download route, which hold a connection until done.
+S3_MAX_POOL_CONNECTIONS = S3_IO_THREADS + S3_UPLOAD_WORKERS * S3_UPLOAD_PART_CONCURRENCY + 32
+
 # ============================================================================
 # Logging Configuration
 # ============================================================================
@@ -238,6 +342,16 @@ CONVERTIBLE_EXTENSIONS = {
     ".webp",  # Images
 }
 
+#: Cached conversions are keyed by the file's SHA-256 plus the converter
+#: version (markitdown release, image-description model and this format
+#: number), so a document is converted once no matter how often, or from which
+#: session, it is read. Bump CONVERSION_CACHE_FORMAT to invalidate all entries.
+CONVERSION_CACHE_FORMAT = 1
+#: Size cap of CONVERSION_CACHE_PATH; least recently read entries go first.
+CONVERSION_CACHE_MAX_BYTES = 512 * 1024 * 1024
+#: Conversions running at once (each may call the LLM for embedded images).
+CONVERSION_CONCURRENCY = 2
+
 # ============================================================================
 # System Configuration
 # ============================================================================
@@ -387,6 +501,10 @@ MSG_TYPE_FUNCTION_ARGUMENTS_DELTA = "function_call_arguments_delta"
 #: Signals that function arguments JSON is complete and ready for execution.
 MSG_TYPE_FUNCTION_ARGUMENTS_DONE = "function_call_arguments_done"
 
+#: Message type for oversized document summarization progress (backend only, no frontend display yet).
+#: Carries the summary of each chunk as it completes, before the combined summary.
+MSG_TYPE_DOCUMENT_SUMMARY_PROGRESS = "document_summary_progress"
+
 #: Message type for reasoning text streaming delta (backend only, no frontend display yet).
 #: Contains incremental reasoning text chunks from reasoning models (GPT-5, O1, O3).
 MSG_TYPE_REASONING_DELTA = "reasoning_delta"
@@ -506,6 +624,19 @@ KEEP_LAST_N_MESSAGES = 2
 #: technical detail while keeping room for multiple sources
 DOCUMENT_SUMMARIZATION_THRESHOLD = 10000
 
+#: Documents longer than this many tokens are summarized map-reduce style:
+#: split into chunks of about this size on line boundaries, each chunk
+#: summarized concurrently (at most DOCUMENT_SUMMARY_CONCURRENCY at a time),
+#: then the chunk summaries are summarized together. Shorter documents take a
+#: single summarization call. Keeps every call well inside the model context.
+DOCUMENT_SUMMARY_CHUNK_TOKENS = 32000
+DOCUMENT_SUMMARY_CONCURRENCY = 4
+
+#: Summaries are cached by content hash and model, so re-reading an oversized
+#: document does not summarize it again.
+DOCUMENT_SUMMARY_CACHE_SIZE = 256
+DOCUMENT_SUMMARY_CACHE_TTL = 6 * 3600.0
+
 #: Per-message token overhead for message structure (role, metadata, formatting).
 #: Added to each message token count during conversation token calculation.
 #: Rationale: OpenAI API adds ~4 tokens for role field, ~3 for formatting,
@@ -556,6 +687,51 @@ MAX_CONVERSATION_TURNS = 100
 #: (messages, function args, results), so 128 provides 3-6x headroom.
 TOKEN_CACHE_SIZE = 128
 
+# ============================================================================
+# Project Context Search Configuration
+# ============================================================================
+
+#: Smoothing constant for reciprocal rank fusion (score = sum(1 / (k + rank))).
+#: Rationale: 60 is the value from the original RRF paper; it damps the
+#: influence of the very top ranks so neither retriever dominates the fusion.
+CONTEXT_SEARCH_RRF_K = 60
+
+#: Candidates fetched from each retriever (vector and full-text) per result.
+#: Hybrid search pulls top_k × this many candidates from each side before fusion,
+#: giving RRF and MMR enough overlap to work with while keeping scans bounded.
+CONTEXT_SEARCH_CANDIDATE_MULTIPLIER = 4
+
+#: Default MMR trade-off between relevance (1.0) and diversity (0.0).
+#: Used when callers enable MMR without an explicit lambda.
+CONTEXT_SEARCH_MMR_LAMBDA = 0.7
+
+#: Projects with fewer chunks than this are searched with an exact scan.
+#: Rationale: a sequential distance sort over a few thousand rows is cheaper and
+#: has perfect recall, whereas the shared HNSW graph may return too few rows
+#: for a small project once other tenants' neighbours are filtered out.
+CONTEXT_EXACT_SCAN_MAX_CHUNKS = 2000
+
+#: Projects with at least this many chunks get a dedicated partial HNSW index.
+#: Built by the vector index maintenance command, not on the request path.
+CONTEXT_PARTIAL_INDEX_MIN_CHUNKS = 50000
+
+#: Bounds for the per-query hnsw.ef_search setting.
+#: ef_search is scaled from the scan LIMIT (2 × candidates) within these bounds;
+#: 40 is pgvector's default and 400 keeps worst-case graph traversal bounded.
+HNSW_EF_SEARCH_MIN = 40
+HNSW_EF_SEARCH_MAX = 400
+
+#: Seconds a project's search strategy (exact / global / partial) is cached.
+CONTEXT_INDEX_STRATEGY_TTL = 300.0
+
+#: ANN candidates fetched per result when the index stores compact vectors.
+#: Candidates are re-ranked with the full-precision embedding, so oversampling
+#: recovers the recall lost to quantization. halfvec keeps ~3 significant
+#: digits and barely reorders neighbours; 1-bit binary quantization needs a
+#: much wider candidate pool to get comparable recall after re-ranking.
+CONTEXT_HALFVEC_OVERSAMPLE = 2
+CONTEXT_BINARY_OVERSAMPLE = 8
+
 # ============================================================================
 # Session Loading Pagination Configuration
 # ============================================================================
@@ -570,6 +746,59 @@ INITIAL_SESSION_CHUNK_SIZE = 50
 #: Value of 100 provides good throughput while staying well under buffer constraints.
 MAX_MESSAGES_PER_CHUNK = 100
 
+# ============================================================================
+# Cache Configuration
+# ============================================================================
+
+#: Postgres NOTIFY channel carrying cache invalidations between workers/replicas.
+CACHE_INVALIDATION_CHANNEL = "chatjuicer_cache"
+
+#: Seconds between reconnect attempts when the LISTEN connection drops.
+#: Every L1 cache is cleared after reconnecting (missed invalidations).
+CACHE_LISTENER_RECONNECT_DELAY = 5.0
+
+#: Seconds between sweeps of expired rows in the shared cache_entries table.
+CACHE_SHARED_PURGE_INTERVAL = 300.0
+
+#: Seconds between background sweeps of expired in-process cache entries.
+CACHE_SWEEP_INTERVAL = 30.0
+
+#: In-process memory caps (bytes of serialized payload) for the session caches.
+#: List pages are the large entries (up to 100 sessions each).
+CACHE_SESSION_MAX_BYTES = 4 * 1024 * 1024
+CACHE_SESSION_LIST_MAX_BYTES = 16 * 1024 * 1024
+
+# ============================================================================
+# Authentication Cache Configuration
+# ============================================================================
+
+#: Seconds an authenticated user (keyed by JWT sub + token version) stays cached.
+#: Short so profile changes show up quickly; revocation does not rely on it.
+AUTH_USER_CACHE_TTL = 30.0
+
+#: Maximum cached users per process.
+AUTH_USER_CACHE_MAX_SIZE = 5000
+
+#: Seconds between token denylist syncs from the database. Bounds how long a
+#: revocation made by another worker/replica takes to apply locally.
+AUTH_DENYLIST_SYNC_INTERVAL = 15.0
+
+# ============================================================================
+# Health Probe Configuration
+# ============================================================================
+
+#: Seconds between background probes of the database, MCP servers and S3.
+#: /health serves the latest probe results instead of checking inline, so
+#: load balancer polling never turns into MCP or S3 traffic.
+HEALTH_PROBE_INTERVAL = 15.0
+
+#: Seconds each dependency check may take before it counts as failed.
+HEALTH_PROBE_TIMEOUT = 5.0
+
+#: Probe results older than this are reported as stale (and the status as
+#: degraded): the prober should have refreshed them several times by then.
+HEALTH_PROBE_MAX_AGE = 4 * HEALTH_PROBE_INTERVAL
+
 # ============================================================================
 # Reasoning Effort Configuration
 # ============================================================================
@@ -802,6 +1031,25 @@ class Settings(BaseSettings):
     )
     mcp_acquire_timeout: float = Field(default=30.0, description="MCP server acquire timeout (seconds)")
 
+    # Vector search configuration
+    context_ann_storage: Literal["full", "halfvec", "binary"] = Field(
+        default="halfvec",
+        description=(
+            "Vector representation used by the context_chunks ANN index (full-precision re-ranking "
+            "always applies). Run 'make db-vector-indexes EXECUTE=1' after changing it"
+        ),
+    )
+
+    # Cache tiers (utils/cache.py, utils/shared_cache.py)
+    cache_shared_backend: Literal["none", "postgres"] = Field(
+        default="none",
+        description="Shared L2 cache tier behind the in-process L1 ('postgres' uses the UNLOGGED cache_entries table)",
+    )
+    cache_invalidation_enabled: bool = Field(
+        default=True,
+        description="Broadcast cache invalidations to other workers/replicas via Postgres LISTEN/NOTIFY",
+    )
+
     # Sandbox Pool configuration
     sandbox_pool_size: int = Field(default=3, description="Number of warm sandbox containers to pre-spawn")
     sandbox_acquire_timeout: float = Field(
@@ -847,6 +1095,22 @@ class Settings(BaseSettings):
         default=120,
         description="Regular API requests per minute per user",
     )
+    rate_limit_backend: Literal["local", "postgres"] = Field(
+        default="local",
+        description="Rate limit state: per-process ('local') or shared across replicas ('postgres')",
+    )
+
+    # Password hashing pool (bcrypt runs off the event loop)
+    password_hash_workers: int = Field(
+        default=2,
+        ge=1,
+        description="Threads hashing/verifying passwords concurrently",
+    )
+    password_hash_max_queue: int = Field(
+        default=16,
+        ge=0,
+        description="Password operations allowed to queue for a worker; auth requests are shed beyond this",
+    )
 
     # Request size limits
     max_request_body_size: int = Field(
@@ -903,6 +1167,10 @@ class Settings(BaseSettings):
     jwt_algorithm: str = Field(default="HS256", description="JWT signing algorithm")
     access_token_expires_minutes: int = Field(default=15, description="Access token lifetime (minutes)")
     refresh_token_expires_days: int = Field(default=7, description="Refresh token lifetime (days)")
+    auth_stateless_tokens: bool = Field(
+        default=False,
+        description="Trust user claims in access tokens and skip the users lookup (revocation via denylist only)",
+    )
     registration_invite_code: str | None = Field(
         default=None,
         description="Required invite code for registration (if set, registration is restricted)",
@@ -63,12 +63,14 @@ When reading multiple files, **ALWAYS** call read_file in parallel:
 
 **list_directory** - Explore directory structure and discover files
 **search_files** - Find files matching glob patterns (*.md, **/*.py, etc.) with recursive search
-**read_file** - Read files with automatic format conversion (PDF, Word, Excel, images, etc.), supports head/tail for partial reads. Note: File images are converted to text descriptions; for attached images you can see them directly without using this tool.
+**grep_files** - Search inside files (including converted PDFs and Word docs) for lines matching a regex, with optional context lines
+**read_file** - Read files with automatic format conversion (PDF, Word, Excel, images, etc.), supports head/tail for partial reads and offset/limit to page through large files. Note: File images are converted to text descriptions; for attached images you can see them directly without using this tool.
 **generate_document** - Create and save documents to output files
 **edit_file** - Make batch edits with git-style diff output and whitespace-flexible matching
 **execute_python_code** - Run Python code in a secure sandbox for data analysis, visualization, computation, advanced file operations, and more
 **list_registered_databases** - Discover configured database connections
 **get_table_schema** - Fetch column metadata for a database table, helpful for source/target mapping requests
+**get_table_schemas** - Fetch column metadata for several tables of one database in a single call
 {TOKEN_MCP_TOOLS}
 
 ## Workflow Guidance
@@ -81,6 +83,12 @@ Use **search_files** to quickly locate files by pattern:
 - Returns up to 100 results by default (configurable with max_results)
 - Use when you don't know where a file is located
 
+### When Finding Content:
+Use **grep_files** before reading whole documents:
+- Find which files mention a term and on which lines: `pattern="revenue"`, `ignore_case=true`
+- Add `context_lines` to see the surrounding text without reading the file
+- Then **read_file** with `offset` set to a match's line number and a small `limit`
+
 ### When Generating Documents:
 1. Use **search_files** to discover source files by pattern (e.g., `*.pdf`, `report_*.docx`)
 2. Read source files (in parallel when possible)
@@ -140,13 +148,13 @@ Use **execute_python_code** to run Python in a secure sandbox:
 - Keep code focused and efficient due to timeout limits
 
 ### When Doing Source/Target Mapping:
-Use **list_registered_databases** to discover available connections, then **get_table_schema** for each table involved in the mapping. Integration work often involves:
+Use **list_registered_databases** to discover available connections, then **get_table_schemas** with all tables involved in the mapping (or **get_table_schema** for a single table). Integration work often involves:
 - **One source → one target**: A single table or view feeding a denormalized fact table
 - **Multiple sources → one target**: Several tables feeding a denormalized fact table
 - **One source → multiple targets**: A source splitting into normalized dimension tables
 - **Transformations**: Concatenation, type conversion, lookups, calculations
 - **Code Interpreter**: Use the Code Interpreter tool to execute Python code to populate the mapping template
-- **Clarifying Questions**: If the **get_table_schema** tool doesn't return a schema, ask the user for clarification on the table name
+- **Clarifying Questions**: If a table comes back without columns or under `not_found`, ask the user for clarification on the table name
 
 {TOKEN_MCP_SEQUENTIAL_SECTION}
 
@@ -184,6 +192,23 @@ Write the summary as continuous prose. Keep it information-dense while preservin
 **CRITICAL**: The summary MUST be less than {tokens} tokens or you will FAIL!"""
 
 
+# Document Chunk Summarization Instructions (map step for oversized documents)
+# Use .format(part=..., parts=..., tokens=...) to inject the chunk position and token limit
+DOCUMENT_CHUNK_SUMMARIZATION_INSTRUCTIONS = """You are a document summarizer. You are given part {part} of {parts} of a document that is too long to summarize at once. Your summary will be combined with the summaries of the other parts.
+
+## PRIORITIZE:
+- Core technical concepts, decisions, requirements and constraints in this part
+- Names, numbers, definitions and references other parts may depend on
+
+## AVOID:
+- Introductions or conclusions about the document as a whole
+- Verbose explanations and redundant content
+
+Write the summary as continuous prose. Keep it information-dense while preserving technical accuracy.
+
+**CRITICAL**: The summary MUST be less than {tokens} tokens or you will FAIL!"""
+
+
 # Conversation Summarization System Instructions
 # Used as system prompt for one-shot summarization agent
 CONVERSATION_SUMMARIZATION_INSTRUCTIONS = """You are a conversation summarizer. Given conversation history, create a CONCISE but TECHNICALLY COMPLETE summary.
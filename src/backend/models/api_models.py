@@ -55,6 +55,7 @@ class FileReadResponse(BaseModel):
     file_path: str | None = None
     size: int | None = None
     format: str | None = None  # e.g., "text", "pdf", "docx"
+    total_lines: int | None = None  # Set for offset/limit reads, for paging
     error: str | None = None
 
     def to_json(self, indent: int = 2) -> str:
@@ -109,12 +110,42 @@ class SearchFilesResponse(BaseModel):
         return self.model_dump_json(exclude_none=True, indent=indent)
 
 
+class GrepMatch(BaseModel):
+    """One matching line returned by grep_files."""
+
+    file: str
+    line: int  # 1-based; usable as read_file offset
+    text: str
+    before: list[str] | None = None  # Context lines, when requested
+    after: list[str] | None = None
+
+
+class GrepFilesResponse(BaseModel):
+    """Response model for grep_files function."""
+
+    success: bool = True
+    pattern: str
+    base_path: str
+    matches: list[GrepMatch]
+    count: int
+    files_searched: int = 0
+    truncated: bool = False  # True if results limited by max_results or the file cap
+    unconverted: list[str] | None = None  # Documents not searchable until converted
+    error: str | None = None
+
+    def to_json(self, indent: int = 2) -> str:
+        """Convert to JSON string for function return."""
+        return self.model_dump_json(exclude_none=True, indent=indent)
+
+
 __all__ = [
     "DirectoryListResponse",
     "DocumentGenerateResponse",
     "FileInfo",
     "FileReadResponse",
     "FunctionResponse",
+    "GrepFilesResponse",
+    "GrepMatch",
     "SearchFilesResponse",
     "TextEditResponse",
 ]
@@ -235,6 +266,7 @@ class SessionWithHistoryResponse(BaseModel):
     full_history: list[MessageItem]
     files: list[FileInfo]
     has_more: bool
+    next_cursor: str | None = None
     loaded_count: int
     message_count: int
 
@@ -72,6 +72,7 @@ class ErrorCode(str, Enum):
     # Internal errors (9xxx)
     INTERNAL_ERROR = "INT_9001"
     INTERNAL_CONFIGURATION_ERROR = "INT_9002"
+    INTERNAL_OVERLOADED = "INT_9003"
     INTERNAL_UNEXPECTED = "INT_9999"
 
 
@@ -201,6 +202,7 @@ ERROR_CODE_TO_STATUS: dict[ErrorCode, int] = {
     ErrorCode.MCP_SERVER_ERROR: 502,
     # 503 Service Unavailable
     ErrorCode.EXTERNAL_TIMEOUT: 503,
+    ErrorCode.INTERNAL_OVERLOADED: 503,
     # 429 Too Many Requests
     ErrorCode.EXTERNAL_RATE_LIMITED: 429,
 }
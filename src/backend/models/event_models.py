@@ -10,6 +10,7 @@ from typing import Any, Literal
 from pydantic import BaseModel, Field, field_validator
 
 from core.constants import (
+    MSG_TYPE_DOCUMENT_SUMMARY_PROGRESS,
     MSG_TYPE_ERROR,
     MSG_TYPE_FUNCTION_COMPLETED,
     MSG_TYPE_FUNCTION_DETECTED,
@@ -189,6 +190,17 @@ class FunctionArgumentsDoneMessage(BaseModel):
         return json_str
 
 
+class DocumentSummaryProgress(BaseModel):
+    """Chunk summary of an oversized document being read (backend only, no frontend display yet)."""
+
+    type: Literal["document_summary_progress"] = MSG_TYPE_DOCUMENT_SUMMARY_PROGRESS
+    file_name: str
+    part: int  # 1-based chunk index
+    parts: int
+    completed: int  # Chunks summarized so far
+    summary: str
+
+
 class ReasoningDeltaMessage(BaseModel):
     """Reasoning text streaming for reasoning models (backend only, no frontend display yet)."""
 
@@ -11,6 +11,7 @@ This module provides:
 from models.error_models import ErrorDetail, ErrorResponse
 from models.schemas.auth import (
     LoginRequest,
+    LogoutRequest,
     RefreshRequest,
     TokenResponse,
     UserInfo,
@@ -68,6 +69,7 @@ __all__ = [
     "ModelConfigItem",
     "PaginatedResponse",
     "ReadinessResponse",
+    "LogoutRequest",
     "RefreshRequest",
     "SessionListResponse",
     "SessionResponse",
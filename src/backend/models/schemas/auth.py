@@ -96,6 +96,24 @@ class RefreshRequest(BaseModel):
     )
 
 
+class LogoutRequest(BaseModel):
+    """Logout request."""
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "refresh_token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...",
+            }
+        }
+    )
+
+    refresh_token: str | None = Field(
+        default=None,
+        description="Refresh token to revoke along with the access token",
+        json_schema_extra={"example": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."},
+    )
+
+
 class UserInfo(BaseModel):
     """Public user information."""
 
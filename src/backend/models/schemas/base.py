@@ -46,7 +46,7 @@ class APIMetadata(BaseModel):
 
 
 class PaginationMeta(BaseModel):
-    """Pagination metadata for list responses using offset/limit."""
+    """Pagination metadata for list responses (cursor or offset/limit)."""
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -54,7 +54,8 @@ class PaginationMeta(BaseModel):
                 "total_count": 42,
                 "offset": 0,
                 "limit": 50,
-                "has_more": False,
+                "has_more": True,
+                "next_cursor": "MjAyNS0wMS0xNVQxMDozMDowMCswMDowMHw1NTBlODQwMA",
             }
         }
     )
@@ -83,6 +84,11 @@ class PaginationMeta(BaseModel):
         description="Whether more items are available",
         json_schema_extra={"example": False},
     )
+    next_cursor: str | None = Field(
+        default=None,
+        description="Opaque cursor for the next page (null when there are no more items)",
+        json_schema_extra={"example": None},
+    )
 
 
 class APIResponse(BaseModel, Generic[T]):
@@ -117,6 +117,8 @@ class FileUploadResponse(BaseModel):
                 "modified": "2025-01-15T10:30:00Z",
                 "extension": ".pdf",
                 "path": "input/document.pdf",
+                "content_hash": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
+                "deduplicated": False,
             }
         }
     )
@@ -131,6 +133,11 @@ class FileUploadResponse(BaseModel):
         description="Relative path within session",
         json_schema_extra={"example": "input/document.pdf"},
     )
+    content_hash: str | None = Field(default=None, description="SHA-256 of the content (hex)")
+    deduplicated: bool = Field(
+        default=False,
+        description="True if identical content was already stored at this path (write and S3 upload skipped)",
+    )
 
 
 class FilePathResponse(BaseModel):
@@ -91,6 +91,42 @@ class S3Health(BaseModel):
     error: str | None = Field(default=None, description="Connectivity error")
 
 
+class CacheStats(BaseModel):
+    """In-process cache statistics (one entry per named cache)."""
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "size": 42,
+                "max_size": 500,
+                "bytes": 183000,
+                "max_bytes": 4194304,
+                "hits": 1200,
+                "misses": 80,
+                "hit_rate": "93.8%",
+                "evictions": 0,
+                "expired": 12,
+                "shared": False,
+                "coalesced": 3,
+                "shared_errors": 0,
+            }
+        }
+    )
+
+    size: int = Field(default=0, ge=0, description="Entries in the in-process tier")
+    max_size: int = Field(default=0, ge=0, description="Maximum in-process entries")
+    bytes: int = Field(default=0, ge=0, description="Estimated in-process payload bytes (tracked when capped)")
+    max_bytes: int | None = Field(default=None, description="In-process memory cap in bytes")
+    hits: int = Field(default=0, ge=0, description="In-process cache hits")
+    misses: int = Field(default=0, ge=0, description="In-process cache misses")
+    hit_rate: str = Field(default="0.0%", description="In-process hit rate")
+    evictions: int = Field(default=0, ge=0, description="Entries evicted by the size or memory cap")
+    expired: int = Field(default=0, ge=0, description="Entries removed after their TTL")
+    shared: bool = Field(default=False, description="Shared tier attached")
+    coalesced: int = Field(default=0, ge=0, description="Loads served by an in-flight load for the same key")
+    shared_errors: int = Field(default=0, ge=0, description="Shared tier failures treated as misses")
+
+
 class HealthResponse(BaseModel):
     """Comprehensive health check response."""
 
@@ -101,6 +137,9 @@ class HealthResponse(BaseModel):
                 "version": "1.0.0-local",
                 "uptime_seconds": 3600.5,
                 "startup_time": "2023-12-31T12:00:00Z",
+                "checked_at": "2024-01-01T12:00:00Z",
+                "check_age_seconds": 4.2,
+                "stale": False,
                 "database": {
                     "healthy": True,
                     "pool_size": 10,
@@ -123,6 +162,9 @@ class HealthResponse(BaseModel):
                     "bucket": "test-bucket",
                     "connected": True,
                 },
+                "caches": {
+                    "session": {"size": 42, "hits": 1200, "misses": 80, "hit_rate": "93.8%"},
+                },
             }
         }
     )
@@ -139,10 +181,16 @@ class HealthResponse(BaseModel):
     )
     uptime_seconds: float = Field(..., description="Seconds since startup")
     startup_time: str = Field(..., description="Startup timestamp (ISO 8601)")
+    checked_at: str | None = Field(
+        default=None, description="When database, MCP and S3 connectivity were last probed (ISO 8601)"
+    )
+    check_age_seconds: float | None = Field(default=None, ge=0, description="Seconds since the last probe")
+    stale: bool = Field(default=False, description="Probe results are older than expected (prober stalled)")
     database: DatabaseHealth = Field(..., description="Database health")
     websocket: WebSocketHealth = Field(..., description="WebSocket health")
     mcp: MCPHealth = Field(..., description="MCP server pool health")
     s3: S3Health | None = Field(default=None, description="S3 storage health")
+    caches: dict[str, CacheStats] = Field(default_factory=dict, description="Cache statistics by cache name")
 
 
 class ReadinessResponse(BaseModel):
@@ -380,6 +380,7 @@ class SessionWithHistoryResponse(BaseModel):
                 "messages": [{"id": "msg_1", "role": "user", "content": "Hello"}],
                 "files": [{"name": "doc.pdf", "type": "file", "size": 1024}],
                 "has_more": False,
+                "next_cursor": None,
                 "loaded_count": 50,
                 "message_count": 24,
             }
@@ -396,6 +397,10 @@ class SessionWithHistoryResponse(BaseModel):
         description="Session files",
     )
     has_more: bool = Field(default=False, description="More messages available")
+    next_cursor: str | None = Field(
+        default=None,
+        description="Cursor for loading older messages via GET /sessions/{session_id}/messages",
+    )
     loaded_count: int = Field(default=0, description="Number of messages loaded")
     message_count: int = Field(default=0, description="Total message count")
 
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Maintenance command for per-project partial HNSW indexes on context_chunks.
+
+Creates a dedicated partial HNSW index for every project at or above
+CONTEXT_PARTIAL_INDEX_MIN_CHUNKS, and drops partial indexes for projects that
+were deleted or shrank below half that size. Also builds the global index for
+the configured CONTEXT_ANN_STORAGE if it is missing (e.g. after switching to
+binary quantization). Indexes are built CONCURRENTLY,
+so it is safe to run against a live database (e.g. from cron).
+
+Usage (from src/backend):
+    # Dry run (show planned creates/drops)
+    python -m scripts.maintain_vector_indexes
+
+    # Apply changes
+    python -m scripts.maintain_vector_indexes --execute
+
+Requirements:
+    - DATABASE_URL environment variable or .env file (read via Settings)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+
+import asyncpg
+
+from api.services.vector_index_service import VectorIndexManager
+from core.constants import CONTEXT_PARTIAL_INDEX_MIN_CHUNKS, get_settings
+
+
+async def run_maintenance(execute: bool) -> None:
+    """Plan (and optionally apply) partial index changes."""
+    settings = get_settings()
+    # Single connection is enough; CONCURRENTLY builds run one at a time
+    pool = await asyncpg.create_pool(settings.database_url, min_size=1, max_size=1, command_timeout=None)
+    try:
+        manager = VectorIndexManager(pool)
+        actions = await manager.run_maintenance(dry_run=not execute)
+
+        if not actions:
+            print(f"No changes needed (partial index threshold: {CONTEXT_PARTIAL_INDEX_MIN_CHUNKS:,} chunks)")
+            return
+
+        for action in actions:
+            detail = f" ({action.chunk_count:,} chunks)" if action.action == "create" and action.project_id else ""
+            print(f"  {action.action.upper():<6} {action.index_name}{detail}")
+
+        if execute:
+            print(f"\n✓ Applied {len(actions)} index changes.")
+        else:
+            print("\n⚠ DRY RUN - No changes made. Run with --execute to apply changes.")
+    finally:
+        await pool.close()
+
+
+def main() -> None:
+    """Entry point."""
+    asyncio.run(run_maintenance(execute="--execute" in sys.argv))
+
+
+if __name__ == "__main__":
+    main()
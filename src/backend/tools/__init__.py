@@ -36,6 +36,7 @@ Available Tools:
 File Operations:
     - list_directory: Explore project structure with metadata (size, modified time)
     - search_files: Find files matching glob patterns with recursive search
+    - grep_files: Search file contents by regex, backed by a trigram index
     - read_file: Read any file format (auto-converts PDF, Word, Excel, HTML, etc.)
 
 Document Generation:
@@ -84,7 +85,7 @@ See Also:
 """
 
 from tools.document_generation import generate_document
-from tools.file_operations import list_directory, read_file, search_files
+from tools.file_operations import grep_files, list_directory, read_file, search_files
 from tools.registry import AGENT_TOOLS, FUNCTION_REGISTRY, TOOLS
 from tools.text_editing import edit_file
 
@@ -94,6 +95,7 @@ __all__ = [
     "TOOLS",
     "edit_file",
     "generate_document",
+    "grep_files",
     "list_directory",
     "read_file",
     "search_files",
@@ -1,7 +1,8 @@
 """
 Context search tool for project knowledge base.
 
-Provides semantic search over project context using embeddings.
+Provides hybrid (semantic + keyword) search over project context using
+embeddings and full-text matching.
 """
 
 from __future__ import annotations
@@ -16,8 +17,9 @@ async def search_project_context(
 ) -> str:
     """Search the current project's knowledge base for relevant context.
 
-    Uses semantic similarity to find related session summaries, messages,
-    and file content from the current project.
+    Combines semantic similarity with exact keyword matching to find related
+    session summaries, messages, and file content from the current project.
+    Exact terms such as IDs, error codes, and identifiers are matched directly.
 
     Args:
         query: Natural language search query describing what you're looking for
@@ -64,10 +66,11 @@ async def _search_project_context_impl(
     # Generate query embedding
     query_embedding = await embedding_service.embed_text(query)
 
-    # Search for matching chunks
+    # Hybrid search: vector similarity fused with full-text matches
     results = await context_service.search_chunks(
         project_id=project_uuid,
         query_embedding=query_embedding,
+        query_text=query,
         top_k=min(max(top_k, 1), 20),  # Clamp to 1-20
         score_threshold=max(0.0, min(min_score, 1.0)),  # Clamp to 0-1
     )
@@ -6,20 +6,26 @@ Provides directory listing and file reading capabilities.
 from __future__ import annotations
 
 import asyncio
+import re
 
+from itertools import islice
 from pathlib import Path
 
-import aiofiles
-
 from core.constants import (
     CONVERTIBLE_EXTENSIONS,
+    DEFAULT_GREP_MAX_RESULTS,
     DEFAULT_SEARCH_MAX_RESULTS,
     DOCUMENT_SUMMARIZATION_THRESHOLD,
     MAX_FILE_SIZE,
+    MAX_GREP_CONTEXT_LINES,
+    MAX_GREP_RESULTS,
 )
 from models.api_models import DirectoryListResponse, FileInfo, FileReadResponse
+from utils.content_index import get_content_index
+from utils.conversion_cache import get_conversion_cache
 from utils.document_processor import get_markitdown_converter, summarize_content
 from utils.file_utils import get_jail_relative_path, read_file_content, validate_directory_path, validate_file_path
+from utils.line_reader import read_head_lines, read_line_range, read_tail_lines
 from utils.logger import logger
 from utils.token_utils import count_tokens
 
@@ -45,6 +51,17 @@ def _create_file_info(file_path: Path) -> FileInfo:
     )
 
 
+def _glob_file_infos(base_dir: Path, pattern: str, recursive: bool, max_results: int) -> tuple[list[FileInfo], bool]:
+    """Glob up to ``max_results`` matches and build their FileInfo (worker thread).
+
+    Returns the matches and whether more were found than ``max_results``.
+    """
+    # Use rglob for recursive, glob for non-recursive
+    file_iter = base_dir.rglob(pattern) if recursive else base_dir.glob(pattern)
+    paths = list(islice(file_iter, max_results + 1))
+    return [_create_file_info(file_path) for file_path in paths[:max_results]], len(paths) > max_results
+
+
 def list_directory(path: str = ".", session_id: str | None = None, show_hidden: bool = False) -> str:
     """
     List contents of a directory for project discovery.
@@ -90,7 +107,9 @@ def list_directory(path: str = ".", session_id: str | None = None, show_hidden:
         )
 
         # Return validated response with jail-relative path
-        return DirectoryListResponse(success=True, path=get_jail_relative_path(target_path, session_id), items=items).to_json()  # type: ignore[no-any-return]
+        return DirectoryListResponse(
+            success=True, path=get_jail_relative_path(target_path, session_id), items=items
+        ).to_json()  # type: ignore[no-any-return]
 
     except Exception as e:
         return DirectoryListResponse(  # type: ignore[no-any-return]
@@ -131,20 +150,8 @@ async def search_files(
                 success=False, pattern=pattern, base_path=base_path, items=[], count=0, error=error
             ).to_json()
 
-        # Use rglob for recursive, glob for non-recursive
-        matches: list[FileInfo] = []
-        file_iter = base_dir.rglob(pattern) if recursive else base_dir.glob(pattern)
-
-        # Collect matches up to max_results
-        for file_path in file_iter:
-            if len(matches) >= max_results:
-                break
-
-            # Create FileInfo for each match
-            file_info = _create_file_info(file_path)
-            matches.append(file_info)
-
-        truncated = len(matches) >= max_results
+        # Walk and stat on a worker thread, stopping once max_results are found
+        matches, truncated = await asyncio.to_thread(_glob_file_infos, base_dir, pattern, recursive, max_results)
         count = len(matches)
 
         # Log search operation
@@ -171,11 +178,105 @@ async def search_files(
         ).to_json()
 
 
+async def grep_files(
+    pattern: str,
+    base_path: str = ".",
+    session_id: str | None = None,
+    glob: str = "*",
+    ignore_case: bool = False,
+    context_lines: int = 0,
+    max_results: int = DEFAULT_GREP_MAX_RESULTS,
+) -> str:
+    """
+    Search inside files for lines matching a regular expression.
+
+    Backed by the content index: files that cannot contain the pattern's
+    literal text are skipped without being read. Documents (PDF, Word, ...)
+    are searched through their cached markdown conversion.
+
+    Security: When session_id is provided, search restricted to session workspace.
+
+    Args:
+        pattern: Regular expression matched against each line (Python syntax)
+        base_path: Directory to start search (default: current directory)
+        session_id: Session ID for workspace isolation (enforces chroot jail)
+        glob: Only search files whose relative path matches (e.g., "*.md", "input/*")
+        ignore_case: Match case-insensitively (default: False)
+        context_lines: Lines of context before and after each match (max 10)
+        max_results: Maximum number of matching lines to return (default: 50, max 500)
+
+    Returns:
+        JSON string with GrepFilesResponse containing matching lines
+    """
+    from models.api_models import GrepFilesResponse, GrepMatch
+
+    try:
+        regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    except re.error as e:
+        return GrepFilesResponse(  # type: ignore[no-any-return]
+            success=False,
+            pattern=pattern,
+            base_path=base_path,
+            matches=[],
+            count=0,
+            error=f"Invalid regular expression: {e!s}",
+        ).to_json()
+
+    try:
+        base_dir, error = validate_directory_path(base_path, check_exists=True, session_id=session_id)
+        if error:
+            return GrepFilesResponse(  # type: ignore[no-any-return]
+                success=False, pattern=pattern, base_path=base_path, matches=[], count=0, error=error
+            ).to_json()
+
+        result = await get_content_index().search(
+            base_dir,
+            regex,
+            glob=glob or "*",
+            context_lines=min(max(context_lines, 0), MAX_GREP_CONTEXT_LINES),
+            max_results=min(max(max_results, 1), MAX_GREP_RESULTS),
+        )
+        matches = [
+            GrepMatch(
+                file=get_jail_relative_path(match.path, session_id),
+                line=match.line,
+                text=match.text,
+                before=match.before or None,
+                after=match.after or None,
+            )
+            for match in result.matches
+        ]
+
+        logger.info(
+            f"Grepped '{pattern}' in {base_dir.name}: {len(matches)} matches in {result.files_searched} files"
+            f"{' (truncated)' if result.truncated else ''}",
+            functions="grep_files",
+        )
+
+        return GrepFilesResponse(  # type: ignore[no-any-return]
+            success=True,
+            pattern=pattern,
+            base_path=get_jail_relative_path(base_dir, session_id),
+            matches=matches,
+            count=len(matches),
+            files_searched=result.files_searched,
+            truncated=result.truncated,
+            unconverted=[get_jail_relative_path(path, session_id) for path in result.unconverted] or None,
+        ).to_json()
+
+    except Exception as e:
+        return GrepFilesResponse(  # type: ignore[no-any-return]
+            success=False, pattern=pattern, base_path=base_path, matches=[], count=0, error=f"Search failed: {e!s}"
+        ).to_json()
+
+
 async def read_file(  # noqa: PLR0911
     file_path: str,
     session_id: str | None = None,
     head: int | None = None,
     tail: int | None = None,
+    offset: int | None = None,
+    limit: int | None = None,
     model: str | None = None,
 ) -> str:
     """
@@ -191,6 +292,8 @@ async def read_file(  # noqa: PLR0911
         session_id: Session ID for workspace isolation (enforces chroot jail)
         head: Read only first N lines (raw text only, skips conversion)
         tail: Read only last N lines (raw text only, skips conversion)
+        offset: Read starting at this 1-based line (takes precedence over head/tail)
+        limit: Read at most this many lines (from offset, or from line 1)
         model: Model to use for document summarization (uses conversation's model)
 
     Returns:
@@ -204,9 +307,11 @@ async def read_file(  # noqa: PLR0911
     try:
         extension = target_file.suffix.lower()
 
-        # Handle partial reads (head/tail)
-        if head is not None or tail is not None:
-            # For convertible files, convert first then apply head/tail
+        # Handle partial reads (offset/limit, head, tail)
+        if offset is not None or limit is not None or head is not None or tail is not None:
+            ranged = offset is not None or limit is not None
+            total_lines = None
+            # For convertible files, convert first (cached) then slice the lines
             if extension in CONVERTIBLE_EXTENSIONS:
                 markitdown_converter = get_markitdown_converter()
                 if markitdown_converter is None:
@@ -216,34 +321,30 @@ async def read_file(  # noqa: PLR0911
                         error=f"MarkItDown is required for reading {extension} files. Install with: pip install markitdown",
                     ).to_json()
                 try:
-                    # Run sync conversion in thread to avoid blocking event loop
-                    result = await asyncio.to_thread(markitdown_converter.convert, str(target_file))
-                    all_lines = result.text_content.splitlines(keepends=True)
-                    if head is not None:
-                        content = "".join(all_lines[:head])
+                    converted = await get_conversion_cache().convert(markitdown_converter, target_file)
+                    all_lines = converted.splitlines(keepends=True)
+                    if ranged:
+                        first = max(offset or 1, 1) - 1
+                        content = "".join(all_lines[first : None if limit is None else first + max(limit, 0)])
+                        total_lines = len(all_lines)
+                    elif head is not None:
+                        content = "".join(all_lines[: max(head, 0)])
                     elif tail is not None:
-                        content = "".join(all_lines[-tail:] if len(all_lines) > tail else all_lines)
+                        content = "".join(all_lines[-tail:] if tail > 0 else [])
                     file_format = f"converted {extension} (partial)"
                 except Exception as e:
                     return FileReadResponse(  # type: ignore[no-any-return]
                         success=False, file_path=file_path, error=f"Conversion failed: {e!s}"
                     ).to_json()
             else:
-                # Text files: read directly
+                # Text files: read only the blocks that hold the requested lines
                 try:
-                    async with aiofiles.open(target_file, encoding="utf-8") as f:
-                        if head is not None:
-                            # Read first N lines
-                            lines = []
-                            async for line in f:
-                                lines.append(line)
-                                if len(lines) >= head:
-                                    break
-                            content = "".join(lines)
-                        elif tail is not None:
-                            # Read last N lines (read all, take last N)
-                            all_lines = await f.readlines()
-                            content = "".join(all_lines[-tail:] if len(all_lines) > tail else all_lines)
+                    if ranged:
+                        content, total_lines = await asyncio.to_thread(read_line_range, target_file, offset or 1, limit)
+                    elif head is not None:
+                        content = await asyncio.to_thread(read_head_lines, target_file, head)
+                    elif tail is not None:
+                        content = await asyncio.to_thread(read_tail_lines, target_file, tail)
                     file_format = "text (partial)"
                 except UnicodeDecodeError:
                     return FileReadResponse(  # type: ignore[no-any-return]
@@ -254,13 +355,17 @@ async def read_file(  # noqa: PLR0911
                         success=False, file_path=file_path, error=f"Failed to read file: {e!s}"
                     ).to_json()
 
-            # Token counting for partial read
+            # Token counting for partial read (the returned lines only)
             token_count = count_tokens(content)
             exact_tokens = token_count["exact_tokens"]
             file_size = target_file.stat().st_size
 
+            if ranged:
+                mode = f"offset={offset or 1}, limit={limit}"
+            else:
+                mode = f"head={head}" if head is not None else f"tail={tail}"
             logger.info(
-                f"Partial read {target_file.name} ({'head' if head else 'tail'}={head or tail}): "
+                f"Partial read {target_file.name} ({mode}): "
                 f"{len(content)} chars, {len(content.splitlines())} lines, {exact_tokens} tokens",
                 tokens=exact_tokens,
                 functions="read_file",
@@ -273,6 +378,7 @@ async def read_file(  # noqa: PLR0911
                 file_path=get_jail_relative_path(target_file, session_id),
                 size=file_size,
                 format=file_format,
+                total_lines=total_lines,
             ).to_json()
 
         # Full read with optional conversion
@@ -290,10 +396,9 @@ async def read_file(  # noqa: PLR0911
                     error=f"MarkItDown is required for reading {extension} files. Install with: pip install markitdown",
                 ).to_json()
             try:
-                # Run sync conversion in thread to avoid blocking event loop
-                # (important for image-heavy documents where LLM describes each image)
-                conversion_result = await asyncio.to_thread(markitdown_converter.convert, str(target_file))
-                content = conversion_result.text_content
+                # Cached by content hash; a miss converts on a worker thread
+                # (slow for image-heavy documents where the LLM describes each image)
+                content = await get_conversion_cache().convert(markitdown_converter, target_file)
                 conversion_method = "markitdown"
 
                 # Check if conversion actually produced content
@@ -10,8 +10,8 @@ from typing import Any
 
 from tools.code_interpreter import execute_python_code
 from tools.document_generation import generate_document
-from tools.file_operations import list_directory, read_file, search_files
-from tools.schema_fetch import get_table_schema, list_registered_databases
+from tools.file_operations import grep_files, list_directory, read_file, search_files
+from tools.schema_fetch import get_table_schema, get_table_schemas, list_registered_databases
 from tools.text_editing import edit_file
 
 # Agent/Runner tools - wrap functions with function_tool decorator
@@ -36,22 +36,26 @@ def initialize_tools() -> tuple[list[Any], dict[str, Callable[..., str] | Callab
         list_directory_tool = function_tool(list_directory)
         read_file_tool = function_tool(read_file)
         search_files_tool = function_tool(search_files)
+        grep_files_tool = function_tool(grep_files)
         generate_document_tool = function_tool(generate_document)
         edit_file_tool = function_tool(edit_file)
         execute_python_code_tool = function_tool(execute_python_code)
         list_registered_databases_tool = function_tool(list_registered_databases)
         get_table_schema_tool = function_tool(get_table_schema)
+        get_table_schemas_tool = function_tool(get_table_schemas)
 
         # List of tools for Agent
         agent_tools = [
             list_directory_tool,
             read_file_tool,
             search_files_tool,
+            grep_files_tool,
             generate_document_tool,
             edit_file_tool,
             execute_python_code_tool,
             list_registered_databases_tool,
             get_table_schema_tool,
+            get_table_schemas_tool,
         ]
 
         # Function registry for direct execution
@@ -59,11 +63,13 @@ def initialize_tools() -> tuple[list[Any], dict[str, Callable[..., str] | Callab
             "list_directory": list_directory,
             "read_file": read_file,
             "search_files": search_files,
+            "grep_files": grep_files,
             "generate_document": generate_document,
             "edit_file": edit_file,
             "execute_python_code": execute_python_code,
             "list_registered_databases": list_registered_databases,
             "get_table_schema": get_table_schema,
+            "get_table_schemas": get_table_schemas,
         }
 
         return agent_tools, function_registry
@@ -100,7 +106,7 @@ TOOLS: list[dict[str, Any]] = [
     {
         "type": "function",
         "name": "read_file",
-        "description": "Read any file to view its contents. Automatically converts PDFs, Word docs, Excel sheets, and other formats to text. Use this before editing or analyzing documents. Read multiple files in parallel for efficiency. Protected with 100MB size limit. Supports partial reads with head/tail for previewing large files.",
+        "description": "Read any file to view its contents. Automatically converts PDFs, Word docs, Excel sheets, and other formats to text. Use this before editing or analyzing documents. Read multiple files in parallel for efficiency. Protected with 100MB size limit. Supports partial reads with head/tail for previewing large files and offset/limit for paging through them.",
         "parameters": {
             "type": "object",
             "properties": {
@@ -116,6 +122,14 @@ TOOLS: list[dict[str, Any]] = [
                     "type": "integer",
                     "description": "Read only last N lines (raw text only, skips format conversion). Useful for checking file endings or logs.",
                 },
+                "offset": {
+                    "type": "integer",
+                    "description": "Start reading at this 1-based line number. Combine with limit to page through large files; the response includes total_lines.",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of lines to read, starting at offset (or line 1).",
+                },
             },
             "required": ["file_path"],
         },
@@ -147,6 +161,41 @@ TOOLS: list[dict[str, Any]] = [
             "required": ["pattern"],
         },
     },
+    {
+        "type": "function",
+        "name": "grep_files",
+        "description": "Search inside files for lines matching a regular expression, without reading whole files into context. Searches text files and converted documents (PDF, Word, ...). Returns file paths, line numbers (usable as read_file offset) and optional context lines. Returns up to 50 matches by default.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "pattern": {
+                    "type": "string",
+                    "description": "Regular expression matched against each line (Python syntax). Examples: 'revenue', 'ERR-\\d+', '^## '",
+                },
+                "base_path": {
+                    "type": "string",
+                    "description": "Directory to start search from. Default is current directory ('.'). Examples: 'input/', 'output/'",
+                },
+                "glob": {
+                    "type": "string",
+                    "description": "Only search files whose path matches this glob - default is '*' (all files). Examples: '*.md', 'input/*.pdf'",
+                },
+                "ignore_case": {
+                    "type": "boolean",
+                    "description": "Match case-insensitively - default is false.",
+                },
+                "context_lines": {
+                    "type": "integer",
+                    "description": "Lines of context to include before and after each match - default is 0, max 10.",
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of matching lines to return - default is 50, max 500.",
+                },
+            },
+            "required": ["pattern"],
+        },
+    },
     {
         "type": "function",
         "name": "generate_document",
@@ -266,6 +315,26 @@ For documents, save to /workspace/filename.docx (NOT /output/).""",
             "required": ["db_name", "table_name"],
         },
     },
+    {
+        "type": "function",
+        "name": "get_table_schemas",
+        "description": "Fetch column schemas for several tables of one database in a single query. Prefer this over repeated get_table_schema calls when a mapping involves several tables. Tables that do not exist are listed under not_found.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "db_name": {
+                    "type": "string",
+                    "description": "Database name from registry (e.g., 'sales_db'). Use list_registered_databases to see available names.",
+                },
+                "table_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Table names to fetch schemas for (e.g., ['customers', 'orders']), up to 100",
+                },
+            },
+            "required": ["db_name", "table_names"],
+        },
+    },
     {
         "type": "function",
         "name": "search_project_context",
@@ -4,25 +4,39 @@ Schema Fetch Tools for Chat Juicer.
 Provides database schema discovery and fetching capabilities:
 - list_registered_databases(): Discover configured databases
 - get_table_schema(): Fetch column metadata for a table
+- get_table_schemas(): Fetch column metadata for several tables in one query
 
 Uses a unified information_schema query that works across PostgreSQL, MySQL, and SQL Server.
+Connections come from per-database pools opened on first use and closed when idle,
+and fetched schemas are cached for SCHEMA_CACHE_TTL seconds.
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import json
 import os
 import re
 import threading
+import time
 
-from collections.abc import Awaitable, Callable
-from dataclasses import asdict, dataclass
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any
 
 import yaml  # type: ignore[import-untyped]
 
+from core.constants import (
+    MAX_SCHEMA_BATCH_TABLES,
+    SCHEMA_CACHE_SIZE,
+    SCHEMA_CACHE_TTL,
+    SCHEMA_POOL_IDLE_TIMEOUT,
+    SCHEMA_POOL_MAX_SIZE,
+)
+from utils.cache import TTLCache
 from utils.logger import logger
 
 # Type mappings for normalization across databases
@@ -181,6 +195,7 @@ class DatabaseRegistry:
         """Force reload the registry from disk."""
         self._loaded = False
         self._databases.clear()
+        _schema_cache.evict(None)
         self.load()
 
 
@@ -204,108 +219,163 @@ def normalize_type(
     return normalized
 
 
-async def _fetch_postgres_schema(config: DatabaseConfig, table_name: str) -> list[ColumnInfo]:
-    """Fetch schema from PostgreSQL database."""
+# ============================================
+# CONNECTION POOLS
+# ============================================
+# Opens a pool (or client) for a database: returns the handle and a coroutine
+# function that closes it
+PoolOpener = Callable[[DatabaseConfig, int], Awaitable[tuple[Any, Callable[[], Awaitable[None]]]]]
+
+
+@dataclass
+class _Pool:
+    config: DatabaseConfig
+    handle: Any
+    close: Callable[[], Awaitable[None]]
+    last_used: float = field(default_factory=time.monotonic)
+    leases: int = 0
+    # Replaced or discarded; closed once the last lease is released
+    retired: bool = False
+
+
+class ConnectionPools:
+    """Connection pools for registered databases, one per database name.
+
+    Pools are opened on first use and closed by a background task once unused
+    for ``idle_timeout`` seconds. A pool is reopened when the registry entry
+    it was opened with changes. Replaced or discarded pools stay usable by
+    callers that still lease them and close when the last lease is released.
+    """
+
+    def __init__(self, max_size: int = SCHEMA_POOL_MAX_SIZE, idle_timeout: float = SCHEMA_POOL_IDLE_TIMEOUT):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._pools: dict[str, _Pool] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._idle_checker_task: asyncio.Task[None] | None = None
+
+    @asynccontextmanager
+    async def lease(self, config: DatabaseConfig, opener: PoolOpener) -> AsyncIterator[Any]:
+        """Use the pool of ``config``'s database, opening it with ``opener`` if needed."""
+        entry = self._pools.get(config.name)
+        if entry is None or entry.config != config:
+            entry = await self._open(config, opener)
+        entry.leases += 1
+        try:
+            yield entry.handle
+        finally:
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+            if entry.retired and entry.leases == 0:
+                await self._close(config.name, entry)
+
+    async def _open(self, config: DatabaseConfig, opener: PoolOpener) -> _Pool:
+        async with self._locks.setdefault(config.name, asyncio.Lock()):
+            entry = self._pools.get(config.name)
+            if entry is not None and entry.config == config:
+                return entry  # Opened while waiting for the lock
+            handle, close = await opener(config, self.max_size)
+            new_entry = self._pools[config.name] = _Pool(config, handle, close)
+            if entry is not None:
+                await self._retire(config.name, entry)
+            if self._idle_checker_task is None or self._idle_checker_task.done():
+                self._idle_checker_task = asyncio.create_task(self._close_idle_pools())
+            return new_entry
+
+    async def discard(self, name: str, handle: Any = None) -> None:
+        """Stop handing out the pool of a database, e.g. after its session expired.
+
+        With ``handle``, only discards the pool if it is still that one (another
+        caller may already have replaced it). The pool closes once unleased.
+        """
+        entry = self._pools.get(name)
+        if entry is None or (handle is not None and entry.handle is not handle):
+            return
+        del self._pools[name]
+        await self._retire(name, entry)
+
+    async def _retire(self, name: str, entry: _Pool) -> None:
+        entry.retired = True
+        if entry.leases == 0:
+            await self._close(name, entry)
+
+    @staticmethod
+    async def _close(name: str, entry: _Pool) -> None:
+        try:
+            await entry.close()
+        except Exception as e:
+            logger.warning(f"Failed to close connection pool for {name}: {type(e).__name__}")
+
+    async def _close_idle_pools(self) -> None:
+        """Periodically close pools unused for longer than idle_timeout; exits once none are open."""
+        check_interval = min(60.0, self.idle_timeout / 2)
+        while self._pools:
+            await asyncio.sleep(check_interval)
+            now = time.monotonic()
+            for name, entry in list(self._pools.items()):
+                if entry.leases == 0 and now - entry.last_used > self.idle_timeout:
+                    logger.info(f"Closing idle connection pool for {name}")
+                    await self.discard(name)
+
+    async def close_all(self) -> None:
+        """Close every pool and stop the idle checker (shutdown)."""
+        if self._idle_checker_task:
+            self._idle_checker_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._idle_checker_task
+            self._idle_checker_task = None
+        for name in list(self._pools):
+            await self.discard(name)
+
+    def open_databases(self) -> list[str]:
+        """Names of databases with an open pool."""
+        return list(self._pools)
+
+
+_connection_pools = ConnectionPools()
+
+
+def get_connection_pools() -> ConnectionPools:
+    """Get the process-wide schema fetch connection pools."""
+    return _connection_pools
+
+
+async def _open_postgres_pool(config: DatabaseConfig, max_size: int) -> tuple[Any, Callable[[], Awaitable[None]]]:
     import asyncpg
 
-    conn = await asyncpg.connect(
+    pool = await asyncpg.create_pool(
         host=config.host,
         port=config.port,
         database=config.database,
         user=config.username,
         password=config.password,
+        min_size=0,
+        max_size=max_size,
     )
+    return pool, pool.close
 
-    try:
-        rows = await conn.fetch(
-            """
-            SELECT
-                column_name,
-                data_type,
-                character_maximum_length,
-                numeric_precision,
-                numeric_scale,
-                is_nullable
-            FROM information_schema.columns
-            WHERE table_name = $1 AND table_schema = $2
-            ORDER BY ordinal_position
-            """,
-            table_name,
-            config.schema,
-        )
-
-        return [
-            ColumnInfo(
-                name=row["column_name"],
-                type=normalize_type(
-                    row["data_type"],
-                    row["character_maximum_length"],
-                    row["numeric_precision"],
-                    row["numeric_scale"],
-                ),
-                nullable=row["is_nullable"].upper() == "YES",
-            )
-            for row in rows
-        ]
-    finally:
-        await conn.close()
 
-
-async def _fetch_mysql_schema(config: DatabaseConfig, table_name: str) -> list[ColumnInfo]:
-    """Fetch schema from MySQL database."""
+async def _open_mysql_pool(config: DatabaseConfig, max_size: int) -> tuple[Any, Callable[[], Awaitable[None]]]:
     import aiomysql
 
-    conn = await aiomysql.connect(
+    pool = await aiomysql.create_pool(
         host=config.host,
         port=config.port,
         db=config.database,
         user=config.username,
         password=config.password,
+        minsize=0,
+        maxsize=max_size,
     )
 
-    try:
-        async with conn.cursor(aiomysql.DictCursor) as cursor:
-            await cursor.execute(
-                """
-                SELECT
-                    COLUMN_NAME,
-                    DATA_TYPE,
-                    CHARACTER_MAXIMUM_LENGTH,
-                    NUMERIC_PRECISION,
-                    NUMERIC_SCALE,
-                    IS_NULLABLE
-                FROM information_schema.columns
-                WHERE table_name = %s AND table_schema = %s
-                ORDER BY ordinal_position
-                """,
-                (table_name, config.database),
-            )
-            rows = await cursor.fetchall()
+    async def close() -> None:
+        pool.close()
+        await pool.wait_closed()
 
-            result = []
-            for row in rows:
-                # MySQL DictCursor may return keys as uppercase or lowercase depending on version
-                col_name = row.get("COLUMN_NAME") or row.get("column_name", "")
-                data_type = row.get("DATA_TYPE") or row.get("data_type", "")
-                max_len = row.get("CHARACTER_MAXIMUM_LENGTH") or row.get("character_maximum_length")
-                precision = row.get("NUMERIC_PRECISION") or row.get("numeric_precision")
-                scale = row.get("NUMERIC_SCALE") or row.get("numeric_scale")
-                nullable = row.get("IS_NULLABLE") or row.get("is_nullable", "")
-
-                result.append(
-                    ColumnInfo(
-                        name=col_name,
-                        type=normalize_type(data_type, max_len, precision, scale),
-                        nullable=nullable.upper() == "YES",
-                    )
-                )
-            return result
-    finally:
-        conn.close()
+    return pool, close
 
 
-async def _fetch_sqlserver_schema(config: DatabaseConfig, table_name: str) -> list[ColumnInfo]:
-    """Fetch schema from SQL Server database."""
+async def _open_sqlserver_pool(config: DatabaseConfig, max_size: int) -> tuple[Any, Callable[[], Awaitable[None]]]:
     import aioodbc
 
     driver = config.driver or "ODBC Driver 18 for SQL Server"
@@ -317,14 +387,65 @@ async def _fetch_sqlserver_schema(config: DatabaseConfig, table_name: str) -> li
         f"PWD={config.password};"
         "TrustServerCertificate=yes;"
     )
+    pool = await aioodbc.create_pool(dsn=connection_string, minsize=0, maxsize=max_size)
 
-    conn = await aioodbc.connect(dsn=connection_string)
+    async def close() -> None:
+        pool.close()
+        await pool.wait_closed()
 
-    try:
-        cursor = await conn.cursor()
-        await cursor.execute(
+    return pool, close
+
+
+async def _open_salesforce_client(config: DatabaseConfig, max_size: int) -> tuple[Any, Callable[[], Awaitable[None]]]:
+    """Log in once; the client's session is reused until it expires or sits idle."""
+    from simple_salesforce import Salesforce  # type: ignore[attr-defined]
+
+    # Blocking login, run in thread
+    sf = await asyncio.to_thread(
+        Salesforce,
+        username=config.username,
+        password=config.password,
+        security_token=config.security_token or "",
+        domain=config.domain,
+    )
+
+    async def close() -> None:
+        await asyncio.to_thread(sf.session.close)
+
+    return sf, close
+
+
+# ============================================
+# SCHEMA FETCHERS
+# ============================================
+
+
+def _group_by_table(columns: Iterable[tuple[str, ColumnInfo]], table_names: list[str]) -> dict[str, list[ColumnInfo]]:
+    """Group fetched columns under the requested table names.
+
+    Names are matched exactly, then case-insensitively (MySQL and SQL Server
+    usually compare table names case-insensitively). Tables without columns
+    were not found and are left out.
+    """
+    found: dict[str, list[ColumnInfo]] = {}
+    for table, column in columns:
+        found.setdefault(table, []).append(column)
+    folded = {name.casefold(): name for name in found}
+    result: dict[str, list[ColumnInfo]] = {}
+    for name in table_names:
+        key = name if name in found else folded.get(name.casefold())
+        if key is not None:
+            result[name] = found[key]
+    return result
+
+
+async def _fetch_postgres_schemas(config: DatabaseConfig, table_names: list[str]) -> dict[str, list[ColumnInfo]]:
+    """Fetch schemas of several tables from PostgreSQL in one query."""
+    async with _connection_pools.lease(config, _open_postgres_pool) as pool:
+        rows = await pool.fetch(
             """
             SELECT
+                table_name,
                 column_name,
                 data_type,
                 character_maximum_length,
@@ -332,18 +453,121 @@ async def _fetch_sqlserver_schema(config: DatabaseConfig, table_name: str) -> li
                 numeric_scale,
                 is_nullable
             FROM information_schema.columns
-            WHERE table_name = ? AND table_schema = ?
-            ORDER BY ordinal_position
+            WHERE table_name = ANY($1::text[]) AND table_schema = $2
+            ORDER BY table_name, ordinal_position
+            """,
+            table_names,
+            config.schema,
+        )
+
+    return _group_by_table(
+        (
+            (
+                row["table_name"],
+                ColumnInfo(
+                    name=row["column_name"],
+                    type=normalize_type(
+                        row["data_type"],
+                        row["character_maximum_length"],
+                        row["numeric_precision"],
+                        row["numeric_scale"],
+                    ),
+                    nullable=row["is_nullable"].upper() == "YES",
+                ),
+            )
+            for row in rows
+        ),
+        table_names,
+    )
+
+
+async def _fetch_mysql_schemas(config: DatabaseConfig, table_names: list[str]) -> dict[str, list[ColumnInfo]]:
+    """Fetch schemas of several tables from MySQL in one query."""
+    import aiomysql
+
+    placeholders = ", ".join(["%s"] * len(table_names))
+    async with (
+        _connection_pools.lease(config, _open_mysql_pool) as pool,
+        pool.acquire() as conn,
+        conn.cursor(aiomysql.DictCursor) as cursor,
+    ):
+        # Only placeholders are interpolated into the query
+        await cursor.execute(
+            f"""
+            SELECT
+                TABLE_NAME,
+                COLUMN_NAME,
+                DATA_TYPE,
+                CHARACTER_MAXIMUM_LENGTH,
+                NUMERIC_PRECISION,
+                NUMERIC_SCALE,
+                IS_NULLABLE
+            FROM information_schema.columns
+            WHERE table_name IN ({placeholders}) AND table_schema = %s
+            ORDER BY table_name, ordinal_position
             """,
-            (table_name, config.schema),
+            (*table_names, config.database),
         )
         rows = await cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
 
-        result = []
-        for row in rows:
-            row_dict = dict(zip(columns, row, strict=True))
-            result.append(
+    result = []
+    for row in rows:
+        # MySQL DictCursor may return keys as uppercase or lowercase depending on version
+        table = row.get("TABLE_NAME") or row.get("table_name", "")
+        col_name = row.get("COLUMN_NAME") or row.get("column_name", "")
+        data_type = row.get("DATA_TYPE") or row.get("data_type", "")
+        max_len = row.get("CHARACTER_MAXIMUM_LENGTH") or row.get("character_maximum_length")
+        precision = row.get("NUMERIC_PRECISION") or row.get("numeric_precision")
+        scale = row.get("NUMERIC_SCALE") or row.get("numeric_scale")
+        nullable = row.get("IS_NULLABLE") or row.get("is_nullable", "")
+
+        result.append(
+            (
+                table,
+                ColumnInfo(
+                    name=col_name,
+                    type=normalize_type(data_type, max_len, precision, scale),
+                    nullable=nullable.upper() == "YES",
+                ),
+            )
+        )
+    return _group_by_table(result, table_names)
+
+
+async def _fetch_sqlserver_schemas(config: DatabaseConfig, table_names: list[str]) -> dict[str, list[ColumnInfo]]:
+    """Fetch schemas of several tables from SQL Server in one query."""
+    placeholders = ", ".join(["?"] * len(table_names))
+    async with _connection_pools.lease(config, _open_sqlserver_pool) as pool, pool.acquire() as conn:
+        cursor = await conn.cursor()
+        try:
+            # Only placeholders are interpolated into the query
+            await cursor.execute(
+                f"""
+                SELECT
+                    table_name,
+                    column_name,
+                    data_type,
+                    character_maximum_length,
+                    numeric_precision,
+                    numeric_scale,
+                    is_nullable
+                FROM information_schema.columns
+                WHERE table_name IN ({placeholders}) AND table_schema = ?
+                ORDER BY table_name, ordinal_position
+                """,
+                (*table_names, config.schema),
+            )
+            rows = await cursor.fetchall()
+            columns = [desc[0] for desc in cursor.description]
+        finally:
+            await cursor.close()
+
+    result = []
+    for row in rows:
+        row_dict = dict(zip(columns, row, strict=True))
+        result.append(
+            (
+                row_dict["table_name"],
                 ColumnInfo(
                     name=row_dict["column_name"],
                     type=normalize_type(
@@ -353,59 +577,102 @@ async def _fetch_sqlserver_schema(config: DatabaseConfig, table_name: str) -> li
                         row_dict.get("numeric_scale"),
                     ),
                     nullable=row_dict["is_nullable"].upper() == "YES",
-                )
+                ),
             )
-        return result
-    finally:
-        await conn.close()
+        )
+    return _group_by_table(result, table_names)
+
+
+async def _describe_sobjects(config: DatabaseConfig, table_names: list[str]) -> dict[str, list[ColumnInfo]]:
+    from simple_salesforce.exceptions import SalesforceExpiredSession, SalesforceResourceNotFound
+
+    semaphore = asyncio.Semaphore(_connection_pools.max_size)
+
+    async with _connection_pools.lease(config, _open_salesforce_client) as sf:
+
+        async def describe(name: str) -> dict[str, Any] | None:
+            async with semaphore:
+                try:
+                    # SObject names are case-insensitive but API returns proper casing
+                    return await asyncio.to_thread(sf.restful, f"sobjects/{name}/describe")  # type: ignore[no-any-return]
+                except SalesforceResourceNotFound:
+                    return None
+
+        try:
+            descriptions = await asyncio.gather(*(describe(name) for name in table_names))
+        except SalesforceExpiredSession:
+            # Closed once concurrent callers still using this session are done
+            await _connection_pools.discard(config.name, sf)
+            raise
+
+    return {
+        name: [
+            ColumnInfo(
+                name=sobject_field["name"],
+                type=sobject_field["type"],  # valid: string, picklist, currency, reference, etc.
+                nullable=sobject_field["nillable"],
+            )
+            for sobject_field in desc["fields"]
+        ]
+        for name, desc in zip(table_names, descriptions, strict=True)
+        if desc is not None
+    }
 
 
-async def _fetch_salesforce_schema(config: DatabaseConfig, table_name: str) -> list[ColumnInfo]:
-    """Fetch schema for a Salesforce object (SObject)."""
+async def _fetch_salesforce_schemas(config: DatabaseConfig, table_names: list[str]) -> dict[str, list[ColumnInfo]]:
+    """Fetch fields of Salesforce objects (SObjects), one describe call each on a shared session."""
     try:
-        from simple_salesforce import Salesforce  # type: ignore[attr-defined]
+        from simple_salesforce.exceptions import SalesforceExpiredSession
     except ImportError as err:
         raise ImportError("simple-salesforce package is required for Salesforce connections") from err
 
-    # Connect to Salesforce (blocking call, run in thread)
-    def connect_and_describe() -> dict[str, Any]:
-        sf = Salesforce(
-            username=config.username,
-            password=config.password,
-            security_token=config.security_token or "",
-            domain=config.domain,
-        )
-        # SObject names are case-insensitive but API returns proper casing
-        return sf.restful(f"sobjects/{table_name}/describe")  # type: ignore
-
-    # Run blocking I/O in thread
-    loop = asyncio.get_running_loop()
-    desc = await loop.run_in_executor(None, connect_and_describe)
-
-    return [
-        ColumnInfo(
-            name=field["name"],
-            type=field["type"],  # valid: string, picklist, currency, reference, etc.
-            nullable=field["nillable"],
-        )
-        for field in desc["fields"]
-    ]
+    try:
+        return await _describe_sobjects(config, table_names)
+    except SalesforceExpiredSession:
+        # Session timed out server-side (and was discarded): log in again once
+        return await _describe_sobjects(config, table_names)
 
 
 # ============================================
 # SCHEMA FETCHER REGISTRY
 # ============================================
-# Maps database type names to their async fetcher functions.
-# To add a new database type, implement a fetcher and register it here.
-SchemaFetcher = Callable[[DatabaseConfig, str], Awaitable[list[ColumnInfo]]]
+# Maps database type names to their async fetcher functions. A fetcher returns
+# the columns of each requested table that exists, fetched in as few round
+# trips as the database allows. To add a new database type, implement a
+# fetcher (and a PoolOpener for its connections) and register it here.
+SchemaFetcher = Callable[[DatabaseConfig, list[str]], Awaitable[dict[str, list[ColumnInfo]]]]
 
 SCHEMA_FETCHERS: dict[str, SchemaFetcher] = {
-    "postgresql": _fetch_postgres_schema,
-    "mysql": _fetch_mysql_schema,
-    "sqlserver": _fetch_sqlserver_schema,
-    "salesforce": _fetch_salesforce_schema,
+    "postgresql": _fetch_postgres_schemas,
+    "mysql": _fetch_mysql_schemas,
+    "sqlserver": _fetch_sqlserver_schemas,
+    "salesforce": _fetch_salesforce_schemas,
 }
 
+# Fetched schemas by database, schema and table. Emptied when the registry is reset.
+_schema_cache = TTLCache(max_size=SCHEMA_CACHE_SIZE, default_ttl=SCHEMA_CACHE_TTL)
+
+
+async def _fetch_schemas(
+    config: DatabaseConfig, fetcher: SchemaFetcher, table_names: list[str]
+) -> dict[str, list[ColumnInfo]]:
+    """Columns of each existing table, from the schema cache or one fetch for the rest."""
+    result: dict[str, list[ColumnInfo]] = {}
+    missing: list[str] = []
+    for name in table_names:
+        columns = _schema_cache.get_sync(f"{config.name}:{config.schema}:{name}")
+        if columns is None:
+            missing.append(name)
+        else:
+            result[name] = columns
+    if missing:
+        fetched = await fetcher(config, missing)
+        for name, columns in fetched.items():
+            # Tables that were not found are not cached: they may be created next
+            _schema_cache.set_sync(f"{config.name}:{config.schema}:{name}", columns)
+        result.update(fetched)
+    return result
+
 
 # Thread-safe global registry singleton (using dict to avoid 'global' statement)
 _registry_lock = threading.Lock()
@@ -422,9 +689,10 @@ def get_registry() -> DatabaseRegistry:
 
 
 def reset_registry() -> None:
-    """Reset the registry singleton (for testing or config reload)."""
+    """Reset the registry singleton and the schema cache (for testing or config reload)."""
     with _registry_lock:
         _registry_holder.pop("instance", None)
+    _schema_cache.evict(None)
 
 
 async def list_registered_databases() -> str:
@@ -465,10 +733,46 @@ async def list_registered_databases() -> str:
         )
 
 
+def _resolve_database(db_name: str) -> tuple[DatabaseConfig, SchemaFetcher] | dict[str, Any]:
+    """Registry entry and fetcher for a database, or the error response if unavailable."""
+    registry = get_registry()
+    config = registry.get_database(db_name)
+
+    if config is None:
+        return {
+            "success": False,
+            "error": f"Database '{db_name}' not found in registry",
+            "available_databases": registry.get_available_names(),
+        }
+
+    # Fetch schema using handler registry
+    fetcher = SCHEMA_FETCHERS.get(config.type)
+    if not fetcher:
+        return {
+            "success": False,
+            "error": f"Unsupported database type: {config.type}",
+            "supported_types": list(SCHEMA_FETCHERS.keys()),
+        }
+    return config, fetcher
+
+
+def _missing_driver_error(e: ImportError) -> str:
+    missing = str(e).split("'")[-2] if "'" in str(e) else str(e)
+    return json.dumps(
+        {
+            "success": False,
+            "error": f"Missing database driver: {missing}. Install with pip.",
+        }
+    )
+
+
 async def get_table_schema(db_name: str, table_name: str) -> str:
     """
     Fetch column schema for a database table.
 
+    Schemas are cached for a few minutes, and connections to each database are
+    pooled, so repeated lookups do not reconnect.
+
     Args:
         db_name: Database name from registry (e.g., "sales_db")
         table_name: Table name to fetch schema for
@@ -479,31 +783,13 @@ async def get_table_schema(db_name: str, table_name: str) -> str:
                   "columns": [{"name": "id", "type": "integer", "nullable": false}]}
     """
     try:
-        registry = get_registry()
-        config = registry.get_database(db_name)
-
-        if config is None:
-            available = registry.get_available_names()
-            return json.dumps(
-                {
-                    "success": False,
-                    "error": f"Database '{db_name}' not found in registry",
-                    "available_databases": available,
-                }
-            )
-
-        # Fetch schema using handler registry
-        fetcher = SCHEMA_FETCHERS.get(config.type)
-        if not fetcher:
-            return json.dumps(
-                {
-                    "success": False,
-                    "error": f"Unsupported database type: {config.type}",
-                    "supported_types": list(SCHEMA_FETCHERS.keys()),
-                }
-            )
+        resolved = _resolve_database(db_name)
+        if isinstance(resolved, dict):
+            return json.dumps(resolved)
+        config, fetcher = resolved
 
-        columns = await fetcher(config, table_name)
+        schemas = await _fetch_schemas(config, fetcher, [table_name])
+        columns = schemas.get(table_name, [])
 
         return json.dumps(
             {
@@ -518,20 +804,78 @@ async def get_table_schema(db_name: str, table_name: str) -> str:
 
     except ImportError as e:
         # Missing database driver
-        missing = str(e).split("'")[-2] if "'" in str(e) else str(e)
+        return _missing_driver_error(e)
+    except Exception as e:
+        logger.error(f"Failed to fetch schema for {db_name}.{table_name}: {type(e).__name__}")
+        return json.dumps(
+            {
+                "success": False,
+                "error": f"Failed to fetch schema: {type(e).__name__}: {e!s}",
+                "database": db_name,
+                "table": table_name,
+            }
+        )
+
+
+async def get_table_schemas(db_name: str, table_names: list[str]) -> str:
+    """
+    Fetch column schemas for several tables of one database in a single query.
+
+    Args:
+        db_name: Database name from registry (e.g., "sales_db")
+        table_names: Table names to fetch schemas for (at most MAX_SCHEMA_BATCH_TABLES)
+
+    Returns:
+        JSON string with column metadata per table and the tables that were not found.
+        Example: {"success": true, "database": "sales_db", "tables": [{"table": "users",
+                  "columns": [...], "column_count": 3}], "not_found": ["userz"]}
+    """
+    table_names = list(dict.fromkeys(name for name in table_names if name))
+    if not table_names:
+        return json.dumps({"success": False, "error": "No table names provided"})
+    if len(table_names) > MAX_SCHEMA_BATCH_TABLES:
         return json.dumps(
             {
                 "success": False,
-                "error": f"Missing database driver: {missing}. Install with pip.",
+                "error": f"Too many tables: {len(table_names)} (max {MAX_SCHEMA_BATCH_TABLES} per call)",
+            }
+        )
+
+    try:
+        resolved = _resolve_database(db_name)
+        if isinstance(resolved, dict):
+            return json.dumps(resolved)
+        config, fetcher = resolved
+
+        schemas = await _fetch_schemas(config, fetcher, table_names)
+
+        return json.dumps(
+            {
+                "success": True,
+                "database": db_name,
+                "schema": config.schema,
+                "tables": [
+                    {
+                        "table": name,
+                        "columns": [asdict(col) for col in schemas[name]],
+                        "column_count": len(schemas[name]),
+                    }
+                    for name in table_names
+                    if name in schemas
+                ],
+                "not_found": [name for name in table_names if name not in schemas],
             }
         )
+
+    except ImportError as e:
+        return _missing_driver_error(e)
     except Exception as e:
-        logger.error(f"Failed to fetch schema for {db_name}.{table_name}: {type(e).__name__}")
+        logger.error(f"Failed to fetch schemas for {db_name} ({len(table_names)} tables): {type(e).__name__}")
         return json.dumps(
             {
                 "success": False,
-                "error": f"Failed to fetch schema: {type(e).__name__}: {e!s}",
+                "error": f"Failed to fetch schemas: {type(e).__name__}: {e!s}",
                 "database": db_name,
-                "table": table_name,
+                "tables": table_names,
             }
         )
@@ -6,7 +6,10 @@ Provides unified file editing with diff preview and batch operations.
 from __future__ import annotations
 
 import difflib
+import re
 
+from bisect import bisect_right
+from itertools import accumulate, pairwise
 from typing import Any
 
 from pydantic import BaseModel
@@ -70,6 +73,82 @@ def normalize_whitespace_for_matching(text: str) -> str:
     return "\n".join(normalized_lines)
 
 
+class WhitespaceIndex:
+    """Whitespace-normalized view of a text with a map back to original offsets.
+
+    Normalizes every line as ``normalize_whitespace_for_matching`` does and
+    keeps the start of each line in both texts, so building the index costs
+    one split and join per line. A normalized position maps back to the original
+    by bisecting the line starts and walking the tokens of that one line;
+    a collapsed whitespace run maps to its first character.
+
+    Build one per file version and reuse it for every edit that needs
+    whitespace-flexible matching.
+    """
+
+    _TOKENS = re.compile(r"\S+")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        lines = text.split("\n")
+        normalized_lines = [" ".join(line.split()) for line in lines]
+        self.normalized = "\n".join(normalized_lines)
+        self._line_starts = list(accumulate((len(line) + 1 for line in lines), initial=0))
+        self._normalized_starts = list(accumulate((len(line) + 1 for line in normalized_lines), initial=0))
+
+    def original_offset(self, pos: int) -> int:
+        """Map a position in ``normalized`` to the corresponding position in ``text``."""
+        line = bisect_right(self._normalized_starts, pos) - 1
+        line_end = self._line_starts[line + 1] - 1
+        if self.normalized[pos : pos + 1] in ("", "\n"):
+            return line_end  # Trailing whitespace belongs before the line break
+        col = pos - self._normalized_starts[line]
+        for match in self._TOKENS.finditer(self.text, self._line_starts[line], line_end):
+            width = match.end() - match.start()
+            if col < width:
+                return match.start() + col
+            if col == width:
+                return match.end()  # First character of the collapsed whitespace run
+            col -= width + 1
+        return line_end
+
+    def find(self, search_text: str) -> tuple[int, int] | None:
+        """Return the original ``(start, end)`` span of the first flexible match, or None."""
+        needle = normalize_whitespace_for_matching(search_text)
+        if not needle.strip():
+            return None
+        idx = self.normalized.find(needle)
+        if idx == -1:
+            return None
+        start = self.original_offset(idx)
+        end = self.original_offset(idx + len(needle) - 1) + 1
+        # An indented search line replaces the whole original indentation,
+        # so the replacement's own indentation is not added to it
+        if search_text[:1] in (" ", "\t") and (idx == 0 or self.normalized[idx - 1] == "\n"):
+            start = self.text.rfind("\n", 0, start) + 1
+        return start, end
+
+
+def find_text_span(content: str, search_text: str, index: WhitespaceIndex | None = None) -> tuple[int, int] | None:
+    """Find the span of ``search_text`` in ``content`` with whitespace-flexible matching.
+
+    Tries an exact match first, then the normalized match through ``index``
+    (built from ``content`` if not given).
+
+    Args:
+        content: Full file content to search in
+        search_text: Text to find
+        index: WhitespaceIndex of ``content``, to reuse across searches
+
+    Returns:
+        ``(start, end)`` of the matched text in ``content``, or None if not found
+    """
+    idx = content.find(search_text)
+    if idx != -1:
+        return idx, idx + len(search_text)
+    return (index or WhitespaceIndex(content)).find(search_text)
+
+
 def find_text_with_flexible_whitespace(content: str, search_text: str) -> int:
     """Find text in content with whitespace-flexible matching.
 
@@ -83,27 +162,51 @@ def find_text_with_flexible_whitespace(content: str, search_text: str) -> int:
     Returns:
         Index of match, or -1 if not found
     """
-    # Try exact match first
-    idx = content.find(search_text)
-    if idx != -1:
-        return idx
+    span = find_text_span(content, search_text)
+    return -1 if span is None else span[0]
 
-    # Try whitespace-flexible matching
-    normalized_content = normalize_whitespace_for_matching(content)
-    normalized_search = normalize_whitespace_for_matching(search_text)
 
-    idx = normalized_content.find(normalized_search)
-    if idx != -1:
-        # Map normalized position back to original position
-        # Count characters in original up to this point
-        char_count = 0
-        for i, char in enumerate(content):
-            if char_count == idx:
-                return i
-            if not char.isspace() or char == "\n":
-                char_count += 1
+def plan_edits(content: str, edits: list[EditOperation]) -> list[tuple[int, int, str]] | None:
+    """Locate every edit in the original content for a single-pass rewrite.
+
+    Exact matches are found directly; the WhitespaceIndex is built at most
+    once, for the edits that need flexible matching.
 
-    return -1
+    Returns:
+        ``(start, end, newText)`` spans sorted by position, or None if an edit
+        is not found in the original content or edits overlap (apply them
+        sequentially instead)
+    """
+    index: WhitespaceIndex | None = None
+    spans: list[tuple[int, int, str]] = []
+    for edit in edits:
+        idx = content.find(edit.oldText)
+        if idx != -1:
+            span: tuple[int, int] | None = (idx, idx + len(edit.oldText))
+        else:
+            if index is None:
+                index = WhitespaceIndex(content)
+            span = index.find(edit.oldText)
+        if span is None:
+            return None
+        spans.append((span[0], span[1], edit.newText))
+
+    spans.sort(key=lambda s: s[0])
+    if any(cur[0] < prev[1] for prev, cur in pairwise(spans)):
+        return None
+    return spans
+
+
+def apply_spans(content: str, spans: list[tuple[int, int, str]]) -> str:
+    """Rewrite ``content`` with sorted, non-overlapping ``(start, end, newText)`` spans in one join."""
+    parts: list[str] = []
+    pos = 0
+    for start, end, new_text in spans:
+        parts.append(content[pos:start])
+        parts.append(new_text)
+        pos = end
+    parts.append(content[pos:])
+    return "".join(parts)
 
 
 def generate_diff(original_content: str, new_content: str, file_path: str) -> str:
@@ -131,6 +234,121 @@ def generate_diff(original_content: str, new_content: str, file_path: str) -> st
     return "\n".join(diff)
 
 
+#: Characters str.splitlines() treats as line boundaries
+_LINE_BREAKS = frozenset("\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a unified diff line range the way difflib does."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def generate_diff_from_spans(
+    original_content: str, spans: list[tuple[int, int, str]], file_path: str, context: int = 3
+) -> str:
+    """Generate the git-style diff of applying ``spans`` without diffing whole files.
+
+    Only the lines each edit touches are compared (edits on the same lines are
+    grouped, unchanged leading/trailing lines become context), so the cost
+    follows the size of the edits rather than the file. Hunks are merged like
+    difflib's when fewer than ``2 * context`` unchanged lines separate them.
+
+    Args:
+        original_content: Original file content
+        spans: Sorted, non-overlapping ``(start, end, newText)`` edits (see plan_edits)
+        file_path: Path to file (for diff headers)
+        context: Unchanged lines shown around each change
+
+    Returns:
+        Unified diff string
+    """
+    line_starts = list(accumulate((len(line) for line in original_content.splitlines(keepends=True)), initial=0))
+    old_lines = original_content.splitlines()
+
+    def line_of(offset: int) -> int:
+        return bisect_right(line_starts, offset) - 1
+
+    # (first old line, removed lines, added lines)
+    changes: list[tuple[int, list[str], list[str]]] = []
+    i = 0
+    while i < len(spans):
+        first = line_of(spans[i][0])
+        stop = first + 1
+        j = i
+        while True:
+            # Take in every edit that starts on the block's lines
+            while j < len(spans) and line_of(spans[j][0]) < stop:
+                stop = max(stop, line_of(spans[j][1] - 1) + 1)
+                j += 1
+            pieces = [original_content[line_starts[first] : spans[i][0]]]
+            for k in range(i, j):
+                pieces.append(spans[k][2])
+                pieces.append(original_content[spans[k][1] : spans[k + 1][0] if k + 1 < j else line_starts[stop]])
+            block = "".join(pieces)
+            # An edit that removed a line break joins the next line into the block
+            if stop >= len(old_lines) or not block or block[-1] in _LINE_BREAKS:
+                break
+            stop += 1
+        removed = old_lines[first:stop]
+        added = block.splitlines()
+
+        head = 0
+        while head < min(len(removed), len(added)) and removed[head] == added[head]:
+            head += 1
+        tail = 0
+        while tail < min(len(removed), len(added)) - head and removed[-1 - tail] == added[-1 - tail]:
+            tail += 1
+        removed = removed[head : len(removed) - tail]
+        added = added[head : len(added) - tail]
+        if not removed and not added:
+            pass
+        elif changes and changes[-1][0] + len(changes[-1][1]) == first + head:
+            # Directly follows the previous change: one block, as difflib shows it
+            at, prev_removed, prev_added = changes[-1]
+            changes[-1] = (at, prev_removed + removed, prev_added + added)
+        else:
+            changes.append((first + head, removed, added))
+        i = j
+
+    if not changes:
+        return ""
+
+    output = [f"--- a/{file_path}", f"+++ b/{file_path}"]
+    offset = 0  # New line number minus old line number before the current hunk
+    k = 0
+    while k < len(changes):
+        m = k
+        while m + 1 < len(changes) and changes[m + 1][0] - (changes[m][0] + len(changes[m][1])) <= 2 * context:
+            m += 1
+        hunk_start = max(changes[k][0] - context, 0)
+        hunk_stop = min(changes[m][0] + len(changes[m][1]) + context, len(old_lines))
+
+        body: list[str] = []
+        pos = hunk_start
+        growth = 0
+        for at, removed, added in changes[k : m + 1]:
+            body.extend(" " + line for line in old_lines[pos:at])
+            body.extend("-" + line for line in removed)
+            body.extend("+" + line for line in added)
+            pos = at + len(removed)
+            growth += len(added) - len(removed)
+        body.extend(" " + line for line in old_lines[pos:hunk_stop])
+
+        new_start = hunk_start + offset
+        new_stop = hunk_stop + offset + growth
+        output.append(f"@@ -{_format_range(hunk_start, hunk_stop)} +{_format_range(new_start, new_stop)} @@")
+        output.extend(body)
+        offset += growth
+        k = m + 1
+    return "\n".join(output)
+
+
 async def edit_file(
     file_path: str,
     edits: list[EditOperation],
@@ -153,7 +371,9 @@ async def edit_file(
     - Batch multiple edits in one operation
     - Git-style diff output for verification
     - Whitespace-flexible matching (tries exact first, then normalized)
-    - Sequential edit processing (each edit sees previous edit's result)
+    - Edits are located in the original file and applied in one rewrite; if an
+      edit only matches after earlier edits (or edits overlap), they are
+      processed sequentially, each edit seeing the previous edit's result
     - Smart output/ prepending for workflow consistency
 
     Args:
@@ -181,34 +401,31 @@ async def edit_file(
         if not edits_list:
             return None, {"error": "No edits provided"}
 
-        # Store original content for diff
-        original_content = content
-        current_content = content
-        changes_made = 0
-
-        # Apply edits sequentially
         for i, edit in enumerate(edits_list):
-            old_text = edit.oldText
-            new_text = edit.newText
-
-            if not old_text:
+            if not edit.oldText:
                 return None, {"error": f"Edit {i + 1}: oldText cannot be empty"}
 
-            # Find text with flexible whitespace matching
-            idx = find_text_with_flexible_whitespace(current_content, old_text)
-
-            if idx == -1:
-                return None, {
-                    "error": f"Edit {i + 1}: oldText not found",
-                    "oldText": old_text[:100] + "..." if len(old_text) > 100 else old_text,
-                }
-
-            # Replace the text
-            current_content = current_content[:idx] + new_text + current_content[idx + len(old_text) :]
-            changes_made += 1
-
-        # Generate diff (use original file_path for clearer diff headers)
-        diff_output = generate_diff(original_content, current_content, file_path)
+        # Locate all edits in the original and rewrite the file once
+        spans = plan_edits(content, edits_list)
+        if spans is not None:
+            current_content = apply_spans(content, spans)
+            diff_output = generate_diff_from_spans(content, spans, file_path)
+        else:
+            # An edit only matches after earlier edits, or edits overlap:
+            # apply sequentially, each edit seeing the previous result
+            current_content = content
+            for i, edit in enumerate(edits_list):
+                span = find_text_span(current_content, edit.oldText)
+                if span is None:
+                    old_text = edit.oldText
+                    return None, {
+                        "error": f"Edit {i + 1}: oldText not found",
+                        "oldText": old_text[:100] + "..." if len(old_text) > 100 else old_text,
+                    }
+                current_content = current_content[: span[0]] + edit.newText + current_content[span[1] :]
+            # Use original file_path for clearer diff headers
+            diff_output = generate_diff(content, current_content, file_path)
+        changes_made = len(edits_list)
 
         # Return new content to be written
         return current_content, {
@@ -31,9 +31,10 @@ if TYPE_CHECKING:
 from tools.code_interpreter import execute_python_code
 from tools.context_search import _search_project_context_impl
 from tools.document_generation import generate_document
-from tools.file_operations import list_directory, read_file, search_files
-from tools.schema_fetch import get_table_schema, list_registered_databases
+from tools.file_operations import grep_files, list_directory, read_file, search_files
+from tools.schema_fetch import get_table_schema, get_table_schemas, list_registered_databases
 from tools.text_editing import EditOperation, edit_file, resolve_edit_path
+from utils.document_processor import ProgressCallback, summary_progress
 from utils.logger import logger
 
 
@@ -43,6 +44,7 @@ def create_session_aware_tools(
     s3_sync: S3SyncService | None = None,
     pool: asyncpg.Pool | None = None,
     project_id: str | None = None,
+    on_progress: ProgressCallback | None = None,
 ) -> list[Any]:
     """Create tool wrappers that automatically inject session_id and model for workspace isolation.
 
@@ -55,6 +57,8 @@ def create_session_aware_tools(
         s3_sync: Optional S3 sync service for cloud file persistence
         pool: Database pool for context search (optional)
         project_id: Project ID for context search scope (optional)
+        on_progress: Async callback for tool progress events, e.g. chunk summaries
+            of oversized documents read with read_file (optional)
 
     Returns:
         List of Agent-compatible tool wrappers with session_id and model injection
@@ -114,7 +118,13 @@ def create_session_aware_tools(
     logger.info(f"Creating session-aware tools for session: {session_id}, model: {model}")
 
     # File Operations - Read-only tools with session_id injection
-    def wrapped_list_directory(path: str = ".", show_hidden: bool = False) -> str:
+    async def hydrate_tree(path: str) -> None:
+        """Download pending S3 files under ``path`` so filesystem tools see them."""
+        if s3_sync:
+            await s3_sync.wait_for_rehydration(session_id)
+            await s3_sync.hydrate_all(session_id, path)
+
+    async def wrapped_list_directory(path: str = ".", show_hidden: bool = False) -> str:
         """List contents of a directory within session workspace.
 
         Args:
@@ -124,6 +134,7 @@ def create_session_aware_tools(
         Returns:
             JSON with directory contents and metadata
         """
+        await hydrate_tree(path)
         start_time = time.perf_counter()
         status = "success"
         try:
@@ -137,18 +148,40 @@ def create_session_aware_tools(
             mcp_tool_call_duration_seconds.labels(tool_name="list_directory").observe(duration)
 
     @track_tool_execution("read_file")
-    async def wrapped_read_file(file_path: str, head: int | None = None, tail: int | None = None) -> str:
+    async def wrapped_read_file(
+        file_path: str,
+        head: int | None = None,
+        tail: int | None = None,
+        offset: int | None = None,
+        limit: int | None = None,
+    ) -> str:
         """Read file contents with automatic format conversion.
 
         Args:
             file_path: Path to file relative to session workspace
             head: Read only first N lines (optional)
             tail: Read only last N lines (optional)
+            offset: Start reading at this 1-based line number (optional)
+            limit: Maximum number of lines to read (optional)
 
         Returns:
             JSON with file contents and metadata
         """
-        return await read_file(file_path=file_path, session_id=session_id, head=head, tail=tail, model=model)  # type: ignore[no-any-return]
+        if s3_sync:
+            await s3_sync.hydrate(session_id, file_path)
+        token = summary_progress.set(on_progress)
+        try:
+            return await read_file(  # type: ignore[no-any-return]
+                file_path=file_path,
+                session_id=session_id,
+                head=head,
+                tail=tail,
+                offset=offset,
+                limit=limit,
+                model=model,
+            )
+        finally:
+            summary_progress.reset(token)
 
     @track_tool_execution("search_files")
     async def wrapped_search_files(
@@ -168,6 +201,7 @@ def create_session_aware_tools(
         Returns:
             JSON with matching files and metadata
         """
+        await hydrate_tree(base_path)
         return await search_files(  # type: ignore[no-any-return]
             pattern=pattern,
             base_path=base_path,
@@ -176,6 +210,39 @@ def create_session_aware_tools(
             max_results=max_results,
         )
 
+    @track_tool_execution("grep_files")
+    async def wrapped_grep_files(
+        pattern: str,
+        base_path: str = ".",
+        glob: str = "*",
+        ignore_case: bool = False,
+        context_lines: int = 0,
+        max_results: int = 50,
+    ) -> str:
+        """Search inside files for lines matching a regular expression.
+
+        Args:
+            pattern: Regular expression matched against each line (e.g., "revenue", "def \\w+_test")
+            base_path: Directory to start search (default: ".")
+            glob: Only search files whose path matches (e.g., "*.md", "input/*")
+            ignore_case: Match case-insensitively (default: False)
+            context_lines: Lines of context before and after each match (max 10)
+            max_results: Maximum number of matching lines (default: 50, max 500)
+
+        Returns:
+            JSON with matching lines, their file paths and line numbers
+        """
+        await hydrate_tree(base_path)
+        return await grep_files(  # type: ignore[no-any-return]
+            pattern=pattern,
+            base_path=base_path,
+            session_id=session_id,
+            glob=glob,
+            ignore_case=ignore_case,
+            context_lines=context_lines,
+            max_results=max_results,
+        )
+
     # Text Editing - Unified editing tool with session_id injection
     @track_tool_execution("edit_file")
     async def wrapped_edit_file(
@@ -191,6 +258,8 @@ def create_session_aware_tools(
         Returns:
             JSON with diff output and edit summary
         """
+        if s3_sync:
+            await s3_sync.hydrate(session_id, resolve_edit_path(file_path))
         result = await edit_file(
             file_path=file_path,
             edits=edits,
@@ -284,6 +353,8 @@ def create_session_aware_tools(
         Returns:
             JSON with stdout, files generated, and execution metadata
         """
+        # The sandbox gets a copy of the whole workspace
+        await hydrate_tree(".")
         result = await execute_python_code(code=code, session_id=session_id)
 
         # Trigger S3 sync for generated files
@@ -332,6 +403,23 @@ def create_session_aware_tools(
         """
         return await get_table_schema(db_name=db_name, table_name=table_name)  # type: ignore[no-any-return]
 
+    @track_tool_execution("get_table_schemas")
+    async def wrapped_get_table_schemas(db_name: str, table_names: list[str]) -> str:
+        """Fetch column schemas for several tables of one database in a single call.
+
+        Prefer this over repeated get_table_schema calls when a mapping involves
+        several tables of the same database. Tables that do not exist are listed
+        under not_found.
+
+        Args:
+            db_name: Database name from registry (use list_registered_databases to discover)
+            table_names: Table names to fetch schemas for (up to 100)
+
+        Returns:
+            JSON with column metadata per table
+        """
+        return await get_table_schemas(db_name=db_name, table_names=table_names)  # type: ignore[no-any-return]
+
     # Context Search - Project knowledge base search (requires pool and project_id)
     @track_tool_execution("search_project_context")
     async def wrapped_search_project_context(
@@ -373,6 +461,8 @@ def create_session_aware_tools(
         function_tool(wrapped_execute_python_code),
         function_tool(wrapped_list_registered_databases),
         function_tool(wrapped_get_table_schema),
+        function_tool(wrapped_grep_files),
+        function_tool(wrapped_get_table_schemas),
     ]
 
     # Only add context search if pool and project_id are available
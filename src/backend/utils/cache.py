@@ -1,89 +1,212 @@
-"""In-memory TTL cache for performance optimization.
+"""TTL caches for performance optimization.
 
-Simple LRU cache with TTL expiration for reducing database queries.
-Suitable for single-instance deployments.
+- TTLCache: in-process LRU cache with TTL expiration and optional byte cap
+- StripedTTLCache: lock-striped, thread-safe TTLCache
+- TieredCache: TTLCache as L1 in front of an optional shared L2 backend, with
+  single-flight loading and cross-process invalidation hooks
+
+Shared-tier wiring (Postgres L2 table, LISTEN/NOTIFY invalidation) lives in
+utils/shared_cache.py so this module stays free of database dependencies.
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import secrets
+import sys
+import threading
 import time
+import weakref
 
 from collections import OrderedDict
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from functools import wraps
-from typing import Any, TypeVar
+from typing import Any, Protocol, TypeVar
+from uuid import UUID
+
+import orjson
+
+from core.constants import (
+    AUTH_USER_CACHE_MAX_SIZE,
+    AUTH_USER_CACHE_TTL,
+    CACHE_SESSION_LIST_MAX_BYTES,
+    CACHE_SESSION_MAX_BYTES,
+    CACHE_SWEEP_INTERVAL,
+)
+from utils.logger import logger
 
 T = TypeVar("T")
 
+#: TTL of generation tokens. Losing one (expiry or LRU eviction) only turns the
+#: entries keyed under it into misses, so this just bounds token churn.
+GENERATION_TTL = 24 * 3600.0
+
+
+class CacheBackend(Protocol):
+    """Async key/value cache interface (TTLCache, shared L2 backends)."""
+
+    async def get(self, key: str) -> Any | None: ...
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None: ...
+
+    async def delete(self, key: str) -> bool: ...
+
+    async def clear(self) -> None: ...
+
+
+class Sweepable(Protocol):
+    """Cache whose expired entries can be removed in bulk."""
+
+    def sweep(self) -> int: ...
+
+
+#: Every live in-process cache, swept by the background sweeper
+_live_caches: weakref.WeakSet[Sweepable] = weakref.WeakSet()
+
+#: Callback publishing an invalidation to other processes: (cache name, key or None for clear)
+InvalidationPublisher = Callable[[str, "str | None"], Awaitable[None]]
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory footprint of a cached value in bytes.
+
+    Uses the serialized JSON length (cached values are API dicts/lists), which
+    tracks payload size far better than ``sys.getsizeof`` on the container.
+    """
+    try:
+        return len(orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS))
+    except TypeError:
+        return sys.getsizeof(value)
+
 
 class TTLCache:
-    """Simple in-memory cache with TTL and max size.
+    """In-memory LRU cache with TTL, entry-count and optional byte caps.
 
-    Thread-safe for asyncio (uses asyncio.Lock).
+    The core operations (``get_sync``, ``set_sync``, ``evict``, ``sweep``) are
+    synchronous dict work that never awaits, so under asyncio's single thread
+    they need no lock; the async methods are thin wrappers kept for the
+    CacheBackend interface. Use StripedTTLCache when threads share a cache.
+
+    Expired entries are dropped on access and by ``sweep``, which the
+    background sweeper (``start_cache_sweeper``) runs for every live cache.
     """
 
-    def __init__(self, max_size: int = 1000, default_ttl: float = 60.0) -> None:
+    def __init__(
+        self,
+        max_size: int = 1000,
+        default_ttl: float = 60.0,
+        max_bytes: int | None = None,
+        sizer: Callable[[Any], int] = estimate_size,
+    ) -> None:
         """Initialize cache.
 
         Args:
             max_size: Maximum number of entries (LRU eviction when exceeded)
             default_ttl: Default time-to-live in seconds
+            max_bytes: Optional cap on the summed entry sizes (LRU eviction when
+                exceeded); entries are only sized when this is set
+            sizer: Entry size estimator used with max_bytes
         """
-        self._cache: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        # key -> (value, expires_at, size_bytes)
+        self._cache: OrderedDict[str, tuple[Any, float, int]] = OrderedDict()
         self._max_size = max_size
         self._default_ttl = default_ttl
-        self._lock = asyncio.Lock()
+        self._max_bytes = max_bytes
+        self._sizer = sizer
+        self._bytes = 0
         self._hits = 0
         self._misses = 0
+        self._evictions = 0
+        self._expired = 0
+        _live_caches.add(self)
+
+    def get_sync(self, key: str) -> Any | None:
+        """Get value if present and not expired."""
+        entry = self._cache.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        value, expires_at, size = entry
+        if time.monotonic() > expires_at:
+            del self._cache[key]
+            self._bytes -= size
+            self._expired += 1
+            self._misses += 1
+            return None
+
+        # Move to end (most recently used)
+        self._cache.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set_sync(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Set value with TTL, evicting least recently used entries over the caps."""
+        ttl = ttl if ttl is not None else self._default_ttl
+        size = self._sizer(value) if self._max_bytes is not None else 0
+
+        old = self._cache.pop(key, None)
+        if old is not None:
+            self._bytes -= old[2]
+
+        if self._max_bytes is not None and size > self._max_bytes:
+            return  # Would evict everything and still not fit
+
+        while self._cache and (
+            len(self._cache) >= self._max_size
+            or (self._max_bytes is not None and self._bytes + size > self._max_bytes)
+        ):
+            _, (_, _, evicted_size) = self._cache.popitem(last=False)
+            self._bytes -= evicted_size
+            self._evictions += 1
+
+        self._cache[key] = (value, time.monotonic() + ttl, size)
+        self._bytes += size
+
+    def evict(self, key: str | None) -> bool:
+        """Remove one entry, or all entries when key is None."""
+        if key is None:
+            self._cache.clear()
+            self._bytes = 0
+            return True
+        entry = self._cache.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[2]
+        return True
+
+    def evict_prefix(self, prefix: str) -> int:
+        """Remove every entry whose key starts with prefix. Returns the number removed."""
+        keys = [key for key in self._cache if key.startswith(prefix)]
+        for key in keys:
+            self.evict(key)
+        return len(keys)
+
+    def sweep(self) -> int:
+        """Remove all expired entries. Returns the number removed."""
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at, _) in self._cache.items() if expires_at < now]
+        for key in expired:
+            self.evict(key)
+        self._expired += len(expired)
+        return len(expired)
 
     async def get(self, key: str) -> Any | None:
         """Get value from cache if not expired."""
-        async with self._lock:
-            if key not in self._cache:
-                self._misses += 1
-                return None
-
-            value, expires_at = self._cache[key]
-            if time.monotonic() > expires_at:
-                # Expired
-                del self._cache[key]
-                self._misses += 1
-                return None
-
-            # Move to end (most recently used)
-            self._cache.move_to_end(key)
-            self._hits += 1
-            return value
+        return self.get_sync(key)
 
     async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
         """Set value in cache with TTL."""
-        ttl = ttl if ttl is not None else self._default_ttl
-        expires_at = time.monotonic() + ttl
-
-        async with self._lock:
-            # Remove old entry if exists
-            if key in self._cache:
-                del self._cache[key]
-
-            # Evict oldest entries if at capacity
-            while len(self._cache) >= self._max_size:
-                self._cache.popitem(last=False)
-
-            self._cache[key] = (value, expires_at)
+        self.set_sync(key, value, ttl)
 
     async def delete(self, key: str) -> bool:
         """Remove entry from cache."""
-        async with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                return True
-            return False
+        return self.evict(key)
 
     async def clear(self) -> None:
         """Clear all entries."""
-        async with self._lock:
-            self._cache.clear()
+        self.evict(None)
 
     def stats(self) -> dict[str, Any]:
         """Get cache statistics."""
@@ -92,36 +215,382 @@ class TTLCache:
         return {
             "size": len(self._cache),
             "max_size": self._max_size,
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
             "hits": self._hits,
             "misses": self._misses,
             "hit_rate": f"{hit_rate:.1%}",
+            "evictions": self._evictions,
+            "expired": self._expired,
+        }
+
+
+class StripedTTLCache:
+    """Thread-safe TTLCache split into lock-striped shards.
+
+    Keys hash to one of ``stripes`` independent TTLCaches, each guarded by its
+    own ``threading.Lock``, so threads touching different keys rarely contend.
+    Caps are divided evenly between the shards.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        default_ttl: float = 60.0,
+        max_bytes: int | None = None,
+        stripes: int = 16,
+        sizer: Callable[[Any], int] = estimate_size,
+    ) -> None:
+        shard_size = max(1, max_size // stripes)
+        shard_bytes = max(1, max_bytes // stripes) if max_bytes is not None else None
+        self._shards = [TTLCache(shard_size, default_ttl, shard_bytes, sizer) for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._max_size = shard_size * stripes
+        # Sweep through this wrapper so shards are only touched under their locks
+        for shard in self._shards:
+            _live_caches.discard(shard)
+        _live_caches.add(self)
+
+    def _stripe(self, key: str) -> int:
+        return hash(key) % len(self._shards)
+
+    def get_sync(self, key: str) -> Any | None:
+        i = self._stripe(key)
+        with self._locks[i]:
+            return self._shards[i].get_sync(key)
+
+    def set_sync(self, key: str, value: Any, ttl: float | None = None) -> None:
+        i = self._stripe(key)
+        with self._locks[i]:
+            self._shards[i].set_sync(key, value, ttl)
+
+    def evict(self, key: str | None) -> bool:
+        if key is not None:
+            i = self._stripe(key)
+            with self._locks[i]:
+                return self._shards[i].evict(key)
+        for lock, shard in zip(self._locks, self._shards, strict=True):
+            with lock:
+                shard.evict(None)
+        return True
+
+    def sweep(self) -> int:
+        removed = 0
+        for lock, shard in zip(self._locks, self._shards, strict=True):
+            with lock:
+                removed += shard.sweep()
+        return removed
+
+    async def get(self, key: str) -> Any | None:
+        return self.get_sync(key)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self.set_sync(key, value, ttl)
+
+    async def delete(self, key: str) -> bool:
+        return self.evict(key)
+
+    async def clear(self) -> None:
+        self.evict(None)
+
+    def stats(self) -> dict[str, Any]:
+        """Aggregate statistics across shards."""
+        shard_stats = [shard.stats() for shard in self._shards]
+        hits = sum(st["hits"] for st in shard_stats)
+        misses = sum(st["misses"] for st in shard_stats)
+        total = hits + misses
+        max_bytes = self._shards[0]._max_bytes
+        return {
+            "size": sum(st["size"] for st in shard_stats),
+            "max_size": self._max_size,
+            "bytes": sum(st["bytes"] for st in shard_stats),
+            "max_bytes": max_bytes * len(self._shards) if max_bytes is not None else None,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": f"{hits / total if total else 0.0:.1%}",
+            "evictions": sum(st["evictions"] for st in shard_stats),
+            "expired": sum(st["expired"] for st in shard_stats),
+            "stripes": len(self._shards),
+        }
+
+
+class TieredCache:
+    """Named cache with an in-process L1 and an optional shared L2.
+
+    Reads try L1, then L2 (back-filling L1). Writes go to both tiers. Deletes and
+    clears also call the invalidation publisher so other workers/replicas drop
+    their L1 copies; received invalidations are applied with ``invalidate_local``.
+
+    ``get_or_load`` coalesces concurrent misses for the same key into a single
+    loader call (single-flight), so a burst of requests for a cold key hits the
+    database once.
+
+    Families of keys (e.g. every list page of one user) embed a generation token
+    from ``generation(scope)``; ``bump_generation(scope)`` invalidates the whole
+    family in O(1) without enumerating keys. Tokens are random rather than
+    counters so a lost token can never be re-issued and revive old entries.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_size: int = 1000,
+        default_ttl: float = 60.0,
+        max_bytes: int | None = None,
+    ) -> None:
+        """Initialize cache.
+
+        Args:
+            name: Cache name used in invalidation messages and L2 namespacing
+            max_size: Maximum L1 entries
+            default_ttl: Default time-to-live in seconds
+            max_bytes: Optional L1 memory cap (see TTLCache)
+        """
+        self.name = name
+        self.default_ttl = default_ttl
+        self.local = TTLCache(max_size=max_size, default_ttl=default_ttl, max_bytes=max_bytes)
+        self.shared: CacheBackend | None = None
+        self.publisher: InvalidationPublisher | None = None
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+        self._coalesced = 0
+        self._shared_errors = 0
+
+    async def get(self, key: str) -> Any | None:
+        """Get value from L1, falling back to the shared tier."""
+        value = self.local.get_sync(key)
+        if value is not None or self.shared is None:
+            return value
+
+        try:
+            value = await self.shared.get(key)
+        except Exception as e:
+            self._shared_errors += 1
+            logger.warning(f"Shared cache read failed ({self.name}): {e}")
+            return None
+
+        if value is not None:
+            self.local.set_sync(key, value)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Set value in both tiers."""
+        self.local.set_sync(key, value, ttl)
+        if self.shared is not None:
+            try:
+                await self.shared.set(key, value, ttl)
+            except Exception as e:
+                self._shared_errors += 1
+                logger.warning(f"Shared cache write failed ({self.name}): {e}")
+
+    async def delete(self, key: str) -> bool:
+        """Remove entry from all tiers and notify other processes."""
+        deleted = self.invalidate_local(key)
+        if self.shared is not None:
+            try:
+                deleted = await self.shared.delete(key) or deleted
+            except Exception as e:
+                self._shared_errors += 1
+                logger.warning(f"Shared cache delete failed ({self.name}): {e}")
+        await self._publish(key)
+        return deleted
+
+    async def clear(self) -> None:
+        """Clear all tiers and notify other processes."""
+        self.invalidate_local(None)
+        if self.shared is not None:
+            try:
+                await self.shared.clear()
+            except Exception as e:
+                self._shared_errors += 1
+                logger.warning(f"Shared cache clear failed ({self.name}): {e}")
+        await self._publish(None)
+
+    def invalidate_local(self, key: str | None) -> bool:
+        """Drop a key (or everything when key is None) from L1 only.
+
+        Used for invalidations received from other processes. In-flight loads for
+        the key are detached so their (possibly stale) results are not cached.
+        """
+        if key is None:
+            self._inflight.clear()
+        else:
+            self._inflight.pop(key, None)
+        return self.local.evict(key)
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float | None = None,
+    ) -> Any | None:
+        """Get a value, loading and caching it on a miss (single-flight).
+
+        Concurrent callers that miss on the same key await the first caller's
+        loader instead of running their own. None results are not cached.
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The leading caller was cancelled; load independently
+                return await self.get_or_load(key, loader, ttl)
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when no caller is waiting
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+                detached = False
+            else:
+                detached = True
+
+        future.set_result(value)
+        if value is not None and not detached:
+            await self.set(key, value, ttl)
+        return value
+
+    async def generation(self, scope: str) -> str:
+        """Get the current generation token for a key family."""
+        key = f"gen:{scope}"
+        token = await self.get(key)
+        if token is None:
+            token = secrets.token_hex(4)
+            await self.set(key, token, ttl=GENERATION_TTL)
+        return str(token)
+
+    async def bump_generation(self, scope: str) -> None:
+        """Invalidate every key built from the current generation of ``scope``."""
+        await self.delete(f"gen:{scope}")
+
+    async def _publish(self, key: str | None) -> None:
+        if self.publisher is None:
+            return
+        try:
+            await self.publisher(self.name, key)
+        except Exception as e:
+            logger.warning(f"Cache invalidation publish failed ({self.name}): {e}")
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache statistics (L1 stats plus tiering counters)."""
+        return {
+            **self.local.stats(),
+            "shared": self.shared is not None,
+            "coalesced": self._coalesced,
+            "shared_errors": self._shared_errors,
         }
 
 
-# Global cache instances
-_session_cache = TTLCache(max_size=500, default_ttl=60.0)  # Session metadata
-_session_list_cache = TTLCache(max_size=100, default_ttl=30.0)  # Session lists per user
+# Global cache instances, keyed by name for cross-process invalidation
+_caches: dict[str, TieredCache] = {
+    # Session metadata
+    "session": TieredCache("session", max_size=500, default_ttl=60.0, max_bytes=CACHE_SESSION_MAX_BYTES),
+    # Session list pages, totals and generation tokens per user
+    "session_list": TieredCache(
+        "session_list", max_size=1000, default_ttl=30.0, max_bytes=CACHE_SESSION_LIST_MAX_BYTES
+    ),
+    # Authenticated users by JWT sub + token version, and the localhost default user
+    "user": TieredCache("user", max_size=AUTH_USER_CACHE_MAX_SIZE, default_ttl=AUTH_USER_CACHE_TTL),
+}
+
+# Background sweeper task (mutable container avoids global statement)
+_sweeper: dict[str, asyncio.Task[None]] = {}
+
+
+def sweep_caches() -> int:
+    """Remove expired entries from every live in-process cache."""
+    return sum(cache.sweep() for cache in list(_live_caches))
+
+
+async def _sweep_loop(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            removed = sweep_caches()
+            if removed:
+                logger.debug(f"Cache sweeper removed {removed} expired entries")
+        except Exception as e:
+            logger.warning(f"Cache sweep failed: {e}")
+
 
+def start_cache_sweeper(interval: float = CACHE_SWEEP_INTERVAL) -> None:
+    """Start the background task that sweeps expired cache entries."""
+    task = _sweeper.get("task")
+    if task is None or task.done():
+        _sweeper["task"] = asyncio.create_task(_sweep_loop(interval))
 
-def get_session_cache() -> TTLCache:
+
+async def stop_cache_sweeper() -> None:
+    """Stop the background sweeper task."""
+    task = _sweeper.pop("task", None)
+    if task is not None:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+def get_session_cache() -> TieredCache:
     """Get the session metadata cache."""
-    return _session_cache
+    return _caches["session"]
 
 
-def get_session_list_cache() -> TTLCache:
+def get_session_list_cache() -> TieredCache:
     """Get the session list cache."""
-    return _session_list_cache
+    return _caches["session_list"]
+
+
+def get_user_cache() -> TieredCache:
+    """Get the authenticated user cache."""
+    return _caches["user"]
+
+
+def get_tiered_caches() -> dict[str, TieredCache]:
+    """Get all named tiered caches."""
+    return _caches
+
+
+def session_cache_key(user_id: UUID | str, session_id: str) -> str:
+    """Session metadata cache key."""
+    return f"session:{user_id}:{session_id}"
+
+
+async def invalidate_session_caches(user_id: UUID | str, session_id: str | None = None) -> None:
+    """Drop a session's cached metadata and every cached session-list page of its owner."""
+    if session_id is not None:
+        await get_session_cache().delete(session_cache_key(user_id, session_id))
+    await get_session_list_cache().bump_generation(str(user_id))
+
+
+def user_cache_key(user_id: UUID | str, token_version: int) -> str:
+    """Authenticated user cache key; a version bump makes old keys unreachable."""
+    return f"user:{user_id}:{token_version}"
 
 
 def cached(
-    cache: TTLCache,
+    cache: CacheBackend,
     key_fn: Callable[..., str],
     ttl: float | None = None,
 ) -> Callable[..., Any]:
     """Decorator for caching async function results.
 
     Args:
-        cache: TTLCache instance to use
+        cache: Cache instance to use (TTLCache or TieredCache)
         key_fn: Function to generate cache key from arguments
         ttl: Optional TTL override
 
@@ -0,0 +1,301 @@
+"""
+Trigram index of workspace file contents for ``grep_files``.
+
+``grep_files`` lets the agent search inside session files instead of pulling
+whole documents into context with ``read_file``. To avoid scanning every file
+on every search, the set of byte trigrams of each file (casefolded UTF-8) is
+kept in memory:
+
+- A search derives the literal runs every match must contain from the regex
+  and only scans files whose trigram set holds all of their trigrams
+- Entries are validated against size and mtime on every search; file writes
+  (uploads, ``edit_file``, ``generate_document``) call ``invalidate`` so an
+  entry never outlives a write, even on filesystems with coarse mtimes
+- PDFs, Office documents and other convertible formats are searched through
+  their cached markdown conversion (uploads are converted in the background);
+  documents without a conversion yet are reported rather than converted here
+- The index is capped at ``CONTENT_INDEX_MAX_BYTES``, least recently used first
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from stat import S_ISREG
+from typing import Any
+
+from core.constants import (
+    CONTENT_INDEX_MAX_BYTES,
+    CONTENT_INDEX_MAX_FILE_SIZE,
+    CONTENT_INDEX_TTL,
+    CONVERTIBLE_EXTENSIONS,
+    DEFAULT_GREP_MAX_RESULTS,
+    GREP_MAX_FILES,
+    GREP_MAX_LINE_CHARS,
+    MAX_FILE_SIZE,
+)
+from utils.cache import TTLCache
+from utils.conversion_cache import get_conversion_cache
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - Python 3.10
+    import sre_parse  # type: ignore[no-redef]
+
+_REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, getattr(sre_parse, "POSSESSIVE_REPEAT", sre_parse.MAX_REPEAT)}
+
+
+def _trigrams(text: str) -> frozenset[bytes]:
+    data = text.casefold().encode("utf-8")
+    return frozenset(data[i : i + 3] for i in range(len(data) - 2))
+
+
+def _literal_runs(items: Any, runs: list[str]) -> None:
+    """Collect runs of literal characters that every match of ``items`` contains."""
+    run: list[str] = []
+    for op, av in items:
+        if op == sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            runs.append("".join(run))
+            run = []
+        if op == sre_parse.SUBPATTERN:
+            _literal_runs(av[-1], runs)
+        elif op in _REPEATS and av[0] >= 1:
+            _literal_runs(av[2], runs)
+        # Alternations, classes, optional repeats and lookarounds require nothing
+    if run:
+        runs.append("".join(run))
+
+
+def required_trigrams(pattern: re.Pattern[str]) -> frozenset[bytes]:
+    """Trigrams (casefolded UTF-8) that any line matching ``pattern`` contains.
+
+    Empty when the pattern has no literal run of three or more bytes, in which
+    case the index cannot rule out any file.
+    """
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return frozenset()
+    runs: list[str] = []
+    _literal_runs(parsed, runs)
+    return frozenset().union(*(_trigrams(run) for run in runs))
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    size: int
+    mtime_ns: int
+    trigrams: frozenset[bytes] | None  # None: too large to index, always scanned
+    searchable: bool = True  # False for binary and non-UTF-8 files
+
+
+def _entry_size(entry: _Entry) -> int:
+    # Rough: a 3-byte bytes object plus its set slot
+    return 64 + 56 * len(entry.trigrams or ())
+
+
+@dataclass(frozen=True, slots=True)
+class ContentMatch:
+    """One matching line with its surrounding context."""
+
+    path: Path
+    line: int  # 1-based, in the file or its markdown conversion
+    text: str
+    before: list[str] = field(default_factory=list)
+    after: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ContentSearchResult:
+    """Matches of one search plus what was (not) searched."""
+
+    matches: list[ContentMatch] = field(default_factory=list)
+    files_searched: int = 0
+    truncated: bool = False
+    unconverted: list[Path] = field(default_factory=list)
+
+
+def _walk(root: Path, glob: str, limit: int) -> tuple[list[tuple[Path, os.stat_result]], bool]:
+    """Regular files below ``root`` matching ``glob``, skipping hidden entries and symlinks (worker thread).
+
+    Returns the files in path order and whether ``limit`` cut the walk short.
+    """
+    found: list[tuple[Path, os.stat_result]] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            if name.startswith("."):
+                continue
+            path = Path(dirpath, name)
+            if not PurePosixPath(path.relative_to(root).as_posix()).match(glob):
+                continue
+            try:
+                stat = os.lstat(path)
+            except OSError:
+                continue
+            if not S_ISREG(stat.st_mode):
+                continue
+            if len(found) >= limit:
+                return found, True
+            found.append((path, stat))
+    return found, False
+
+
+def _read_text(path: Path) -> str | None:
+    """Decode a file as UTF-8; None for binary files and other encodings (worker thread)."""
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    if b"\0" in data[:8192]:
+        return None
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+def _clip(line: str) -> str:
+    return line if len(line) <= GREP_MAX_LINE_CHARS else line[:GREP_MAX_LINE_CHARS] + "…"
+
+
+def _index_and_grep(
+    path: Path,
+    text: str,
+    pattern: re.Pattern[str],
+    needed: frozenset[bytes],
+    converted: bool,
+    context_lines: int,
+    limit: int,
+) -> tuple[frozenset[bytes] | None, list[ContentMatch], bool]:
+    """Index ``text`` and collect up to ``limit`` matching lines (worker thread).
+
+    Returns the trigram set (None if too large to index), the matches and
+    whether the file has more matches than ``limit``.
+    """
+    trigrams = _trigrams(text) if len(text) <= CONTENT_INDEX_MAX_FILE_SIZE else None
+    if needed and trigrams is not None and not needed <= trigrams:
+        return trigrams, [], False
+
+    # Line numbers follow read_file: conversions are split like its offset/limit
+    # reads of documents, text files on "\n" like its reads of text files
+    lines = text.splitlines() if converted else text.replace("\r\n", "\n").split("\n")
+    matches: list[ContentMatch] = []
+    for i, line in enumerate(lines):
+        if not pattern.search(line):
+            continue
+        if len(matches) >= limit:
+            return trigrams, matches, True
+        matches.append(
+            ContentMatch(
+                path=path,
+                line=i + 1,
+                text=_clip(line),
+                before=[_clip(ln) for ln in lines[max(i - context_lines, 0) : i]],
+                after=[_clip(ln) for ln in lines[i + 1 : i + 1 + context_lines]],
+            )
+        )
+    return trigrams, matches, False
+
+
+class ContentIndex:
+    """Process-wide trigram index of file contents keyed by absolute path."""
+
+    def __init__(self, max_bytes: int = CONTENT_INDEX_MAX_BYTES) -> None:
+        # Bounded by max_bytes; the entry cap only matters for many tiny files
+        self._entries = TTLCache(
+            max_size=100_000, default_ttl=CONTENT_INDEX_TTL, max_bytes=max_bytes, sizer=_entry_size
+        )
+        self._searches = 0
+        self._skipped = 0
+        self._scanned = 0
+
+    def invalidate(self, path: Path | str) -> None:
+        """Drop the entry for a file that was just written or deleted."""
+        self._entries.evict(os.path.abspath(path))
+
+    async def _load_text(self, path: Path, stat: os.stat_result) -> tuple[str | None, bool]:
+        """Searchable text of a file and whether it is a document conversion."""
+        if path.suffix.lower() in CONVERTIBLE_EXTENSIONS:
+            return await get_conversion_cache().cached(path), True
+        if stat.st_size > MAX_FILE_SIZE:
+            return None, False
+        return await asyncio.to_thread(_read_text, path), False
+
+    async def search(
+        self,
+        root: Path,
+        pattern: re.Pattern[str],
+        glob: str = "*",
+        context_lines: int = 0,
+        max_results: int = DEFAULT_GREP_MAX_RESULTS,
+        max_files: int = GREP_MAX_FILES,
+    ) -> ContentSearchResult:
+        """Find lines matching ``pattern`` in files below ``root`` whose path matches ``glob``."""
+        self._searches += 1
+        files, truncated = await asyncio.to_thread(_walk, root, glob, max_files)
+        needed = required_trigrams(pattern)
+        result = ContentSearchResult(truncated=truncated)
+
+        for path, stat in files:
+            if len(result.matches) >= max_results:
+                result.truncated = True
+                break
+            key = os.path.abspath(path)
+            entry: _Entry | None = self._entries.get_sync(key)
+            if entry is not None and (entry.size, entry.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                if not entry.searchable:
+                    continue
+                if needed and entry.trigrams is not None and not needed <= entry.trigrams:
+                    self._skipped += 1
+                    result.files_searched += 1
+                    continue
+
+            text, converted = await self._load_text(path, stat)
+            if text is None:
+                if converted:
+                    result.unconverted.append(path)
+                else:
+                    self._entries.set_sync(key, _Entry(stat.st_size, stat.st_mtime_ns, frozenset(), searchable=False))
+                continue
+
+            self._scanned += 1
+            result.files_searched += 1
+            trigrams, matches, more = await asyncio.to_thread(
+                _index_and_grep,
+                path,
+                text,
+                pattern,
+                needed,
+                converted,
+                context_lines,
+                max_results - len(result.matches),
+            )
+            self._entries.set_sync(key, _Entry(stat.st_size, stat.st_mtime_ns, trigrams))
+            result.matches.extend(matches)
+            result.truncated = result.truncated or more
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """Index statistics."""
+        return {
+            **self._entries.stats(),
+            "searches": self._searches,
+            "files_scanned": self._scanned,
+            "files_skipped": self._skipped,
+        }
+
+
+_content_index = ContentIndex()
+
+
+def get_content_index() -> ContentIndex:
+    """Get the process-wide content index."""
+    return _content_index
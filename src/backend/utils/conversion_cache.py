@@ -0,0 +1,252 @@
+"""
+Content-addressed cache of MarkItDown conversions.
+
+Converting a PDF, DOCX or PPTX can take seconds, and much longer when
+MarkItDown asks the LLM to describe embedded images. ``read_file`` used to
+repeat that work on every read, including head/tail reads, which convert the
+whole document. Conversions are now stored as markdown files under
+``CONVERSION_CACHE_PATH``:
+
+- Keyed by the SHA-256 of the file content plus ``converter_version()``, so
+  re-uploads, copies across sessions and S3 rehydration all hit the cache
+- Uploads prefetch the conversion in the background with the hash computed
+  while streaming the upload, so the first ``read_file`` is a cache hit
+- Concurrent reads of the same document share one conversion
+- The store is capped at ``CONVERSION_CACHE_MAX_BYTES``; least recently read
+  entries are removed first
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import os
+
+from functools import cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from core.constants import (
+    CONVERSION_CACHE_FORMAT,
+    CONVERSION_CACHE_MAX_BYTES,
+    CONVERSION_CACHE_PATH,
+    CONVERSION_CONCURRENCY,
+    CONVERTIBLE_EXTENSIONS,
+    DEFAULT_MODEL,
+)
+from utils.cache import TTLCache
+from utils.logger import logger
+
+if TYPE_CHECKING:
+    from markitdown import MarkItDown
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@cache
+def converter_version() -> str:
+    """Identify the conversion output: markitdown release, image model and cache format."""
+    try:
+        markitdown_version = version("markitdown")
+    except PackageNotFoundError:
+        markitdown_version = "unknown"
+    return f"markitdown={markitdown_version};model={DEFAULT_MODEL};format={CONVERSION_CACHE_FORMAT}"
+
+
+def _stat_key(path: Path, stat: os.stat_result) -> str:
+    return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _hash_file(path: Path) -> tuple[str, os.stat_result]:
+    """SHA-256 of a file and its stat (worker thread)."""
+    hasher = hashlib.sha256()
+    with path.open("rb") as f:
+        stat = os.fstat(f.fileno())
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest(), stat
+
+
+def _read_entry(path: Path) -> str | None:
+    """Read a cached conversion and mark it as recently used (worker thread)."""
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    with contextlib.suppress(OSError):
+        os.utime(path)
+    return text
+
+
+def _write_entry(path: Path, text: str) -> int:
+    """Atomically store a conversion; returns its size in bytes (worker thread)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = text.encode("utf-8")
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.part")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return len(data)
+
+
+def _prune(root: Path, max_bytes: int) -> int:
+    """Delete least recently used entries until the store is under 90% of ``max_bytes``.
+
+    Returns the size of the store afterwards (worker thread).
+    """
+    entries: list[tuple[float, int, Path]] = []
+    for path in root.glob("*/*.md"):
+        with contextlib.suppress(OSError):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return total
+    entries.sort()
+    target = max_bytes * 9 // 10
+    for _, size, path in entries:
+        if total <= target:
+            break
+        with contextlib.suppress(OSError):
+            path.unlink()
+            total -= size
+    return total
+
+
+class ConversionCache:
+    """Process-wide store of markdown conversions keyed by content hash."""
+
+    def __init__(self, root: Path = CONVERSION_CACHE_PATH, max_bytes: int = CONVERSION_CACHE_MAX_BYTES) -> None:
+        self.root = root
+        self._max_bytes = max_bytes
+        # (path, size, mtime) -> SHA-256, so repeat reads skip hashing the file
+        self._hashes = TTLCache(max_size=4096, default_ttl=3600.0)
+        self._inflight: dict[str, asyncio.Task[str]] = {}
+        self._slots = asyncio.Semaphore(CONVERSION_CONCURRENCY)
+        self._prefetches: set[asyncio.Task[None]] = set()
+        self._size: int | None = None
+        self._hits = 0
+        self._misses = 0
+
+    def _entry_path(self, content_hash: str) -> Path:
+        key = hashlib.sha256(f"{content_hash}:{converter_version()}".encode()).hexdigest()
+        return self.root / key[:2] / f"{key}.md"
+
+    async def _content_hash(self, file_path: Path) -> tuple[str, os.stat_result]:
+        """SHA-256 of a file and the stat it was computed for."""
+        stat = await asyncio.to_thread(file_path.stat)
+        content_hash: str | None = self._hashes.get_sync(_stat_key(file_path, stat))
+        if content_hash is None:
+            content_hash, stat = await asyncio.to_thread(_hash_file, file_path)
+            self._hashes.set_sync(_stat_key(file_path, stat), content_hash)
+        return content_hash, stat
+
+    async def convert(
+        self,
+        converter: MarkItDown,
+        file_path: Path,
+        content_hash: str | None = None,
+        stat: os.stat_result | None = None,
+    ) -> str:
+        """Return the markdown conversion of ``file_path``, converting only on a cache miss.
+
+        ``content_hash`` and ``stat`` describe the file as the caller saw it; the
+        conversion is only stored under that hash if the file still matches
+        ``stat`` when converted. Empty conversions are returned but not cached.
+        Conversion errors propagate to every caller waiting on the same document.
+        """
+        if content_hash is None:
+            content_hash, stat = await self._content_hash(file_path)
+        entry = self._entry_path(content_hash)
+
+        text = await asyncio.to_thread(_read_entry, entry)
+        if text is not None:
+            self._hits += 1
+            return text
+
+        task = self._inflight.get(content_hash)
+        if task is None:
+            self._misses += 1
+            task = asyncio.create_task(self._convert(converter, file_path, entry, stat))
+            self._inflight[content_hash] = task
+            task.add_done_callback(lambda _: self._inflight.pop(content_hash, None))
+        return await asyncio.shield(task)
+
+    async def cached(self, file_path: Path) -> str | None:
+        """Return the stored conversion of ``file_path``, or None without converting it."""
+        content_hash, _ = await self._content_hash(file_path)
+        return await asyncio.to_thread(_read_entry, self._entry_path(content_hash))
+
+    async def _convert(
+        self, converter: MarkItDown, file_path: Path, entry: Path, expected: os.stat_result | None
+    ) -> str:
+        async with self._slots:
+            before = await asyncio.to_thread(file_path.stat)
+            result = await asyncio.to_thread(converter.convert, str(file_path))
+        text: str = result.text_content or ""
+        if not text.strip():
+            return text
+        # Only cache if the file is still the one that was hashed and was not
+        # replaced while converting; the entry is shared by every file with that hash
+        after = await asyncio.to_thread(file_path.stat)
+        versions = {(st.st_size, st.st_mtime_ns) for st in (expected, before, after) if st is not None}
+        if len(versions) > 1:
+            logger.debug(f"{file_path.name} changed since it was hashed; conversion not cached")
+            return text
+        try:
+            await self._store(entry, text)
+        except OSError as e:
+            logger.warning(f"Failed to cache conversion of {file_path.name}: {e}")
+        return text
+
+    async def _store(self, entry: Path, text: str) -> None:
+        size = await asyncio.to_thread(_write_entry, entry, text)
+        if self._size is None:
+            self._size = await asyncio.to_thread(_prune, self.root, self._max_bytes)
+        else:
+            self._size += size
+            if self._size > self._max_bytes:
+                self._size = await asyncio.to_thread(_prune, self.root, self._max_bytes)
+
+    def prefetch(self, file_path: Path, content_hash: str, stat: os.stat_result) -> None:
+        """Convert a just-written file in the background if it is a convertible format.
+
+        ``content_hash`` and ``stat`` describe the file as written, so the
+        first read neither hashes it again nor waits for the conversion.
+        """
+        if file_path.suffix.lower() not in CONVERTIBLE_EXTENSIONS:
+            return
+        from utils.document_processor import get_markitdown_converter
+
+        converter = get_markitdown_converter()
+        if converter is None:
+            return
+        self._hashes.set_sync(_stat_key(file_path, stat), content_hash)
+        task = asyncio.create_task(self._prefetch(converter, file_path, content_hash, stat))
+        self._prefetches.add(task)
+        task.add_done_callback(self._prefetches.discard)
+
+    async def _prefetch(self, converter: MarkItDown, file_path: Path, content_hash: str, stat: os.stat_result) -> None:
+        try:
+            await self.convert(converter, file_path, content_hash, stat)
+        except Exception as e:
+            # read_file reports the error if the document is actually read
+            logger.debug(f"Background conversion of {file_path.name} failed: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        """Cache statistics."""
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "converting": len(self._inflight),
+            "size_bytes": self._size,
+        }
+
+
+_conversion_cache = ConversionCache()
+
+
+def get_conversion_cache() -> ConversionCache:
+    """Get the process-wide conversion cache."""
+    return _conversion_cache
@@ -20,6 +20,7 @@ from typing import Any, ParamSpec, TypeVar
 import asyncpg
 
 from utils.logger import logger
+from utils.pg_codecs import register_type_codecs
 
 P = ParamSpec("P")
 T = TypeVar("T")
@@ -77,6 +78,8 @@ async def create_database_pool(
         await conn.execute(f"SET statement_timeout = '{int(command_timeout * 1000)}'")
         # Set lock timeout to prevent indefinite waits
         await conn.execute(f"SET lock_timeout = '{int(command_timeout * 1000)}'")
+        # Binary codecs: JSONB via orjson, pgvector embeddings as float lists
+        await register_type_codecs(conn)
 
     try:
         pool = await asyncio.wait_for(
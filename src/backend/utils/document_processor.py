@@ -5,14 +5,29 @@ Handles document conversion, summarization, and content optimization.
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import asyncio
+import hashlib
+
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
 
 from agents import Agent, Runner
 
 if TYPE_CHECKING:
     from markitdown import MarkItDown
 
-from core.constants import DEFAULT_MODEL, DOCUMENT_SUMMARIZATION_THRESHOLD, get_settings
+from core.constants import (
+    DEFAULT_MODEL,
+    DOCUMENT_SUMMARIZATION_THRESHOLD,
+    DOCUMENT_SUMMARY_CACHE_SIZE,
+    DOCUMENT_SUMMARY_CACHE_TTL,
+    DOCUMENT_SUMMARY_CHUNK_TOKENS,
+    DOCUMENT_SUMMARY_CONCURRENCY,
+    get_settings,
+)
+from models.event_models import DocumentSummaryProgress
+from utils.cache import TTLCache
 from utils.client_factory import create_sync_openai_client
 from utils.logger import logger
 from utils.token_utils import count_tokens
@@ -28,69 +43,170 @@ except ImportError:  # pragma: no cover - optional dependency
 # Lazy-initialized converter cache (mutable container avoids global statement)
 _converter_cache: dict[str, _MarkItDown | None] = {}
 
-
-async def summarize_content(content: str, file_name: str = "document", model: str | None = None) -> str:
+#: Receives summarization progress events (e.g. relayed over the session WebSocket)
+ProgressCallback = Callable[[dict[str, Any]], Awaitable[None]]
+
+#: Progress callback for summaries started in the current context. Set by the
+#: session tool wrappers around read_file, whose signature is exposed to the model.
+summary_progress: ContextVar[ProgressCallback | None] = ContextVar("summary_progress", default=None)
+
+# Document summaries keyed by model and content hash, plus summaries in progress
+_summary_cache = TTLCache(max_size=DOCUMENT_SUMMARY_CACHE_SIZE, default_ttl=DOCUMENT_SUMMARY_CACHE_TTL)
+_summarizing: dict[str, asyncio.Task[str | None]] = {}
+
+# Reduce passes before the combined chunk summaries are summarized in one call
+# regardless of size, and the smallest summary requested per chunk
+_MAX_REDUCE_DEPTH = 3
+_MIN_PART_SUMMARY_TOKENS = 500
+
+
+def _split_chunks(content: str, max_chars: int) -> list[str]:
+    """Split text into chunks of at most ``max_chars``, on line boundaries where possible."""
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for line in content.splitlines(keepends=True):
+        if size + len(line) > max_chars and current:
+            chunks.append("".join(current))
+            current, size = [], 0
+        # Lines longer than a chunk are cut; the remainder starts the next chunk
+        cut = len(line) - len(line) % max_chars if len(line) > max_chars else 0
+        chunks.extend(line[i : i + max_chars] for i in range(0, cut, max_chars))
+        current.append(line[cut:])
+        size += len(line) - cut
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+async def _run_summarizer(instructions: str, content: str, deployment: str) -> str:
+    """One-shot summarization agent run; raises ValueError on an empty summary."""
+    agent = Agent(name="DocumentSummarizer", model=deployment, instructions=instructions)
+    # No session for document summarization (one-shot operation)
+    result = await Runner.run(agent, input=content, session=None)
+    summarized = result.final_output or ""
+    if not summarized.strip():
+        raise ValueError(f"empty summary from {deployment} for {len(content)} chars")
+    return str(summarized)
+
+
+async def _map_reduce(
+    content: str,
+    tokens: int,
+    file_name: str,
+    deployment: str,
+    on_progress: ProgressCallback | None,
+    depth: int = 0,
+) -> str:
+    """Summarize in one call if the content fits a chunk, else summarize chunks concurrently and combine."""
+    from core.prompts import DOCUMENT_CHUNK_SUMMARIZATION_INSTRUCTIONS, DOCUMENT_SUMMARIZATION_INSTRUCTIONS
+
+    if tokens <= DOCUMENT_SUMMARY_CHUNK_TOKENS or depth >= _MAX_REDUCE_DEPTH:
+        instructions = DOCUMENT_SUMMARIZATION_INSTRUCTIONS.format(tokens=DOCUMENT_SUMMARIZATION_THRESHOLD)
+        return await _run_summarizer(instructions, content, deployment)
+
+    chars_per_token = max(1.0, len(content) / tokens)
+    chunks = _split_chunks(content, int(DOCUMENT_SUMMARY_CHUNK_TOKENS * chars_per_token))
+    parts = len(chunks)
+    # Size chunk summaries so that, combined, they fit in a single reduce call
+    budget = max(_MIN_PART_SUMMARY_TOKENS, DOCUMENT_SUMMARY_CHUNK_TOKENS // parts)
+    slots = asyncio.Semaphore(DOCUMENT_SUMMARY_CONCURRENCY)
+    completed = 0
+
+    async def summarize_part(part: int, chunk: str) -> str:
+        nonlocal completed
+        async with slots:
+            instructions = DOCUMENT_CHUNK_SUMMARIZATION_INSTRUCTIONS.format(part=part, parts=parts, tokens=budget)
+            summary = await _run_summarizer(instructions, chunk, deployment)
+        completed += 1
+        if on_progress is not None:
+            progress = DocumentSummaryProgress(
+                file_name=file_name, part=part, parts=parts, completed=completed, summary=summary
+            )
+            try:
+                await on_progress(progress.model_dump())
+            except Exception as e:
+                logger.debug(f"Summary progress event for {file_name} not delivered: {e}")
+        return summary
+
+    logger.info(f"Summarizing {file_name} in {parts} chunks ({tokens:,} tokens, depth {depth})")
+    summaries = await asyncio.gather(*(summarize_part(i, chunk) for i, chunk in enumerate(chunks, start=1)))
+    combined = "\n\n".join(f"## Part {i} of {parts}\n\n{summary}" for i, summary in enumerate(summaries, start=1))
+    combined_tokens = count_tokens(combined, deployment)["exact_tokens"]
+    return await _map_reduce(combined, combined_tokens, file_name, deployment, on_progress, depth + 1)
+
+
+async def summarize_content(
+    content: str,
+    file_name: str = "document",
+    model: str | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> str:
     """
     Summarize large document content using Agent/Runner pattern.
 
-    Creates a one-shot summarization agent with full instructions specifying
-    the summary criteria. Document content is passed directly as input.
+    Documents that fit in DOCUMENT_SUMMARY_CHUNK_TOKENS are passed to one
+    summarization agent. Longer documents are split into chunks that are
+    summarized concurrently (``on_progress`` receives each chunk summary as a
+    ``DocumentSummaryProgress`` event), and the chunk summaries are then
+    summarized together. Results are cached by content hash and model, and
+    concurrent requests for the same document share one summarization.
 
     Args:
         content: The document content to summarize
         file_name: Name of the file being summarized (for logging)
         model: Model to use for summarization (defaults to DEFAULT_MODEL if not provided)
+        on_progress: Optional async callback for chunk progress events
+            (defaults to the ``summary_progress`` context variable)
 
     Returns:
         Summarized content or original if summarization fails
     """
-    try:
-        from core.prompts import DOCUMENT_SUMMARIZATION_INSTRUCTIONS
-
-        # Use conversation's model if provided, otherwise fall back to default
-        deployment = model or DEFAULT_MODEL
-
-        # Create document summarization agent with full instructions
-        summary_agent = Agent(
-            name="DocumentSummarizer",
-            model=deployment,
-            instructions=DOCUMENT_SUMMARIZATION_INSTRUCTIONS.format(tokens=DOCUMENT_SUMMARIZATION_THRESHOLD),
-        )
-
-        # Pass document content directly as input
-        result = await Runner.run(
-            summary_agent,
-            input=content,
-            session=None,  # No session for document summarization (one-shot operation)
-        )
-
-        summarized = result.final_output or ""
-
-        if not summarized or not summarized.strip():
-            logger.error(
-                f"Agent returned empty/null summary for {file_name} - "
-                f"deployment={deployment}, "
-                f"content_length={len(content)} chars"
-            )
-            return content
-
-        # Log summarization stats
-        original_tokens = count_tokens(content, deployment)
-        summary_tokens = count_tokens(summarized, deployment)
+    # Use conversation's model if provided, otherwise fall back to default
+    deployment = model or DEFAULT_MODEL
+    on_progress = on_progress or summary_progress.get()
+    key = f"{deployment}:{hashlib.sha256(content.encode()).hexdigest()}"
+
+    cached: str | None = _summary_cache.get_sync(key)
+    if cached is not None:
+        logger.info(f"Using cached summary of {file_name} ({deployment})")
+        return cached
+
+    task = _summarizing.get(key)
+    if task is None:
+        task = asyncio.create_task(_summarize(content, file_name, deployment, on_progress))
+        _summarizing[key] = task
+        task.add_done_callback(lambda _: _summarizing.pop(key, None))
+    summarized = await asyncio.shield(task)
+    if summarized is None:
+        return content  # Return original on error
+    _summary_cache.set_sync(key, summarized)
+    return summarized
 
-        orig_count = original_tokens["exact_tokens"]
-        summ_count = summary_tokens["exact_tokens"]
 
-        logger.info(
-            f"Summarized {file_name} using {deployment}: {orig_count:,} tokens → {summ_count:,} tokens "
-            f"({int((1 - summ_count / orig_count) * 100)}% reduction)"
+async def _summarize(content: str, file_name: str, deployment: str, on_progress: ProgressCallback | None) -> str | None:
+    """Run the (map-reduce) summarization; None on failure."""
+    try:
+        original_tokens = count_tokens(content, deployment)["exact_tokens"]
+        summarized = await _map_reduce(content, original_tokens, file_name, deployment, on_progress)
+    except ValueError as e:
+        logger.error(
+            f"Agent returned empty/null summary for {file_name} - "
+            f"deployment={deployment}, "
+            f"content_length={len(content)} chars: {e}"
         )
-
-        return summarized
-
+        return None
     except Exception as e:
         logger.error(f"Document summarization failed for {file_name}: {e}", exc_info=True)
-        return content  # Return original on error
+        return None
+
+    # Log summarization stats
+    summ_count = count_tokens(summarized, deployment)["exact_tokens"]
+    logger.info(
+        f"Summarized {file_name} using {deployment}: {original_tokens:,} tokens → {summ_count:,} tokens "
+        f"({int((1 - summ_count / original_tokens) * 100)}% reduction)"
+    )
+    return summarized
 
 
 def get_markitdown_converter() -> MarkItDown | None:
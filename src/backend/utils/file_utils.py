@@ -25,6 +25,7 @@ from core.constants import (
 )
 from models.api_models import TextEditResponse
 from models.ipc_models import UploadResult
+from utils.content_index import get_content_index
 from utils.json_utils import json_pretty
 from utils.logger import logger
 
@@ -316,6 +317,7 @@ async def write_file_content(target_path: Path, content: str) -> tuple[None, str
     try:
         async with aiofiles.open(target_path, "w", encoding="utf-8") as f:
             await f.write(content)
+        get_content_index().invalidate(target_path)
         return None, None
     except PermissionError:
         return None, f"Permission denied: {target_path}"
@@ -0,0 +1,151 @@
+"""
+Line-oriented partial reads of large text files.
+
+``read_file`` head/tail reads used to go through aiofiles line by line, and a
+tail read loaded every line of the file to keep the last few. These helpers
+work on raw bytes on a worker thread instead:
+
+- Head reads stop at the block containing the last requested line
+- Tail reads seek to the end and read blocks backwards
+- Offset/limit reads go through a sparse line index built over an mmap of the
+  file: one checkpoint every ``LINE_INDEX_STRIDE`` bytes, so a lookup bisects
+  the checkpoints and scans at most one stride. Indexes are cached by path,
+  size and mtime, so paging through a file indexes it once
+
+Content is decoded as strict UTF-8 (``UnicodeDecodeError`` propagates) with
+``\\r\\n`` normalized to ``\\n``, matching text-mode reads.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+
+from core.constants import LINE_INDEX_CACHE_SIZE, LINE_INDEX_STRIDE, TEXT_READ_BLOCK_SIZE
+from utils.cache import StripedTTLCache
+
+# Looked up and filled from asyncio.to_thread workers, so it must be thread-safe
+_line_indexes = StripedTTLCache(max_size=LINE_INDEX_CACHE_SIZE, default_ttl=3600.0, stripes=8)
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8").replace("\r\n", "\n")
+
+
+@dataclass(frozen=True, slots=True)
+class LineIndex:
+    """Newline counts at fixed byte checkpoints of one version of a file."""
+
+    size: int
+    offsets: list[int]  # Checkpoint byte offsets
+    newlines: list[int]  # Newlines before each checkpoint
+    total_newlines: int
+    ends_with_newline: bool
+
+    @property
+    def total_lines(self) -> int:
+        """Number of lines, counting an unterminated last line."""
+        return self.total_newlines + (1 if self.size and not self.ends_with_newline else 0)
+
+    def line_start(self, mm: mmap.mmap, line: int) -> int:
+        """Byte offset where 0-based ``line`` starts (file size past the end)."""
+        if line <= 0:
+            return 0
+        if line > self.total_newlines:
+            return self.size
+        i = bisect_left(self.newlines, line) - 1
+        pos = self.offsets[i] - 1
+        for _ in range(line - self.newlines[i]):
+            pos = mm.find(b"\n", pos + 1)
+        return pos + 1
+
+
+def build_line_index(mm: mmap.mmap, size: int, stride: int = LINE_INDEX_STRIDE) -> LineIndex:
+    """Count newlines between checkpoints ``stride`` bytes apart."""
+    offsets: list[int] = []
+    newlines: list[int] = []
+    seen = 0
+    for pos in range(0, size, stride):
+        offsets.append(pos)
+        newlines.append(seen)
+        seen += mm[pos : pos + stride].count(b"\n")
+    return LineIndex(size, offsets, newlines, seen, size > 0 and mm[size - 1 : size] == b"\n")
+
+
+def _get_line_index(path: Path, stat: os.stat_result, mm: mmap.mmap) -> LineIndex:
+    key = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    index: LineIndex | None = _line_indexes.get_sync(key)
+    if index is None:
+        index = build_line_index(mm, stat.st_size, LINE_INDEX_STRIDE)
+        _line_indexes.set_sync(key, index)
+    return index
+
+
+def read_head_lines(path: Path, lines: int, block_size: int = TEXT_READ_BLOCK_SIZE) -> str:
+    """Return the first ``lines`` lines of a file (worker thread)."""
+    if lines <= 0:
+        return ""
+    chunks: list[bytes] = []
+    seen = 0
+    with path.open("rb") as f:
+        while block := f.read(block_size):
+            count = block.count(b"\n")
+            if seen + count >= lines:
+                pos = -1
+                for _ in range(lines - seen):
+                    pos = block.find(b"\n", pos + 1)
+                chunks.append(block[: pos + 1])
+                break
+            chunks.append(block)
+            seen += count
+    return _decode(b"".join(chunks))
+
+
+def read_tail_lines(path: Path, lines: int, block_size: int = TEXT_READ_BLOCK_SIZE) -> str:
+    """Return the last ``lines`` lines of a file, reading backwards from the end (worker thread)."""
+    if lines <= 0:
+        return ""
+    with path.open("rb") as f:
+        pos = os.fstat(f.fileno()).st_size
+        if pos == 0:
+            return ""
+        f.seek(pos - 1)
+        # A trailing newline ends the last line rather than starting a new one
+        wanted = lines + (f.read(1) == b"\n")
+        blocks: list[bytes] = []
+        found = 0
+        while pos > 0 and found < wanted:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            blocks.append(block)
+            found += block.count(b"\n")
+    data = b"".join(reversed(blocks))
+    if found < wanted:
+        return _decode(data)  # Fewer lines than requested: the whole file
+    cut = len(data)
+    for _ in range(wanted):
+        cut = data.rfind(b"\n", 0, cut)
+    return _decode(data[cut + 1 :])
+
+
+def read_line_range(path: Path, start: int, count: int | None = None) -> tuple[str, int]:
+    """Return ``count`` lines starting at 1-based line ``start`` (all remaining if None).
+
+    Returns the text and the total number of lines in the file (worker thread).
+    """
+    with path.open("rb") as f:
+        stat = os.fstat(f.fileno())
+        if stat.st_size == 0:
+            return "", 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            index = _get_line_index(path, stat, mm)
+            first = max(start, 1) - 1
+            begin = index.line_start(mm, first)
+            end = index.size if count is None else index.line_start(mm, first + max(count, 0))
+            return _decode(mm[begin:end]), index.total_lines
@@ -67,6 +67,78 @@ db_query_duration_seconds = Histogram(
 )
 
 
+# ============================================================================
+# Vector Search Metrics
+# ============================================================================
+
+context_search_duration_seconds = Histogram(
+    f"{NAMESPACE}_context_search_duration_seconds",
+    "Project context search duration in seconds",
+    ["strategy", "mode"],  # strategy: "exact" | "global" | "partial"; mode: "vector" | "hybrid"
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+context_partial_indexes = Gauge(
+    f"{NAMESPACE}_context_partial_indexes",
+    "Number of per-project partial HNSW indexes on context_chunks",
+)
+
+context_index_maintenance_actions_total = Counter(
+    f"{NAMESPACE}_context_index_maintenance_actions_total",
+    "Partial index maintenance actions performed",
+    ["action"],  # "create" or "drop"
+)
+
+
+# ============================================================================
+# Password Hashing Metrics
+# ============================================================================
+
+password_hash_wait_seconds = Histogram(
+    f"{NAMESPACE}_password_hash_wait_seconds",
+    "Time password hash operations wait for a pool worker",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+password_hash_duration_seconds = Histogram(
+    f"{NAMESPACE}_password_hash_duration_seconds",
+    "bcrypt hash/verify duration on a pool worker",
+    ["operation"],  # "hash" or "verify"
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+password_hash_pending = Gauge(
+    f"{NAMESPACE}_password_hash_pending",
+    "Password hash operations running or queued",
+)
+
+
+# ============================================================================
+# S3 Sync Metrics
+# ============================================================================
+
+s3_upload_queue_depth = Gauge(
+    f"{NAMESPACE}_s3_upload_queue_depth",
+    "Background S3 uploads queued or in progress",
+)
+
+s3_upload_bytes_total = Counter(
+    f"{NAMESPACE}_s3_upload_bytes_total",
+    "Bytes uploaded to S3 by the background upload queue (rate() gives bytes/sec)",
+)
+
+s3_uploads_total = Counter(
+    f"{NAMESPACE}_s3_uploads_total",
+    "Background S3 upload outcomes",
+    ["status"],  # status: "uploaded", "coalesced", "retried", "failed", "skipped"
+)
+
+s3_upload_duration_seconds = Histogram(
+    f"{NAMESPACE}_s3_upload_duration_seconds",
+    "Duration of successful S3 upload attempts in seconds",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
 # ============================================================================
 # MCP (Model Context Protocol) Metrics
 # ============================================================================
@@ -0,0 +1,124 @@
+"""Bounded worker pool for bcrypt password hashing.
+
+bcrypt spends 100-300ms of CPU per hash/verify by design. Run inline it stalls
+the event loop and every token stream on the worker, so hashing runs on a small
+dedicated thread pool (bcrypt releases the GIL while hashing).
+
+Admission is bounded: at most ``workers + max_queue`` operations may be pending.
+Beyond that ``PasswordHasherSaturatedError`` is raised immediately instead of
+growing an unbounded backlog, and ``saturated`` lets the auth rate-limit tier
+shed requests before they reach the handler.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+import bcrypt
+
+from core.constants import get_settings
+from utils.logger import logger
+from utils.metrics import password_hash_duration_seconds, password_hash_pending, password_hash_wait_seconds
+
+T = TypeVar("T")
+
+
+class PasswordHasherSaturatedError(RuntimeError):
+    """Raised when the hashing pool has no free worker or queue slot."""
+
+
+class PasswordHasher:
+    """bcrypt hash/verify on a size-limited thread pool with queue accounting."""
+
+    def __init__(self, workers: int = 2, max_queue: int = 16) -> None:
+        """Initialize the pool.
+
+        Args:
+            workers: Threads hashing concurrently (each occupies one CPU core)
+            max_queue: Operations allowed to wait for a worker before rejecting
+        """
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._workers = workers
+        self._capacity = workers + max_queue
+        self._pending = 0
+        self._rejected = 0
+        self._completed = 0
+        self._wait_total = 0.0
+
+    @property
+    def saturated(self) -> bool:
+        """True when new operations would be rejected."""
+        return self._pending >= self._capacity
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with a fresh salt."""
+        hashed = await self._run("hash", lambda: bcrypt.hashpw(password.encode(), bcrypt.gensalt()))
+        return hashed.decode()
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        """Check a password against a stored bcrypt hash."""
+        return await self._run("verify", lambda: bcrypt.checkpw(password.encode(), password_hash.encode()))
+
+    async def _run(self, operation: str, fn: Callable[[], T]) -> T:
+        if self.saturated:
+            self._rejected += 1
+            raise PasswordHasherSaturatedError("Password hashing pool is saturated")
+
+        submitted = time.perf_counter()
+
+        def timed() -> tuple[float, T]:
+            started = time.perf_counter()
+            try:
+                return started - submitted, fn()
+            finally:
+                password_hash_duration_seconds.labels(operation=operation).observe(time.perf_counter() - started)
+
+        self._pending += 1
+        password_hash_pending.set(self._pending)
+        try:
+            wait, result = await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self._pending -= 1
+            password_hash_pending.set(self._pending)
+
+        self._completed += 1
+        self._wait_total += wait
+        password_hash_wait_seconds.observe(wait)
+        return result
+
+    def shutdown(self) -> None:
+        """Stop the worker threads (queued operations still complete)."""
+        self._executor.shutdown(wait=False)
+        logger.info("Password hashing pool stopped")
+
+    def stats(self) -> dict[str, Any]:
+        """Pool statistics."""
+        return {
+            "workers": self._workers,
+            "capacity": self._capacity,
+            "pending": self._pending,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_wait_ms": round(self._wait_total / self._completed * 1000, 1) if self._completed else 0.0,
+        }
+
+
+# Module-level singleton
+_password_hasher: PasswordHasher | None = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Get or create the singleton password hasher."""
+    global _password_hasher  # noqa: PLW0603
+    if _password_hasher is None:
+        settings = get_settings()
+        _password_hasher = PasswordHasher(
+            workers=settings.password_hash_workers,
+            max_queue=settings.password_hash_max_queue,
+        )
+    return _password_hasher
@@ -0,0 +1,100 @@
+"""Binary asyncpg type codecs for JSONB and PostgreSQL extension types.
+
+Registered on every pool connection so services pass and receive native Python
+objects instead of formatting text themselves:
+
+- ``jsonb``: dicts/lists in, dicts/lists out, serialized with orjson
+- ``vector`` / ``halfvec`` (pgvector): float lists as packed floats instead of
+  text literals like ``"[0.1,0.2,...]"``
+
+Wire formats (big-endian):
+    jsonb:   uint8 version (1), UTF-8 JSON text
+    vector:  uint16 dim, uint16 unused, dim × float32
+    halfvec: uint16 dim, uint16 unused, dim × float16
+"""
+
+from __future__ import annotations
+
+import struct
+
+from collections.abc import Sequence
+from typing import Any
+
+import asyncpg
+import orjson
+
+from utils.logger import logger
+
+_HEADER = struct.Struct(">HH")
+
+#: jsonb binary format version byte
+_JSONB_VERSION = b"\x01"
+
+
+def encode_jsonb(value: Any) -> bytes:
+    """Encode a Python object as a ``jsonb`` binary value.
+
+    UUIDs, datetimes and dataclasses are serialized natively by orjson;
+    non-string dict keys are stringified like ``json.dumps`` does.
+    """
+    return _JSONB_VERSION + orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def decode_jsonb(data: bytes) -> Any:
+    """Decode a ``jsonb`` binary value into a Python object."""
+    return orjson.loads(memoryview(data)[1:])
+
+
+def encode_vector(value: Sequence[float]) -> bytes:
+    """Encode a float sequence as a pgvector ``vector`` binary value."""
+    dim = len(value)
+    return struct.pack(f">HH{dim}f", dim, 0, *value)
+
+
+def decode_vector(data: bytes) -> list[float]:
+    """Decode a pgvector ``vector`` binary value into a float list."""
+    dim, _ = _HEADER.unpack_from(data)
+    return list(struct.unpack_from(f">{dim}f", data, _HEADER.size))
+
+
+def encode_halfvec(value: Sequence[float]) -> bytes:
+    """Encode a float sequence as a pgvector ``halfvec`` binary value."""
+    dim = len(value)
+    return struct.pack(f">HH{dim}e", dim, 0, *value)
+
+
+def decode_halfvec(data: bytes) -> list[float]:
+    """Decode a pgvector ``halfvec`` binary value into a float list."""
+    dim, _ = _HEADER.unpack_from(data)
+    return list(struct.unpack_from(f">{dim}e", data, _HEADER.size))
+
+
+async def register_type_codecs(conn: asyncpg.Connection) -> None:
+    """Register binary codecs for JSONB and extension types on a connection.
+
+    Safe to call on databases without pgvector: the missing types are skipped
+    with a warning so non-vector queries keep working.
+    """
+    await conn.set_type_codec(
+        "jsonb",
+        schema="pg_catalog",
+        encoder=encode_jsonb,
+        decoder=decode_jsonb,
+        format="binary",
+    )
+
+    for type_name, encoder, decoder in (
+        ("vector", encode_vector, decode_vector),
+        ("halfvec", encode_halfvec, decode_halfvec),
+    ):
+        try:
+            await conn.set_type_codec(
+                type_name,
+                schema="public",
+                encoder=encoder,
+                decoder=decoder,
+                format="binary",
+            )
+        except ValueError:  # noqa: PERF203
+            # asyncpg raises ValueError for unknown types (extension not installed)
+            logger.warning(f"pgvector type '{type_name}' not found; binary codec not registered")
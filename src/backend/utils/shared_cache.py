@@ -0,0 +1,226 @@
+"""Cross-process cache tier for TieredCache, backed by PostgreSQL.
+
+- PostgresCacheBackend: optional shared L2 on the UNLOGGED cache_entries table
+- SharedCacheCoordinator: publishes invalidations with pg_notify and applies
+  invalidations from other workers/replicas received on a dedicated LISTEN
+  connection
+
+Both reuse the existing database, so multi-replica deployments need no extra
+service. Invalidation messages are JSON payloads on CACHE_INVALIDATION_CHANNEL:
+``{"o": origin, "c": cache name, "k": key or null for clear}``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import secrets
+
+from typing import Any
+
+import asyncpg
+import orjson
+
+from core.constants import (
+    CACHE_INVALIDATION_CHANNEL,
+    CACHE_LISTENER_RECONNECT_DELAY,
+    CACHE_SHARED_PURGE_INTERVAL,
+)
+from utils.cache import TieredCache
+from utils.logger import logger
+
+
+class PostgresCacheBackend:
+    """Shared cache tier on an UNLOGGED table (values stored as JSONB).
+
+    Values must be JSON-serializable; they come back as plain dicts/lists.
+    Expired rows are ignored on read and removed by ``purge_expired``.
+    """
+
+    def __init__(self, pool: asyncpg.Pool, namespace: str, default_ttl: float = 60.0) -> None:
+        self.pool = pool
+        self.namespace = namespace
+        self._default_ttl = default_ttl
+
+    async def get(self, key: str) -> Any | None:
+        async with self.pool.acquire() as conn:
+            return await conn.fetchval(
+                "SELECT value FROM cache_entries WHERE namespace = $1 AND key = $2 AND expires_at > now()",
+                self.namespace,
+                key,
+            )
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        ttl = ttl if ttl is not None else self._default_ttl
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                """
+                INSERT INTO cache_entries (namespace, key, value, expires_at)
+                VALUES ($1, $2, $3, now() + make_interval(secs => $4))
+                ON CONFLICT (namespace, key)
+                DO UPDATE SET value = EXCLUDED.value, expires_at = EXCLUDED.expires_at
+                """,
+                self.namespace,
+                key,
+                value,
+                ttl,
+            )
+
+    async def delete(self, key: str) -> bool:
+        async with self.pool.acquire() as conn:
+            result: str = await conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = $1 AND key = $2",
+                self.namespace,
+                key,
+            )
+        return result == "DELETE 1"
+
+    async def clear(self) -> None:
+        async with self.pool.acquire() as conn:
+            await conn.execute("DELETE FROM cache_entries WHERE namespace = $1", self.namespace)
+
+    @staticmethod
+    async def purge_expired(pool: asyncpg.Pool) -> int:
+        """Delete expired rows across all namespaces. Returns rows removed."""
+        async with pool.acquire() as conn:
+            result: str = await conn.execute("DELETE FROM cache_entries WHERE expires_at <= now()")
+        return int(result.split()[-1])
+
+
+class SharedCacheCoordinator:
+    """Attaches shared tiers and cross-process invalidation to TieredCaches.
+
+    Holds one dedicated connection (outside the pool) for LISTEN. If it drops,
+    the coordinator reconnects and clears every L1, since invalidations sent
+    while disconnected were missed.
+    """
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        dsn: str,
+        caches: dict[str, TieredCache],
+        *,
+        shared_backend: str = "none",
+        invalidation: bool = True,
+    ) -> None:
+        self.pool = pool
+        self.dsn = dsn
+        self.caches = caches
+        self.shared_backend = shared_backend
+        self.invalidation = invalidation
+        self.origin = secrets.token_hex(8)
+        self._listen_conn: asyncpg.Connection | None = None
+        self._reconnect_task: asyncio.Task[None] | None = None
+        self._purge_task: asyncio.Task[None] | None = None
+        self._stopping = False
+        self._received = 0
+
+    async def start(self) -> None:
+        """Attach tiers/publishers to the caches and start listening."""
+        for name, cache in self.caches.items():
+            if self.shared_backend == "postgres":
+                cache.shared = PostgresCacheBackend(self.pool, name, cache.default_ttl)
+            if self.invalidation:
+                cache.publisher = self.publish
+
+        if self.invalidation:
+            try:
+                await self._connect()
+            except Exception as e:
+                logger.error(f"Cache invalidation listener failed to connect: {e}")
+                self._schedule_reconnect()
+
+        if self.shared_backend == "postgres":
+            self._purge_task = asyncio.create_task(self._purge_loop())
+
+        logger.info(
+            f"Cache tiers configured (shared={self.shared_backend}, "
+            f"invalidation={'listen/notify' if self.invalidation else 'local only'})"
+        )
+
+    async def stop(self) -> None:
+        """Detach from the caches and close the LISTEN connection."""
+        self._stopping = True
+        for task in (self._reconnect_task, self._purge_task):
+            if task:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+
+        for cache in self.caches.values():
+            cache.shared = None
+            cache.publisher = None
+
+        if self._listen_conn is not None:
+            with contextlib.suppress(Exception):
+                await self._listen_conn.close()
+            self._listen_conn = None
+
+    async def publish(self, cache_name: str, key: str | None) -> None:
+        """Broadcast an invalidation to other processes."""
+        payload = orjson.dumps({"o": self.origin, "c": cache_name, "k": key}).decode()
+        await self.pool.execute("SELECT pg_notify($1, $2)", CACHE_INVALIDATION_CHANNEL, payload)
+
+    def _on_notification(self, _conn: Any, _pid: int, _channel: str, payload: str) -> None:
+        try:
+            message = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            logger.warning(f"Ignoring malformed cache invalidation: {payload[:100]}")
+            return
+
+        if message.get("o") == self.origin:
+            return  # Already applied locally
+        cache = self.caches.get(message.get("c"))
+        if cache is not None:
+            self._received += 1
+            cache.invalidate_local(message.get("k"))
+
+    async def _connect(self) -> None:
+        conn = await asyncpg.connect(self.dsn)
+        await conn.add_listener(CACHE_INVALIDATION_CHANNEL, self._on_notification)
+        conn.add_termination_listener(self._on_connection_lost)
+        self._listen_conn = conn
+
+    def _on_connection_lost(self, _conn: Any) -> None:
+        self._listen_conn = None
+        if not self._stopping:
+            logger.warning("Cache invalidation listener connection lost; reconnecting")
+            self._schedule_reconnect()
+
+    def _schedule_reconnect(self) -> None:
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect_loop())
+
+    async def _reconnect_loop(self) -> None:
+        while not self._stopping:
+            await asyncio.sleep(CACHE_LISTENER_RECONNECT_DELAY)
+            try:
+                await self._connect()
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener reconnect failed: {e}")
+                continue
+            # Invalidations sent while disconnected were missed
+            for cache in self.caches.values():
+                cache.invalidate_local(None)
+            logger.info("Cache invalidation listener reconnected")
+            return
+
+    async def _purge_loop(self) -> None:
+        while not self._stopping:
+            await asyncio.sleep(CACHE_SHARED_PURGE_INTERVAL)
+            try:
+                removed = await PostgresCacheBackend.purge_expired(self.pool)
+                if removed:
+                    logger.debug(f"Purged {removed} expired shared cache entries")
+            except Exception as e:
+                logger.warning(f"Shared cache purge failed: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        """Coordinator status for health reporting."""
+        return {
+            "shared_backend": self.shared_backend,
+            "invalidation": self.invalidation,
+            "listening": self._listen_conn is not None,
+            "invalidations_received": self._received,
+        }
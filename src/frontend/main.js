@@ -673,12 +673,17 @@ app.whenReady().then(() => {
           case "load_more": {
             const sessionId = data?.session_id;
             if (!sessionId) return { error: "Missing session_id", messages: [] };
-            const offset = data?.offset ?? 0;
             const limit = data?.limit ?? 50;
-            const result = await apiRequest(`/api/v1/sessions/${sessionId}/messages?limit=${limit}&offset=${offset}`, {
+            // Keyset pagination: cursor pages backwards from the newest message
+            const cursor = data?.cursor ? `&cursor=${encodeURIComponent(data.cursor)}` : "";
+            const result = await apiRequest(`/api/v1/sessions/${sessionId}/messages?limit=${limit}${cursor}`, {
               signal: controller.signal,
             });
-            return { success: true, messages: result.messages || [] };
+            return {
+              success: true,
+              messages: result.messages || [],
+              next_cursor: result.pagination?.next_cursor ?? null,
+            };
           }
           case "update_config": {
             const sessionId = data?.session_id;
@@ -158,15 +158,9 @@ export function setupSessionEventHandlers({
         }
 
         // Load remaining messages in background if there are more
-        if (sessionData.hasMore && sessionData.loadedCount > 0) {
+        if (sessionData.hasMore && sessionData.nextCursor) {
           console.log("[session] Loading remaining messages in background...");
-          loadRemainingMessages(
-            sessionId,
-            sessionData.loadedCount,
-            sessionData.messageCount,
-            sessionService,
-            chatContainer
-          );
+          loadRemainingMessages(sessionId, sessionData.nextCursor, sessionService, chatContainer);
         }
 
         // Reconstruct streaming state if session has active streaming (e.g., tool orchestration)
@@ -184,48 +178,37 @@ export function setupSessionEventHandlers({
    * Load remaining messages in background and prepend to chat
    * Called after initial session load when has_more=true
    *
-   * The initial session load fetches the NEWEST messages (DESC order, then reversed).
-   * This function loads the OLDER messages that weren't included in the initial load.
-   * The messages API uses ASC order, so offset=0 gets the oldest messages first.
+   * The initial session load fetches the NEWEST messages and returns a cursor
+   * positioned at the oldest of them. Each page returned by the messages API is
+   * the next OLDER chunk (chronological within the chunk), so prepending pages in
+   * the order they arrive keeps the whole history in order.
    *
    * @param {string} sessionId - Session ID to load messages for
-   * @param {number} loadedCount - Number of messages already loaded (the newest ones)
-   * @param {number} totalCount - Total messages in session
+   * @param {string} cursor - next_cursor from the initial session load
    * @param {Object} sessionService - Session service instance
    * @param {Object} chatContainer - Chat container component
    */
-  const loadRemainingMessages = async (sessionId, loadedCount, totalCount, sessionService, chatContainer) => {
-    // Calculate how many older messages we need to load
-    const remainingCount = totalCount - loadedCount;
-    if (remainingCount <= 0) {
-      console.log(`[session] No remaining messages to load`);
-      return;
-    }
-
+  const loadRemainingMessages = async (sessionId, cursor, sessionService, chatContainer) => {
     const chunkSize = 100; // Match backend MAX_MESSAGES_PER_CHUNK
-    let offset = 0; // Start from the oldest messages (ASC order)
     let loaded = 0;
 
-    console.log(
-      `[session] loadRemainingMessages starting: need ${remainingCount} older messages, totalCount=${totalCount}, loadedCount=${loadedCount}`
-    );
+    console.log(`[session] loadRemainingMessages starting from cursor=${cursor}`);
 
-    while (loaded < remainingCount) {
+    while (cursor) {
       try {
-        const limit = Math.min(chunkSize, remainingCount - loaded);
-        console.log(`[session] Loading chunk at offset=${offset}, limit=${limit}`);
-        const result = await sessionService.loadMoreMessages(sessionId, offset, limit);
+        const result = await sessionService.loadMoreMessages(sessionId, cursor, chunkSize);
         console.log(`[session] loadMoreMessages result:`, {
           success: result.success,
           messageCount: result.messages?.length,
+          hasMore: Boolean(result.nextCursor),
         });
 
         if (result.success && result.messages?.length > 0) {
           // Prepend older messages to the beginning of chat
           chatContainer.prependMessages(result.messages);
-          offset += result.messages.length;
           loaded += result.messages.length;
-          console.log(`[session] Prepended ${result.messages.length} messages, loaded ${loaded}/${remainingCount}`);
+          cursor = result.nextCursor;
+          console.log(`[session] Prepended ${result.messages.length} messages, loaded ${loaded}`);
         } else {
           // No more messages or error - stop loading
           console.log(`[session] Stopping: success=${result.success}, error=${result.error}`);
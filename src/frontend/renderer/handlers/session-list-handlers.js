@@ -373,12 +373,12 @@ async function handleSwitch(sessionId, sessionService, streamManager, updateSess
       }
 
       // Load remaining messages before stream reconstruction to preserve ordering
-      if (result.hasMore && result.loadedCount > 0) {
+      if (result.hasMore && result.nextCursor) {
         console.log("[session] Loading remaining messages in background...", {
           loadedCount: result.loadedCount,
           messageCount: result.messageCount,
         });
-        await loadRemainingMessages(sessionId, result.loadedCount, result.messageCount, sessionService);
+        await loadRemainingMessages(sessionId, result.nextCursor, sessionService);
       }
 
       // AFTER history is loaded, reconstruct streaming state if session is actively streaming
@@ -428,39 +428,28 @@ async function handleSwitch(sessionId, sessionService, streamManager, updateSess
  * Load remaining messages in background and prepend to chat
  * Called after initial session load when hasMore=true
  *
- * The initial session load fetches the NEWEST messages (DESC order, then reversed).
- * This function loads the OLDER messages that weren't included in the initial load.
- * The messages API uses ASC order, so offset=0 gets the oldest messages first.
+ * The initial session load fetches the NEWEST messages and returns a cursor
+ * positioned at the oldest of them. Each page returned by the messages API is
+ * the next OLDER chunk (chronological within the chunk), so prepending pages in
+ * the order they arrive keeps the whole history in order.
  *
  * @param {string} sessionId - Session ID to load messages for
- * @param {number} loadedCount - Number of messages already loaded (the newest ones)
- * @param {number} totalCount - Total messages in session
+ * @param {string} cursor - next_cursor from the initial session load
  * @param {Object} sessionService - Session service instance
  */
-async function loadRemainingMessages(sessionId, loadedCount, totalCount, sessionService) {
-  // Calculate how many older messages we need to load
-  const remainingCount = totalCount - loadedCount;
-  if (remainingCount <= 0) {
-    console.log(`[session] No remaining messages to load`);
-    return;
-  }
-
+async function loadRemainingMessages(sessionId, cursor, sessionService) {
   const chunkSize = 100; // Match backend MAX_MESSAGES_PER_CHUNK
-  let offset = 0; // Start from the oldest messages (ASC order)
   let loaded = 0;
 
-  console.log(
-    `[session] loadRemainingMessages starting: need ${remainingCount} older messages, totalCount=${totalCount}, loadedCount=${loadedCount}`
-  );
+  console.log(`[session] loadRemainingMessages starting from cursor=${cursor}`);
 
-  while (loaded < remainingCount) {
+  while (cursor) {
     try {
-      const limit = Math.min(chunkSize, remainingCount - loaded);
-      console.log(`[session] Loading chunk at offset=${offset}, limit=${limit}`);
-      const result = await sessionService.loadMoreMessages(sessionId, offset, limit);
+      const result = await sessionService.loadMoreMessages(sessionId, cursor, chunkSize);
       console.log(`[session] loadMoreMessages result:`, {
         success: result.success,
         messageCount: result.messages?.length,
+        hasMore: Boolean(result.nextCursor),
       });
 
       if (result.success && result.messages?.length > 0) {
@@ -468,9 +457,9 @@ async function loadRemainingMessages(sessionId, loadedCount, totalCount, session
         if (window.components?.chatContainer) {
           window.components.chatContainer.prependMessages(result.messages);
         }
-        offset += result.messages.length;
         loaded += result.messages.length;
-        console.log(`[session] Prepended ${result.messages.length} messages, loaded ${loaded}/${remainingCount}`);
+        cursor = result.nextCursor;
+        console.log(`[session] Prepended ${result.messages.length} messages, loaded ${loaded}`);
       } else {
         // No more messages or error - stop loading
         console.log(`[session] Stopping: success=${result.success}, error=${result.error}`);
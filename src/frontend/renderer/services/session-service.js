@@ -230,6 +230,7 @@ export class SessionService {
           session: response.session,
           fullHistory: response.messages || response.full_history || [],
           hasMore: response.has_more || false,
+          nextCursor: response.next_cursor || null,
           loadedCount: response.loaded_count || 0,
           messageCount: response.message_count || 0,
           // Token fields are nested in session object
@@ -436,20 +437,20 @@ export class SessionService {
    * Load more messages for current session (pagination)
    *
    * @param {string} sessionId - Session ID
-   * @param {number} offset - Message offset
+   * @param {string} cursor - Cursor of the oldest loaded message (next_cursor from the previous page)
    * @param {number} limit - Messages per page
-   * @returns {Promise<Object>} Result with messages
+   * @returns {Promise<Object>} Result with messages (chronological) and nextCursor (null when no older messages)
    */
-  async loadMoreMessages(sessionId, offset, limit = 100) {
+  async loadMoreMessages(sessionId, cursor, limit = 100) {
     if (!sessionId) {
       return { success: false, error: "No session ID provided", messages: [] };
     }
 
     try {
-      const response = await this.ipc.sendSessionCommand("load_more", { session_id: sessionId, offset, limit });
+      const response = await this.ipc.sendSessionCommand("load_more", { session_id: sessionId, cursor, limit });
 
       if (response?.messages) {
-        return { success: true, messages: response.messages };
+        return { success: true, messages: response.messages, nextCursor: response.next_cursor ?? null };
       } else if (response?.error) {
         return { success: false, error: response.error, messages: [] };
       } else {
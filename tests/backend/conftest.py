@@ -44,6 +44,13 @@ def pytest_configure(config: pytest.Config) -> None:
     mock_settings.log_level = "INFO"
     mock_settings.http_request_logging = False
     mock_settings.tavily_api_key = None
+    mock_settings.context_ann_storage = "halfvec"
+    mock_settings.cache_shared_backend = "none"
+    mock_settings.cache_invalidation_enabled = False
+    mock_settings.auth_stateless_tokens = False
+    mock_settings.password_hash_workers = 2
+    mock_settings.password_hash_max_queue = 16
+    mock_settings.rate_limit_backend = "local"
 
     # Store for later use - cast to Any to avoid mypy attr-defined errors
     cfg: Any = config
@@ -117,6 +124,13 @@ def mock_settings_for_ci(monkeypatch: pytest.MonkeyPatch) -> Generator[MagicMock
     mock_settings.log_level = "INFO"
     mock_settings.http_request_logging = False
     mock_settings.tavily_api_key = None
+    mock_settings.context_ann_storage = "halfvec"
+    mock_settings.cache_shared_backend = "none"
+    mock_settings.cache_invalidation_enabled = False
+    mock_settings.auth_stateless_tokens = False
+    mock_settings.password_hash_workers = 2
+    mock_settings.password_hash_max_queue = 16
+    mock_settings.rate_limit_backend = "local"
 
     # Patch at the core.constants level so all imports get the mock
     monkeypatch.setattr("core.constants.get_settings", lambda: mock_settings)
@@ -172,6 +186,26 @@ def clear_token_cache() -> Generator[None, None, None]:
         pass
 
 
+@pytest.fixture(autouse=True)
+def isolate_conversion_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Give each test an empty conversion cache outside the real data directory."""
+    from utils import conversion_cache
+
+    monkeypatch.setattr(
+        conversion_cache, "_conversion_cache", conversion_cache.ConversionCache(root=tmp_path / "conversions")
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_summary_cache() -> Generator[None, None, None]:
+    """Clear cached document summaries so mocked summarizers are always called."""
+    from utils import document_processor
+
+    document_processor._summary_cache.evict(None)
+    yield
+    document_processor._summary_cache.evict(None)
+
+
 @pytest.fixture(autouse=True)
 def cleanup_test_session_directories() -> Generator[None, None, None]:
     """Clean up test session directories created in data/files/.
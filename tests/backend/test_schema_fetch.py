@@ -6,10 +6,12 @@ Tests DatabaseRegistry, type normalization, and tool functions.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import tempfile
 
+from collections.abc import AsyncIterator, Iterator
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -17,16 +19,28 @@ import pytest
 
 from tools.schema_fetch import (
     ColumnInfo,
+    ConnectionPools,
     DatabaseConfig,
     DatabaseRegistry,
+    _group_by_table,
+    get_connection_pools,
     get_registry,
     get_table_schema,
+    get_table_schemas,
     list_registered_databases,
     normalize_type,
     reset_registry,
 )
 
 
+@pytest.fixture(autouse=True)
+async def close_schema_pools() -> AsyncIterator[None]:
+    """Close pools opened against mocked drivers so they do not leak into other tests."""
+    yield
+    await get_connection_pools().close_all()
+    reset_registry()
+
+
 class TestTypeNormalization:
     """Tests for normalize_type function."""
 
@@ -411,7 +425,7 @@ databases:
                         ColumnInfo(name="id", type="integer", nullable=False),
                         ColumnInfo(name="name", type="varchar(255)", nullable=True),
                     ]
-                    mock_fetcher = AsyncMock(return_value=mock_columns_info)
+                    mock_fetcher = AsyncMock(return_value={"users": mock_columns_info})
 
                     with patch.dict("tools.schema_fetch.SCHEMA_FETCHERS", {"postgresql": mock_fetcher}):
                         result = await get_table_schema("pg_db", "users")
@@ -437,7 +451,7 @@ databases:
     @pytest.mark.asyncio
     async def test_fetch_postgres_schema_internals(self) -> None:
         """Should fetch PostgreSQL schema using internal fetcher directly."""
-        from tools.schema_fetch import DatabaseConfig, _fetch_postgres_schema
+        from tools.schema_fetch import DatabaseConfig, _fetch_postgres_schemas
 
         config = DatabaseConfig(
             name="test",
@@ -451,6 +465,7 @@ databases:
 
         mock_rows = [
             {
+                "table_name": "users",
                 "column_name": "id",
                 "data_type": "integer",
                 "character_maximum_length": None,
@@ -460,25 +475,27 @@ databases:
             },
         ]
 
-        # Connection mock
-        mock_conn = MagicMock()
-        mock_conn.fetch = AsyncMock(return_value=mock_rows)
-        mock_conn.close = AsyncMock()
+        # Pool mock: asyncpg pools run queries directly
+        mock_pool = MagicMock()
+        mock_pool.fetch = AsyncMock(return_value=mock_rows)
+        mock_pool.close = AsyncMock()
 
         # Mock asyncpg module
         mock_asyncpg = MagicMock()
-        mock_asyncpg.connect = AsyncMock(return_value=mock_conn)
-        # Handle async with asyncpg.connect() -> returns mock_conn
-        mock_asyncpg.connect.return_value.__aenter__.return_value = mock_conn
-        mock_asyncpg.connect.return_value.close = mock_conn.close
+        mock_asyncpg.create_pool = AsyncMock(return_value=mock_pool)
 
         with patch.dict("sys.modules", {"asyncpg": mock_asyncpg}):
-            result = await _fetch_postgres_schema(config, "users")
+            result = await _fetch_postgres_schemas(config, ["users", "missing"])
+            await _fetch_postgres_schemas(config, ["users"])
 
-            assert len(result) == 1
-            assert result[0].name == "id"
-            assert result[0].type == "integer"
-            assert result[0].nullable is False
+            assert list(result) == ["users"]
+            assert result["users"][0].name == "id"
+            assert result["users"][0].type == "integer"
+            assert result["users"][0].nullable is False
+
+            # One pool for both fetches, one query per fetch with all table names
+            mock_asyncpg.create_pool.assert_awaited_once()
+            assert mock_pool.fetch.await_args_list[0].args[1:] == (["users", "missing"], "public")
 
     @pytest.mark.asyncio
     async def test_handles_missing_driver(self) -> None:
@@ -517,6 +534,194 @@ databases:
                 reset_registry()
 
 
+REGISTRY_YAML = """
+databases:
+  pg_db:
+    type: postgresql
+    host: localhost
+    port: 5432
+    database: testdb
+    username: user
+    password: pass
+"""
+
+
+@pytest.fixture
+def pg_registry(tmp_path: Path) -> Iterator[None]:
+    registry_path = tmp_path / "db_registry.yaml"
+    registry_path.write_text(REGISTRY_YAML)
+    with patch("tools.schema_fetch.DEFAULT_REGISTRY_PATH", registry_path):
+        reset_registry()
+        yield
+
+
+class TestGetTableSchemas:
+    """Tests for the batch get_table_schemas tool and the schema cache."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_tables_in_one_call(self, pg_registry: None) -> None:
+        """Should fetch all tables with one fetcher call and list missing ones."""
+        mock_fetcher = AsyncMock(
+            return_value={
+                "users": [ColumnInfo(name="id", type="integer", nullable=False)],
+                "orders": [ColumnInfo(name="total", type="decimal(10,2)", nullable=True)],
+            }
+        )
+        with patch.dict("tools.schema_fetch.SCHEMA_FETCHERS", {"postgresql": mock_fetcher}):
+            result = await get_table_schemas("pg_db", ["users", "orders", "userz", "users"])
+
+        parsed = json.loads(result)
+        assert parsed["success"] is True
+        assert [t["table"] for t in parsed["tables"]] == ["users", "orders"]
+        assert parsed["tables"][1]["columns"][0]["type"] == "decimal(10,2)"
+        assert parsed["not_found"] == ["userz"]
+        mock_fetcher.assert_awaited_once()
+        assert mock_fetcher.await_args.args[1] == ["users", "orders", "userz"]
+
+    @pytest.mark.asyncio
+    async def test_rejects_empty_and_oversized_batches(self, pg_registry: None) -> None:
+        """Should refuse calls without tables or with too many."""
+        assert json.loads(await get_table_schemas("pg_db", []))["success"] is False
+
+        too_many = [f"t{i}" for i in range(101)]
+        parsed = json.loads(await get_table_schemas("pg_db", too_many))
+        assert parsed["success"] is False
+        assert "Too many tables" in parsed["error"]
+
+    @pytest.mark.asyncio
+    async def test_schemas_are_cached(self, pg_registry: None) -> None:
+        """Should serve repeated lookups from the cache until the registry is reset."""
+        users = [ColumnInfo(name="id", type="integer", nullable=False)]
+        mock_fetcher = AsyncMock(side_effect=lambda _config, names: {n: users for n in names if n == "users"})
+        with patch.dict("tools.schema_fetch.SCHEMA_FETCHERS", {"postgresql": mock_fetcher}):
+            await get_table_schema("pg_db", "users")
+            await get_table_schemas("pg_db", ["users", "orders"])
+            assert json.loads(await get_table_schema("pg_db", "users"))["column_count"] == 1
+
+            # Only orders (not found, so not cached) was fetched again
+            assert [call.args[1] for call in mock_fetcher.await_args_list] == [["users"], ["orders"]]
+
+            reset_registry()
+            await get_table_schema("pg_db", "users")
+            assert mock_fetcher.await_count == 3
+
+
+class TestConnectionPools:
+    """Tests for per-database connection pools."""
+
+    @staticmethod
+    def _config(password: str = "pass") -> DatabaseConfig:
+        return DatabaseConfig(
+            name="pg_db",
+            type="postgresql",
+            host="localhost",
+            port=5432,
+            database="testdb",
+            username="user",
+            password=password,
+        )
+
+    @staticmethod
+    def _opener() -> AsyncMock:
+        async def open_pool(config: DatabaseConfig, max_size: int) -> tuple[MagicMock, AsyncMock]:
+            return MagicMock(name=f"pool-{config.password}"), AsyncMock()
+
+        return AsyncMock(side_effect=open_pool)
+
+    @pytest.mark.asyncio
+    async def test_pool_opened_once_and_reused(self) -> None:
+        """Concurrent leases should share one lazily opened pool."""
+        pools = ConnectionPools()
+        opener = self._opener()
+
+        async def use() -> object:
+            async with pools.lease(self._config(), opener) as pool:
+                await asyncio.sleep(0)
+                return pool
+
+        handles = await asyncio.gather(*(use() for _ in range(5)))
+
+        assert len(set(map(id, handles))) == 1
+        opener.assert_awaited_once()
+        await pools.close_all()
+
+    @pytest.mark.asyncio
+    async def test_pool_reopened_when_config_changes(self) -> None:
+        """A changed registry entry should replace the old pool with a new one."""
+        pools = ConnectionPools()
+        opener = self._opener()
+
+        async with pools.lease(self._config(), opener):
+            pass
+        async with pools.lease(self._config(password="rotated"), opener):
+            pass
+
+        assert opener.await_count == 2
+        assert pools.open_databases() == ["pg_db"]
+        await pools.close_all()
+
+    @pytest.mark.asyncio
+    async def test_replaced_pool_closes_after_last_lease(self) -> None:
+        """A config change should not close a pool other callers are still using."""
+        pools = ConnectionPools()
+        old_close, new_close = AsyncMock(), AsyncMock()
+        opener = AsyncMock(side_effect=[(MagicMock(), old_close), (MagicMock(), new_close)])
+
+        async with pools.lease(self._config(), opener) as old_pool:
+            async with pools.lease(self._config(password="rotated"), opener) as new_pool:
+                assert new_pool is not old_pool
+                old_close.assert_not_awaited()  # Still leased by the outer block
+            old_close.assert_not_awaited()
+        old_close.assert_awaited_once()
+
+        new_close.assert_not_awaited()
+        await pools.close_all()
+        new_close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_discard_ignores_already_replaced_pool(self) -> None:
+        """Discarding a stale handle should leave its replacement open."""
+        pools = ConnectionPools()
+        opener = self._opener()
+
+        async with pools.lease(self._config(), opener) as old_pool:
+            await pools.discard("pg_db", old_pool)
+            assert pools.open_databases() == []
+            async with pools.lease(self._config(), opener) as new_pool:
+                await pools.discard("pg_db", old_pool)  # e.g. a second caller saw the same expired session
+                assert pools.open_databases() == ["pg_db"]
+                assert new_pool is not old_pool
+
+        assert opener.await_count == 2
+        await pools.close_all()
+
+    @pytest.mark.asyncio
+    async def test_idle_pools_are_closed(self) -> None:
+        """Pools unused for idle_timeout should be closed by the idle checker."""
+        pools = ConnectionPools(idle_timeout=0.02)
+        close = AsyncMock()
+        opener = AsyncMock(return_value=(MagicMock(), close))
+
+        async with pools.lease(self._config(), opener):
+            await asyncio.sleep(0.05)  # Leased pools are never idle
+            assert pools.open_databases() == ["pg_db"]
+
+        await asyncio.sleep(0.1)
+        assert pools.open_databases() == []
+        close.assert_awaited_once()
+        await pools.close_all()
+
+
+def test_group_by_table_matches_requested_names() -> None:
+    """Columns should be grouped under the requested names, case-insensitively as a fallback."""
+    id_col = ColumnInfo(name="id", type="integer", nullable=False)
+    name_col = ColumnInfo(name="name", type="text", nullable=True)
+
+    grouped = _group_by_table([("Users", id_col), ("Users", name_col), ("orders", id_col)], ["users", "missing"])
+
+    assert grouped == {"users": [id_col, name_col]}
+
+
 class TestColumnInfo:
     """Tests for ColumnInfo dataclass."""
 
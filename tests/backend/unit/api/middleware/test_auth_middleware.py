@@ -41,13 +41,12 @@ async def test_get_current_user_valid_token(
     mock_request: MagicMock, mock_db_pool: MagicMock, mock_auth_service: MagicMock
 ) -> None:
     creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials="valid_token")
-    mock_auth_service.decode_access_token.return_value = {"sub": "550e8400-e29b-41d4-a716-446655440000"}
-    mock_auth_service.get_user_by_id = AsyncMock(return_value={"id": "uid", "email": "user@test.com"})
+    mock_auth_service.authenticate = AsyncMock(return_value=mock_auth_service.user_payload.return_value)
 
     user = await get_current_user(mock_request, creds, mock_db_pool)
 
     assert user.email == "user@test.com"
-    mock_auth_service.decode_access_token.assert_called_with("valid_token")
+    mock_auth_service.authenticate.assert_awaited_with("valid_token")
 
 
 @pytest.mark.asyncio
@@ -55,7 +54,7 @@ async def test_get_current_user_invalid_token(
     mock_request: MagicMock, mock_db_pool: MagicMock, mock_auth_service: MagicMock
 ) -> None:
     creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials="bad_token")
-    mock_auth_service.decode_access_token.side_effect = ValueError("Bad token")
+    mock_auth_service.authenticate = AsyncMock(side_effect=ValueError("Bad token"))
 
     with pytest.raises(AuthenticationError) as exc:
         await get_current_user(mock_request, creds, mock_db_pool)
@@ -68,8 +67,7 @@ async def test_get_current_user_user_not_found(
     mock_request: MagicMock, mock_db_pool: MagicMock, mock_auth_service: MagicMock
 ) -> None:
     creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials="valid_token")
-    mock_auth_service.decode_access_token.return_value = {"sub": "550e8400-e29b-41d4-a716-446655440000"}
-    mock_auth_service.get_user_by_id = AsyncMock(return_value=None)
+    mock_auth_service.authenticate = AsyncMock(return_value=None)
 
     with pytest.raises(AuthenticationError) as exc:
         await get_current_user(mock_request, creds, mock_db_pool)
@@ -88,18 +86,14 @@ async def test_get_current_user_localhost_bypass(
     mock_settings = MagicMock(spec=Settings)
     mock_settings.allow_localhost_noauth = True
 
-    mock_auth_service.get_default_user = AsyncMock(return_value={"id": "def_uid", "email": "default@test.com"})
+    mock_auth_service.get_default_user_info = AsyncMock(
+        return_value={"id": "550e8400-e29b-41d4-a716-446655440001", "email": "default@test.com"}
+    )
 
     with patch("api.middleware.auth.get_settings", return_value=mock_settings):
         user = await get_current_user(mock_request, None, mock_db_pool)
 
-    assert (
-        user.email == "user@test.com"
-    )  # Returns payload from user_payload, which is mocked in fixture to user@test.com
-    # Wait, mock_auth_service.user_payload returns constant.
-    # But usually it takes the user record.
-    # In test_get_current_user_valid_token we verified email.
-    # Here let's just assert success.
+    assert user.email == "default@test.com"
 
 
 @pytest.mark.asyncio
@@ -120,8 +114,7 @@ async def test_get_current_user_no_creds_remote(mock_request: MagicMock, mock_db
 
 @pytest.mark.asyncio
 async def test_ws_get_user_valid_token(mock_db_pool: MagicMock, mock_auth_service: MagicMock) -> None:
-    mock_auth_service.decode_access_token.return_value = {"sub": "550e8400-e29b-41d4-a716-446655440000"}
-    mock_auth_service.get_user_by_id = AsyncMock(return_value={"id": "uid"})
+    mock_auth_service.authenticate = AsyncMock(return_value=mock_auth_service.user_payload.return_value)
 
     user = await get_current_user_from_token("valid_token", mock_db_pool)
     assert user.email == "user@test.com"
@@ -129,7 +122,7 @@ async def test_ws_get_user_valid_token(mock_db_pool: MagicMock, mock_auth_servic
 
 @pytest.mark.asyncio
 async def test_ws_get_user_invalid_token(mock_db_pool: MagicMock, mock_auth_service: MagicMock) -> None:
-    mock_auth_service.decode_access_token.side_effect = ValueError("Bad token")
+    mock_auth_service.authenticate = AsyncMock(side_effect=ValueError("Bad token"))
 
     with pytest.raises(AuthenticationError) as exc:
         await get_current_user_from_token("bad_token", mock_db_pool)
@@ -2,20 +2,24 @@
 
 from __future__ import annotations
 
-import time
-
-from unittest.mock import MagicMock, patch
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
 from starlette.requests import Request
-from starlette.responses import JSONResponse
 
 from api.middleware.rate_limiter import (
+    RATE_LIMIT_TIERS,
+    GCRARateLimiter,
+    LocalRateLimitBackend,
+    PostgresRateLimitBackend,
     RateLimitMiddleware,
-    SlidingWindowRateLimiter,
     _get_client_identifier,
     _get_tier_for_path,
+    gcra,
 )
 
 
@@ -80,15 +84,53 @@ class TestGetClientIdentifier:
         assert identifier == "ip:203.0.113.50"
 
 
-class TestSlidingWindowRateLimiter:
-    """Tests for the sliding window algorithm."""
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestGcra:
+    """Tests for the pure GCRA step."""
+
+    def test_idle_client_gets_full_capacity(self) -> None:
+        tat, decision = gcra(None, 100.0, interval=1.0, capacity=3)
+        assert tat == 101.0
+        assert decision.allowed is True
+        assert decision.remaining == 2
+
+    def test_denied_leaves_state_and_reports_retry(self) -> None:
+        tat = None
+        for _ in range(3):
+            tat, _ = gcra(tat, 100.0, interval=1.0, capacity=3)
+        new_tat, decision = gcra(tat, 100.0, interval=1.0, capacity=3)
+        assert new_tat is None
+        assert decision.allowed is False
+        assert decision.retry_after == pytest.approx(1.0)
+        assert decision.reset_after == pytest.approx(3.0)
+
+    def test_stale_state_behaves_as_idle(self) -> None:
+        _, decision = gcra(50.0, 100.0, interval=1.0, capacity=3)
+        assert decision.remaining == 2
+
+
+class TestGCRARateLimiter:
+    """Tests for the GCRA rate limiter."""
 
     @pytest.fixture
-    def rate_limiter(self) -> SlidingWindowRateLimiter:
-        return SlidingWindowRateLimiter(cleanup_interval=300.0)
+    def clock(self) -> FakeClock:
+        return FakeClock()
+
+    @pytest.fixture
+    def rate_limiter(self, clock: FakeClock) -> GCRARateLimiter:
+        return GCRARateLimiter(cleanup_interval=300.0, clock=clock)
 
     @pytest.mark.asyncio
-    async def test_first_request_allowed(self, rate_limiter: SlidingWindowRateLimiter) -> None:
+    async def test_first_request_allowed(self, rate_limiter: GCRARateLimiter) -> None:
         """First request should always be allowed."""
         allowed, headers = await rate_limiter.is_allowed("user:1", "api")
         assert allowed is True
@@ -96,7 +138,7 @@ class TestSlidingWindowRateLimiter:
         assert "X-RateLimit-Remaining" in headers
 
     @pytest.mark.asyncio
-    async def test_burst_allowance(self, rate_limiter: SlidingWindowRateLimiter) -> None:
+    async def test_burst_allowance(self, rate_limiter: GCRARateLimiter) -> None:
         """Auth tier should allow burst requests up to limit."""
         # Auth tier has requests_per_minute=10, burst_size=5
         # The burst adds to the base limit, so effective limit starts at 15
@@ -109,17 +151,18 @@ class TestSlidingWindowRateLimiter:
             assert allowed is True, f"Request {i+1} should be allowed"
 
     @pytest.mark.asyncio
-    async def test_rate_limit_headers(self, rate_limiter: SlidingWindowRateLimiter) -> None:
+    async def test_rate_limit_headers(self, rate_limiter: GCRARateLimiter) -> None:
         """Rate limit headers should be accurate."""
         _allowed, headers = await rate_limiter.is_allowed("user:1", "api")
 
-        # API tier is 120 req/min
+        # API tier is 120 req/min: one request takes 0.5s to replenish
         assert headers["X-RateLimit-Limit"] == 120
         assert headers["X-RateLimit-Remaining"] == 119
-        assert headers["X-RateLimit-Reset"] == 60
+        assert headers["X-RateLimit-Reset"] == 1
+        assert "Retry-After" not in headers
 
     @pytest.mark.asyncio
-    async def test_separate_users_independent(self, rate_limiter: SlidingWindowRateLimiter) -> None:
+    async def test_separate_users_independent(self, rate_limiter: GCRARateLimiter) -> None:
         """Different users should have independent rate limits."""
         # Exhaust user 1's limit
         for _ in range(120):
@@ -134,7 +177,7 @@ class TestSlidingWindowRateLimiter:
         assert allowed is True
 
     @pytest.mark.asyncio
-    async def test_separate_tiers_independent(self, rate_limiter: SlidingWindowRateLimiter) -> None:
+    async def test_separate_tiers_independent(self, rate_limiter: GCRARateLimiter) -> None:
         """Different tiers for same user should be independent."""
         # Make requests in auth tier
         for _ in range(15):
@@ -149,154 +192,247 @@ class TestSlidingWindowRateLimiter:
         assert allowed is True
 
     @pytest.mark.asyncio
-    async def test_sliding_window_recovery(self, rate_limiter: SlidingWindowRateLimiter) -> None:
-        """Rate limit should recover as time passes (sliding window)."""
-        # Make 5 requests
-        for _ in range(5):
+    async def test_recovery_over_time(self, rate_limiter: GCRARateLimiter, clock: FakeClock) -> None:
+        """Capacity replenishes continuously at the sustained rate."""
+        for _ in range(120):
             await rate_limiter.is_allowed("user:1", "api")
 
-        # Fast-forward time by modifying timestamps
-        async with rate_limiter._lock:
-            entries = rate_limiter._entries["api"]
-            if "user:1" in entries:
-                # Move all timestamps to 90 seconds ago (outside 60s window)
-                old_ts = [time.monotonic() - 90.0]
-                entries["user:1"].timestamps = old_ts
+        allowed, headers = await rate_limiter.is_allowed("user:1", "api")
+        assert allowed is False
+        assert headers["Retry-After"] == 1
+        assert headers["X-RateLimit-Reset"] == 60
 
-        # Now requests should be allowed again
+        # One emission interval later exactly one request fits again
+        clock.now += 0.5
         allowed, headers = await rate_limiter.is_allowed("user:1", "api")
         assert allowed is True
-        # Old timestamps should be cleaned, so remaining should be nearly full
-        assert headers["X-RateLimit-Remaining"] >= 118
+        assert headers["X-RateLimit-Remaining"] == 0
 
+        # A full minute later the client is back to full capacity
+        clock.now += 60.0
+        allowed, headers = await rate_limiter.is_allowed("user:1", "api")
+        assert allowed is True
+        assert headers["X-RateLimit-Remaining"] == 119
 
-class TestRateLimitMiddleware:
-    """Tests for the FastAPI middleware."""
+    @pytest.mark.asyncio
+    async def test_cleanup_drops_idle_clients(self, rate_limiter: GCRARateLimiter, clock: FakeClock) -> None:
+        """Clients back at full capacity carry no state after cleanup."""
+        for i in range(100):
+            await rate_limiter.is_allowed(f"ip:10.0.0.{i}", "api")
+        await rate_limiter.is_allowed("user:busy", "auth")
+        assert len(rate_limiter.local) == 101
+
+        clock.now += 1.0  # api state (0.5s) has drained, auth (6s) has not
+        await rate_limiter._cleanup_expired()
+
+        assert len(rate_limiter.local) == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_backend_used(self) -> None:
+        """A shared backend decides when configured."""
+        backend = MagicMock()
+        backend.acquire = AsyncMock(return_value=LocalRateLimitBackend().acquire_sync("k", 1.0, 1))
+        rate_limiter = GCRARateLimiter(backend=backend)
+
+        allowed, _ = await rate_limiter.is_allowed("user:1", "upload")
+
+        assert allowed is True
+        backend.acquire.assert_awaited_once_with("upload:user:1", 6.0, 10)
+        assert len(rate_limiter.local) == 0
+
+    @pytest.mark.asyncio
+    async def test_shared_backend_failure_falls_back_to_local(self) -> None:
+        """Backend errors degrade to per-process limits instead of failing requests."""
+        backend = MagicMock()
+        backend.acquire = AsyncMock(side_effect=OSError("db down"))
+        rate_limiter = GCRARateLimiter(backend=backend)
+
+        allowed, _ = await rate_limiter.is_allowed("user:1", "api")
+
+        assert allowed is True
+        assert len(rate_limiter.local) == 1
+        assert rate_limiter.stats()["backend_errors"] == 1
+
+
+class TestPostgresRateLimitBackend:
+    """Tests for the shared Postgres GCRA backend."""
 
     @pytest.fixture
-    def mock_rate_limiter(self) -> SlidingWindowRateLimiter:
-        return SlidingWindowRateLimiter()
+    def pool(self) -> MagicMock:
+        pool = MagicMock()
+        conn = AsyncMock()
+        cm = MagicMock()
+        cm.__aenter__ = AsyncMock(return_value=conn)
+        cm.__aexit__ = AsyncMock(return_value=None)
+        pool.acquire.return_value = cm
+        pool.conn = conn
+        return pool
 
     @pytest.mark.asyncio
-    async def test_exempt_path_bypasses_limiter(self) -> None:
-        """Health endpoints should bypass rate limiting."""
-        call_next_called = False
+    async def test_allowed_upsert(self, pool: MagicMock) -> None:
+        pool.conn.fetchrow.return_value = {"tat": 105.0, "now": 100.0}
+        backend = PostgresRateLimitBackend(pool)
 
-        async def call_next(request: Request) -> JSONResponse:
-            nonlocal call_next_called
-            call_next_called = True
-            return JSONResponse(content={"status": "ok"})
+        decision = await backend.acquire("api:user:1", 0.5, 120)
 
-        request = MagicMock(spec=Request)
-        request.url = MagicMock()
-        request.url.path = "/health"
-        request.headers = {}
+        sql, key, interval, horizon = pool.conn.fetchrow.call_args[0]
+        assert "ON CONFLICT (key) DO UPDATE" in sql
+        assert (key, interval, horizon) == ("api:user:1", 0.5, 60.0)
+        assert decision.allowed is True
+        assert decision.remaining == 110
+        assert pool.conn.fetchrow.await_count == 1
 
-        rate_limiter = SlidingWindowRateLimiter()
-        middleware = RateLimitMiddleware(lambda r: None, rate_limiter)
+    @pytest.mark.asyncio
+    async def test_denied_reads_state(self, pool: MagicMock) -> None:
+        pool.conn.fetchrow.side_effect = [None, {"tat": 160.0, "now": 100.0}]
+        backend = PostgresRateLimitBackend(pool)
 
-        with patch.object(rate_limiter, "is_allowed") as mock_is_allowed:
-            await middleware.dispatch(request, call_next)
+        decision = await backend.acquire("api:user:1", 0.5, 120)
 
-            # Rate limiter should not be called for exempt paths
-            mock_is_allowed.assert_not_called()
-            assert call_next_called is True
+        assert decision.allowed is False
+        assert decision.retry_after == pytest.approx(0.5)
+        assert decision.reset_after == pytest.approx(60.0)
 
     @pytest.mark.asyncio
-    async def test_websocket_bypasses_limiter(self) -> None:
-        """WebSocket upgrade requests should bypass rate limiting."""
-        call_next_called = False
+    async def test_purge_expired(self, pool: MagicMock) -> None:
+        pool.conn.execute.return_value = "DELETE 12"
 
-        async def call_next(request: Request) -> JSONResponse:
-            nonlocal call_next_called
-            call_next_called = True
-            return JSONResponse(content={})
+        assert await PostgresRateLimitBackend(pool).purge_expired() == 12
 
-        request = MagicMock(spec=Request)
-        request.url = MagicMock()
-        request.url.path = "/ws/chat/123"
-        request.headers = {"upgrade": "websocket"}
 
-        rate_limiter = SlidingWindowRateLimiter()
-        middleware = RateLimitMiddleware(lambda r: None, rate_limiter)
+def _client(rate_limiter: GCRARateLimiter) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, rate_limiter=rate_limiter)
 
-        with (
-            patch.object(rate_limiter, "is_allowed") as mock_is_allowed,
-            patch("api.middleware.rate_limiter.get_settings") as mock_settings,
-        ):
-            mock_settings.return_value.is_development = False
+    @app.get("/health")
+    def health() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/api/v1/sessions")
+    def list_sessions() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.post("/api/v1/auth/login")
+    def login() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.post("/api/v1/auth/refresh")
+    def refresh() -> dict[str, str]:
+        return {"status": "ok"}
+
+    return TestClient(app)
+
+
+class TestRateLimitMiddleware:
+    """Tests for the ASGI middleware."""
+
+    @pytest.fixture
+    def mock_settings(self) -> Iterator[MagicMock]:
+        with patch("api.middleware.rate_limiter.get_settings") as mock_settings:
             mock_settings.return_value.rate_limit_enabled = True
-            await middleware.dispatch(request, call_next)
+            yield mock_settings
 
-            mock_is_allowed.assert_not_called()
-            assert call_next_called is True
+    def test_exempt_path_bypasses_limiter(self, mock_settings: MagicMock) -> None:
+        """Health endpoints should bypass rate limiting."""
+        rate_limiter = GCRARateLimiter()
 
-    @pytest.mark.asyncio
-    async def test_rate_limited_returns_429(self) -> None:
-        """Exceeding rate limit should return 429 response."""
+        with patch.object(rate_limiter, "is_allowed") as mock_is_allowed:
+            response = _client(rate_limiter).get("/health")
 
-        async def call_next(request: Request) -> JSONResponse:
-            return JSONResponse(content={"status": "ok"})
+        # Rate limiter should not be called for exempt paths
+        mock_is_allowed.assert_not_called()
+        assert response.status_code == 200
+        assert "X-RateLimit-Limit" not in response.headers
 
-        request = MagicMock(spec=Request)
-        request.url = MagicMock()
-        request.url.path = "/api/v1/sessions"
-        request.headers = {}
-        request.state = MagicMock()
-        request.state.user = None
-        request.client = MagicMock()
-        request.client.host = "192.168.1.1"
+    def test_websocket_bypasses_limiter(self, mock_settings: MagicMock) -> None:
+        """WebSocket upgrade requests should bypass rate limiting."""
+        rate_limiter = GCRARateLimiter()
 
-        rate_limiter = SlidingWindowRateLimiter()
-        middleware = RateLimitMiddleware(lambda r: None, rate_limiter)
+        with patch.object(rate_limiter, "is_allowed") as mock_is_allowed:
+            response = _client(rate_limiter).get("/api/v1/sessions", headers={"upgrade": "websocket"})
+
+        mock_is_allowed.assert_not_called()
+        assert response.status_code == 200
+
+    def test_disabled_bypasses_limiter(self, mock_settings: MagicMock) -> None:
+        mock_settings.return_value.rate_limit_enabled = False
+        rate_limiter = GCRARateLimiter()
+
+        with patch.object(rate_limiter, "is_allowed") as mock_is_allowed:
+            response = _client(rate_limiter).get("/api/v1/sessions")
+
+        mock_is_allowed.assert_not_called()
+        assert response.status_code == 200
+
+    def test_rate_limited_returns_429(self, mock_settings: MagicMock) -> None:
+        """Exceeding rate limit should return 429 response."""
+        rate_limiter = GCRARateLimiter()
 
         # Mock is_allowed to return False (rate limited)
-        with (
-            patch.object(
-                rate_limiter,
-                "is_allowed",
-                return_value=(False, {"X-RateLimit-Limit": 120, "X-RateLimit-Remaining": 0, "X-RateLimit-Reset": 60}),
-            ),
-            patch("api.middleware.rate_limiter.get_settings") as mock_settings,
+        with patch.object(
+            rate_limiter,
+            "is_allowed",
+            return_value=(False, {"X-RateLimit-Limit": 120, "X-RateLimit-Remaining": 0, "X-RateLimit-Reset": 60}),
         ):
-            mock_settings.return_value.is_development = False
-            mock_settings.return_value.rate_limit_enabled = True
-            response = await middleware.dispatch(request, call_next)
+            response = _client(rate_limiter).get("/api/v1/sessions")
 
         assert response.status_code == 429
         assert response.headers["Retry-After"] == "60"
+        assert response.headers["X-RateLimit-Remaining"] == "0"
+        assert response.json()["error"] == "rate_limit_exceeded"
 
-    @pytest.mark.asyncio
-    async def test_allowed_request_includes_headers(self) -> None:
+    def test_allowed_request_includes_headers(self, mock_settings: MagicMock) -> None:
         """Allowed requests should include rate limit headers."""
+        rate_limiter = GCRARateLimiter()
 
-        async def call_next(request: Request) -> JSONResponse:
-            return JSONResponse(content={"status": "ok"})
+        with patch.object(
+            rate_limiter,
+            "is_allowed",
+            return_value=(True, {"X-RateLimit-Limit": 120, "X-RateLimit-Remaining": 119, "X-RateLimit-Reset": 60}),
+        ) as mock_is_allowed:
+            response = _client(rate_limiter).get("/api/v1/sessions")
 
-        request = MagicMock(spec=Request)
-        request.url = MagicMock()
-        request.url.path = "/api/v1/sessions"
-        request.headers = {}
-        request.state = MagicMock()
-        request.state.user = None
-        request.client = MagicMock()
-        request.client.host = "192.168.1.1"
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+        assert response.headers["X-RateLimit-Limit"] == "120"
+        assert response.headers["X-RateLimit-Remaining"] == "119"
+        mock_is_allowed.assert_called_once_with("ip:testclient", "api")
 
-        rate_limiter = SlidingWindowRateLimiter()
-        middleware = RateLimitMiddleware(lambda r: None, rate_limiter)
+    def test_limits_enforced_end_to_end(self, mock_settings: MagicMock) -> None:
+        """Real limiter: the burst is allowed, the next request is rejected."""
+        client = _client(GCRARateLimiter())
+        capacity = RATE_LIMIT_TIERS["api"].capacity
+
+        statuses = [client.get("/api/v1/sessions").status_code for _ in range(capacity + 1)]
+
+        assert statuses[:capacity] == [200] * capacity
+        assert statuses[-1] == 429
+
+    def test_saturated_auth_tier_is_shed(self, mock_settings: MagicMock) -> None:
+        """Auth requests get 503 while the password hashing pool is saturated."""
+        rate_limiter = GCRARateLimiter()
 
         with (
-            patch.object(
-                rate_limiter,
-                "is_allowed",
-                return_value=(True, {"X-RateLimit-Limit": 120, "X-RateLimit-Remaining": 119, "X-RateLimit-Reset": 60}),
-            ),
-            patch("api.middleware.rate_limiter.get_settings") as mock_settings,
+            patch.object(rate_limiter, "is_allowed") as mock_is_allowed,
+            patch("api.middleware.rate_limiter.get_password_hasher") as mock_hasher,
         ):
-            mock_settings.return_value.is_development = False
-            mock_settings.return_value.rate_limit_enabled = True
-            response = await middleware.dispatch(request, call_next)
+            mock_hasher.return_value.saturated = True
+            response = _client(rate_limiter).post("/api/v1/auth/login")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        mock_is_allowed.assert_not_called()
+
+    def test_saturation_does_not_shed_refresh(self, mock_settings: MagicMock) -> None:
+        """Token refresh does no password hashing, so it is not shed."""
+        rate_limiter = GCRARateLimiter()
+
+        with (
+            patch.object(rate_limiter, "is_allowed", return_value=(True, {})) as mock_is_allowed,
+            patch("api.middleware.rate_limiter.get_password_hasher") as mock_hasher,
+        ):
+            mock_hasher.return_value.saturated = True
+            response = _client(rate_limiter).post("/api/v1/auth/refresh")
 
         assert response.status_code == 200
-        assert response.headers["X-RateLimit-Limit"] == "120"
-        assert response.headers["X-RateLimit-Remaining"] == "119"
+        mock_is_allowed.assert_called_once_with("ip:testclient", "auth")
@@ -2,11 +2,10 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock
+from collections.abc import Iterator
 
-import pytest
-
-from starlette.requests import Request
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
 from starlette.responses import JSONResponse
 
 from api.middleware.request_limits import (
@@ -31,136 +30,89 @@ class TestIsUploadPath:
         assert _is_upload_path("/api/v1/auth/login") is False
 
 
-class TestRequestSizeLimitMiddleware:
-    """Tests for the request size limit middleware."""
+def _client(**kwargs: int) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(RequestSizeLimitMiddleware, **kwargs)
 
-    @pytest.mark.asyncio
-    async def test_get_request_bypasses_check(self) -> None:
-        """GET requests should bypass size check."""
-        call_next_called = False
+    @app.get("/api/v1/sessions")
+    def list_sessions() -> dict[str, str]:
+        return {"status": "ok"}
 
-        async def call_next(request: Request) -> JSONResponse:
-            nonlocal call_next_called
-            call_next_called = True
-            return JSONResponse(content={"status": "ok"})
+    @app.post("/api/v1/sessions")
+    async def create_session(request: Request) -> dict[str, int]:
+        return {"received": len(await request.body())}
 
-        request = MagicMock(spec=Request)
-        request.method = "GET"
+    @app.post("/api/v1/files/sessions/{session_id}/upload")
+    async def upload(request: Request) -> dict[str, int]:
+        return {"received": len(await request.body())}
 
-        middleware = RequestSizeLimitMiddleware(lambda r: None)
-        response = await middleware.dispatch(request, call_next)
+    return TestClient(app)
 
-        assert call_next_called is True
-        assert response.status_code == 200
 
-    @pytest.mark.asyncio
-    async def test_post_without_content_length_passes(self) -> None:
-        """POST requests without Content-Length should pass through."""
-        call_next_called = False
+def _chunks(total: int, chunk_size: int = 1024) -> Iterator[bytes]:
+    for offset in range(0, total, chunk_size):
+        yield b"x" * min(chunk_size, total - offset)
 
-        async def call_next(request: Request) -> JSONResponse:
-            nonlocal call_next_called
-            call_next_called = True
-            return JSONResponse(content={"status": "ok"})
 
-        # POST without content-length (e.g., chunked encoding)
-        request = MagicMock()
-        request.method = "POST"
-        request.url.path = "/api/v1/sessions"
-        request.headers = {}  # No content-length
+class TestRequestSizeLimitMiddleware:
+    """Tests for the request size limit middleware."""
 
-        middleware = RequestSizeLimitMiddleware(lambda r: None)
-        response = await middleware.dispatch(request, call_next)
+    def test_get_request_bypasses_check(self) -> None:
+        """GET requests should bypass size check."""
+        response = _client(max_body_size=1).get("/api/v1/sessions")
 
-        assert call_next_called is True
         assert response.status_code == 200
 
-    @pytest.mark.asyncio
-    async def test_oversized_request_rejected(self) -> None:
-        """Requests over limit should be rejected with 413."""
-        call_next_called = False
-
-        async def call_next(request: Request) -> JSONResponse:
-            nonlocal call_next_called
-            call_next_called = True
-            return JSONResponse(content={"status": "ok"})
+    def test_post_within_limit_passes(self) -> None:
+        response = _client(max_body_size=1024).post("/api/v1/sessions", content=b"x" * 1024)
 
-        request = MagicMock(spec=Request)
-        request.method = "POST"
-        request.url = MagicMock()
-        request.url.path = "/api/v1/sessions"
-        request.headers = {"content-length": str(10 * 1024 * 1024)}  # 10MB
+        assert response.status_code == 200
+        assert response.json() == {"received": 1024}
 
-        middleware = RequestSizeLimitMiddleware(lambda r: None, max_body_size=1024 * 1024)
-        response = await middleware.dispatch(request, call_next)
+    def test_oversized_request_rejected(self) -> None:
+        """Requests over limit should be rejected with 413."""
+        response = _client(max_body_size=1024 * 1024).post(
+            "/api/v1/sessions", content=b"x" * 10, headers={"content-length": str(10 * 1024 * 1024)}
+        )
 
-        assert call_next_called is False
         assert response.status_code == 413
+        assert response.json()["max_size"] == 1024 * 1024
 
-    @pytest.mark.asyncio
-    async def test_upload_uses_higher_limit(self) -> None:
+    def test_upload_uses_higher_limit(self) -> None:
         """Upload endpoints should use higher size limit."""
-        call_next_called = False
-
-        async def call_next(request: Request) -> JSONResponse:
-            nonlocal call_next_called
-            call_next_called = True
-            return JSONResponse(content={"status": "ok"})
-
-        request = MagicMock(spec=Request)
-        request.method = "POST"
-        request.url = MagicMock()
-        request.url.path = "/api/v1/files/sessions/123/upload"
-        # 10MB - larger than regular limit but smaller than upload limit
-        request.headers = {"content-length": str(10 * 1024 * 1024)}
-
-        middleware = RequestSizeLimitMiddleware(
-            lambda r: None,
-            max_body_size=1 * 1024 * 1024,  # 1MB regular
-            max_upload_size=50 * 1024 * 1024,  # 50MB upload
-        )
-        response = await middleware.dispatch(request, call_next)
-
-        assert call_next_called is True
-        assert response.status_code == 200
+        client = _client(max_body_size=1024, max_upload_size=64 * 1024)
 
-    @pytest.mark.asyncio
-    async def test_websocket_bypasses_check(self) -> None:
-        """WebSocket upgrades should bypass size check."""
-        call_next_called = False
+        assert client.post("/api/v1/files/sessions/123/upload", content=b"x" * 10 * 1024).status_code == 200
+        assert client.post("/api/v1/sessions", content=b"x" * 10 * 1024).status_code == 413
 
-        async def call_next(request: Request) -> JSONResponse:
-            nonlocal call_next_called
-            call_next_called = True
-            return JSONResponse(content={})
+    def test_chunked_within_limit_passes(self) -> None:
+        """Chunked bodies (no Content-Length) under the limit pass through."""
+        response = _client(max_body_size=8192).post("/api/v1/sessions", content=_chunks(4096))
 
-        request = MagicMock(spec=Request)
-        request.method = "GET"
-        request.headers = {"upgrade": "websocket"}
+        assert response.status_code == 200
+        assert response.json() == {"received": 4096}
 
-        middleware = RequestSizeLimitMiddleware(lambda r: None)
-        await middleware.dispatch(request, call_next)
+    def test_chunked_oversized_request_rejected(self) -> None:
+        """Chunked bodies are counted as they stream and rejected past the limit."""
+        response = _client(max_body_size=4096).post("/api/v1/sessions", content=_chunks(16 * 1024))
 
-        assert call_next_called is True
+        assert response.status_code == 413
+        assert response.json()["error"] == "request_too_large"
 
-    @pytest.mark.asyncio
-    async def test_invalid_content_length_passes(self) -> None:
-        """Invalid Content-Length should not crash middleware."""
-        call_next_called = False
+    def test_websocket_upgrade_bypasses_check(self) -> None:
+        """WebSocket upgrades should bypass size check."""
+        response = _client(max_body_size=1).post(
+            "/api/v1/sessions", content=b"x" * 10, headers={"upgrade": "websocket"}
+        )
 
-        async def call_next(request: Request) -> JSONResponse:
-            nonlocal call_next_called
-            call_next_called = True
-            return JSONResponse(content={"status": "ok"})
+        assert response.status_code == 200
 
-        request = MagicMock(spec=Request)
-        request.method = "POST"
-        request.url = MagicMock()
-        request.url.path = "/api/v1/sessions"
-        request.headers = {"content-length": "invalid"}
+    def test_invalid_content_length_passes(self) -> None:
+        """Invalid Content-Length should not crash middleware."""
+        app = RequestSizeLimitMiddleware(JSONResponse({"status": "ok"}))
+        client = TestClient(app)
 
-        middleware = RequestSizeLimitMiddleware(lambda r: None)
-        await middleware.dispatch(request, call_next)
+        response = client.post("/api/v1/sessions", content=b"{}", headers={"content-length": "invalid"})
 
         # Should not crash, just pass through
-        assert call_next_called is True
+        assert response.status_code == 200
@@ -137,3 +137,59 @@ async def test_me_unauthenticated(client: TestClient, app: FastAPI) -> None:
 
     assert response.status_code == 401
     assert response.json()["error"]["code"] == ErrorCode.AUTH_REQUIRED
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_tokens(client: TestClient, app: FastAPI, mock_auth_service: AsyncMock) -> None:
+    from api.middleware.auth import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: UserInfo(id=USER_ID, email=EMAIL)
+    mock_auth_service.revoke_token = AsyncMock()
+
+    response = client.post(
+        "/api/v1/auth/logout",
+        json={"refresh_token": REFRESH_TOKEN},
+        headers={"Authorization": f"Bearer {ACCESS_TOKEN}"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+    mock_auth_service.revoke_token.assert_any_await(ACCESS_TOKEN)
+    mock_auth_service.revoke_token.assert_any_await(REFRESH_TOKEN, "refresh")
+
+
+@pytest.mark.asyncio
+async def test_logout_all_revokes_every_token(client: TestClient, app: FastAPI, mock_auth_service: AsyncMock) -> None:
+    from uuid import UUID
+
+    from api.middleware.auth import get_current_user
+    from models.api_models import UserInfo as AuthenticatedUser
+
+    # The model get_current_user actually returns (string id)
+    app.dependency_overrides[get_current_user] = lambda: AuthenticatedUser(id=USER_ID, email=EMAIL)
+    mock_auth_service.revoke_user_tokens = AsyncMock()
+
+    response = client.post("/api/v1/auth/logout-all", headers={"Authorization": f"Bearer {ACCESS_TOKEN}"})
+
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+    mock_auth_service.revoke_user_tokens.assert_awaited_once_with(UUID(USER_ID))
+
+
+@pytest.mark.asyncio
+async def test_logout_all_requires_authentication(client: TestClient) -> None:
+    response = client.post("/api/v1/auth/logout-all")
+
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_login_hasher_saturated(client: TestClient, mock_auth_service: AsyncMock) -> None:
+    from utils.password_hasher import PasswordHasherSaturatedError
+
+    mock_auth_service.login = AsyncMock(side_effect=PasswordHasherSaturatedError("busy"))
+
+    response = client.post("/api/v1/auth/login", json={"email": EMAIL, "password": "password"})
+
+    assert response.status_code == 503
+    assert response.json()["error"]["code"] == ErrorCode.INTERNAL_OVERLOADED
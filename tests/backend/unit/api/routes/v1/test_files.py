@@ -1,3 +1,5 @@
+from pathlib import Path
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 from uuid import UUID
 
@@ -10,6 +12,7 @@ from api.dependencies import get_db, get_file_service
 from api.middleware.auth import get_current_user
 from api.middleware.exception_handlers import register_exception_handlers
 from api.routes.v1.files import router
+from api.services.s3_sync_service import S3Download
 from models.api_models import UserInfo
 
 SESSION_ID = "sess_123"
@@ -22,6 +25,7 @@ SESSION_UUID = "660e8400-e29b-41d4-a716-446655440001"
 def mock_file_service() -> AsyncMock:
     service = AsyncMock()
     # service methods are async
+    service.s3_sync.is_pending = MagicMock(return_value=False)
     return service
 
 
@@ -88,13 +92,21 @@ def test_list_files_empty(client: TestClient, mock_file_service: AsyncMock) -> N
 
 
 def test_upload_file(client: TestClient, mock_file_service: AsyncMock) -> None:
-    mock_file_service.save_file.return_value = {
-        "name": "upload.txt",
-        "type": "file",
-        "size": 11,
-        "modified": "2024-01-01T00:00:00Z",
-        "extension": ".txt",
-    }
+    received: list[bytes] = []
+
+    async def save_stream(**kwargs: Any) -> dict[str, Any]:
+        received.extend([chunk async for chunk in kwargs["chunks"]])
+        return {
+            "name": "upload.txt",
+            "type": "file",
+            "size": 11,
+            "modified": "2024-01-01T00:00:00Z",
+            "extension": ".txt",
+            "content_hash": "a" * 64,
+            "deduplicated": False,
+        }
+
+    mock_file_service.save_stream.side_effect = save_stream
 
     files = {"file": ("upload.txt", b"Hello World", "text/plain")}
     response = client.post(f"/api/v1/{SESSION_ID}/files/upload", files=files)
@@ -103,27 +115,105 @@ def test_upload_file(client: TestClient, mock_file_service: AsyncMock) -> None:
     data = response.json()
     assert data["name"] == "upload.txt"
     assert data["path"] == f"{FOLDER}/upload.txt"
+    assert data["content_hash"] == "a" * 64
+    assert data["deduplicated"] is False
 
-    # Verify service call
-    mock_file_service.save_file.assert_called_once()
-    _, kwargs = mock_file_service.save_file.call_args
+    # Verify service call: content is streamed, never passed whole
+    mock_file_service.save_stream.assert_called_once()
+    mock_file_service.save_file.assert_not_called()
+    _, kwargs = mock_file_service.save_stream.call_args
     assert kwargs["filename"] == "upload.txt"
-    assert kwargs["content"] == b"Hello World"
+    assert b"".join(received) == b"Hello World"
 
 
-def test_download_file(client: TestClient, mock_file_service: AsyncMock) -> None:
-    mock_file_service.get_file_content.return_value = b"File Content"
+@pytest.fixture
+def cached_file(tmp_path: Path, mock_file_service: AsyncMock) -> Path:
+    path = tmp_path / "doc.txt"
+    path.write_bytes(b"File Content")
+    mock_file_service.stat_file.return_value = path.stat()
+    mock_file_service.get_file_path = MagicMock(return_value=path)
+    return path
+
 
+def test_download_file(client: TestClient, mock_file_service: AsyncMock, cached_file: Path) -> None:
     filename = "doc.txt"
     response = client.get(f"/api/v1/{SESSION_ID}/files/{filename}/download")
 
     assert response.status_code == 200
     assert response.content == b"File Content"
     assert response.headers["content-disposition"] == f'attachment; filename="{filename}"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert "etag" in response.headers
+    assert "last-modified" in response.headers
+    mock_file_service.get_file_content.assert_not_called()
+
+
+def test_download_file_range(client: TestClient, cached_file: Path) -> None:
+    response = client.get(f"/api/v1/{SESSION_ID}/files/doc.txt/download", headers={"Range": "bytes=5-"})
+
+    assert response.status_code == 206
+    assert response.content == b"Content"
+    assert response.headers["content-range"] == "bytes 5-11/12"
+
+
+def test_download_file_if_none_match(client: TestClient, cached_file: Path) -> None:
+    etag = client.get(f"/api/v1/{SESSION_ID}/files/doc.txt/download").headers["etag"]
+
+    response = client.get(f"/api/v1/{SESSION_ID}/files/doc.txt/download", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_download_file_if_modified_since(client: TestClient, cached_file: Path) -> None:
+    last_modified = client.get(f"/api/v1/{SESSION_ID}/files/doc.txt/download").headers["last-modified"]
+
+    fresh = client.get(f"/api/v1/{SESSION_ID}/files/doc.txt/download", headers={"If-Modified-Since": last_modified})
+    stale = client.get(
+        f"/api/v1/{SESSION_ID}/files/doc.txt/download",
+        headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"},
+    )
+
+    assert fresh.status_code == 304
+    assert stale.status_code == 200
+
+
+def test_download_file_streams_from_s3_when_not_cached(client: TestClient, mock_file_service: AsyncMock) -> None:
+    body = MagicMock()
+    body.iter_chunks.return_value = iter([b"from ", b"s3"])
+    mock_file_service.stat_file.return_value = None
+    mock_file_service.s3_sync.open_download.return_value = S3Download(
+        status_code=206,
+        headers={"Content-Length": "7", "Content-Range": "bytes 0-6/20", "ETag": '"abc"'},
+        body=body,
+    )
+
+    response = client.get(f"/api/v1/{SESSION_ID}/files/doc.txt/download", headers={"Range": "bytes=0-6"})
+
+    assert response.status_code == 206
+    assert response.content == b"from s3"
+    assert response.headers["content-range"] == "bytes 0-6/20"
+    assert response.headers["content-disposition"] == 'attachment; filename="doc.txt"'
+    _, kwargs = mock_file_service.s3_sync.open_download.call_args
+    assert kwargs["byte_range"] == "bytes=0-6"
+    body.close.assert_called_once()
+
+
+def test_download_file_s3_not_modified(client: TestClient, mock_file_service: AsyncMock) -> None:
+    mock_file_service.stat_file.return_value = None
+    mock_file_service.s3_sync.open_download.return_value = S3Download(status_code=304)
+
+    response = client.get(f"/api/v1/{SESSION_ID}/files/doc.txt/download", headers={"If-None-Match": '"abc"'})
+
+    assert response.status_code == 304
+    _, kwargs = mock_file_service.s3_sync.open_download.call_args
+    assert kwargs["if_none_match"] == '"abc"'
 
 
 def test_download_file_not_found(client: TestClient, mock_file_service: AsyncMock) -> None:
-    mock_file_service.get_file_content.side_effect = FileNotFoundError("Not found")
+    mock_file_service.stat_file.return_value = None
+    mock_file_service.s3_sync = None
 
     filename = "missing.txt"
     response = client.get(f"/api/v1/{SESSION_ID}/files/{filename}/download")
@@ -132,6 +222,15 @@ def test_download_file_not_found(client: TestClient, mock_file_service: AsyncMoc
     assert response.json()["error"]["code"] == "FILE_5001"  # FILE_NOT_FOUND (Check ErrorCode enum later if different)
 
 
+def test_download_file_not_found_in_s3(client: TestClient, mock_file_service: AsyncMock) -> None:
+    mock_file_service.stat_file.return_value = None
+    mock_file_service.s3_sync.open_download.side_effect = FileNotFoundError("Not found")
+
+    response = client.get(f"/api/v1/{SESSION_ID}/files/missing.txt/download")
+
+    assert response.status_code == 404
+
+
 def test_get_file_path(client: TestClient, mock_file_service: AsyncMock) -> None:
     # Mocking Path object returned by service
     mock_path = MagicMock()
@@ -1,3 +1,7 @@
+import asyncio
+import time
+
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -7,6 +11,8 @@ from fastapi.testclient import TestClient
 
 from api.dependencies import get_db
 from api.routes.v1.health import router
+from api.services.health_prober import HealthSnapshot
+from core.constants import HEALTH_PROBE_MAX_AGE
 
 
 @pytest.fixture
@@ -98,7 +104,7 @@ async def test_health_check_healthy(client: TestClient, mock_db_pool: MagicMock)
     # In health.py: db_health_data = await check_pool_health(db)
     # If I mock check_pool_health, I control the result.
 
-    with patch("api.routes.v1.health.check_pool_health", new_callable=AsyncMock) as mock_check:
+    with patch("api.services.health_prober.check_pool_health", new_callable=AsyncMock) as mock_check:
         mock_check.return_value = {"healthy": True, "pool_size": 10, "pool_free": 8, "pool_used": 2}
 
         response = client.get("/health")
@@ -109,6 +115,8 @@ async def test_health_check_healthy(client: TestClient, mock_db_pool: MagicMock)
         assert data["database"]["healthy"] is True
         assert data["websocket"]["active_connections"] == 5
         assert data["mcp"]["initialized"] is True
+        assert {"session", "session_list"} <= set(data["caches"])
+        assert "hit_rate" in data["caches"]["session"]
 
 
 @pytest.mark.asyncio
@@ -119,7 +127,7 @@ async def test_health_check_degraded(client: TestClient, mock_db_pool: MagicMock
     # 1. WS Unhealthy (shutting down)
     mock_ws_manager.get_stats.return_value = {"active_connections": 0, "active_sessions": 0, "shutting_down": True}
 
-    with patch("api.routes.v1.health.check_pool_health", new_callable=AsyncMock) as mock_check:
+    with patch("api.services.health_prober.check_pool_health", new_callable=AsyncMock) as mock_check:
         # DB Healthy
         mock_check.return_value = {"healthy": True, "pool_size": 10}
 
@@ -136,10 +144,66 @@ async def test_health_check_unhealthy(client: TestClient, mock_ws_manager: Magic
     # DB Unhealthy and WS shutting down
     mock_ws_manager.get_stats.return_value = {"shutting_down": True}
 
-    with patch("api.routes.v1.health.check_pool_health", new_callable=AsyncMock) as mock_check:
+    with patch("api.services.health_prober.check_pool_health", new_callable=AsyncMock) as mock_check:
         mock_check.return_value = {"healthy": False}
 
         response = client.get("/health")
 
         data = response.json()
         assert data["status"] == "unhealthy"
+
+
+def _snapshot(age: float = 1.0, db_healthy: bool = True) -> HealthSnapshot:
+    return HealthSnapshot(
+        database={"healthy": db_healthy},
+        mcp={"healthy": True, "latency_ms": 3.0},
+        s3=None,
+        checked_at=datetime.now(timezone.utc),
+        checked_monotonic=time.monotonic() - age,
+        duration_ms=3.0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_health_check_serves_prober_snapshot(
+    app: FastAPI, client: TestClient, mock_mcp_manager: MagicMock
+) -> None:
+    prober = MagicMock()
+    prober.snapshot = _snapshot(age=2.0)
+    app.state.health_prober = prober
+
+    with patch("api.services.health_prober.check_pool_health", new_callable=AsyncMock) as mock_check:
+        data = client.get("/health").json()
+
+    # Served from the snapshot: no inline database, MCP or S3 checks
+    mock_check.assert_not_awaited()
+    mock_mcp_manager.check_connectivity.assert_not_awaited()
+    assert data["status"] == "healthy"
+    assert data["stale"] is False
+    assert 2.0 <= data["check_age_seconds"] < 10.0
+    assert data["mcp"]["ping_latency_ms"] == 3.0
+    # Pool statistics are read live from the pool
+    assert data["database"] == {"healthy": True, "pool_size": 10, "pool_free": 8, "pool_used": 2, "error": None}
+
+
+@pytest.mark.asyncio
+async def test_health_check_stale_snapshot_is_degraded(app: FastAPI, client: TestClient) -> None:
+    prober = MagicMock()
+    prober.snapshot = _snapshot(age=HEALTH_PROBE_MAX_AGE + 1)
+    app.state.health_prober = prober
+
+    data = client.get("/health").json()
+
+    assert data["stale"] is True
+    assert data["status"] == "degraded"
+
+
+@pytest.mark.asyncio
+async def test_readiness_check_shutting_down(app: FastAPI, client: TestClient) -> None:
+    app.state.shutdown_event = asyncio.Event()
+    app.state.shutdown_event.set()
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json() == {"ready": False, "error": "Shutting down"}
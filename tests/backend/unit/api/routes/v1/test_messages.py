@@ -2,7 +2,7 @@ import datetime
 import json
 
 from unittest.mock import AsyncMock, MagicMock
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import pytest
 
@@ -60,19 +60,16 @@ async def test_list_messages_success(client: TestClient, mock_db_pool: MagicMock
     cm = mock_db_pool.acquire.return_value
     conn = cm.__aenter__.return_value
 
-    # 1. Fetch Session UUID with user_id for ownership check
-    conn.fetchrow.return_value = {"id": SESSION_UUID, "user_id": UUID(USER_ID)}
+    # 1. Fetch Session UUID, user_id for ownership check and maintained message_count
+    conn.fetchrow.return_value = {"id": SESSION_UUID, "user_id": UUID(USER_ID), "message_count": 2}
 
-    # 2. Count messages
-    conn.fetchval.return_value = 2
-
-    # 3. Fetch messages
+    # 2. Fetch newest page (newest first, reversed to chronological)
     now = datetime.datetime.now(datetime.timezone.utc)
     conn.fetch.return_value = [
         {
-            "id": "msg_1",
-            "role": "user",
-            "content": "Hello",
+            "id": "msg_2",
+            "role": "assistant",
+            "content": "Hi!",
             "created_at": now,
             "tool_call_id": None,
             "tool_name": None,
@@ -82,9 +79,9 @@ async def test_list_messages_success(client: TestClient, mock_db_pool: MagicMock
             "metadata": None,
         },
         {
-            "id": "msg_2",
-            "role": "assistant",
-            "content": "Hi!",
+            "id": "msg_1",
+            "role": "user",
+            "content": "Hello",
             "created_at": now,
             "tool_call_id": None,
             "tool_name": None,
@@ -101,7 +98,11 @@ async def test_list_messages_success(client: TestClient, mock_db_pool: MagicMock
     data = response.json()
     assert len(data["messages"]) == 2
     assert data["pagination"]["total_count"] == 2
+    assert data["pagination"]["has_more"] is False
+    assert data["pagination"]["next_cursor"] is None
     assert data["messages"][0]["content"] == "Hello"
+    # No COUNT(*) over messages
+    conn.fetchval.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -122,8 +123,7 @@ async def test_list_messages_with_tools_and_json_parsing(client: TestClient, moc
     cm = mock_db_pool.acquire.return_value
     conn = cm.__aenter__.return_value
 
-    conn.fetchrow.return_value = {"id": SESSION_UUID, "user_id": UUID(USER_ID)}
-    conn.fetchval.return_value = 1
+    conn.fetchrow.return_value = {"id": SESSION_UUID, "user_id": UUID(USER_ID), "message_count": 1}
 
     now = datetime.datetime.now(datetime.timezone.utc)
     # Simulate DB storing JSON string for arguments
@@ -160,8 +160,7 @@ async def test_list_messages_pagination(client: TestClient, mock_db_pool: MagicM
     cm = mock_db_pool.acquire.return_value
     conn = cm.__aenter__.return_value
 
-    conn.fetchrow.return_value = {"id": SESSION_UUID, "user_id": UUID(USER_ID)}
-    conn.fetchval.return_value = 100
+    conn.fetchrow.return_value = {"id": SESSION_UUID, "user_id": UUID(USER_ID), "message_count": 100}
     conn.fetch.return_value = []  # Return empty for simplicity, checking pagination meta
 
     response = client.get(f"/api/v1/sessions/{SESSION_ID}/messages?limit=10&offset=50")
@@ -171,4 +170,65 @@ async def test_list_messages_pagination(client: TestClient, mock_db_pool: MagicM
     assert data["pagination"]["total_count"] == 100
     assert data["pagination"]["limit"] == 10
     assert data["pagination"]["offset"] == 50
-    assert data["pagination"]["has_more"] is True  # 50 + 10 < 100
+    assert data["pagination"]["has_more"] is True  # 50 + 0 < 100
+    assert data["pagination"]["next_cursor"] is None
+    assert "OFFSET" in conn.fetch.call_args[0][0]
+
+
+def _message_row(message_id: str, created_at: datetime.datetime) -> dict:
+    return {
+        "id": message_id,
+        "role": "user",
+        "content": message_id,
+        "created_at": created_at,
+        "tool_call_id": None,
+        "tool_name": None,
+        "tool_arguments": None,
+        "tool_result": None,
+        "tool_success": None,
+        "metadata": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_list_messages_cursor_pagination(client: TestClient, mock_db_pool: MagicMock) -> None:
+    cm = mock_db_pool.acquire.return_value
+    conn = cm.__aenter__.return_value
+
+    conn.fetchrow.return_value = {"id": SESSION_UUID, "user_id": UUID(USER_ID), "message_count": 5}
+    base = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    newest_first = [_message_row(str(uuid4()), base - datetime.timedelta(seconds=i)) for i in range(3)]
+    conn.fetch.return_value = newest_first  # limit=2 plus one look-ahead row
+
+    response = client.get(f"/api/v1/sessions/{SESSION_ID}/messages?limit=2")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [m["id"] for m in data["messages"]] == [newest_first[1]["id"], newest_first[0]["id"]]
+    assert data["pagination"]["has_more"] is True
+    next_cursor = data["pagination"]["next_cursor"]
+    assert next_cursor
+
+    # Follow the cursor: keyset predicate instead of OFFSET
+    conn.fetch.return_value = newest_first[2:]
+    response = client.get(f"/api/v1/sessions/{SESSION_ID}/messages", params={"limit": 2, "cursor": next_cursor})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [m["id"] for m in data["messages"]] == [newest_first[2]["id"]]
+    assert data["pagination"]["has_more"] is False
+    assert data["pagination"]["next_cursor"] is None
+    sql, _, created_at, message_id, _ = conn.fetch.call_args[0]
+    assert "(created_at, id) < ($2, $3)" in sql
+    assert "OFFSET" not in sql
+    assert created_at == newest_first[1]["created_at"]
+    assert str(message_id) == newest_first[1]["id"]
+
+
+@pytest.mark.asyncio
+async def test_list_messages_invalid_cursor(client: TestClient, mock_db_pool: MagicMock) -> None:
+    response = client.get(f"/api/v1/sessions/{SESSION_ID}/messages?cursor=garbage")
+
+    assert response.status_code == 422
+    assert response.json()["error"]["code"] == ErrorCode.VALIDATION_ERROR
+    mock_db_pool.acquire.assert_not_called()
@@ -27,10 +27,8 @@ def mock_session_service() -> AsyncMock:
 @pytest.fixture
 def mock_file_service() -> MagicMock:
     service = MagicMock()
-    # Configure _s3_sync.sync_from_s3 to be awaitable
-    # Configure s3_sync.sync_from_s3 to be awaitable
+    # s3_sync.start_rehydration schedules a background task (not awaited)
     service.s3_sync = MagicMock()
-    service.s3_sync.sync_from_s3 = AsyncMock()
     return service
 
 
@@ -153,7 +151,7 @@ def test_create_session(
     mock_file_service.init_session_workspace.assert_called_once()
 
 
-def test_get_session(client: TestClient, mock_session_service: AsyncMock) -> None:
+def test_get_session(client: TestClient, mock_session_service: AsyncMock, mock_file_service: MagicMock) -> None:
     mock_session_service.get_session_with_history.return_value = {
         "session": {
             "id": str(SESSION_UUID),
@@ -170,6 +168,7 @@ def test_get_session(client: TestClient, mock_session_service: AsyncMock) -> Non
         "full_history": [],
         "files": [],
         "has_more": False,
+        "next_cursor": None,
         "loaded_count": 0,
         "message_count": 10,
     }
@@ -181,6 +180,7 @@ def test_get_session(client: TestClient, mock_session_service: AsyncMock) -> Non
     assert data["session"]["session_id"] == SESSION_ID
 
     mock_session_service.get_session_with_history.assert_called_with(USER_ID, SESSION_ID)
+    mock_file_service.s3_sync.start_rehydration.assert_called_once_with(SESSION_ID)
 
 
 def test_get_session_not_found(client: TestClient, mock_session_service: AsyncMock) -> None:
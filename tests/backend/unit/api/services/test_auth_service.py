@@ -1,3 +1,4 @@
+from collections.abc import Generator
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
@@ -7,7 +8,9 @@ import pytest
 from jose import jwt
 
 from api.services.auth_service import AuthService
+from api.services.token_denylist import get_token_denylist
 from core.constants import Settings
+from utils.cache import get_user_cache, user_cache_key
 
 # Constants
 TEST_SECRET = "test_secret_key"
@@ -26,9 +29,20 @@ def mock_settings() -> MagicMock:
     settings.access_token_expires_minutes = 15
     settings.refresh_token_expires_days = 7
     settings.default_user_email = "default@chatjuicer.dev"
+    settings.auth_stateless_tokens = False
     return settings
 
 
+@pytest.fixture(autouse=True)
+def reset_auth_state() -> Generator[None, None, None]:
+    """Isolate the process-wide user cache and denylist between tests."""
+    yield
+    get_user_cache().invalidate_local(None)
+    denylist = get_token_denylist()
+    denylist._jtis.clear()
+    denylist._min_versions.clear()
+
+
 @pytest.fixture
 def mock_db_pool() -> MagicMock:
     pool = MagicMock()
@@ -142,3 +156,105 @@ async def test_get_default_user(auth_service: AuthService, mock_db_pool: MagicMo
 
     conn.fetchrow.assert_called_with("SELECT * FROM users WHERE email = $1", "default@chatjuicer.dev")
     assert user["email"] == "default@chatjuicer.dev"
+
+
+@pytest.mark.asyncio
+async def test_refresh_rejects_old_token_version(auth_service: AuthService, mock_db_pool: MagicMock) -> None:
+    conn = mock_db_pool.acquire.return_value.__aenter__.return_value
+    conn.fetchrow.return_value = {"id": USER_ID, "email": EMAIL, "token_version": 2}
+    refresh_token = auth_service._issue_tokens({"id": USER_ID, "email": EMAIL, "token_version": 1})["refresh"]
+
+    with pytest.raises(ValueError, match="Invalid refresh token"):
+        await auth_service.refresh(refresh_token)
+
+
+def test_issue_tokens_claims(auth_service: AuthService) -> None:
+    user = {"id": USER_ID, "email": EMAIL, "display_name": "Test User", "token_version": 3}
+    tokens = auth_service._issue_tokens(user)
+
+    access = jwt.decode(tokens["access"], TEST_SECRET, algorithms=[TEST_ALGO])
+    refresh = jwt.decode(tokens["refresh"], TEST_SECRET, algorithms=[TEST_ALGO])
+    assert access["ver"] == refresh["ver"] == 3
+    assert access["name"] == "Test User"
+    assert "name" not in refresh
+    assert access["jti"] != refresh["jti"]
+
+
+@pytest.mark.asyncio
+async def test_authenticate_caches_user(auth_service: AuthService, mock_db_pool: MagicMock) -> None:
+    conn = mock_db_pool.acquire.return_value.__aenter__.return_value
+    conn.fetchrow.return_value = {"id": USER_ID, "email": EMAIL, "display_name": "Test User", "token_version": 0}
+    token = auth_service._issue_tokens(conn.fetchrow.return_value, include_refresh=False)["access"]
+
+    first = await auth_service.authenticate(token)
+    second = await auth_service.authenticate(token)
+
+    assert first == second == {"id": str(USER_ID), "email": EMAIL, "display_name": "Test User"}
+    assert conn.fetchrow.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_authenticate_rejects_stale_version(auth_service: AuthService, mock_db_pool: MagicMock) -> None:
+    conn = mock_db_pool.acquire.return_value.__aenter__.return_value
+    conn.fetchrow.return_value = {"id": USER_ID, "email": EMAIL, "token_version": 1}
+    token = auth_service._issue_tokens({"id": USER_ID, "email": EMAIL}, include_refresh=False)["access"]
+
+    assert await auth_service.authenticate(token) is None
+
+
+@pytest.mark.asyncio
+async def test_authenticate_stateless_skips_db(
+    auth_service: AuthService, mock_db_pool: MagicMock, mock_settings: MagicMock
+) -> None:
+    mock_settings.auth_stateless_tokens = True
+    user = {"id": USER_ID, "email": EMAIL, "display_name": "Test User"}
+    token = auth_service._issue_tokens(user, include_refresh=False)["access"]
+
+    result = await auth_service.authenticate(token)
+
+    assert result == {"id": str(USER_ID), "email": EMAIL, "display_name": "Test User"}
+    mock_db_pool.acquire.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_authenticate_rejects_revoked(
+    auth_service: AuthService, mock_db_pool: MagicMock, mock_settings: MagicMock
+) -> None:
+    mock_settings.auth_stateless_tokens = True
+    token = auth_service._issue_tokens({"id": USER_ID, "email": EMAIL}, include_refresh=False)["access"]
+
+    await auth_service.revoke_token(token)
+
+    conn = mock_db_pool.acquire.return_value.__aenter__.return_value
+    sql, jti, user_id, _exp = conn.execute.call_args[0]
+    assert "INSERT INTO token_denylist" in sql
+    assert user_id == USER_ID
+    with pytest.raises(ValueError, match="Token revoked"):
+        await auth_service.authenticate(token)
+
+
+@pytest.mark.asyncio
+async def test_revoke_user_tokens(auth_service: AuthService, mock_db_pool: MagicMock) -> None:
+    conn = mock_db_pool.acquire.return_value.__aenter__.return_value
+    conn.fetchval.return_value = 1
+    token = auth_service._issue_tokens({"id": USER_ID, "email": EMAIL}, include_refresh=False)["access"]
+    await get_user_cache().set(user_cache_key(USER_ID, 0), {"id": str(USER_ID), "email": EMAIL})
+
+    await auth_service.revoke_user_tokens(USER_ID)
+
+    assert await get_user_cache().get(user_cache_key(USER_ID, 0)) is None
+    with pytest.raises(ValueError, match="Token revoked"):
+        await auth_service.authenticate(token)
+
+
+@pytest.mark.asyncio
+async def test_get_default_user_info_cached(auth_service: AuthService, mock_db_pool: MagicMock) -> None:
+    conn = mock_db_pool.acquire.return_value.__aenter__.return_value
+    conn.fetchrow.return_value = {"id": USER_ID, "email": "default@chatjuicer.dev"}
+
+    first = await auth_service.get_default_user_info()
+    second = await auth_service.get_default_user_info()
+
+    assert first == second
+    assert first is not None and first["email"] == "default@chatjuicer.dev"
+    assert conn.fetchrow.await_count == 1
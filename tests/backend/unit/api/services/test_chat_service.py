@@ -26,6 +26,7 @@ def mock_file_service() -> Mock:
     service = Mock()
     service.init_session_workspace = Mock()
     service.list_files = AsyncMock(return_value=[])
+    service.s3_sync = None
     return service
 
 
@@ -122,6 +123,8 @@ class TestChatService:
         conn = mock_db_pool.acquire.return_value.__aenter__.return_value
         conn.fetchrow.return_value = {
             "id": session_uuid,
+            "user_id": uuid4(),
+            "session_id": session_id,
             "model": "gpt-4o",
             "reasoning_effort": "medium",
             "mcp_config": None,  # No MCP config
@@ -282,6 +285,8 @@ class TestChatService:
         conn = mock_db_pool.acquire.return_value.__aenter__.return_value
         conn.fetchrow.return_value = {
             "id": session_uuid,
+            "user_id": uuid4(),
+            "session_id": session_id,
             "model": "gpt-4o",
             "reasoning_effort": "medium",
             "mcp_config": None,
@@ -360,6 +365,8 @@ class TestChatService:
         conn = mock_db_pool.acquire.return_value.__aenter__.return_value
         conn.fetchrow.return_value = {
             "id": session_uuid,
+            "user_id": uuid4(),
+            "session_id": "session_tool_test",
             "model": "gpt-4o",
             "reasoning_effort": "medium",
             "mcp_config": None,
@@ -9,37 +9,35 @@ import pytest
 from api.services.context_service import (
     ChunkResult,
     ContextService,
-    _embedding_to_pgvector,
-    _metadata_to_json,
+    _mmr_select,
+    _rrf_score,
 )
+from api.services.vector_index_service import ScanPlan
 
 
 @pytest.fixture
 def context_service(mock_db_pool: MagicMock) -> ContextService:
-    return ContextService(pool=mock_db_pool)
-
+    service = ContextService(pool=mock_db_pool)
+    service.index_manager.prepare_search = AsyncMock(  # type: ignore[method-assign]
+        return_value=ScanPlan("global", "", "embedding::halfvec(1536) <=> $2::vector::halfvec(1536)", 10)
+    )
+    return service
 
-def test_embedding_to_pgvector() -> None:
-    """Test _embedding_to_pgvector converts list to pgvector string."""
-    embedding = [0.1, 0.2, 0.3]
-    result = _embedding_to_pgvector(embedding)
-    assert result == "[0.1,0.2,0.3]"
 
+def test_rrf_score_sums_present_ranks() -> None:
+    """Test _rrf_score ignores retrievers that missed the candidate."""
+    assert _rrf_score((1, 1), k=60) == pytest.approx(2 / 61)
+    assert _rrf_score((None, 2), k=60) == pytest.approx(1 / 62)
+    assert _rrf_score((None, None)) == 0.0
 
-def test_metadata_to_json_none() -> None:
-    """Test _metadata_to_json returns None for None input."""
-    result = _metadata_to_json(None)
-    assert result is None
 
+def test_mmr_select_prefers_diverse_candidates() -> None:
+    """Test _mmr_select skips a near-duplicate of the top candidate."""
+    embeddings = [[1.0, 0.0], [0.99, 0.01], [0.0, 1.0]]
+    relevance = [1.0, 0.95, 0.8]
 
-def test_metadata_to_json_with_uuid() -> None:
-    """Test _metadata_to_json serializes UUIDs."""
-    test_uuid = uuid4()
-    metadata = {"id": test_uuid, "name": "test"}
-    result = _metadata_to_json(metadata)
-    assert result is not None
-    assert str(test_uuid) in result
-    assert "test" in result
+    assert _mmr_select(embeddings, relevance, top_k=2, mmr_lambda=0.5) == [0, 2]
+    assert _mmr_select(embeddings, relevance, top_k=2, mmr_lambda=1.0) == [0, 1]
 
 
 @pytest.mark.asyncio
@@ -66,6 +64,9 @@ async def test_upsert_session_summary(context_service: ContextService, mock_db_p
 
     assert result == chunk_id
     conn.fetchrow.assert_called_once()
+    # Embedding and metadata are passed natively for the binary codecs
+    assert conn.fetchrow.call_args[0][5] == embedding
+    assert conn.fetchrow.call_args[0][7] == {"title": "Test Session"}
 
 
 @pytest.mark.asyncio
@@ -134,6 +135,30 @@ async def test_search_chunks(context_service: ContextService, mock_db_pool: Magi
     assert results[0].source_type == "session_summary"
 
 
+@pytest.mark.asyncio
+async def test_search_chunks_uses_index_strategy(context_service: ContextService, mock_db_pool: MagicMock) -> None:
+    """Test search_chunks configures the scan inside a transaction and applies the predicate."""
+    project_id = uuid4()
+    predicate = f"AND project_id = '{project_id}'::uuid"
+    distance = "binary_quantize(embedding)::bit(1536) <~> binary_quantize($2::vector)"
+    context_service.index_manager.prepare_search = AsyncMock(  # type: ignore[method-assign]
+        return_value=ScanPlan("partial", predicate, distance, 56)
+    )
+    conn = mock_db_pool.acquire.return_value.__aenter__.return_value
+    conn.fetch = AsyncMock(return_value=[])
+
+    await context_service.search_chunks(project_id=project_id, query_embedding=[0.1] * 1536, top_k=7)
+
+    conn.transaction.assert_called_once()
+    context_service.index_manager.prepare_search.assert_awaited_once_with(conn, project_id, 7)
+    sql, *args = conn.fetch.call_args[0]
+    assert predicate in sql
+    # Compact ANN scan, then full-precision re-rank down to top_k
+    assert f"ORDER BY {distance}" in sql
+    assert "embedding <=> $2 AS distance" in sql
+    assert args[3:] == [7, 56]
+
+
 @pytest.mark.asyncio
 async def test_search_chunks_empty(context_service: ContextService, mock_db_pool: MagicMock) -> None:
     """Test search_chunks returns empty list when no matches."""
@@ -148,6 +173,70 @@ async def test_search_chunks_empty(context_service: ContextService, mock_db_pool
     assert results == []
 
 
+def _hybrid_row(content: str, score: float, v_rank: int | None, t_rank: int | None) -> dict:
+    return {
+        "id": uuid4(),
+        "source_type": "message",
+        "source_id": uuid4(),
+        "chunk_index": 0,
+        "content": content,
+        "score": score,
+        "metadata": None,
+        "created_at": datetime.now(timezone.utc),
+        "v_rank": v_rank,
+        "t_rank": t_rank,
+        "embedding": [1.0, 0.0],
+    }
+
+
+@pytest.mark.asyncio
+async def test_search_chunks_hybrid_fuses_rankings(context_service: ContextService, mock_db_pool: MagicMock) -> None:
+    """Test hybrid search orders by RRF and keeps text hits below the threshold."""
+    conn = mock_db_pool.acquire.return_value.__aenter__.return_value
+    conn.fetch = AsyncMock(
+        return_value=[
+            _hybrid_row("vector only", 0.9, 1, None),
+            _hybrid_row("both retrievers", 0.8, 2, 1),
+            _hybrid_row("exact id ERR-4021", 0.2, None, 2),
+            _hybrid_row("weak vector", 0.3, 3, None),
+        ]
+    )
+
+    results = await context_service.search_chunks(
+        project_id=uuid4(),
+        query_embedding=[0.1] * 1536,
+        top_k=5,
+        score_threshold=0.5,
+        query_text="ERR-4021 failure",
+    )
+
+    assert [r.content for r in results] == ["both retrievers", "vector only", "exact id ERR-4021"]
+    assert results[0].fused_score == pytest.approx(1 / 62 + 1 / 61)
+    sql = conn.fetch.call_args[0][0]
+    assert "content_tsv" in sql
+    assert "c.embedding AS embedding" not in sql
+
+
+@pytest.mark.asyncio
+async def test_search_chunks_hybrid_with_mmr(context_service: ContextService, mock_db_pool: MagicMock) -> None:
+    """Test hybrid search fetches embeddings and limits results when MMR is enabled."""
+    conn = mock_db_pool.acquire.return_value.__aenter__.return_value
+    rows = [_hybrid_row(f"chunk {i}", 0.9, i + 1, None) for i in range(4)]
+    rows[1]["embedding"] = [0.0, 1.0]
+    conn.fetch = AsyncMock(return_value=rows)
+
+    results = await context_service.search_chunks(
+        project_id=uuid4(),
+        query_embedding=[0.1] * 1536,
+        top_k=2,
+        query_text="some query",
+        mmr_lambda=0.5,
+    )
+
+    assert [r.content for r in results] == ["chunk 0", "chunk 1"]
+    assert "c.embedding AS embedding" in conn.fetch.call_args[0][0]
+
+
 @pytest.mark.asyncio
 async def test_delete_chunks_for_source(context_service: ContextService, mock_db_pool: MagicMock) -> None:
     """Test delete_chunks_for_source returns count."""
@@ -0,0 +1,148 @@
+"""Unit tests for the in-memory directory index."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.services import file_index
+from api.services.file_index import DirectoryIndex
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    folder = tmp_path / "sess" / "input"
+    (folder / "nested").mkdir(parents=True)
+    (folder / "nested" / "one.txt").write_text("1")
+    (folder / "b.txt").write_text("bb")
+    (folder / "A.md").write_text("a")
+    (folder / ".a.md.x.part").write_text("partial")
+    return folder
+
+
+@pytest.mark.asyncio
+async def test_list_dir_scans_once(workspace: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    index = DirectoryIndex()
+    scan = MagicMock(wraps=file_index._scan_directory)
+    monkeypatch.setattr(file_index, "_scan_directory", scan)
+
+    files = await index.list_dir(workspace)
+    assert await index.list_dir(workspace) == files
+
+    assert scan.call_count == 1
+    assert [(f["name"], f["type"]) for f in files] == [("nested", "folder"), ("A.md", "file"), ("b.txt", "file")]
+    assert files[0]["file_count"] == 1
+    assert files[2]["size"] == 2
+    assert "modified" in files[1]
+
+
+@pytest.mark.asyncio
+async def test_list_dir_missing_directory(tmp_path: Path) -> None:
+    assert await DirectoryIndex().list_dir(tmp_path / "missing") == []
+
+
+@pytest.mark.asyncio
+async def test_record_and_remove_update_listing(workspace: Path) -> None:
+    index = DirectoryIndex()
+    await index.list_dir(workspace)
+
+    new_file = workspace / "c.txt"
+    new_file.write_text("ccc")
+    index.record_file(new_file, new_file.stat())
+    index.record_file(workspace / ".c.txt.tmp.part", new_file.stat())  # hidden: ignored
+    (workspace / "b.txt").unlink()
+    index.remove(workspace / "b.txt")
+
+    names = [f["name"] for f in await index.list_dir(workspace)]
+    assert names == ["nested", "A.md", "c.txt"]
+
+
+@pytest.mark.asyncio
+async def test_nested_write_refreshes_folder_count(workspace: Path) -> None:
+    index = DirectoryIndex()
+    await index.list_dir(workspace)
+
+    nested_file = workspace / "nested" / "two.txt"
+    nested_file.write_text("2")
+    index.record_file(nested_file, nested_file.stat())
+
+    files = await index.list_dir(workspace)
+    assert files[0]["file_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_subtree(workspace: Path) -> None:
+    index = DirectoryIndex()
+    await index.list_dir(workspace)
+    await index.list_dir(workspace / "nested")
+    index.mark_workspace(workspace.parent)
+
+    (workspace / "nested" / "two.txt").write_text("2")
+    index.invalidate(workspace.parent)
+
+    assert not index.workspace_ready(workspace.parent)
+    assert index.stats()["size"] == 0
+    assert len(await index.list_dir(workspace / "nested")) == 2
+
+
+@pytest.mark.asyncio
+async def test_scan_racing_a_write_is_not_cached(workspace: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    index = DirectoryIndex()
+    real_scan = file_index._scan_directory
+
+    def scan_then_write(dir_path: Path) -> dict[str, object] | None:
+        entries = real_scan(dir_path)
+        new_file = workspace / "late.txt"
+        new_file.write_text("late")
+        index.record_file(new_file, new_file.stat())
+        return entries
+
+    monkeypatch.setattr(file_index, "_scan_directory", scan_then_write)
+    stale = await index.list_dir(workspace)
+    monkeypatch.setattr(file_index, "_scan_directory", real_scan)
+
+    assert "late.txt" not in [f["name"] for f in stale]
+    assert "late.txt" in [f["name"] for f in await index.list_dir(workspace)]
+
+
+@pytest.mark.asyncio
+async def test_watcher_invalidates_external_changes(workspace: Path) -> None:
+    index = DirectoryIndex()
+    root = workspace.parent.parent
+    assert await index.start(root)
+    try:
+        assert index.watching
+        await asyncio.sleep(0.2)  # Let the watcher register
+        await index.list_dir(workspace)
+
+        (workspace / "external.txt").write_text("written by a tool")
+        for _ in range(50):
+            if "external.txt" in [f["name"] for f in await index.list_dir(workspace)]:
+                break
+            await asyncio.sleep(0.1)
+        else:
+            pytest.fail("watcher did not invalidate the listing")
+        assert index.stats()["watch_events"] > 0
+    finally:
+        await index.stop()
+    assert not index.watching
+
+
+@pytest.mark.asyncio
+async def test_watcher_keeps_listing_for_own_writes(workspace: Path) -> None:
+    index = DirectoryIndex()
+    await index.list_dir(workspace)
+    own = workspace / "own.txt"
+    own.write_text("own")
+    index.record_file(own, own.stat())
+    misses = index.stats()["misses"]
+
+    await index._apply_changes({(file_index.Change.added, os.fspath(own))})
+
+    await index.list_dir(workspace)
+    assert index.stats()["misses"] == misses
@@ -1,7 +1,12 @@
+import hashlib
+
+from collections.abc import AsyncIterator
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from api.services.file_index import DirectoryIndex
 from api.services.file_service import LocalFileService
 
 SESSION_ID = "sess_123"
@@ -32,8 +37,8 @@ def mock_pool() -> MagicMock:
 
 @pytest.fixture
 def file_service(tmp_path: MagicMock, mock_pool: MagicMock) -> LocalFileService:
-    # Use tmp_path as base_path for isolation
-    return LocalFileService(base_path=tmp_path, pool=mock_pool)
+    # Use tmp_path as base_path and a private index for isolation
+    return LocalFileService(base_path=tmp_path, pool=mock_pool, index=DirectoryIndex())
 
 
 @pytest.mark.asyncio
@@ -68,6 +73,137 @@ async def test_save_file(file_service: LocalFileService, tmp_path: MagicMock, mo
     assert conn.execute.call_count >= 1  # upsert calls execute (delete then insert)
 
 
+async def _chunks(*parts: bytes) -> AsyncIterator[bytes]:
+    for part in parts:
+        yield part
+
+
+@pytest.mark.asyncio
+async def test_save_stream_writes_and_hashes(file_service: LocalFileService, tmp_path: Path) -> None:
+    mock_s3 = MagicMock()
+    file_service._s3_sync = mock_s3
+
+    result = await file_service.save_stream(SESSION_ID, FOLDER, "big.bin", _chunks(b"abc", b"def"), "text/plain")
+
+    target = tmp_path / SESSION_ID / FOLDER / "big.bin"
+    assert target.read_bytes() == b"abcdef"
+    assert result["size"] == 6
+    assert result["content_hash"] == hashlib.sha256(b"abcdef").hexdigest()
+    assert result["deduplicated"] is False
+    # No temp files left behind
+    assert [p.name for p in target.parent.iterdir()] == ["big.bin"]
+    mock_s3.upload_to_s3_background.assert_called_once_with(
+        SESSION_ID, FOLDER, "big.bin", content_hash=result["content_hash"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_save_stream_records_hash(file_service: LocalFileService, mock_pool: MagicMock) -> None:
+    conn = mock_pool.acquire.return_value.__aenter__.return_value
+
+    result = await file_service.save_stream(SESSION_ID, FOLDER, "a.txt", _chunks(b"abc"))
+
+    insert_args = conn.execute.call_args_list[-1][0]
+    assert "content_hash" in insert_args[0]
+    assert insert_args[-1] == result["content_hash"]
+
+
+@pytest.mark.asyncio
+async def test_save_stream_dedupes_identical_upload(
+    file_service: LocalFileService, tmp_path: Path, mock_pool: MagicMock
+) -> None:
+    target = tmp_path / SESSION_ID / FOLDER / "same.txt"
+    target.parent.mkdir(parents=True)
+    target.write_bytes(b"abc")
+    conn = mock_pool.acquire.return_value.__aenter__.return_value
+    conn.fetchval.return_value = 1  # session found, identical hash on record
+    mock_s3 = MagicMock()
+    mock_s3.is_pending.return_value = False
+    file_service._s3_sync = mock_s3
+
+    result = await file_service.save_stream(SESSION_ID, FOLDER, "same.txt", _chunks(b"abc"))
+
+    assert result["deduplicated"] is True
+    assert target.read_bytes() == b"abc"
+    assert [p.name for p in target.parent.iterdir()] == ["same.txt"]
+    conn.execute.assert_not_called()
+    mock_s3.upload_to_s3_background.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_save_stream_does_not_trust_stale_recorded_hash(
+    file_service: LocalFileService, tmp_path: Path, mock_pool: MagicMock
+) -> None:
+    target = tmp_path / SESSION_ID / FOLDER / "notes.txt"
+    target.parent.mkdir(parents=True)
+    target.write_bytes(b"xyz")  # Same-length edit by a tool; the record still has the hash of b"abc"
+    conn = mock_pool.acquire.return_value.__aenter__.return_value
+    conn.fetchval.return_value = 1
+    mock_s3 = MagicMock()
+    mock_s3.is_pending.return_value = False
+    file_service._s3_sync = mock_s3
+
+    result = await file_service.save_stream(SESSION_ID, FOLDER, "notes.txt", _chunks(b"abc"))
+
+    assert result["deduplicated"] is False
+    assert target.read_bytes() == b"abc"
+    mock_s3.upload_to_s3_background.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_save_stream_dedupe_refreshes_missing_record(
+    file_service: LocalFileService, tmp_path: Path, mock_pool: MagicMock
+) -> None:
+    target = tmp_path / SESSION_ID / FOLDER / "generated.md"
+    target.parent.mkdir(parents=True)
+    target.write_bytes(b"abc")
+    conn = mock_pool.acquire.return_value.__aenter__.return_value
+    conn.fetchval.side_effect = [1, None]  # Session found, no record with this hash
+    mock_s3 = MagicMock()
+    mock_s3.is_pending.return_value = False
+    file_service._s3_sync = mock_s3
+
+    result = await file_service.save_stream(SESSION_ID, FOLDER, "generated.md", _chunks(b"abc"))
+
+    assert result["deduplicated"] is True
+    insert_args = conn.execute.call_args_list[-1].args
+    assert insert_args[-1] == hashlib.sha256(b"abc").hexdigest()
+    mock_s3.upload_to_s3_background.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_save_stream_uploads_over_pending_local_copy(file_service: LocalFileService, tmp_path: Path) -> None:
+    target = tmp_path / SESSION_ID / FOLDER / "doc.txt"
+    target.parent.mkdir(parents=True)
+    target.write_bytes(b"abc")  # S3 holds a newer version that has not hydrated yet
+    mock_s3 = MagicMock()
+    mock_s3.is_pending.return_value = True
+    file_service._s3_sync = mock_s3
+
+    result = await file_service.save_stream(SESSION_ID, FOLDER, "doc.txt", _chunks(b"abc"))
+
+    assert result["deduplicated"] is False
+    mock_s3.is_pending.assert_called_once_with(SESSION_ID, FOLDER, "doc.txt")
+    mock_s3.upload_to_s3_background.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_save_stream_failure_keeps_original(file_service: LocalFileService, tmp_path: Path) -> None:
+    target = tmp_path / SESSION_ID / FOLDER / "keep.txt"
+    target.parent.mkdir(parents=True)
+    target.write_bytes(b"original")
+
+    async def broken() -> AsyncIterator[bytes]:
+        yield b"partial"
+        raise ConnectionError("client went away")
+
+    with pytest.raises(ConnectionError):
+        await file_service.save_stream(SESSION_ID, FOLDER, "keep.txt", broken())
+
+    assert target.read_bytes() == b"original"
+    assert [p.name for p in target.parent.iterdir()] == ["keep.txt"]
+
+
 @pytest.mark.asyncio
 async def test_list_files(file_service: LocalFileService, tmp_path: MagicMock) -> None:
     # Setup files
@@ -94,6 +230,49 @@ async def test_list_files(file_service: LocalFileService, tmp_path: MagicMock) -
     assert subdir["type"] == "folder"
 
 
+@pytest.mark.asyncio
+async def test_list_files_merges_pending_s3_files(file_service: LocalFileService, tmp_path: Path) -> None:
+    session_dir = tmp_path / SESSION_ID / FOLDER
+    session_dir.mkdir(parents=True)
+    (session_dir / "local.txt").write_text("local")
+    (session_dir / "stale.txt").write_text("v1")
+    mock_s3 = MagicMock()
+    mock_s3.wait_for_rehydration = AsyncMock()
+    mock_s3.pending_entries.return_value = [
+        {"name": "charts", "type": "folder", "size": 0, "file_count": 2},
+        {"name": "Remote.md", "type": "file", "size": 10},
+        {"name": "stale.txt", "type": "file", "size": 7},
+    ]
+    file_service._s3_sync = mock_s3
+
+    files = await file_service.list_files(SESSION_ID, FOLDER)
+
+    mock_s3.wait_for_rehydration.assert_awaited_once_with(SESSION_ID)
+    mock_s3.pending_entries.assert_called_once_with(SESSION_ID, FOLDER)
+    assert [f["name"] for f in files] == ["charts", "local.txt", "Remote.md", "stale.txt"]
+    assert files[-1]["size"] == 7
+
+
+@pytest.mark.asyncio
+async def test_list_files_tracks_writes_without_rescanning(
+    file_service: LocalFileService, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await file_service.save_file(SESSION_ID, FOLDER, "a.txt", b"A")
+    assert [f["name"] for f in await file_service.list_files(SESSION_ID, FOLDER)] == ["a.txt"]
+
+    scans = MagicMock(side_effect=AssertionError("listing should come from the index"))
+    monkeypatch.setattr("api.services.file_index._scan_directory", scans)
+
+    await file_service.save_file(SESSION_ID, FOLDER, "B.txt", b"BB")
+    await file_service.save_file(SESSION_ID, FOLDER, "a.txt", b"AAA")
+    files = await file_service.list_files(SESSION_ID, FOLDER)
+    assert [(f["name"], f["size"]) for f in files] == [("a.txt", 3), ("B.txt", 2)]
+
+    assert await file_service.delete_file(SESSION_ID, FOLDER, "a.txt")
+    assert [f["name"] for f in await file_service.list_files(SESSION_ID, FOLDER)] == ["B.txt"]
+    assert not any(p.name.endswith(".part") for p in (tmp_path / SESSION_ID / FOLDER).iterdir())
+
+
 @pytest.mark.asyncio
 async def test_get_file_content(file_service: LocalFileService, tmp_path: MagicMock) -> None:
     # Setup file
@@ -112,6 +291,20 @@ async def test_get_file_content_not_found(file_service: LocalFileService) -> Non
         await file_service.get_file_content(SESSION_ID, FOLDER, "nonexistent.txt")
 
 
+@pytest.mark.asyncio
+async def test_stat_file(file_service: LocalFileService, tmp_path: MagicMock) -> None:
+    session_dir = tmp_path / SESSION_ID / FOLDER
+    (session_dir / "subdir").mkdir(parents=True)
+    (session_dir / "stat.txt").write_bytes(b"12345")
+
+    stat_result = await file_service.stat_file(SESSION_ID, FOLDER, "stat.txt")
+
+    assert stat_result is not None
+    assert stat_result.st_size == 5
+    assert await file_service.stat_file(SESSION_ID, FOLDER, "missing.txt") is None
+    assert await file_service.stat_file(SESSION_ID, FOLDER, "subdir") is None
+
+
 @pytest.mark.asyncio
 async def test_delete_file(file_service: LocalFileService, tmp_path: MagicMock, mock_pool: MagicMock) -> None:
     # Setup file
@@ -139,3 +332,17 @@ def test_init_session_workspace(file_service: LocalFileService, tmp_path: MagicM
     session_dir = tmp_path / SESSION_ID
     assert (session_dir / "input").exists()
     assert (session_dir / "output").exists()
+
+
+def test_init_session_workspace_once_per_session(file_service: LocalFileService, tmp_path: Path) -> None:
+    file_service.init_session_workspace(SESSION_ID)
+    (tmp_path / SESSION_ID / "output").rmdir()
+
+    # Remembered: no filesystem work on later chat turns
+    file_service.init_session_workspace(SESSION_ID)
+    assert not (tmp_path / SESSION_ID / "output").exists()
+
+    # Until the workspace is invalidated (e.g. local cache cleanup)
+    file_service._index.invalidate(tmp_path / SESSION_ID)
+    file_service.init_session_workspace(SESSION_ID)
+    assert (tmp_path / SESSION_ID / "output").exists()
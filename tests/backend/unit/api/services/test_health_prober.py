@@ -0,0 +1,74 @@
+"""Unit tests for the background health prober."""
+
+from __future__ import annotations
+
+import asyncio
+
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from api.services.health_prober import HealthProber, probe_dependencies
+
+
+@pytest.fixture
+def check_db() -> Iterator[AsyncMock]:
+    with patch("api.services.health_prober.check_pool_health", new_callable=AsyncMock) as mock_check:
+        mock_check.return_value = {"healthy": True, "pool_size": 4}
+        yield mock_check
+
+
+async def test_probe_dependencies_checks_configured_components(check_db: AsyncMock) -> None:
+    mcp = MagicMock()
+    mcp.check_connectivity = AsyncMock(return_value={"healthy": True, "latency_ms": 1.5})
+
+    snapshot = await probe_dependencies(MagicMock(), mcp_manager=mcp)
+
+    assert snapshot.database["healthy"] is True
+    assert snapshot.mcp == {"healthy": True, "latency_ms": 1.5}
+    assert snapshot.s3 is None
+    assert snapshot.healthy_components() == {"database": True, "mcp": True}
+
+
+async def test_slow_or_failing_checks_are_bounded(check_db: AsyncMock) -> None:
+    async def hang() -> dict[str, bool]:
+        await asyncio.sleep(10)
+        return {"connected": True}
+
+    mcp = MagicMock()
+    mcp.check_connectivity = AsyncMock(side_effect=RuntimeError("server gone"))
+    s3 = MagicMock()
+    s3.check_connectivity = hang
+
+    snapshot = await probe_dependencies(MagicMock(), mcp_manager=mcp, s3_sync=s3, timeout=0.05)
+
+    assert snapshot.mcp == {"healthy": False, "error": "server gone"}
+    assert snapshot.s3 == {"connected": False, "error": "Timed out after 0.05s"}
+    assert snapshot.duration_ms < 1000
+    assert snapshot.healthy_components() == {"database": True, "mcp": False, "s3": False}
+
+
+async def test_prober_refreshes_snapshot_in_background(check_db: AsyncMock) -> None:
+    prober = HealthProber(MagicMock(), interval=0.01)
+    assert prober.snapshot is None
+
+    prober.start()
+    await asyncio.sleep(0.05)
+    await prober.stop()
+
+    assert prober.snapshot is not None
+    assert prober.snapshot.database["healthy"] is True
+    assert check_db.await_count >= 2
+
+
+async def test_prober_keeps_running_after_failed_round(check_db: AsyncMock) -> None:
+    prober = HealthProber(MagicMock(), interval=0.01)
+
+    with patch("api.services.health_prober.probe_dependencies", side_effect=[RuntimeError("boom")]):
+        prober.start()
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.05)
+    await prober.stop()
+
+    assert prober.snapshot is not None
@@ -4,13 +4,19 @@ from __future__ import annotations
 
 import json
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any
+from unittest.mock import AsyncMock
 from uuid import uuid4
 
+import pytest
+
 from api.services.message_utils import (
     _extract_display_content,
     calculate_tool_status,
+    decode_message_cursor,
+    encode_message_cursor,
+    fetch_message_page,
     row_to_message,
 )
 
@@ -191,3 +197,65 @@ class TestCalculateToolStatus:
         """None success returns pending."""
         result = calculate_tool_status({}, None)
         assert result == "pending"
+
+
+class TestMessageCursor:
+    """Tests for keyset cursor encoding."""
+
+    def test_roundtrip(self) -> None:
+        """Cursor decodes back to the same position."""
+        created_at = datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+        message_id = uuid4()
+        cursor = encode_message_cursor(created_at, message_id)
+        assert "=" not in cursor
+        assert decode_message_cursor(cursor) == (created_at, message_id)
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", "!!!", "MjAyNS0wMS0wMg"])
+    def test_invalid_cursor_raises_value_error(self, cursor: str) -> None:
+        """Malformed cursors raise ValueError."""
+        with pytest.raises(ValueError):
+            decode_message_cursor(cursor)
+
+
+class TestFetchMessagePage:
+    """Tests for fetch_message_page keyset pagination."""
+
+    @staticmethod
+    def _rows(count: int) -> list[dict[str, Any]]:
+        """Rows newest-first, as returned by ORDER BY created_at DESC, id DESC."""
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        return [{"id": uuid4(), "created_at": base - timedelta(seconds=i)} for i in range(count)]
+
+    @pytest.mark.asyncio
+    async def test_newest_page_with_more(self) -> None:
+        """Extra row signals older messages; page is returned chronologically."""
+        rows = self._rows(4)
+        conn = AsyncMock()
+        conn.fetch.return_value = rows
+
+        page, next_cursor = await fetch_message_page(conn, uuid4(), 3)
+
+        assert page == list(reversed(rows[:3]))
+        assert next_cursor is not None
+        assert decode_message_cursor(next_cursor) == (rows[2]["created_at"], rows[2]["id"])
+        sql, *params = conn.fetch.call_args[0]
+        assert "ORDER BY created_at DESC, id DESC" in sql
+        assert "OFFSET" not in sql
+        assert params[-1] == 4
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self) -> None:
+        """Pages reaching the first message return no cursor."""
+        rows = self._rows(2)
+        conn = AsyncMock()
+        conn.fetch.return_value = rows
+        before = (datetime(2025, 2, 1, tzinfo=timezone.utc), uuid4())
+
+        page, next_cursor = await fetch_message_page(conn, uuid4(), 3, before=before)
+
+        assert page == list(reversed(rows))
+        assert next_cursor is None
+        sql, _, created_at, message_id, limit = conn.fetch.call_args[0]
+        assert "(created_at, id) < ($2, $3)" in sql
+        assert (created_at, message_id) == before
+        assert limit == 4
@@ -92,23 +92,25 @@ async def test_add_items_inserts_json(postgres_session: PostgresSession, mock_db
     ]
 
     conn = mock_db_pool.acquire.return_value.__aenter__.return_value
-    conn.execute = AsyncMock()
+    conn.executemany = AsyncMock()
 
     await postgres_session.add_items(items)
 
-    # Should have 2 execute calls (one per item)
-    assert conn.execute.call_count == 2
+    # One batched insert, items serialized in order
+    conn.executemany.assert_awaited_once()
+    records = conn.executemany.call_args[0][1]
+    assert [json.loads(content) for _, _, content in records] == items
 
 
 @pytest.mark.asyncio
 async def test_add_items_empty_list(postgres_session: PostgresSession, mock_db_pool: MagicMock) -> None:
     """Test add_items with empty list does nothing."""
     conn = mock_db_pool.acquire.return_value.__aenter__.return_value
-    conn.execute = AsyncMock()
+    conn.executemany = AsyncMock()
 
     await postgres_session.add_items([])
 
-    conn.execute.assert_not_called()
+    conn.executemany.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -126,12 +128,12 @@ async def test_add_items_skips_unserializable(postgres_session: PostgresSession,
     ]
 
     conn = mock_db_pool.acquire.return_value.__aenter__.return_value
-    conn.execute = AsyncMock()
+    conn.executemany = AsyncMock()
 
     await postgres_session.add_items(items)
 
     # Only 2 valid items should be inserted
-    assert conn.execute.call_count == 2
+    assert len(conn.executemany.call_args[0][1]) == 2
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,402 @@
+"""Unit tests for S3SyncService streaming downloads and rehydration."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.services.s3_sync_service import RemoteObject, S3Download, S3SyncService
+from core.constants import S3_MAX_POOL_CONNECTIONS, S3_SYNC_MANIFEST
+
+SESSION_ID = "sess_123"
+
+
+class ClientError(Exception):
+    """Stand-in with the botocore ClientError ``response`` shape."""
+
+    def __init__(self, code: str) -> None:
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+@pytest.fixture
+def client() -> MagicMock:
+    return MagicMock()
+
+
+@pytest.fixture
+def service(client: MagicMock, tmp_path: Path) -> S3SyncService:
+    settings = MagicMock()
+    settings.s3_bucket = "bucket"
+    service = S3SyncService(settings=settings, local_base_path=tmp_path)
+    service._client = client
+    return service
+
+
+class TestOpenDownload:
+    @pytest.mark.asyncio
+    async def test_full_object(self, service: S3SyncService, client: MagicMock) -> None:
+        body = MagicMock()
+        client.get_object.return_value = {
+            "Body": body,
+            "ContentLength": 20,
+            "ETag": '"abc"',
+            "LastModified": datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC),
+        }
+
+        download = await service.open_download(SESSION_ID, "input", "doc.pdf")
+
+        client.get_object.assert_called_once_with(Bucket="bucket", Key=f"{SESSION_ID}/input/doc.pdf")
+        assert download.status_code == 200
+        assert download.body is body
+        assert download.headers == {
+            "Accept-Ranges": "bytes",
+            "Content-Length": "20",
+            "ETag": '"abc"',
+            "Last-Modified": "Tue, 02 Jan 2024 03:04:05 GMT",
+        }
+
+    @pytest.mark.asyncio
+    async def test_range_and_conditions_passed_through(self, service: S3SyncService, client: MagicMock) -> None:
+        client.get_object.return_value = {"Body": MagicMock(), "ContentLength": 10, "ContentRange": "bytes 0-9/20"}
+
+        download = await service.open_download(
+            SESSION_ID, "input", "doc.pdf", byte_range="bytes=0-9", if_modified_since="Tue, 02 Jan 2024 03:04:05 GMT"
+        )
+
+        _, kwargs = client.get_object.call_args
+        assert kwargs["Range"] == "bytes=0-9"
+        assert kwargs["IfModifiedSince"] == datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC)
+        assert download.status_code == 206
+        assert download.headers["Content-Range"] == "bytes 0-9/20"
+
+    @pytest.mark.asyncio
+    async def test_not_modified(self, service: S3SyncService, client: MagicMock) -> None:
+        client.get_object.side_effect = ClientError("304")
+
+        download = await service.open_download(SESSION_ID, "input", "doc.pdf", if_none_match='"abc"')
+
+        assert download.status_code == 304
+        assert download.body is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_range(self, service: S3SyncService, client: MagicMock) -> None:
+        client.get_object.side_effect = ClientError("InvalidRange")
+
+        download = await service.open_download(SESSION_ID, "input", "doc.pdf", byte_range="bytes=100-")
+
+        assert download.status_code == 416
+
+    @pytest.mark.asyncio
+    async def test_missing_object(self, service: S3SyncService, client: MagicMock) -> None:
+        client.get_object.side_effect = ClientError("NoSuchKey")
+
+        with pytest.raises(FileNotFoundError):
+            await service.open_download(SESSION_ID, "input", "doc.pdf")
+
+    @pytest.mark.asyncio
+    async def test_other_errors_propagate(self, service: S3SyncService, client: MagicMock) -> None:
+        client.get_object.side_effect = ClientError("AccessDenied")
+
+        with pytest.raises(ClientError):
+            await service.open_download(SESSION_ID, "input", "doc.pdf")
+
+
+class TestClient:
+    def test_shared_client_pools_connections(self, tmp_path: Path) -> None:
+        settings = MagicMock()
+        settings.s3_region = "us-east-1"
+        settings.s3_endpoint = "http://localhost:9000"
+        settings.aws_access_key_id = "key"
+        settings.aws_secret_access_key = "secret"
+        service = S3SyncService(settings=settings, local_base_path=tmp_path)
+
+        client = service._get_client()
+
+        assert service._get_client() is client
+        assert client.meta.config.max_pool_connections == S3_MAX_POOL_CONNECTIONS
+        service.close()
+        assert service._client is None
+
+    @pytest.mark.asyncio
+    async def test_calls_run_on_dedicated_pool(self, service: S3SyncService, client: MagicMock) -> None:
+        threads: list[str] = []
+        client.head_bucket.side_effect = lambda **_: threads.append(threading.current_thread().name)
+        client.get_object.side_effect = lambda **_: threads.append(threading.current_thread().name) or {
+            "Body": MagicMock(),
+            "ContentLength": 0,
+        }
+
+        await service.ensure_bucket_exists()
+        assert (await service.check_connectivity())["connected"]
+        await service.open_download(SESSION_ID, "input", "doc.pdf")
+
+        assert len(threads) == 3
+        assert all(name.startswith("s3-io") for name in threads)
+
+
+def test_download_iter_and_close() -> None:
+    body = MagicMock()
+    body.iter_chunks.return_value = [b"a", b"b"]
+    download = S3Download(status_code=200, body=body)
+
+    assert list(download.iter_chunks(1024)) == [b"a", b"b"]
+    body.iter_chunks.assert_called_once_with(1024)
+    download.close()
+    body.close.assert_called_once()
+    assert list(S3Download(status_code=304).iter_chunks(1024)) == []
+
+
+class TestRehydration:
+    @pytest.fixture
+    def bucket(self, client: MagicMock) -> dict[str, tuple[bytes, str]]:
+        """Objects under the session prefix: relative key -> (content, etag)."""
+        objects: dict[str, tuple[bytes, str]] = {}
+
+        def list_pages(**kwargs: Any) -> list[dict[str, Any]]:
+            contents = [
+                {"Key": f"{SESSION_ID}/{key}", "ETag": etag, "Size": len(data)} for key, (data, etag) in objects.items()
+            ]
+            return [{"Contents": contents[:2]}, {"Contents": contents[2:]}]
+
+        def get_object(Bucket: str, Key: str) -> dict[str, Any]:
+            data, etag = objects[Key.removeprefix(f"{SESSION_ID}/")]
+            body = MagicMock()
+            body.iter_chunks.return_value = [data]
+            return {"Body": body, "ETag": etag}
+
+        client.get_paginator.return_value.paginate.side_effect = list_pages
+        client.get_object.side_effect = get_object
+        return objects
+
+    def _write(self, tmp_path: Path, key: str, data: bytes) -> Path:
+        path = tmp_path / SESSION_ID / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return path
+
+    def _downloaded(self, client: MagicMock) -> list[str]:
+        return sorted(call.kwargs["Key"].removeprefix(f"{SESSION_ID}/") for call in client.get_object.call_args_list)
+
+    @pytest.mark.asyncio
+    async def test_eager_input_lazy_rest(
+        self, service: S3SyncService, client: MagicMock, bucket: dict[str, tuple[bytes, str]], tmp_path: Path
+    ) -> None:
+        bucket.update(
+            {
+                "input/missing.txt": (b"new", '"e1"'),
+                "input/legacy.txt": (b"same", '"e2"'),
+                "output/report.md": (b"report", '"e3"'),
+                "output/changed.md": (b"v2", '"e5"'),
+            }
+        )
+        self._write(tmp_path, "input/legacy.txt", b"same")  # Synced before manifests: adopted by size
+        self._write(tmp_path, "output/changed.md", b"v1")
+        self._write(tmp_path, S3_SYNC_MANIFEST, json.dumps({"output/changed.md": '"e4"'}).encode())
+
+        assert await service.sync_from_s3(SESSION_ID) == 1
+
+        assert self._downloaded(client) == ["input/missing.txt"]
+        assert (tmp_path / SESSION_ID / "input/missing.txt").read_bytes() == b"new"
+        assert service.is_pending(SESSION_ID, "output", "report.md")
+        assert service.is_pending(SESSION_ID, "output", "changed.md")
+        assert not service.is_pending(SESSION_ID, "input", "legacy.txt")
+        manifest = json.loads((tmp_path / SESSION_ID / S3_SYNC_MANIFEST).read_text())
+        assert manifest == {"input/missing.txt": '"e1"', "input/legacy.txt": '"e2"', "output/changed.md": '"e4"'}
+        assert not list((tmp_path / SESSION_ID).rglob("*.part"))
+
+    @pytest.mark.asyncio
+    async def test_hydrate_on_first_access(
+        self, service: S3SyncService, client: MagicMock, bucket: dict[str, tuple[bytes, str]], tmp_path: Path
+    ) -> None:
+        bucket.update({"output/a.md": (b"a", '"ea"'), "output/b.md": (b"b", '"eb"'), "output/c.md": (b"c", '"ec"')})
+        await service.sync_from_s3(SESSION_ID)
+        assert client.get_object.call_count == 0
+
+        first, second = await asyncio.gather(
+            service.hydrate(SESSION_ID, "output/a.md"), service.hydrate(SESSION_ID, "./output/a.md")
+        )
+        assert (first, second) == (True, True)
+        assert client.get_object.call_count == 1  # Concurrent callers share one download
+        assert (tmp_path / SESSION_ID / "output/a.md").read_bytes() == b"a"
+        assert not await service.hydrate(SESSION_ID, "output/a.md")
+
+        assert await service.hydrate_all(SESSION_ID) == 2
+        assert self._downloaded(client) == ["output/a.md", "output/b.md", "output/c.md"]
+
+        # Everything is current now: the next sync only lists
+        client.get_object.reset_mock()
+        assert await service.sync_from_s3(SESSION_ID) == 0
+        assert client.get_object.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_pending_files_listed_and_hydrated_by_prefix(
+        self, service: S3SyncService, client: MagicMock, bucket: dict[str, tuple[bytes, str]], tmp_path: Path
+    ) -> None:
+        bucket.update(
+            {
+                "output/report.md": (b"report", '"e1"'),
+                "output/charts/a.png": (b"png", '"e2"'),
+                "templates/base.md": (b"base", '"e3"'),
+            }
+        )
+        await service.sync_from_s3(SESSION_ID)
+
+        assert service.pending_entries(SESSION_ID, "output") == [
+            {"name": "charts", "type": "folder", "size": 0, "file_count": 1},
+            {"name": "report.md", "type": "file", "size": 6},
+        ]
+        assert service.pending_entries(SESSION_ID, "input") == []
+
+        assert await service.hydrate_all(SESSION_ID, "./output/charts") == 1
+        assert self._downloaded(client) == ["output/charts/a.png"]
+        assert await service.hydrate_all(SESSION_ID, "output") == 1
+        assert service.pending_entries(SESSION_ID, "output") == []
+        assert service.is_pending(SESSION_ID, "templates", "base.md")
+
+    @pytest.mark.asyncio
+    async def test_remote_change_detected_by_etag(
+        self, service: S3SyncService, client: MagicMock, bucket: dict[str, tuple[bytes, str]], tmp_path: Path
+    ) -> None:
+        bucket["input/doc.txt"] = (b"v1", '"e1"')
+        await service.sync_from_s3(SESSION_ID)
+
+        bucket["input/doc.txt"] = (b"v2", '"e2"')  # Same size, different content
+        assert await service.sync_from_s3(SESSION_ID) == 1
+        assert (tmp_path / SESSION_ID / "input/doc.txt").read_bytes() == b"v2"
+
+    @pytest.mark.asyncio
+    async def test_failed_download_stays_stale(
+        self, service: S3SyncService, client: MagicMock, bucket: dict[str, tuple[bytes, str]]
+    ) -> None:
+        bucket["input/doc.txt"] = (b"v1", '"e1"')
+        client.get_object.side_effect = ClientError("SlowDown")
+
+        assert await service.sync_from_s3(SESSION_ID) == 0
+        assert service._manifests[SESSION_ID] == {}
+
+    @pytest.mark.asyncio
+    async def test_start_rehydration_runs_once(
+        self, service: S3SyncService, client: MagicMock, bucket: dict[str, tuple[bytes, str]], tmp_path: Path
+    ) -> None:
+        bucket["input/doc.txt"] = (b"doc", '"e1"')
+
+        task = service.start_rehydration(SESSION_ID)
+        assert service.start_rehydration(SESSION_ID) is task
+        await service.wait_for_rehydration(SESSION_ID)
+
+        assert task.result() == 1
+        assert (tmp_path / SESSION_ID / "input/doc.txt").exists()
+        await service.wait_for_rehydration(SESSION_ID)  # Nothing in progress: returns immediately
+
+    def test_cleanup_forgets_session(self, service: S3SyncService, tmp_path: Path) -> None:
+        self._write(tmp_path, "input/doc.txt", b"doc")
+        service._manifests[SESSION_ID] = {"input/doc.txt": '"e1"'}
+
+        assert service.cleanup_session_files(SESSION_ID) == 1
+        assert SESSION_ID not in service._manifests
+
+
+class FakeS3:
+    """MinIO-style in-memory bucket implementing the client calls uploads use."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, tuple[bytes, dict[str, str]]] = {}
+        self.fail_uploads = 0
+        self.configs: list[Any] = []
+
+    def upload_file(
+        self, Filename: str, Bucket: str, Key: str, ExtraArgs: dict[str, Any] | None = None, Config: Any = None
+    ) -> None:
+        self.configs.append(Config)
+        if self.fail_uploads:
+            self.fail_uploads -= 1
+            raise ConnectionError("connection reset by peer")
+        metadata = (ExtraArgs or {}).get("Metadata", {})
+        self.objects[Key] = (Path(Filename).read_bytes(), metadata)
+
+    def head_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        data, metadata = self.objects[Key]
+        return {"ETag": f'"{hashlib.md5(data).hexdigest()}"', "ContentLength": len(data), "Metadata": metadata}
+
+
+class TestUploads:
+    @pytest.fixture
+    def s3(self, service: S3SyncService) -> FakeS3:
+        fake = FakeS3()
+        service._client = fake
+        service._uploads._base_delay = 0.0
+        return fake
+
+    def _write(self, tmp_path: Path, key: str, data: bytes) -> None:
+        path = tmp_path / SESSION_ID / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    @pytest.mark.asyncio
+    async def test_background_uploads_record_etag(self, service: S3SyncService, s3: FakeS3, tmp_path: Path) -> None:
+        self._write(tmp_path, "output/report.md", b"report")
+
+        service.upload_to_s3_background(SESSION_ID, "output", "report.md", content_hash="abc")
+        assert await service.drain_uploads(5)
+
+        data, metadata = s3.objects[f"{SESSION_ID}/output/report.md"]
+        assert (data, metadata) == (b"report", {"sha256": "abc"})
+        assert s3.configs[0].multipart_threshold == service._get_transfer_config().multipart_threshold
+        manifest = json.loads((tmp_path / SESSION_ID / S3_SYNC_MANIFEST).read_text())
+        assert manifest == {"output/report.md": s3.head_object("bucket", f"{SESSION_ID}/output/report.md")["ETag"]}
+
+    @pytest.mark.asyncio
+    async def test_local_write_is_not_hydrated_over(self, service: S3SyncService, s3: FakeS3, tmp_path: Path) -> None:
+        service._pending[SESSION_ID] = {"output/report.md": RemoteObject("output/report.md", '"old"', 3)}
+        self._write(tmp_path, "output/report.md", b"new report")
+        s3.fail_uploads = 100  # Even if the upload never succeeds
+
+        service.upload_to_s3_background(SESSION_ID, "output", "report.md")
+
+        assert not service.is_pending(SESSION_ID, "output", "report.md")
+        assert service.pending_entries(SESSION_ID, "output") == []
+        assert await service.hydrate(SESSION_ID, "output/report.md") is False
+        assert await service.hydrate_all(SESSION_ID) == 0
+        assert (tmp_path / SESSION_ID / "output/report.md").read_bytes() == b"new report"
+        await service.drain_uploads(0.1)
+
+    @pytest.mark.asyncio
+    async def test_rapid_edits_upload_once(self, service: S3SyncService, s3: FakeS3, tmp_path: Path) -> None:
+        self._write(tmp_path, "output/draft.md", b"v1")
+        for _ in range(5):
+            service.upload_to_s3_background(SESSION_ID, "output", "draft.md")
+        assert await service.drain_uploads(5)
+
+        assert len(s3.configs) == 1
+        assert service.upload_stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_retried(self, service: S3SyncService, s3: FakeS3, tmp_path: Path) -> None:
+        self._write(tmp_path, "input/doc.txt", b"doc")
+        s3.fail_uploads = 2
+
+        service.upload_to_s3_background(SESSION_ID, "input", "doc.txt")
+        assert await service.drain_uploads(5)
+
+        assert f"{SESSION_ID}/input/doc.txt" in s3.objects
+        assert service.upload_stats()["retried"] == 2
+
+    @pytest.mark.asyncio
+    async def test_upload_all(self, service: S3SyncService, s3: FakeS3, tmp_path: Path) -> None:
+        self._write(tmp_path, "input/a.txt", b"a")
+        self._write(tmp_path, "output/code/plot.png", b"png")
+        self._write(tmp_path, "output/.hidden", b"x")
+
+        assert await service.upload_all_to_s3(SESSION_ID) == 2
+        assert sorted(s3.objects) == [f"{SESSION_ID}/input/a.txt", f"{SESSION_ID}/output/code/plot.png"]
+        await service.drain_uploads(5)
@@ -0,0 +1,140 @@
+"""Unit tests for the coalescing S3 upload queue."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from prometheus_client import REGISTRY
+
+from api.services.s3_upload_queue import S3UploadQueue, UploadJob
+
+
+class Recorder:
+    """Upload function stand-in: records calls, optionally blocks or fails."""
+
+    def __init__(self, failures: int = 0, exc: Exception | None = None) -> None:
+        self.calls: list[tuple[str, str | None]] = []
+        self.failures = failures
+        self.exc = exc or ConnectionError("reset")
+        self.gate: asyncio.Event | None = None
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, job: UploadJob) -> int:
+        self.calls.append((job.key, job.content_hash))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            if self.gate is not None:
+                await self.gate.wait()
+            else:
+                await asyncio.sleep(0)
+            if self.failures:
+                self.failures -= 1
+                raise self.exc
+            return 100
+        finally:
+            self.running -= 1
+
+
+def _queue(upload: Recorder, **kwargs: float) -> S3UploadQueue:
+    return S3UploadQueue(upload, base_delay=0.0, max_delay=0.0, **kwargs)  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_repeated_writes_coalesce() -> None:
+    upload = Recorder()
+    upload.gate = asyncio.Event()
+    queue = _queue(upload, workers=1)
+
+    first = queue.enqueue("s1", "output", "a.md", "h1")
+    await asyncio.sleep(0)  # Worker picks up the first write
+    later = [queue.enqueue("s1", "output", "a.md", f"h{i}") for i in range(2, 5)]
+    assert queue.depth == 2
+
+    upload.gate.set()
+    assert await first is True
+    assert all(await asyncio.gather(*later))
+
+    # One upload in flight, the three writes during it collapse into one more
+    assert upload.calls == [("s1/output/a.md", "h1"), ("s1/output/a.md", "h4")]
+    assert queue.stats()["coalesced"] == 2
+    await queue.drain(1)
+
+
+@pytest.mark.asyncio
+async def test_workers_bound_concurrency() -> None:
+    upload = Recorder()
+    upload.gate = asyncio.Event()
+    queue = _queue(upload, workers=2)
+
+    waiters = [queue.enqueue("s1", "input", f"{i}.txt") for i in range(5)]
+    await asyncio.sleep(0.01)
+    assert upload.running == 2
+    upload.gate.set()
+
+    assert all(await asyncio.gather(*waiters))
+    assert upload.max_running == 2
+    assert len(upload.calls) == 5
+    await queue.drain(1)
+
+
+@pytest.mark.asyncio
+async def test_retries_then_succeeds() -> None:
+    upload = Recorder(failures=2)
+    queue = _queue(upload, max_attempts=3)
+
+    assert await queue.enqueue("s1", "input", "a.txt") is True
+    assert len(upload.calls) == 3
+    assert queue.stats()["retried"] == 2
+    await queue.drain(1)
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_attempts() -> None:
+    upload = Recorder(failures=10)
+    queue = _queue(upload, max_attempts=3)
+
+    assert await queue.enqueue("s1", "input", "a.txt") is False
+    assert len(upload.calls) == 3
+    assert queue.stats()["failed"] == 1
+    await queue.drain(1)
+
+
+@pytest.mark.asyncio
+async def test_missing_file_not_retried() -> None:
+    upload = Recorder(failures=1, exc=FileNotFoundError("gone"))
+    queue = _queue(upload)
+
+    assert await queue.enqueue("s1", "input", "a.txt") is False
+    assert len(upload.calls) == 1
+    await queue.drain(1)
+
+
+@pytest.mark.asyncio
+async def test_drain_finishes_queue_and_stops_workers() -> None:
+    upload = Recorder()
+    queue = _queue(upload, workers=2)
+    before = REGISTRY.get_sample_value("chatjuicer_s3_upload_bytes_total") or 0.0
+
+    waiters = [queue.enqueue("s1", "output", f"{i}.md") for i in range(4)]
+    assert await queue.drain(1) is True
+
+    assert all(w.done() and w.result() for w in waiters)
+    assert queue.depth == 0
+    assert queue.stats()["workers"] == 0
+    assert REGISTRY.get_sample_value("chatjuicer_s3_upload_queue_depth") == 0
+    assert REGISTRY.get_sample_value("chatjuicer_s3_upload_bytes_total") == before + 400
+
+
+@pytest.mark.asyncio
+async def test_drain_timeout() -> None:
+    upload = Recorder()
+    upload.gate = asyncio.Event()
+    queue = _queue(upload, workers=1)
+
+    waiter = queue.enqueue("s1", "output", "slow.md")
+    assert await queue.drain(0.01) is False
+    assert waiter.done() and waiter.result() is False
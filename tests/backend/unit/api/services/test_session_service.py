@@ -1,4 +1,3 @@
-import json
 
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, Mock
@@ -8,6 +7,7 @@ import pytest
 
 from api.services.session_service import SessionService
 from core.constants import DEFAULT_MODEL
+from utils.cache import invalidate_session_caches
 
 
 @pytest.fixture
@@ -26,7 +26,7 @@ async def test_create_session(session_service: SessionService, mock_db_pool: Moc
         "session_id": "chat_12345",
         "title": None,
         "model": DEFAULT_MODEL,
-        "mcp_config": json.dumps(["sequential-thinking", "fetch"]),
+        "mcp_config": ["sequential-thinking", "fetch"],  # JSONB decoded by the pool codec
         "reasoning_effort": "medium",
         "pinned": False,
         "is_named": False,
@@ -46,8 +46,9 @@ async def test_create_session(session_service: SessionService, mock_db_pool: Moc
     assert result["model"] == DEFAULT_MODEL
     assert result["mcp_config"] == ["sequential-thinking", "fetch"]
 
-    # Verify DB call
+    # Verify DB call passes mcp_config natively to the JSONB codec
     conn.fetchrow.assert_called_once()
+    assert ["sequential-thinking", "fetch"] in conn.fetchrow.call_args[0]
     args = conn.fetchrow.call_args[0]
     assert "INSERT INTO sessions" in args[0]
     assert args[1] == user_id
@@ -130,6 +131,18 @@ async def test_list_sessions(session_service: SessionService, mock_db_pool: Mock
     assert result["total_count"] == 10
     assert result["has_more"] is True  # 2 < 10
 
+    # Any page size is cached; the count is shared across pages
+    assert await session_service.list_sessions(user_id, offset=0, limit=2) == result
+    await session_service.list_sessions(user_id, offset=2, limit=2)
+    assert conn.fetch.call_count == 2
+    assert conn.fetchval.call_count == 1
+
+    # A mutation bumps the user's list generation, invalidating every page
+    await invalidate_session_caches(user_id)
+    await session_service.list_sessions(user_id, offset=0, limit=2)
+    assert conn.fetch.call_count == 3
+    assert conn.fetchval.call_count == 2
+
 
 @pytest.mark.asyncio
 async def test_update_session(session_service: SessionService, mock_db_pool: Mock) -> None:
@@ -290,6 +303,10 @@ async def test_get_session_with_history(session_service: SessionService, mock_db
     assert len(result["full_history"]) == 1
     assert len(result["files"]) == 1
     assert result["files"][0]["name"] == "test.txt"
+    assert result["has_more"] is False
+    assert result["next_cursor"] is None
+    # Total comes from the maintained counter, not COUNT(*)
+    assert "message_count" in conn.fetchval.call_args[0][0]
 
 
 def test_get_model_limit(session_service: SessionService) -> None:
@@ -0,0 +1,75 @@
+"""Unit tests for the synced token denylist."""
+
+from __future__ import annotations
+
+import time
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from api.services.token_denylist import TokenDenylist
+
+
+@pytest.fixture
+def pool() -> MagicMock:
+    pool = MagicMock()
+    conn = AsyncMock()
+    cm = MagicMock()
+    cm.__aenter__ = AsyncMock(return_value=conn)
+    cm.__aexit__ = AsyncMock(return_value=None)
+    pool.acquire.return_value = cm
+    pool.conn = conn
+    return pool
+
+
+def test_is_revoked_by_jti_and_version() -> None:
+    denylist = TokenDenylist()
+    denylist.add_token("abc", time.time() + 60)
+    denylist.set_min_version("user-1", 2)
+
+    assert denylist.is_revoked({"sub": "user-2", "jti": "abc"})
+    assert denylist.is_revoked({"sub": "user-1", "jti": "x", "ver": 1})
+    assert not denylist.is_revoked({"sub": "user-1", "jti": "x", "ver": 2})
+    assert not denylist.is_revoked({"sub": "user-2", "jti": "x"})
+
+
+@pytest.mark.asyncio
+async def test_sync_replaces_state_and_keeps_pending_local(pool: MagicMock) -> None:
+    user_id = uuid4()
+    pool.conn.fetch.side_effect = [
+        [{"jti": "db-jti", "exp": time.time() + 60}],
+        [{"id": user_id, "token_version": 3}],
+    ]
+    denylist = TokenDenylist()
+    denylist.add_token("local-jti", time.time() + 60)
+    denylist.add_token("expired-jti", time.time() - 1)
+    denylist.set_min_version("gone-user", 5)
+
+    with patch("api.services.token_denylist.get_settings") as settings:
+        settings.return_value.refresh_token_expires_days = 7
+        await denylist.start(pool, interval=3600)
+    await denylist.stop()
+
+    assert denylist.is_revoked({"sub": "u", "jti": "db-jti"})
+    assert denylist.is_revoked({"sub": "u", "jti": "local-jti"})
+    assert not denylist.is_revoked({"sub": "u", "jti": "expired-jti"})
+    assert denylist.is_revoked({"sub": str(user_id), "ver": 2})
+    assert not denylist.is_revoked({"sub": "gone-user", "ver": 0})
+    pool.conn.execute.assert_awaited_once_with("DELETE FROM token_denylist WHERE expires_at <= now()")
+    stats = denylist.stats()
+    assert stats["revoked_tokens"] == 2
+    assert stats["revoked_users"] == 1
+    assert stats["last_sync_age"] is not None
+
+
+@pytest.mark.asyncio
+async def test_start_survives_sync_failure(pool: MagicMock) -> None:
+    pool.conn.execute.side_effect = RuntimeError("db down")
+    denylist = TokenDenylist()
+
+    await denylist.start(pool, interval=3600)
+    await denylist.stop()
+
+    assert denylist.stats()["last_sync_age"] is None
@@ -0,0 +1,193 @@
+"""Unit tests for VectorIndexManager."""
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from api.services.vector_index_service import (
+    ANN_INDEX_SPECS,
+    FULL_DISTANCE,
+    PARTIAL_INDEX_PREFIX,
+    VectorIndexManager,
+    ef_search_for,
+    partial_index_name,
+)
+from core.constants import (
+    CONTEXT_BINARY_OVERSAMPLE,
+    CONTEXT_EXACT_SCAN_MAX_CHUNKS,
+    CONTEXT_PARTIAL_INDEX_MIN_CHUNKS,
+    HNSW_EF_SEARCH_MAX,
+    HNSW_EF_SEARCH_MIN,
+)
+
+
+@pytest.fixture
+def manager(mock_db_pool: MagicMock) -> VectorIndexManager:
+    return VectorIndexManager(pool=mock_db_pool)
+
+
+def test_partial_index_name_fits_identifier_limit() -> None:
+    """Test partial index names stay under PostgreSQL's 63-char identifier limit."""
+    project_id = uuid4()
+    name = partial_index_name(project_id)
+    assert name == f"{PARTIAL_INDEX_PREFIX}{project_id.hex}"
+    assert len(name) <= 63
+
+
+def test_ef_search_for_is_clamped() -> None:
+    """Test ef_search scales with the candidate limit within bounds."""
+    assert ef_search_for(3) == HNSW_EF_SEARCH_MIN
+    assert ef_search_for(80) == 160
+    assert ef_search_for(10_000) == HNSW_EF_SEARCH_MAX
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chunk_count", "has_partial_index", "expected"),
+    [
+        (10, False, "exact"),
+        (CONTEXT_EXACT_SCAN_MAX_CHUNKS, False, "global"),
+        (CONTEXT_EXACT_SCAN_MAX_CHUNKS, True, "partial"),
+    ],
+)
+async def test_project_strategy(
+    manager: VectorIndexManager, chunk_count: int, has_partial_index: bool, expected: str
+) -> None:
+    """Test strategy selection from project size and partial index presence."""
+    conn = AsyncMock()
+    conn.fetchrow = AsyncMock(return_value={"chunk_count": chunk_count, "has_partial_index": has_partial_index})
+
+    assert await manager.project_strategy(conn, uuid4()) == expected
+
+
+@pytest.mark.asyncio
+async def test_project_strategy_is_cached(manager: VectorIndexManager) -> None:
+    """Test repeated lookups for a project skip the database."""
+    conn = AsyncMock()
+    conn.fetchrow = AsyncMock(return_value={"chunk_count": 5, "has_partial_index": False})
+    project_id = uuid4()
+
+    await manager.project_strategy(conn, project_id)
+    await manager.project_strategy(conn, project_id)
+
+    conn.fetchrow.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_prepare_search_exact_disables_index_scan(manager: VectorIndexManager) -> None:
+    """Test exact strategy forces a distance sort."""
+    conn = AsyncMock()
+    conn.fetchrow = AsyncMock(return_value={"chunk_count": 5, "has_partial_index": False})
+
+    plan = await manager.prepare_search(conn, uuid4(), 5)
+
+    assert plan.strategy == "exact"
+    assert plan.predicate == ""
+    # Exact scans sort by full precision directly, no oversampling needed
+    assert plan.distance == FULL_DISTANCE
+    assert plan.scan_limit == 5
+    conn.execute.assert_called_once_with("SET LOCAL enable_indexscan = off")
+
+
+@pytest.mark.asyncio
+async def test_prepare_search_partial_sets_ef_search_and_predicate(manager: VectorIndexManager) -> None:
+    """Test partial strategy tunes ef_search and adds a literal project predicate."""
+    conn = AsyncMock()
+    conn.fetchrow = AsyncMock(return_value={"chunk_count": CONTEXT_EXACT_SCAN_MAX_CHUNKS, "has_partial_index": True})
+    project_id = uuid4()
+
+    plan = await manager.prepare_search(conn, project_id, 20)
+
+    assert plan.strategy == "partial"
+    assert plan.predicate == f"AND project_id = '{project_id}'::uuid"
+    conn.execute.assert_called_once_with(f"SET LOCAL hnsw.ef_search = {ef_search_for(plan.scan_limit)}")
+
+
+@pytest.mark.asyncio
+async def test_prepare_search_binary_oversamples_compact_scan(mock_db_pool: MagicMock) -> None:
+    """Test binary storage scans the bit index with a wider candidate pool."""
+    manager = VectorIndexManager(pool=mock_db_pool, ann_storage="binary")
+    conn = AsyncMock()
+    conn.fetchrow = AsyncMock(return_value={"chunk_count": CONTEXT_EXACT_SCAN_MAX_CHUNKS, "has_partial_index": False})
+
+    plan = await manager.prepare_search(conn, uuid4(), 20)
+
+    assert plan.strategy == "global"
+    assert plan.distance == ANN_INDEX_SPECS["binary"].distance
+    assert plan.scan_limit == 20 * CONTEXT_BINARY_OVERSAMPLE
+
+
+@pytest.mark.asyncio
+async def test_plan_maintenance(manager: VectorIndexManager, mock_db_pool: MagicMock) -> None:
+    """Test maintenance creates indexes for large projects and drops orphans."""
+    large, shrinking, indexed_large = uuid4(), uuid4(), uuid4()
+    orphan_name = partial_index_name(uuid4())
+
+    conn = mock_db_pool.acquire.return_value.__aenter__.return_value
+    conn.fetch = AsyncMock(
+        side_effect=[
+            [
+                {"project_id": large, "chunk_count": CONTEXT_PARTIAL_INDEX_MIN_CHUNKS},
+                {"project_id": shrinking, "chunk_count": CONTEXT_PARTIAL_INDEX_MIN_CHUNKS - 1},
+                {"project_id": indexed_large, "chunk_count": CONTEXT_PARTIAL_INDEX_MIN_CHUNKS * 2},
+            ],
+            [
+                {"indexname": partial_index_name(shrinking)},
+                {"indexname": partial_index_name(indexed_large)},
+                {"indexname": orphan_name},
+            ],
+        ]
+    )
+
+    actions = await manager.plan_maintenance()
+
+    assert [(a.action, a.index_name) for a in actions] == [
+        ("create", partial_index_name(large)),
+        ("drop", orphan_name),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_maintenance_dry_run_executes_nothing(manager: VectorIndexManager, mock_db_pool: MagicMock) -> None:
+    """Test dry run only plans."""
+    conn = mock_db_pool.acquire.return_value.__aenter__.return_value
+    conn.fetch = AsyncMock(side_effect=[[{"project_id": uuid4(), "chunk_count": CONTEXT_PARTIAL_INDEX_MIN_CHUNKS}], []])
+
+    actions = await manager.run_maintenance(dry_run=True)
+
+    assert len(actions) == 1
+    conn.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_run_maintenance_creates_concurrently(manager: VectorIndexManager, mock_db_pool: MagicMock) -> None:
+    """Test maintenance builds partial indexes concurrently."""
+    project_id = uuid4()
+    conn = mock_db_pool.acquire.return_value.__aenter__.return_value
+    conn.fetch = AsyncMock(
+        side_effect=[[{"project_id": project_id, "chunk_count": CONTEXT_PARTIAL_INDEX_MIN_CHUNKS}], []]
+    )
+    conn.fetchval = AsyncMock(return_value=1)
+
+    await manager.run_maintenance()
+
+    sql = conn.execute.call_args[0][0]
+    assert "CREATE INDEX CONCURRENTLY" in sql
+    assert f"({manager.spec.expression} {manager.spec.opclass})" in sql
+    assert f"WHERE project_id = '{project_id}'::uuid" in sql
+
+
+@pytest.mark.asyncio
+async def test_plan_maintenance_creates_missing_global_index(mock_db_pool: MagicMock) -> None:
+    """Test maintenance builds the global index for the configured storage."""
+    manager = VectorIndexManager(pool=mock_db_pool, ann_storage="binary")
+    conn = mock_db_pool.acquire.return_value.__aenter__.return_value
+    conn.fetchval = AsyncMock(return_value=False)
+    conn.fetch = AsyncMock(side_effect=[[], []])
+
+    actions = await manager.plan_maintenance()
+
+    assert [(a.action, a.project_id, a.index_name) for a in actions] == [
+        ("create", None, ANN_INDEX_SPECS["binary"].index_name)
+    ]
@@ -9,6 +9,7 @@ from api.dependencies import (
     get_db,
     get_file_service,
     get_mcp_manager,
+    get_s3_sync,
     get_session_service,
     get_ws_manager,
 )
@@ -49,11 +50,20 @@ def test_get_mcp_manager() -> None:
 
 def test_get_file_service() -> None:
     mock_db_pool = Mock()
-    mock_settings = Mock()
-    mock_settings.file_storage = "local"
-    service = get_file_service(mock_db_pool, mock_settings)
+    service = get_file_service(mock_db_pool, None)
     assert isinstance(service, LocalFileService)
     assert service.pool == mock_db_pool
+    assert service.s3_sync is None
+
+
+def test_get_file_service_shares_s3_sync() -> None:
+    mock_request = Mock(spec=Request)
+    mock_s3_sync = Mock()
+    mock_request.app.state.s3_sync = mock_s3_sync
+
+    first = get_file_service(Mock(), get_s3_sync(mock_request))
+    second = get_file_service(Mock(), get_s3_sync(mock_request))
+    assert first.s3_sync is second.s3_sync is mock_s3_sync
 
 
 def test_get_session_service() -> None:
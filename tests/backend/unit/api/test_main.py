@@ -139,6 +139,8 @@ async def test_lifespan_shutdown() -> None:
         patch("api.main.WebSocketManager", autospec=True) as MockWSManager,
         patch("tools.code_interpreter.get_sandbox_pool") as mock_get_sandbox_pool,
         patch("api.main.get_rate_limiter") as mock_get_rate_limiter,
+        patch("api.main.get_token_denylist") as mock_get_denylist,
+        patch("api.main.get_directory_index") as mock_get_index,
         patch("workers.embedding_worker.start_embedding_worker", new_callable=AsyncMock) as _mock_start_worker,
         patch("workers.embedding_worker.stop_embedding_worker", new_callable=AsyncMock) as _mock_stop_worker,
     ):
@@ -179,6 +181,16 @@ async def test_lifespan_shutdown() -> None:
         mock_rate_limiter.stop = AsyncMock()
         mock_get_rate_limiter.return_value = mock_rate_limiter
 
+        # Configure token denylist mock
+        mock_denylist = mock_get_denylist.return_value
+        mock_denylist.start = AsyncMock()
+        mock_denylist.stop = AsyncMock()
+
+        # Configure directory index mock
+        mock_index = mock_get_index.return_value
+        mock_index.start = AsyncMock(return_value=True)
+        mock_index.stop = AsyncMock()
+
         async with lifespan(mock_app):
             pass
 
@@ -196,6 +208,14 @@ async def test_lifespan_shutdown() -> None:
         # Check sandbox pool shutdown
         mock_sandbox_pool.shutdown.assert_called_once()
 
+        # Check token denylist sync lifecycle
+        mock_denylist.start.assert_awaited_once_with(db_pool)
+        mock_denylist.stop.assert_awaited_once()
+
+        # Check file index watcher lifecycle
+        mock_index.start.assert_awaited_once()
+        mock_index.stop.assert_awaited_once()
+
 
 @patch("api.main.lifespan", MagicMock())
 def test_app_routes_exist(test_client: TestClient) -> None:
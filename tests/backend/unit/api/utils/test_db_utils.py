@@ -40,6 +40,8 @@ async def test_create_database_pool_success() -> None:
         # Expect SET statement_timeout and SET lock_timeout
         assert mock_conn.execute.call_count == 2
         assert "SET statement_timeout" in mock_conn.execute.call_args_list[0][0][0]
+        # And binary jsonb + pgvector codecs
+        assert mock_conn.set_type_codec.await_count == 3
 
 
 @pytest.mark.asyncio
@@ -12,7 +12,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from tools.file_operations import list_directory, read_file, search_files
+from tools.file_operations import grep_files, list_directory, read_file, search_files
 
 
 class TestListDirectory:
@@ -326,3 +326,50 @@ class TestSearchFiles:
             assert data["success"] is True
             # Should only find root.py, not nested.py
             assert data["count"] == 1
+
+
+class TestGrepFiles:
+    """Tests for grep_files tool."""
+
+    @pytest.mark.asyncio
+    @patch("tools.file_operations.validate_directory_path")
+    async def test_grep_files_success(self, mock_validate: Mock, temp_dir: Path) -> None:
+        """Test grep returns matching lines with line numbers and context."""
+        (temp_dir / "notes.md").write_text("alpha\nTODO: fix totals\nomega\n")
+        (temp_dir / "other.txt").write_text("nothing here\n")
+
+        mock_validate.return_value = (temp_dir, None)
+
+        result = await grep_files("todo", base_path=str(temp_dir), ignore_case=True, context_lines=1)
+        data = json.loads(result)
+
+        assert data["success"] is True
+        assert data["count"] == 1
+        match = data["matches"][0]
+        assert match["file"].endswith("notes.md")
+        assert match["line"] == 2
+        assert match["text"] == "TODO: fix totals"
+        assert match["before"] == ["alpha"]
+        assert match["after"] == ["omega"]
+
+    @pytest.mark.asyncio
+    @patch("tools.file_operations.validate_directory_path")
+    async def test_grep_files_invalid_regex(self, mock_validate: Mock, temp_dir: Path) -> None:
+        """Test grep reports invalid regular expressions."""
+        mock_validate.return_value = (temp_dir, None)
+
+        data = json.loads(await grep_files("(unclosed", base_path=str(temp_dir)))
+
+        assert data["success"] is False
+        assert "Invalid regular expression" in data["error"]
+
+    @pytest.mark.asyncio
+    @patch("tools.file_operations.validate_directory_path")
+    async def test_grep_files_validation_error(self, mock_validate: Mock) -> None:
+        """Test grep with validation error."""
+        mock_validate.return_value = (Path(), "Invalid directory")
+
+        data = json.loads(await grep_files("x", base_path="/invalid"))
+
+        assert data["success"] is False
+        assert data["error"] == "Invalid directory"
@@ -47,8 +47,8 @@ class TestReadFileErrorPaths:
         test_file.write_text("Line 1\nLine 2\nLine 3\n")
 
         try:
-            # Mock aiofiles.open to raise an exception
-            with patch("tools.file_operations.aiofiles.open", side_effect=OSError("Disk error")):
+            # Mock the line reader to raise an exception
+            with patch("tools.file_operations.read_head_lines", side_effect=OSError("Disk error")):
                 result_json = await read_file(str(test_file), head=1)
                 result = json.loads(result_json)
 
@@ -259,6 +259,30 @@ class TestReadFileErrorPaths:
             if test_file.exists():
                 test_file.unlink()
 
+    @pytest.mark.asyncio
+    async def test_read_file_offset_limit_pages(self, temp_dir: Path) -> None:
+        """Test read_file pages through a file with offset/limit and reports total_lines."""
+        sources_dir = Path("sources")
+        sources_dir.mkdir(exist_ok=True)
+        test_file = sources_dir / "paged.txt"
+        test_file.write_text("".join(f"Line {i}\n" for i in range(1, 11)))
+
+        try:
+            with patch("tools.file_operations.count_tokens", return_value={"exact_tokens": 3}) as mock_count:
+                result = json.loads(await read_file(str(test_file), offset=4, limit=2))
+                tail_result = json.loads(await read_file(str(test_file), tail=1))
+
+            assert result["success"] is True
+            assert result["content"] == "Line 4\nLine 5\n"
+            assert result["total_lines"] == 10
+            # Only the returned slice is tokenized
+            mock_count.assert_any_call("Line 4\nLine 5\n")
+            assert tail_result["content"] == "Line 10\n"
+            assert "total_lines" not in tail_result
+        finally:
+            if test_file.exists():
+                test_file.unlink()
+
 
 class TestSearchFilesExtended:
     """Extended tests for search_files function."""
@@ -13,10 +13,15 @@ import pytest
 
 from tools.text_editing import (
     EditOperation,
+    WhitespaceIndex,
+    apply_spans,
     edit_file,
+    find_text_span,
     find_text_with_flexible_whitespace,
     generate_diff,
+    generate_diff_from_spans,
     normalize_whitespace_for_matching,
+    plan_edits,
     resolve_edit_path,
 )
 
@@ -119,6 +124,89 @@ class TestFindTextWithFlexibleWhitespace:
         assert result > 0
 
 
+class TestWhitespaceIndex:
+    """Tests for WhitespaceIndex and find_text_span."""
+
+    def test_normalized_matches_normalize_function(self) -> None:
+        """Test the index builds the same normalized text as normalize_whitespace_for_matching."""
+        content = "  def f(x):\n\t\treturn   x  \n\n   \nend\t"
+        index = WhitespaceIndex(content)
+        assert index.normalized == normalize_whitespace_for_matching(content)
+
+    def test_offsets_map_to_original_characters(self) -> None:
+        """Test normalized positions map back to the same original characters."""
+        content = "a   bb  \n\t cc  d"
+        index = WhitespaceIndex(content)
+        assert index.normalized == "a bb\ncc d"
+        assert [index.original_offset(i) for i in range(len(index.normalized))] == [0, 1, 4, 5, 8, 11, 12, 13, 15]
+
+    def test_find_span_covers_collapsed_whitespace(self) -> None:
+        """Test a flexible match spans the original whitespace, not the search length."""
+        content = "x = call(a,    b)\nnext"
+        span = find_text_span(content, "call(a, b)")
+        assert span is not None
+        assert content[span[0] : span[1]] == "call(a,    b)"
+
+    def test_find_span_indented_search_takes_whole_indentation(self) -> None:
+        """Test an indented search line replaces the original line's indentation."""
+        content = "if x:\n        return 1\n"
+        span = find_text_span(content, "\treturn 1")
+        assert span == (6, 22)
+
+    def test_find_span_exact_match_first(self) -> None:
+        """Test exact matches are preferred over normalized ones."""
+        content = "a  b\na b"
+        assert find_text_span(content, "a b") == (5, 8)
+
+    def test_find_span_whitespace_only_search(self) -> None:
+        """Test a whitespace-only search does not flexibly match anything."""
+        assert find_text_span("abc", "   ") is None
+
+
+class TestPlanEdits:
+    """Tests for plan_edits and apply_spans."""
+
+    def test_plan_sorted_spans(self) -> None:
+        """Test edits are located in the original and sorted by position."""
+        content = "one two three"
+        edits = [EditOperation(oldText="three", newText="3"), EditOperation(oldText="one", newText="1")]
+        spans = plan_edits(content, edits)
+        assert spans == [(0, 3, "1"), (8, 13, "3")]
+        assert apply_spans(content, spans) == "1 two 3"
+
+    def test_plan_not_found(self) -> None:
+        """Test an edit missing from the original content defers to sequential editing."""
+        edits = [EditOperation(oldText="one", newText="two"), EditOperation(oldText="two two", newText="x")]
+        assert plan_edits("one two", edits) is None
+
+    def test_plan_overlapping(self) -> None:
+        """Test overlapping edits are not planned."""
+        edits = [EditOperation(oldText="abc", newText="x"), EditOperation(oldText="bcd", newText="y")]
+        assert plan_edits("abcde", edits) is None
+
+
+class TestGenerateDiffFromSpans:
+    """Tests for generate_diff_from_spans."""
+
+    @pytest.mark.parametrize(
+        ("content", "edits"),
+        [
+            ("Line 1\nLine 2\nLine 3", [("Line 2", "Modified Line 2")]),
+            ("Line 1\nLine 2", [("Line 2", "Line 2\nLine 3")]),
+            ("a\nb\nc\nd\n", [("b\nc\n", "")]),
+            ("a\nb\nc", [("a\nb", "ab")]),
+            ("\n".join(f"line {i}" for i in range(40)), [("line 3\n", "x\n"), ("line 9", "y"), ("line 30", "z")]),
+            ("same\nline", [("same", "same")]),
+        ],
+    )
+    def test_matches_generate_diff(self, content: str, edits: list[tuple[str, str]]) -> None:
+        """Test span diffs match difflib on whole files."""
+        spans = plan_edits(content, [EditOperation(oldText=old, newText=new) for old, new in edits])
+        assert spans is not None
+        expected = generate_diff(content, apply_spans(content, spans), "test.txt")
+        assert generate_diff_from_spans(content, spans, "test.txt") == expected
+
+
 class TestGenerateDiff:
     """Tests for generate_diff function."""
 
@@ -172,7 +260,9 @@ class TestEditFile:
 
         edits = [EditOperation(oldText="world", newText="universe")]
         result = await edit_file(
-            file_path="test.txt", edits=edits, session_id=None  # Will be resolved to output/test.txt
+            file_path="test.txt",
+            edits=edits,
+            session_id=None,  # Will be resolved to output/test.txt
         )
 
         data = json.loads(result)
@@ -286,3 +376,50 @@ class TestEditFile:
 
         data = json.loads(result)
         assert data["success"] is True
+
+    @pytest.mark.asyncio
+    async def test_edit_file_flexible_replaces_matched_span(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a flexible match replaces exactly the matched original text."""
+        import utils.file_utils
+
+        monkeypatch.setattr(utils.file_utils, "PROJECT_ROOT", tmp_path)
+        monkeypatch.setattr(utils.file_utils, "DATA_FILES_PATH", tmp_path / "data" / "files")
+
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+        test_file = output_dir / "test.txt"
+        test_file.write_text("total =   price  *  qty\nprint(total)\n")
+
+        edits = [
+            EditOperation(oldText="total = price * qty", newText="total = price * qty * rate"),
+            EditOperation(oldText="print(total)", newText="print(round(total, 2))"),
+        ]
+        result = await edit_file(file_path="test.txt", edits=edits, session_id=None)
+
+        data = json.loads(result)
+        assert data["success"] is True
+        assert data["changes_made"] == 2
+        assert test_file.read_text() == "total = price * qty * rate\nprint(round(total, 2))\n"
+
+    @pytest.mark.asyncio
+    async def test_edit_file_edit_sees_previous_edit(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test an edit matching text introduced by an earlier edit still applies."""
+        import utils.file_utils
+
+        monkeypatch.setattr(utils.file_utils, "PROJECT_ROOT", tmp_path)
+        monkeypatch.setattr(utils.file_utils, "DATA_FILES_PATH", tmp_path / "data" / "files")
+
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+        test_file = output_dir / "test.txt"
+        test_file.write_text("Version 1.0\n")
+
+        edits = [EditOperation(oldText="1.0", newText="2.0-beta"), EditOperation(oldText="2.0-beta", newText="2.0")]
+        result = await edit_file(file_path="test.txt", edits=edits, session_id=None)
+
+        data = json.loads(result)
+        assert data["success"] is True
+        assert test_file.read_text() == "Version 2.0\n"
+        assert "+Version 2.0" in data["diff"]
@@ -36,9 +36,11 @@ async def test_session_wrappers_inject_session_id(monkeypatch: pytest.MonkeyPatc
         session_id: str | None = None,
         head: int | None = None,
         tail: int | None = None,
+        offset: int | None = None,
+        limit: int | None = None,
         model: str | None = None,
     ) -> str:
-        calls["read_file"] = (file_path, session_id, head, tail, model)
+        calls["read_file"] = (file_path, session_id, head, tail, offset, limit, model)
         return "read"
 
     async def fake_search_files(
@@ -71,6 +73,22 @@ async def test_session_wrappers_inject_session_id(monkeypatch: pytest.MonkeyPatc
         calls["get_table_schema"] = (db_name, table_name)
         return "schema"
 
+    async def fake_get_table_schemas(db_name: str, table_names: list[str]) -> str:
+        calls["get_table_schemas"] = (db_name, tuple(table_names))
+        return "schemas"
+
+    async def fake_grep_files(
+        pattern: str,
+        base_path: str = ".",
+        session_id: str | None = None,
+        glob: str = "*",
+        ignore_case: bool = False,
+        context_lines: int = 0,
+        max_results: int = 50,
+    ) -> str:
+        calls["grep_files"] = (pattern, base_path, session_id, glob, ignore_case, context_lines, max_results)
+        return "grepped"
+
     monkeypatch.setattr(wrappers, "list_directory", fake_list_directory)
     monkeypatch.setattr(wrappers, "read_file", fake_read_file)
     monkeypatch.setattr(wrappers, "search_files", fake_search_files)
@@ -79,23 +97,26 @@ async def test_session_wrappers_inject_session_id(monkeypatch: pytest.MonkeyPatc
     monkeypatch.setattr(wrappers, "execute_python_code", fake_execute_python_code)
     monkeypatch.setattr(wrappers, "list_registered_databases", fake_list_registered_databases)
     monkeypatch.setattr(wrappers, "get_table_schema", fake_get_table_schema)
+    monkeypatch.setattr(wrappers, "get_table_schemas", fake_get_table_schemas)
+    monkeypatch.setattr(wrappers, "grep_files", fake_grep_files)
     _install_function_tool_stub(monkeypatch, collected)
 
     session_id = "session-123"
     tools = wrappers.create_session_aware_tools(session_id)
 
     # function_tool stub should have received each wrapper callable
-    # 8 tools: list_directory, read_file, search_files, edit_file, generate_document,
-    #          execute_python_code, list_registered_databases, get_table_schema
-    assert len(tools) == 8
-    assert len(collected) == 8
+    # 10 tools: list_directory, read_file, search_files, edit_file, generate_document,
+    #           execute_python_code, list_registered_databases, get_table_schema, grep_files,
+    #           get_table_schemas
+    assert len(tools) == 10
+    assert len(collected) == 10
 
     # Invoke wrappers and ensure session_id is forwarded
-    assert tools[0](path="docs", show_hidden=True) == "listed"
+    assert await tools[0](path="docs", show_hidden=True) == "listed"
     assert calls["list_directory"] == ("docs", session_id, True)
 
     assert await tools[1]("notes.txt", head=5) == "read"
-    assert calls["read_file"] == ("notes.txt", session_id, 5, None, None)  # model is None by default
+    assert calls["read_file"] == ("notes.txt", session_id, 5, None, None, None, None)  # model is None by default
 
     assert await tools[2]("*.md", base_path=".", recursive=False, max_results=10) == "searched"
     assert calls["search_files"] == ("*.md", ".", session_id, False, 10)
@@ -116,3 +137,73 @@ async def test_session_wrappers_inject_session_id(monkeypatch: pytest.MonkeyPatc
 
     assert await tools[7]("mydb", "users") == "schema"
     assert calls["get_table_schema"] == ("mydb", "users")
+
+    assert await tools[8]("TODO", glob="*.md", context_lines=2) == "grepped"
+    assert calls["grep_files"] == ("TODO", ".", session_id, "*.md", False, 2, 50)
+
+    assert await tools[9]("mydb", ["users", "orders"]) == "schemas"
+    assert calls["get_table_schemas"] == ("mydb", ("users", "orders"))
+
+
+@pytest.mark.asyncio
+async def test_session_wrappers_hydrate_pending_s3_files(monkeypatch: pytest.MonkeyPatch) -> None:
+    """File tools hydrate lazily synced S3 files before touching them."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    async def fake_tool(*args: Any, **kwargs: Any) -> str:
+        return "{}"
+
+    for name in ("read_file", "search_files", "edit_file", "execute_python_code", "grep_files"):
+        monkeypatch.setattr(wrappers, name, fake_tool)
+    monkeypatch.setattr(wrappers, "list_directory", lambda *args, **kwargs: "{}")
+    _install_function_tool_stub(monkeypatch, [])
+
+    s3_sync = MagicMock()
+    s3_sync.hydrate = AsyncMock(return_value=True)
+    s3_sync.hydrate_all = AsyncMock(return_value=2)
+    s3_sync.wait_for_rehydration = AsyncMock()
+    tools = wrappers.create_session_aware_tools("session-123", s3_sync=s3_sync)
+
+    await tools[0]("output")
+    await tools[1]("output/report.md")
+    await tools[2]("*.md", base_path="input")
+    await tools[3]("draft.md", edits=[])
+    await tools[5]("print(1)")
+    await tools[8]("TODO")
+
+    assert [c.args for c in s3_sync.hydrate.await_args_list] == [
+        ("session-123", "output/report.md"),
+        ("session-123", "output/draft.md"),
+    ]
+    # Listing and searching tools wait for a running rehydration, then hydrate their subtree
+    assert [c.args for c in s3_sync.hydrate_all.await_args_list] == [
+        ("session-123", "output"),
+        ("session-123", "input"),
+        ("session-123", "."),
+        ("session-123", "."),
+    ]
+    assert s3_sync.wait_for_rehydration.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_read_file_relays_summary_progress(monkeypatch: pytest.MonkeyPatch) -> None:
+    """read_file runs with the session's progress callback for document summaries."""
+    from utils.document_processor import summary_progress
+
+    seen: list[Any] = []
+
+    async def fake_read_file(*args: Any, **kwargs: Any) -> str:
+        seen.append(summary_progress.get())
+        return "{}"
+
+    async def on_progress(event: dict[str, Any]) -> None:
+        pass
+
+    monkeypatch.setattr(wrappers, "read_file", fake_read_file)
+    _install_function_tool_stub(monkeypatch, [])
+    tools = wrappers.create_session_aware_tools("session-123", on_progress=on_progress)
+
+    await tools[1]("input/big.pdf")
+
+    assert seen == [on_progress]
+    assert summary_progress.get() is None
@@ -1,14 +1,27 @@
 """Unit tests for TTLCache and caching utilities."""
 
+import asyncio
+import threading
 import time
 
+from typing import Any
+from unittest.mock import AsyncMock
+
 import pytest
 
 from utils.cache import (
+    StripedTTLCache,
+    TieredCache,
     TTLCache,
     cached,
     get_session_cache,
     get_session_list_cache,
+    get_tiered_caches,
+    invalidate_session_caches,
+    session_cache_key,
+    start_cache_sweeper,
+    stop_cache_sweeper,
+    sweep_caches,
 )
 
 
@@ -149,15 +162,17 @@ async def test_cache_custom_ttl(cache: TTLCache) -> None:
 
 
 def test_get_session_cache() -> None:
-    """Test get_session_cache returns TTLCache."""
+    """Test get_session_cache returns the named TieredCache."""
     cache = get_session_cache()
-    assert isinstance(cache, TTLCache)
+    assert isinstance(cache, TieredCache)
+    assert get_tiered_caches()["session"] is cache
 
 
 def test_get_session_list_cache() -> None:
-    """Test get_session_list_cache returns TTLCache."""
+    """Test get_session_list_cache returns the named TieredCache."""
     cache = get_session_list_cache()
-    assert isinstance(cache, TTLCache)
+    assert isinstance(cache, TieredCache)
+    assert get_tiered_caches()["session_list"] is cache
 
 
 @pytest.mark.asyncio
@@ -199,3 +214,370 @@ async def test_cached_decorator_none_not_cached() -> None:
 
     # Should have called twice (None not cached)
     assert call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_evict_sync(cache: TTLCache) -> None:
+    """Test evict removes entries without awaiting."""
+    await cache.set("key1", "value1")
+    await cache.set("key2", "value2")
+
+    assert cache.evict("key1") is True
+    assert cache.evict("key1") is False
+    assert await cache.get("key2") == "value2"
+
+    cache.evict(None)
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_evict_prefix() -> None:
+    """Test evict_prefix removes every matching key."""
+    cache = TTLCache(max_size=10, default_ttl=60.0)
+    for key in ("/a/x", "/a/y", "/ab", "/b"):
+        cache.set_sync(key, key)
+
+    assert cache.evict_prefix("/a/") == 2
+    assert cache.get_sync("/ab") == "/ab"
+    assert cache.get_sync("/b") == "/b"
+    assert cache.stats()["size"] == 2
+
+
+def test_cache_sync_core() -> None:
+    """Test get_sync/set_sync work without an event loop."""
+    cache = TTLCache(max_size=5, default_ttl=60.0)
+    cache.set_sync("key1", "value1")
+
+    assert cache.get_sync("key1") == "value1"
+    assert cache.get_sync("missing") is None
+
+
+def test_cache_byte_cap_evicts_lru() -> None:
+    """Test max_bytes evicts least recently used entries."""
+    cache = TTLCache(max_size=100, default_ttl=60.0, max_bytes=30, sizer=len)
+    cache.set_sync("a", "x" * 10)
+    cache.set_sync("b", "x" * 10)
+    cache.set_sync("c", "x" * 10)
+    cache.get_sync("a")  # a is now most recently used
+
+    cache.set_sync("d", "x" * 10)
+
+    assert cache.get_sync("b") is None
+    assert cache.get_sync("a") is not None
+    stats = cache.stats()
+    assert stats["bytes"] == 30
+    assert stats["max_bytes"] == 30
+    assert stats["evictions"] == 1
+
+
+def test_cache_byte_cap_overwrite_and_oversize() -> None:
+    """Test overwrites re-account bytes and oversize values are not stored."""
+    cache = TTLCache(max_size=100, default_ttl=60.0, max_bytes=30, sizer=len)
+    cache.set_sync("a", "x" * 10)
+    cache.set_sync("a", "x" * 20)
+    assert cache.stats()["bytes"] == 20
+
+    cache.set_sync("big", "x" * 31)
+    assert cache.get_sync("big") is None
+    assert cache.get_sync("a") == "x" * 20
+
+    cache.evict("a")
+    assert cache.stats()["bytes"] == 0
+
+
+def test_cache_sweep_removes_expired() -> None:
+    """Test sweep drops expired entries without access."""
+    cache = TTLCache(max_size=10, default_ttl=60.0, max_bytes=1000, sizer=len)
+    cache.set_sync("short", "value", ttl=0.01)
+    cache.set_sync("long", "value")
+
+    time.sleep(0.02)
+
+    assert cache.sweep() == 1
+    stats = cache.stats()
+    assert stats["size"] == 1
+    assert stats["expired"] == 1
+    assert stats["bytes"] == 5
+    assert stats["misses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_striped_cache_operations() -> None:
+    """Test StripedTTLCache routes keys to shards and aggregates stats."""
+    cache = StripedTTLCache(max_size=64, default_ttl=60.0, max_bytes=6400, stripes=4, sizer=len)
+    for i in range(20):
+        await cache.set(f"key{i}", f"value{i}")
+
+    assert await cache.get("key3") == "value3"
+    assert await cache.delete("key3") is True
+    assert cache.get_sync("key3") is None
+
+    stats = cache.stats()
+    assert stats["size"] == 19
+    assert stats["max_size"] == 64
+    assert stats["max_bytes"] == 6400
+    assert stats["stripes"] == 4
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+    await cache.clear()
+    assert cache.stats()["size"] == 0
+
+
+def test_striped_cache_threads() -> None:
+    """Test StripedTTLCache stays consistent under concurrent threads."""
+    cache = StripedTTLCache(max_size=10000, default_ttl=60.0, stripes=8)
+    errors: list[str] = []
+
+    def worker(n: int) -> None:
+        for i in range(500):
+            key = f"t{n}:{i}"
+            cache.set_sync(key, i)
+            if cache.get_sync(key) != i:
+                errors.append(key)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.stats()["size"] == 4000
+
+
+def test_sweep_caches_covers_live_caches() -> None:
+    """Test sweep_caches sweeps plain and striped caches."""
+    plain = TTLCache(max_size=10, default_ttl=0.01)
+    striped = StripedTTLCache(max_size=16, default_ttl=0.01, stripes=2)
+    plain.set_sync("a", 1)
+    striped.set_sync("b", 2)
+
+    time.sleep(0.02)
+
+    assert sweep_caches() >= 2
+    assert plain.stats()["size"] == 0
+    assert striped.stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_sweeper_task() -> None:
+    """Test the background sweeper expires entries and stops cleanly."""
+    cache = TTLCache(max_size=10, default_ttl=0.01)
+    cache.set_sync("a", 1)
+
+    start_cache_sweeper(interval=0.02)
+    try:
+        await asyncio.sleep(0.1)
+        assert cache.stats()["expired"] == 1
+    finally:
+        await stop_cache_sweeper()
+
+
+class TestTieredCache:
+    """Tests for TieredCache (L1 + shared tier + single-flight)."""
+
+    @pytest.fixture
+    def shared(self) -> AsyncMock:
+        backend = AsyncMock()
+        backend.get.return_value = None
+        backend.delete.return_value = False
+        return backend
+
+    @pytest.mark.asyncio
+    async def test_local_only(self) -> None:
+        """Without a shared tier it behaves like TTLCache."""
+        cache = TieredCache("test")
+        await cache.set("k", {"v": 1})
+        assert await cache.get("k") == {"v": 1}
+        assert await cache.delete("k") is True
+        assert await cache.get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_shared_hit_backfills_local(self, shared: AsyncMock) -> None:
+        """L1 miss falls through to the shared tier and back-fills L1."""
+        cache = TieredCache("test")
+        cache.shared = shared
+        shared.get.return_value = {"v": 2}
+
+        assert await cache.get("k") == {"v": 2}
+        assert await cache.get("k") == {"v": 2}
+        shared.get.assert_awaited_once_with("k")
+
+    @pytest.mark.asyncio
+    async def test_set_writes_both_tiers(self, shared: AsyncMock) -> None:
+        cache = TieredCache("test")
+        cache.shared = shared
+
+        await cache.set("k", "v", ttl=5.0)
+
+        shared.set.assert_awaited_once_with("k", "v", 5.0)
+        assert await cache.local.get("k") == "v"
+
+    @pytest.mark.asyncio
+    async def test_shared_errors_degrade_to_miss(self, shared: AsyncMock) -> None:
+        """Shared tier failures never break callers."""
+        cache = TieredCache("test")
+        cache.shared = shared
+        shared.get.side_effect = ConnectionError("down")
+        shared.set.side_effect = ConnectionError("down")
+
+        await cache.set("k", "v")
+        cache.local.evict("k")
+        assert await cache.get("k") is None
+        assert cache.stats()["shared_errors"] == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_and_clear_publish(self, shared: AsyncMock) -> None:
+        """Deletes and clears are broadcast to other processes."""
+        cache = TieredCache("test")
+        cache.shared = shared
+        cache.publisher = AsyncMock()
+
+        await cache.delete("k")
+        await cache.clear()
+
+        shared.delete.assert_awaited_once_with("k")
+        shared.clear.assert_awaited_once()
+        assert [c.args for c in cache.publisher.await_args_list] == [("test", "k"), ("test", None)]
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_is_logged_not_raised(self) -> None:
+        cache = TieredCache("test")
+        cache.publisher = AsyncMock(side_effect=ConnectionError("down"))
+        await cache.set("k", "v")
+
+        assert await cache.delete("k") is True
+
+    @pytest.mark.asyncio
+    async def test_invalidate_local_does_not_publish(self) -> None:
+        cache = TieredCache("test")
+        cache.publisher = AsyncMock()
+        await cache.set("k", "v")
+
+        assert cache.invalidate_local("k") is True
+        assert await cache.get("k") is None
+        cache.publisher.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_single_flight(self) -> None:
+        """Concurrent misses share one loader call."""
+        cache = TieredCache("test")
+        calls = 0
+        release = asyncio.Event()
+
+        async def loader() -> dict[str, Any]:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"v": calls}
+
+        tasks = [asyncio.create_task(cache.get_or_load("k", loader)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert calls == 1
+        assert all(r == {"v": 1} for r in results)
+        assert cache.stats()["coalesced"] == 9
+        assert await cache.get("k") == {"v": 1}
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_none_not_cached(self) -> None:
+        cache = TieredCache("test")
+        loader = AsyncMock(return_value=None)
+
+        assert await cache.get_or_load("k", loader) is None
+        assert await cache.get_or_load("k", loader) is None
+        assert loader.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_error_propagates_to_waiters(self) -> None:
+        cache = TieredCache("test")
+        release = asyncio.Event()
+
+        async def loader() -> str:
+            await release.wait()
+            raise RuntimeError("db down")
+
+        tasks = [asyncio.create_task(cache.get_or_load("k", loader)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert cache._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_invalidated_result_not_cached(self) -> None:
+        """An invalidation during a load keeps the stale result out of the cache."""
+        cache = TieredCache("test")
+        release = asyncio.Event()
+
+        async def loader() -> str:
+            await release.wait()
+            return "stale"
+
+        task = asyncio.create_task(cache.get_or_load("k", loader))
+        await asyncio.sleep(0)
+        await cache.delete("k")
+        release.set()
+
+        assert await task == "stale"
+        assert await cache.get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_generation_stable_until_bumped(self) -> None:
+        """Generation tokens are stable, and a bump issues a new one."""
+        cache = TieredCache("test")
+        cache.publisher = AsyncMock()
+
+        first = await cache.generation("user-1")
+        assert await cache.generation("user-1") == first
+        assert await cache.generation("user-2") != first
+
+        await cache.bump_generation("user-1")
+
+        assert await cache.generation("user-1") != first
+        cache.publisher.assert_awaited_once_with("test", "gen:user-1")
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_leader_cancelled(self) -> None:
+        """Waiters reload when the leading caller is cancelled."""
+        cache = TieredCache("test")
+        started = asyncio.Event()
+        calls = 0
+
+        async def slow_loader() -> str:
+            nonlocal calls
+            calls += 1
+            started.set()
+            await asyncio.sleep(10)
+            return "never"
+
+        async def fast_loader() -> str:
+            nonlocal calls
+            calls += 1
+            return "fresh"
+
+        leader = asyncio.create_task(cache.get_or_load("k", slow_loader))
+        await started.wait()
+        waiter = asyncio.create_task(cache.get_or_load("k", fast_loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await waiter == "fresh"
+        assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_session_caches() -> None:
+    """Invalidation drops the session entry and bumps the owner's list generation."""
+    session_cache = get_session_cache()
+    list_cache = get_session_list_cache()
+    await session_cache.set(session_cache_key("user-x", "chat_1"), {"id": "1"})
+    generation = await list_cache.generation("user-x")
+
+    await invalidate_session_caches("user-x", "chat_1")
+
+    assert await session_cache.get(session_cache_key("user-x", "chat_1")) is None
+    assert await list_cache.generation("user-x") != generation
@@ -0,0 +1,112 @@
+"""Unit tests for the trigram content index behind grep_files."""
+
+from __future__ import annotations
+
+import re
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from utils.content_index import ContentIndex, _trigrams, required_trigrams
+from utils.conversion_cache import get_conversion_cache
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    root = tmp_path / "session"
+    (root / "input").mkdir(parents=True)
+    (root / "output").mkdir()
+    (root / "input" / "notes.md").write_text("# Notes\nQuarterly revenue grew\nCosts were flat\n")
+    (root / "output" / "draft.md").write_text("intro\nRevenue table\noutro\n")
+    (root / "output" / "blob.bin").write_bytes(b"\x00\x01revenue")
+    (root / ".s3-manifest.json").write_text('{"revenue": 1}')
+    return root
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        ("revenue", {"rev", "eve", "ven", "enu", "nue"}),
+        ("ab(cde)+f", {"cde"}),
+        (r"ERR-\d+", {"err", "rr-"}),
+        ("foo|barbaz", set()),
+        ("(?:abc)?xy", set()),
+        ("[abc]+", set()),
+    ],
+)
+def test_required_trigrams(pattern: str, expected: set[str]) -> None:
+    assert required_trigrams(re.compile(pattern)) == {t.encode() for t in expected}
+
+
+def test_required_trigrams_are_casefolded() -> None:
+    needed = required_trigrams(re.compile("Straße", re.IGNORECASE))
+    assert needed <= _trigrams("STRASSE")
+
+
+@pytest.mark.asyncio
+async def test_search_returns_lines_with_context(workspace: Path) -> None:
+    index = ContentIndex()
+
+    result = await index.search(workspace, re.compile("revenue", re.IGNORECASE), context_lines=1)
+
+    found = [(m.path.relative_to(workspace).as_posix(), m.line, m.text) for m in result.matches]
+    assert found == [("input/notes.md", 2, "Quarterly revenue grew"), ("output/draft.md", 2, "Revenue table")]
+    assert result.matches[0].before == ["# Notes"]
+    assert result.matches[0].after == ["Costs were flat"]
+    assert result.files_searched == 2
+    assert not result.truncated
+
+
+@pytest.mark.asyncio
+async def test_index_skips_files_without_the_literal(workspace: Path) -> None:
+    index = ContentIndex()
+    await index.search(workspace, re.compile("intro"))
+
+    result = await index.search(workspace, re.compile("Costs"))
+
+    assert [m.path.name for m in result.matches] == ["notes.md"]
+    assert index.stats()["files_skipped"] == 1  # draft.md ruled out by its trigrams
+
+
+@pytest.mark.asyncio
+async def test_rewritten_file_is_reindexed(workspace: Path) -> None:
+    index = ContentIndex()
+    draft = workspace / "output" / "draft.md"
+    assert not (await index.search(workspace, re.compile("appendix"))).matches
+
+    draft.write_text("intro\nAppendix A\n")
+    index.invalidate(draft)
+
+    result = await index.search(workspace, re.compile("Appendix"))
+    assert [(m.path.name, m.line) for m in result.matches] == [("draft.md", 2)]
+
+
+@pytest.mark.asyncio
+async def test_glob_and_limits(workspace: Path) -> None:
+    index = ContentIndex()
+
+    only_output = await index.search(workspace, re.compile("revenue", re.IGNORECASE), glob="output/*")
+    assert [m.path.name for m in only_output.matches] == ["draft.md"]
+
+    limited = await index.search(workspace, re.compile("e"), max_results=2)
+    assert len(limited.matches) == 2
+    assert limited.truncated
+
+
+@pytest.mark.asyncio
+async def test_documents_searched_through_cached_conversion(workspace: Path) -> None:
+    report = workspace / "input" / "report.pdf"
+    report.write_bytes(b"%PDF-1.7 binary")
+    index = ContentIndex()
+
+    pending = await index.search(workspace, re.compile("Net income"))
+    assert pending.unconverted == [report]
+
+    converter = SimpleNamespace(convert=lambda _path: SimpleNamespace(text_content="# Report\n\nNet income rose\n"))
+    await get_conversion_cache().convert(converter, report)  # type: ignore[arg-type]
+
+    result = await index.search(workspace, re.compile("Net income"))
+    assert [(m.path.name, m.line) for m in result.matches] == [("report.pdf", 3)]
+    assert result.unconverted == []
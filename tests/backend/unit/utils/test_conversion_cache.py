@@ -0,0 +1,151 @@
+"""Unit tests for the content-addressed conversion cache."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import threading
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from utils.conversion_cache import ConversionCache, _prune
+
+
+class FakeConverter:
+    """MarkItDown stand-in that counts conversions."""
+
+    def __init__(self, text: str = "# Converted", blocked: bool = False) -> None:
+        self.text = text
+        self.calls = 0
+        self._release = threading.Event()
+        if not blocked:
+            self._release.set()
+
+    def release(self) -> None:
+        self._release.set()
+
+    def convert(self, path: str) -> SimpleNamespace:
+        self.calls += 1
+        self._release.wait(5)
+        return SimpleNamespace(text_content=f"{self.text} {Path(path).read_bytes().decode()}")
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> ConversionCache:
+    return ConversionCache(root=tmp_path / "store")
+
+
+def _write(tmp_path: Path, name: str, data: bytes) -> Path:
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path
+
+
+@pytest.mark.asyncio
+async def test_miss_then_hit(cache: ConversionCache, tmp_path: Path) -> None:
+    converter = FakeConverter()
+    doc = _write(tmp_path, "report.pdf", b"v1")
+
+    assert await cache.convert(converter, doc) == "# Converted v1"  # type: ignore[arg-type]
+    assert await cache.convert(converter, doc) == "# Converted v1"  # type: ignore[arg-type]
+
+    assert converter.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_keyed_by_content_not_path(cache: ConversionCache, tmp_path: Path) -> None:
+    converter = FakeConverter()
+    await cache.convert(converter, _write(tmp_path, "a.docx", b"same"))  # type: ignore[arg-type]
+    await cache.convert(converter, _write(tmp_path, "copy.docx", b"same"))  # type: ignore[arg-type]
+    assert converter.calls == 1
+
+    changed = await cache.convert(converter, _write(tmp_path, "a.docx", b"edited"))  # type: ignore[arg-type]
+    assert changed == "# Converted edited"
+    assert converter.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_share_conversion(cache: ConversionCache, tmp_path: Path) -> None:
+    converter = FakeConverter(blocked=True)
+    doc = _write(tmp_path, "slides.pptx", b"deck")
+
+    readers = [asyncio.create_task(cache.convert(converter, doc)) for _ in range(5)]  # type: ignore[arg-type]
+    await asyncio.sleep(0.05)
+    converter.release()
+
+    assert set(await asyncio.gather(*readers)) == {"# Converted deck"}
+    assert converter.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_empty_conversion_not_cached(cache: ConversionCache, tmp_path: Path) -> None:
+    converter = FakeConverter(text="")
+    doc = _write(tmp_path, "blank.pdf", b"")
+
+    assert await cache.convert(converter, doc) == " "  # type: ignore[arg-type]
+    await cache.convert(converter, doc)  # type: ignore[arg-type]
+    assert converter.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_prefetch_makes_first_read_a_hit(cache: ConversionCache, tmp_path: Path) -> None:
+    converter = FakeConverter()
+    doc = _write(tmp_path, "upload.pdf", b"uploaded")
+    notes = _write(tmp_path, "notes.txt", b"plain")
+
+    with patch("utils.document_processor.get_markitdown_converter", return_value=converter):
+        cache.prefetch(doc, hashlib.sha256(b"uploaded").hexdigest(), doc.stat())
+        cache.prefetch(notes, hashlib.sha256(b"plain").hexdigest(), notes.stat())
+        await asyncio.gather(*cache._prefetches)
+
+    assert converter.calls == 1
+    assert await cache.convert(converter, doc) == "# Converted uploaded"  # type: ignore[arg-type]
+    assert converter.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_prefetch_of_overwritten_file_is_not_cached(cache: ConversionCache, tmp_path: Path) -> None:
+    converter = FakeConverter()
+    doc = _write(tmp_path, "upload.pdf", b"content a")
+
+    with patch("utils.document_processor.get_markitdown_converter", return_value=converter):
+        cache.prefetch(doc, hashlib.sha256(b"content a").hexdigest(), doc.stat())
+        doc.write_bytes(b"CONTENT B!")  # Overwritten before the background conversion starts
+        await asyncio.gather(*cache._prefetches)
+
+    other = _write(tmp_path, "other.pdf", b"content a")
+    assert await cache.convert(converter, other) == "# Converted content a"  # type: ignore[arg-type]
+    assert await cache.convert(converter, doc) == "# Converted CONTENT B!"  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_file_changed_after_hashing_is_not_cached(cache: ConversionCache, tmp_path: Path) -> None:
+    converter = FakeConverter()
+    doc = _write(tmp_path, "report.pdf", b"v1")
+    cache._slots = asyncio.Semaphore(1)
+
+    async with cache._slots:  # Hold the conversion slot so the file changes after hashing
+        reader = asyncio.create_task(cache.convert(converter, doc))  # type: ignore[arg-type]
+        await asyncio.sleep(0.05)
+        doc.write_bytes(b"v2 longer")
+    await reader
+
+    other = _write(tmp_path, "copy.pdf", b"v1")
+    assert await cache.convert(converter, other) == "# Converted v1"  # type: ignore[arg-type]
+
+
+def test_prune_removes_least_recently_used(tmp_path: Path) -> None:
+    for i in range(4):
+        entry = tmp_path / "ab" / f"{i}.md"
+        entry.parent.mkdir(exist_ok=True)
+        entry.write_bytes(b"x" * 100)
+        os.utime(entry, (i, i))
+
+    assert _prune(tmp_path, max_bytes=300) == 200
+    assert sorted(p.name for p in (tmp_path / "ab").iterdir()) == ["2.md", "3.md"]
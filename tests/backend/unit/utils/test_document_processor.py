@@ -5,11 +5,14 @@ Tests document conversion and summarization functionality.
 
 from __future__ import annotations
 
+import asyncio
+
+from typing import Any
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from utils.document_processor import get_markitdown_converter, summarize_content
+from utils.document_processor import _split_chunks, get_markitdown_converter, summarize_content
 
 
 class TestSummarizeContent:
@@ -113,6 +116,92 @@ class TestSummarizeContent:
             assert result == "Summary"
 
 
+class TestChunkedSummarization:
+    """Tests for map-reduce summarization of oversized documents."""
+
+    @staticmethod
+    def _document(parts: int) -> str:
+        return "".join(f"section {i} " + "x" * 90 + "\n" for i in range(parts * 10))
+
+    @pytest.fixture
+    def summarizer(self) -> Any:
+        """Patch Agent/Runner: chunk agents echo their part, the final agent returns "final"."""
+        running = {"now": 0, "max": 0}
+
+        def make_agent(name: str, model: str, instructions: str) -> Mock:
+            return Mock(instructions=instructions)
+
+        async def run(agent: Mock, input: str, session: None) -> Mock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+            if "part" in agent.instructions and " of " in agent.instructions:
+                return Mock(final_output=f"summary of {input.split()[0]} {input.split()[1]}")
+            return Mock(final_output="final")
+
+        with (
+            patch("utils.document_processor.Agent", side_effect=make_agent),
+            patch("utils.document_processor.Runner") as mock_runner,
+            patch(
+                "utils.document_processor.count_tokens",
+                side_effect=lambda text, model: {"exact_tokens": len(text) // 4},
+            ),
+            patch("utils.document_processor.DOCUMENT_SUMMARY_CHUNK_TOKENS", 250),
+            patch("utils.document_processor.DOCUMENT_SUMMARY_CONCURRENCY", 2),
+        ):
+            mock_runner.run = AsyncMock(side_effect=run)
+            yield mock_runner, running
+
+    @pytest.mark.asyncio
+    async def test_chunks_summarized_then_combined(self, summarizer: Any) -> None:
+        mock_runner, running = summarizer
+        events: list[dict[str, Any]] = []
+
+        async def on_progress(event: dict[str, Any]) -> None:
+            events.append(event)
+
+        result = await summarize_content(self._document(3), file_name="big.pdf", model="gpt-5", on_progress=on_progress)
+
+        assert result == "final"
+        parts = events[0]["parts"]
+        assert parts > 1
+        assert mock_runner.run.call_count == parts + 1
+        assert sorted(e["completed"] for e in events) == list(range(1, parts + 1))
+        assert {e["type"] for e in events} == {"document_summary_progress"}
+        assert events[0]["summary"].startswith("summary of section")
+        assert running["max"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_by_content_and_model(self, summarizer: Any) -> None:
+        mock_runner, _ = summarizer
+        document = self._document(2)
+
+        first = await summarize_content(document, model="gpt-5")
+        calls = mock_runner.run.call_count
+        assert await summarize_content(document, model="gpt-5") == first
+        assert mock_runner.run.call_count == calls
+
+        await summarize_content(document, model="gpt-5-mini")
+        assert mock_runner.run.call_count == calls * 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_share_summary(self, summarizer: Any) -> None:
+        mock_runner, _ = summarizer
+        document = self._document(2)
+
+        results = await asyncio.gather(*(summarize_content(document, model="gpt-5") for _ in range(3)))
+
+        assert results == ["final"] * 3
+        assert mock_runner.run.call_count == len(_split_chunks(document, 1000)) + 1
+
+    def test_split_chunks_on_line_boundaries(self) -> None:
+        text = "aaaa\nbbbb\ncccc\n" + "d" * 12
+
+        assert _split_chunks(text, 10) == ["aaaa\nbbbb\n", "cccc\n", "d" * 10, "dd"]
+        assert "".join(_split_chunks(text, 10)) == text
+
+
 class TestGetMarkitdownConverter:
     """Tests for get_markitdown_converter function."""
 
@@ -0,0 +1,108 @@
+"""Unit tests for block-based head/tail and indexed line-range reads."""
+
+from __future__ import annotations
+
+import sys
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from utils.line_reader import read_head_lines, read_line_range, read_tail_lines
+
+LINES = [f"line {i} {'x' * (i % 7)}\n" for i in range(1, 501)]
+
+
+@pytest.fixture
+def text_file(tmp_path: Path) -> Path:
+    path = tmp_path / "log.txt"
+    path.write_text("".join(LINES), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("block_size", [7, 64, 65536])
+def test_head_matches_lines(text_file: Path, block_size: int) -> None:
+    assert read_head_lines(text_file, 3, block_size) == "".join(LINES[:3])
+    assert read_head_lines(text_file, 1000, block_size) == "".join(LINES)
+    assert read_head_lines(text_file, 0, block_size) == ""
+
+
+@pytest.mark.parametrize("block_size", [7, 64, 65536])
+def test_tail_matches_lines(text_file: Path, block_size: int) -> None:
+    assert read_tail_lines(text_file, 3, block_size) == "".join(LINES[-3:])
+    assert read_tail_lines(text_file, 1000, block_size) == "".join(LINES)
+    assert read_tail_lines(text_file, 0, block_size) == ""
+
+
+def test_tail_without_trailing_newline(tmp_path: Path) -> None:
+    path = tmp_path / "notes.txt"
+    path.write_bytes(b"a\r\nb\r\nc")
+
+    assert read_tail_lines(path, 1, block_size=2) == "c"
+    assert read_tail_lines(path, 2, block_size=2) == "b\nc"
+    assert read_head_lines(path, 1, block_size=2) == "a\n"
+
+
+def test_multibyte_characters_split_across_blocks(tmp_path: Path) -> None:
+    path = tmp_path / "unicode.txt"
+    path.write_text("héllo wörld\nßecond ✓\n", encoding="utf-8")
+
+    assert read_head_lines(path, 1, block_size=3) == "héllo wörld\n"
+    assert read_tail_lines(path, 1, block_size=3) == "ßecond ✓\n"
+
+
+def test_line_range_pages_through_file(text_file: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Many checkpoints, so lookups land mid-stride
+    monkeypatch.setattr("utils.line_reader.LINE_INDEX_STRIDE", 64)
+
+    pages = [read_line_range(text_file, start, 100) for start in range(1, 501, 100)]
+
+    assert "".join(text for text, _ in pages) == "".join(LINES)
+    assert {total for _, total in pages} == {500}
+    assert read_line_range(text_file, 250, 2) == ("".join(LINES[249:251]), 500)
+    assert read_line_range(text_file, 499) == ("".join(LINES[498:]), 500)
+    assert read_line_range(text_file, 600, 10) == ("", 500)
+
+
+def test_line_range_edge_cases(tmp_path: Path) -> None:
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+    partial = tmp_path / "partial.txt"
+    partial.write_bytes(b"one\ntwo")
+
+    assert read_line_range(empty, 1, 5) == ("", 0)
+    assert read_line_range(partial, 2, 5) == ("two", 2)
+    assert read_line_range(partial, 0, 1) == ("one\n", 2)
+
+
+def test_line_range_rejects_binary(tmp_path: Path) -> None:
+    path = tmp_path / "blob.bin"
+    path.write_bytes(b"\xff\xfe\x00binary\n")
+
+    with pytest.raises(UnicodeDecodeError):
+        read_line_range(path, 1, 1)
+
+
+def test_line_range_from_many_threads(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # More files than the index cache holds, so threads evict each other's entries
+    monkeypatch.setattr("utils.line_reader.LINE_INDEX_STRIDE", 64)
+    paths = []
+    for i in range(40):
+        path = tmp_path / f"log_{i}.txt"
+        path.write_text("".join(LINES), encoding="utf-8")
+        paths.append(path)
+
+    def read(n: int) -> tuple[str, int]:
+        return read_line_range(paths[n % len(paths)], 250, 2)
+
+    # Switch threads as often as possible to widen race windows
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(read, range(800)))
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert set(results) == {("".join(LINES[249:251]), 500)}
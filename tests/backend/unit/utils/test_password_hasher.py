@@ -0,0 +1,68 @@
+"""Unit tests for the bounded bcrypt worker pool."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from unittest.mock import patch
+
+import bcrypt
+import pytest
+
+from utils.password_hasher import PasswordHasher, PasswordHasherSaturatedError
+
+
+@pytest.fixture
+def hasher() -> PasswordHasher:
+    return PasswordHasher(workers=1, max_queue=1)
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_off_loop(hasher: PasswordHasher) -> None:
+    threads: list[str] = []
+    real_checkpw = bcrypt.checkpw
+
+    def checkpw(password: bytes, hashed: bytes) -> bool:
+        threads.append(threading.current_thread().name)
+        return real_checkpw(password, hashed)
+
+    with patch("bcrypt.gensalt", return_value=bcrypt.gensalt(rounds=4)):
+        hashed = await hasher.hash("secret")
+
+    with patch("bcrypt.checkpw", side_effect=checkpw):
+        assert await hasher.verify("secret", hashed) is True
+        assert await hasher.verify("wrong", hashed) is False
+
+    assert all(name.startswith("bcrypt") for name in threads)
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["pending"] == 0
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_saturated(hasher: PasswordHasher) -> None:
+    release = threading.Event()
+
+    def slow_checkpw(password: bytes, hashed: bytes) -> bool:
+        release.wait(5)
+        return True
+
+    with patch("bcrypt.checkpw", side_effect=slow_checkpw):
+        running = asyncio.create_task(hasher.verify("a", "h"))
+        queued = asyncio.create_task(hasher.verify("b", "h"))
+        await asyncio.sleep(0.05)
+
+        assert hasher.saturated is True
+        with pytest.raises(PasswordHasherSaturatedError):
+            await hasher.verify("c", "h")
+
+        release.set()
+        assert await asyncio.gather(running, queued) == [True, True]
+
+    assert hasher.saturated is False
+    stats = hasher.stats()
+    assert stats["rejected"] == 1
+    assert stats["avg_wait_ms"] > 0
+    hasher.shutdown()
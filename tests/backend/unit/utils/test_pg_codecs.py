@@ -0,0 +1,84 @@
+"""Unit tests for binary asyncpg type codecs."""
+
+import struct
+
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from utils.pg_codecs import (
+    decode_halfvec,
+    decode_jsonb,
+    decode_vector,
+    encode_halfvec,
+    encode_jsonb,
+    encode_vector,
+    register_type_codecs,
+)
+
+
+def test_jsonb_roundtrip() -> None:
+    """Test jsonb values carry the version byte and roundtrip natively."""
+    value = {"title": "Test", "tags": ["a", "b"], "count": 2, "nested": {"ok": True}}
+    data = encode_jsonb(value)
+
+    assert data.startswith(b"\x01")
+    assert decode_jsonb(data) == value
+
+
+def test_encode_jsonb_serializes_uuid_and_int_keys() -> None:
+    """Test UUIDs become strings and non-string keys are stringified like json.dumps."""
+    project_id = uuid4()
+    assert decode_jsonb(encode_jsonb({"id": project_id, 1: "x"})) == {"id": str(project_id), "1": "x"}
+
+
+def test_encode_vector_matches_pgvector_wire_format() -> None:
+    """Test vector encoding is dim, unused, then big-endian float32."""
+    data = encode_vector([1.0, -2.5])
+    assert data == struct.pack(">HHff", 2, 0, 1.0, -2.5)
+
+
+def test_vector_roundtrip() -> None:
+    """Test float32-representable values survive a roundtrip."""
+    values = [0.5, -0.25, 3.0] * 512
+    assert decode_vector(encode_vector(values)) == values
+
+
+def test_halfvec_roundtrip_is_half_precision() -> None:
+    """Test halfvec uses 2 bytes per dimension and keeps ~3 significant digits."""
+    values = [0.1234, -0.5, 1.0]
+    data = encode_halfvec(values)
+
+    assert len(data) == 4 + 2 * len(values)
+    assert decode_halfvec(data) == pytest.approx(values, rel=1e-3)
+
+
+def test_encode_empty_vector() -> None:
+    """Test zero-dimension vectors encode to a bare header."""
+    assert decode_vector(encode_vector([])) == []
+
+
+@pytest.mark.asyncio
+async def test_register_type_codecs_binary_format() -> None:
+    """Test codecs are registered in binary format for jsonb and each pgvector type."""
+    conn = AsyncMock()
+
+    await register_type_codecs(conn)
+
+    registered = {call.args[0]: call.kwargs for call in conn.set_type_codec.call_args_list}
+    assert set(registered) == {"jsonb", "vector", "halfvec"}
+    assert all(kwargs["format"] == "binary" for kwargs in registered.values())
+    assert registered["jsonb"]["schema"] == "pg_catalog"
+    assert registered["vector"]["encoder"] is encode_vector
+
+
+@pytest.mark.asyncio
+async def test_register_type_codecs_without_extension() -> None:
+    """Test missing pgvector types are skipped instead of failing the connection."""
+    conn = AsyncMock()
+    conn.set_type_codec.side_effect = [None, ValueError("unknown type"), ValueError("unknown type")]
+
+    await register_type_codecs(conn)
+
+    assert conn.set_type_codec.call_count == 3
@@ -0,0 +1,155 @@
+"""Unit tests for the Postgres-backed shared cache tier and invalidation."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import orjson
+import pytest
+
+from core.constants import CACHE_INVALIDATION_CHANNEL
+from utils.cache import TieredCache
+from utils.shared_cache import PostgresCacheBackend, SharedCacheCoordinator
+
+
+@pytest.fixture
+def pool() -> MagicMock:
+    pool = MagicMock()
+    conn = AsyncMock()
+    cm = MagicMock()
+    cm.__aenter__ = AsyncMock(return_value=conn)
+    cm.__aexit__ = AsyncMock(return_value=None)
+    pool.acquire.return_value = cm
+    pool.execute = AsyncMock()
+    pool.conn = conn
+    return pool
+
+
+@pytest.fixture
+def caches() -> dict[str, TieredCache]:
+    return {"session": TieredCache("session"), "session_list": TieredCache("session_list")}
+
+
+class TestPostgresCacheBackend:
+    @pytest.mark.asyncio
+    async def test_get_ignores_expired(self, pool: MagicMock) -> None:
+        pool.conn.fetchval.return_value = {"v": 1}
+        backend = PostgresCacheBackend(pool, "session")
+
+        assert await backend.get("k") == {"v": 1}
+        sql, namespace, key = pool.conn.fetchval.call_args[0]
+        assert "expires_at > now()" in sql
+        assert (namespace, key) == ("session", "k")
+
+    @pytest.mark.asyncio
+    async def test_set_upserts_with_ttl(self, pool: MagicMock) -> None:
+        backend = PostgresCacheBackend(pool, "session", default_ttl=30.0)
+
+        await backend.set("k", {"v": 1})
+
+        sql, namespace, key, value, ttl = pool.conn.execute.call_args[0]
+        assert "ON CONFLICT (namespace, key)" in sql
+        assert (namespace, key, value, ttl) == ("session", "k", {"v": 1}, 30.0)
+
+    @pytest.mark.asyncio
+    async def test_delete_reports_removal(self, pool: MagicMock) -> None:
+        pool.conn.execute.return_value = "DELETE 1"
+        backend = PostgresCacheBackend(pool, "session")
+
+        assert await backend.delete("k") is True
+
+    @pytest.mark.asyncio
+    async def test_purge_expired(self, pool: MagicMock) -> None:
+        pool.conn.execute.return_value = "DELETE 7"
+
+        assert await PostgresCacheBackend.purge_expired(pool) == 7
+
+
+class TestSharedCacheCoordinator:
+    @pytest.mark.asyncio
+    async def test_start_attaches_tiers_and_listens(self, pool: MagicMock, caches: dict[str, TieredCache]) -> None:
+        listen_conn = AsyncMock()
+        listen_conn.add_termination_listener = MagicMock()
+        coordinator = SharedCacheCoordinator(pool, "postgresql://x", caches, shared_backend="postgres")
+
+        with patch("utils.shared_cache.asyncpg.connect", AsyncMock(return_value=listen_conn)):
+            await coordinator.start()
+
+        listen_conn.add_listener.assert_awaited_once_with(CACHE_INVALIDATION_CHANNEL, coordinator._on_notification)
+        assert all(isinstance(c.shared, PostgresCacheBackend) for c in caches.values())
+        assert all(c.publisher == coordinator.publish for c in caches.values())
+        assert coordinator.stats()["listening"] is True
+
+        await coordinator.stop()
+        listen_conn.close.assert_awaited_once()
+        assert all(c.shared is None and c.publisher is None for c in caches.values())
+
+    @pytest.mark.asyncio
+    async def test_start_without_invalidation(self, pool: MagicMock, caches: dict[str, TieredCache]) -> None:
+        coordinator = SharedCacheCoordinator(pool, "postgresql://x", caches, invalidation=False)
+
+        with patch("utils.shared_cache.asyncpg.connect", AsyncMock()) as connect:
+            await coordinator.start()
+
+        connect.assert_not_called()
+        assert all(c.shared is None and c.publisher is None for c in caches.values())
+        await coordinator.stop()
+
+    @pytest.mark.asyncio
+    async def test_publish_sends_notify(self, pool: MagicMock, caches: dict[str, TieredCache]) -> None:
+        coordinator = SharedCacheCoordinator(pool, "postgresql://x", caches)
+
+        await coordinator.publish("session", "session:u:s")
+
+        sql, channel, payload = pool.execute.call_args[0]
+        assert "pg_notify" in sql
+        assert channel == CACHE_INVALIDATION_CHANNEL
+        assert orjson.loads(payload) == {"o": coordinator.origin, "c": "session", "k": "session:u:s"}
+
+    @pytest.mark.asyncio
+    async def test_notification_invalidates_local(self, pool: MagicMock, caches: dict[str, TieredCache]) -> None:
+        coordinator = SharedCacheCoordinator(pool, "postgresql://x", caches)
+        await caches["session"].set("a", 1)
+        await caches["session"].set("b", 2)
+        await caches["session_list"].set("c", 3)
+
+        coordinator._on_notification(None, 1, CACHE_INVALIDATION_CHANNEL, '{"o":"other","c":"session","k":"a"}')
+        coordinator._on_notification(None, 1, CACHE_INVALIDATION_CHANNEL, '{"o":"other","c":"session_list","k":null}')
+
+        assert await caches["session"].get("a") is None
+        assert await caches["session"].get("b") == 2
+        assert await caches["session_list"].get("c") is None
+        assert coordinator.stats()["invalidations_received"] == 2
+
+    @pytest.mark.asyncio
+    async def test_own_and_malformed_notifications_ignored(
+        self, pool: MagicMock, caches: dict[str, TieredCache]
+    ) -> None:
+        coordinator = SharedCacheCoordinator(pool, "postgresql://x", caches)
+        await caches["session"].set("a", 1)
+
+        own = orjson.dumps({"o": coordinator.origin, "c": "session", "k": "a"}).decode()
+        coordinator._on_notification(None, 1, CACHE_INVALIDATION_CHANNEL, own)
+        coordinator._on_notification(None, 1, CACHE_INVALIDATION_CHANNEL, "not json")
+        coordinator._on_notification(None, 1, CACHE_INVALIDATION_CHANNEL, '{"o":"other","c":"unknown","k":"a"}')
+
+        assert await caches["session"].get("a") == 1
+
+    @pytest.mark.asyncio
+    async def test_reconnect_clears_local_caches(self, pool: MagicMock, caches: dict[str, TieredCache]) -> None:
+        listen_conn = AsyncMock()
+        listen_conn.add_termination_listener = MagicMock()
+        coordinator = SharedCacheCoordinator(pool, "postgresql://x", caches)
+        await caches["session"].set("a", 1)
+
+        with (
+            patch("utils.shared_cache.CACHE_LISTENER_RECONNECT_DELAY", 0),
+            patch("utils.shared_cache.asyncpg.connect", AsyncMock(return_value=listen_conn)),
+        ):
+            coordinator._on_connection_lost(None)
+            assert coordinator._reconnect_task is not None
+            await coordinator._reconnect_task
+
+        assert coordinator.stats()["listening"] is True
+        assert await caches["session"].get("a") is None
+        await coordinator.stop()
@@ -0,0 +1,86 @@
+"""Benchmark configuration and shared fixtures."""
+
+from __future__ import annotations
+
+import os
+import statistics
+import time
+
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+
+import asyncpg
+import pytest
+
+from utils.pg_codecs import register_type_codecs
+
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL", "")
+
+#: Scratch schema for benchmark tables; dropped after each benchmark.
+#: Tables are created with ``LIKE public.<table> INCLUDING ALL`` so they share
+#: the production column and index definitions without foreign keys.
+BENCH_SCHEMA = "chatjuicer_bench"
+
+
+@dataclass
+class Timing:
+    """Latency summary for a benchmarked operation."""
+
+    label: str
+    samples: list[float]
+
+    @property
+    def p50_ms(self) -> float:
+        return statistics.median(self.samples) * 1000
+
+    @property
+    def p95_ms(self) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000
+
+    def report(self) -> str:
+        return f"{self.label}: n={len(self.samples)} p50={self.p50_ms:.3f}ms p95={self.p95_ms:.3f}ms"
+
+
+async def time_async(label: str, fn: Callable[[], Awaitable[object]], iterations: int) -> Timing:
+    """Run an async callable repeatedly and collect wall-clock samples."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return Timing(label, samples)
+
+
+def time_sync(label: str, fn: Callable[[], object], iterations: int) -> Timing:
+    """Run a sync callable repeatedly and collect wall-clock samples."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return Timing(label, samples)
+
+
+@pytest.fixture
+async def bench_pool() -> AsyncIterator[asyncpg.Pool]:
+    """Pool bound to a scratch schema (skips without BENCH_DATABASE_URL)."""
+    if not BENCH_DATABASE_URL:
+        pytest.skip("BENCH_DATABASE_URL not set")
+
+    admin = await asyncpg.connect(BENCH_DATABASE_URL)
+    await admin.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+    await admin.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+    pool = await asyncpg.create_pool(
+        BENCH_DATABASE_URL,
+        min_size=1,
+        max_size=4,
+        server_settings={"search_path": f"{BENCH_SCHEMA}, public"},
+        init=register_type_codecs,
+    )
+    try:
+        yield pool
+    finally:
+        await pool.close()
+        await admin.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+        await admin.close()
@@ -0,0 +1,168 @@
+"""Index size / latency / recall benchmark for context_chunks ANN storage modes.
+
+Builds one synthetic corpus, then for each ``Settings.context_ann_storage`` mode
+(full float32, halfvec, binary-quantized) rebuilds the global HNSW index and
+measures:
+
+- index size (pg_relation_size) and build time
+- search_chunks latency (ANN scan + full-precision re-rank)
+- recall@k against an exact full-precision scan
+
+Also times the embedding wire encoding: text literal formatting vs the binary
+asyncpg codec (no database needed).
+
+Run with:
+    BENCH_DATABASE_URL=postgresql://... pytest tests/benchmarks/test_ann_storage_bench.py -v -s --no-cov
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+
+from uuid import UUID, uuid4
+
+import asyncpg
+import pytest
+
+from api.services.context_service import ContextService
+from api.services.vector_index_service import ANN_INDEX_SPECS, VectorIndexManager
+from utils.pg_codecs import encode_vector
+
+from .conftest import BENCH_SCHEMA, Timing, time_sync
+
+# Above CONTEXT_EXACT_SCAN_MAX_CHUNKS so searches use the global index
+CORPUS_SIZE = 20000
+TOPICS = 200
+DIM = 1536
+QUERIES = 100
+TOP_K = 10
+
+
+def _normalize(vec: list[float]) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+    return [x / norm for x in vec]
+
+
+def _random_embedding(rng: random.Random) -> list[float]:
+    return _normalize([rng.gauss(0, 1) for _ in range(DIM)])
+
+
+def test_embedding_encoding_text_vs_binary() -> None:
+    """Per-embedding encode cost of the old text literal vs the binary codec."""
+    embedding = _random_embedding(random.Random(7))
+
+    text = time_sync("text literal", lambda: "[" + ",".join(str(x) for x in embedding) + "]", 500)
+    binary = time_sync("binary codec", lambda: encode_vector(embedding), 500)
+    print(text.report())
+    print(binary.report())
+    text_bytes = len("[" + ",".join(str(x) for x in embedding) + "]")
+    print(f"payload: text={text_bytes}B binary={len(encode_vector(embedding))}B")
+
+    assert binary.p50_ms < text.p50_ms
+
+
+async def _build_corpus(pool: asyncpg.Pool, project_id: UUID, rng: random.Random) -> None:
+    centroids = [_random_embedding(rng) for _ in range(TOPICS)]
+    records = [
+        (
+            project_id,
+            uuid4(),
+            f"chunk {i}",
+            f"hash-{i}",
+            _normalize([x + rng.gauss(0, 0.03) for x in centroids[i % TOPICS]]),
+        )
+        for i in range(CORPUS_SIZE)
+    ]
+    async with pool.acquire() as conn:
+        await conn.execute("CREATE TABLE context_chunks (LIKE public.context_chunks INCLUDING ALL)")
+        await conn.executemany(
+            """
+            INSERT INTO context_chunks (project_id, source_type, source_id, content, content_hash, embedding)
+            VALUES ($1, 'message', $2, $3, $4, $5)
+            """,
+            records,
+        )
+        await conn.execute("ANALYZE context_chunks")
+
+
+async def _rebuild_hnsw_index(conn: asyncpg.Connection, storage: str) -> tuple[int, float]:
+    """Replace all HNSW indexes on the bench table with one for ``storage``."""
+    existing = await conn.fetch(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = $1 AND tablename = 'context_chunks'"
+        " AND indexdef LIKE '%USING hnsw%'",
+        BENCH_SCHEMA,
+    )
+    for row in existing:
+        await conn.execute(f"DROP INDEX {row['indexname']}")
+
+    spec = ANN_INDEX_SPECS[storage]  # type: ignore[index]
+    start = time.perf_counter()
+    await conn.execute(
+        f"CREATE INDEX {spec.index_name} ON context_chunks"
+        f" USING hnsw ({spec.expression} {spec.opclass}) WITH (m = 16, ef_construction = 64)"
+    )
+    build_seconds = time.perf_counter() - start
+    size = await conn.fetchval("SELECT pg_relation_size($1::regclass)", spec.index_name)
+    return size, build_seconds
+
+
+@pytest.mark.asyncio
+async def test_ann_storage_size_latency_recall(bench_pool: asyncpg.Pool) -> None:
+    rng = random.Random(42)
+    project_id = uuid4()
+    await _build_corpus(bench_pool, project_id, rng)
+    queries = [_random_embedding(rng) for _ in range(QUERIES)]
+
+    # Ground truth: exact full-precision top-k
+    async with bench_pool.acquire() as conn:
+        truth = [
+            {
+                row["id"]
+                for row in await conn.fetch(
+                    "SELECT id FROM context_chunks WHERE project_id = $1 ORDER BY embedding <=> $2 LIMIT $3",
+                    project_id,
+                    query,
+                    TOP_K,
+                )
+            }
+            for query in queries
+        ]
+
+    sizes: dict[str, int] = {}
+    latency: dict[str, float] = {}
+    recall: dict[str, float] = {}
+    for storage in ("full", "halfvec", "binary"):
+        async with bench_pool.acquire() as conn:
+            sizes[storage], build_seconds = await _rebuild_hnsw_index(conn, storage)
+            await conn.execute("ANALYZE context_chunks")
+
+        service = ContextService(bench_pool)
+        service.index_manager = VectorIndexManager(bench_pool, ann_storage=storage)  # type: ignore[arg-type]
+
+        samples = []
+        hits = 0
+        for query, expected in zip(queries, truth, strict=True):
+            start = time.perf_counter()
+            chunks = await service.search_chunks(project_id, query, top_k=TOP_K, score_threshold=-1.0)
+            samples.append(time.perf_counter() - start)
+            hits += len(expected & {c.chunk_id for c in chunks})
+
+        timing = Timing(f"{storage:<8} recall@{TOP_K}", samples)
+        latency[storage] = timing.p50_ms
+        recall[storage] = hits / (QUERIES * TOP_K)
+        print(
+            f"{timing.report()} recall={recall[storage]:.3f}"
+            f" index={sizes[storage] / 1024 / 1024:.1f}MB build={build_seconds:.1f}s"
+        )
+
+    for storage in ("halfvec", "binary"):
+        print(
+            f"{storage}: index {1 - sizes[storage] / sizes['full']:.0%} smaller,"
+            f" p50 {latency[storage] - latency['full']:+.3f}ms vs full"
+        )
+
+    assert sizes["halfvec"] < sizes["full"]
+    assert sizes["binary"] < sizes["halfvec"]
+    assert recall["halfvec"] >= recall["full"] - 0.02
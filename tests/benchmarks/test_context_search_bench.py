@@ -0,0 +1,113 @@
+"""Recall/latency benchmark for ContextService vector vs hybrid search.
+
+Builds a synthetic corpus of clustered embeddings where every chunk carries a
+unique identifier (``ERR-00042``). Two query sets are measured:
+
+- semantic: query embedding is a noisy copy of the target chunk's embedding
+- exact-term: query text names the identifier, but the embedding points at an
+  unrelated topic (the failure mode hybrid search is meant to fix)
+
+Run with:
+    BENCH_DATABASE_URL=postgresql://... pytest tests/benchmarks/test_context_search_bench.py -v -s --no-cov
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+
+from collections.abc import Iterator
+from uuid import UUID, uuid4
+
+import asyncpg
+import pytest
+
+from api.services.context_service import ContextService
+
+from .conftest import Timing
+
+CORPUS_SIZE = 5000
+TOPICS = 50
+DIM = 1536
+QUERIES = 100
+TOP_K = 5
+WORDS = ["deploy", "timeout", "schema", "cache", "invoice", "retry", "webhook", "billing", "latency", "index"]
+
+
+def _normalize(vec: list[float]) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+    return [x / norm for x in vec]
+
+
+def _noisy(base: list[float], rng: random.Random, scale: float) -> list[float]:
+    return _normalize([x + rng.gauss(0, scale) for x in base])
+
+
+async def _build_corpus(pool: asyncpg.Pool, project_id: UUID, rng: random.Random) -> list[tuple[str, list[float]]]:
+    centroids = [_normalize([rng.gauss(0, 1) for _ in range(DIM)]) for _ in range(TOPICS)]
+    docs: list[tuple[str, list[float]]] = []
+    records = []
+    for i in range(CORPUS_SIZE):
+        embedding = _noisy(centroids[i % TOPICS], rng, 0.02)
+        content = f"{' '.join(rng.sample(WORDS, 4))} incident reference ERR-{i:05d}"
+        docs.append((content, embedding))
+        records.append((project_id, uuid4(), content, f"hash-{i}", embedding))
+
+    async with pool.acquire() as conn:
+        await conn.execute("CREATE TABLE context_chunks (LIKE public.context_chunks INCLUDING ALL)")
+        await conn.executemany(
+            """
+            INSERT INTO context_chunks (project_id, source_type, source_id, content, content_hash, embedding)
+            VALUES ($1, 'message', $2, $3, $4, $5)
+            """,
+            records,
+        )
+        await conn.execute("ANALYZE context_chunks")
+    return docs
+
+
+def _queries(
+    docs: list[tuple[str, list[float]]], targets: list[int], query_set: str, rng: random.Random
+) -> Iterator[tuple[str, list[float], str]]:
+    """Yield (target_content, query_embedding, query_text) triples for a query set."""
+    for target in targets:
+        content, embedding = docs[target]
+        if query_set == "semantic":
+            yield content, _noisy(embedding, rng, 0.01), " ".join(content.split()[:2])
+        else:
+            # Embedding points at an unrelated topic; only the identifier matches
+            yield content, docs[(target + TOPICS // 2) % CORPUS_SIZE][1], f"what happened with ERR-{target:05d}"
+
+
+@pytest.mark.asyncio
+async def test_hybrid_vs_vector_recall_and_latency(bench_pool: asyncpg.Pool) -> None:
+    rng = random.Random(1234)
+    project_id = uuid4()
+    docs = await _build_corpus(bench_pool, project_id, rng)
+    service = ContextService(bench_pool)
+    targets = rng.sample(range(CORPUS_SIZE), QUERIES)
+
+    recall: dict[str, float] = {}
+    for query_set in ("semantic", "exact-term"):
+        for mode in ("vector", "hybrid"):
+            hits = 0
+            samples = []
+            for content, query_embedding, query_text in _queries(docs, targets, query_set, rng):
+                start = time.perf_counter()
+                chunks = await service.search_chunks(
+                    project_id,
+                    query_embedding,
+                    top_k=TOP_K,
+                    score_threshold=0.0,
+                    query_text=query_text if mode == "hybrid" else None,
+                )
+                samples.append(time.perf_counter() - start)
+                hits += any(c.content == content for c in chunks)
+
+            key = f"{query_set}/{mode}"
+            recall[key] = hits / QUERIES
+            print(Timing(f"{key:<18} recall@{TOP_K}={recall[key]:.2f}", samples).report())
+
+    assert recall["exact-term/hybrid"] >= recall["exact-term/vector"]
+    assert recall["semantic/hybrid"] >= recall["semantic/vector"] - 0.05
@@ -0,0 +1,119 @@
+"""Microbenchmark: edit_file's matching and rewrite on a 1MB file with 50 edits.
+
+The legacy engine applied edits one at a time: each whitespace-flexible edit
+normalized the whole file again and walked it character by character to map
+the match back, every edit rebuilt the full string, and the diff ran difflib
+over both complete files. The batch engine locates all edits in the original
+through one WhitespaceIndex, rewrites the file in a single join and diffs only
+the touched lines.
+
+Run with:
+    pytest tests/benchmarks/test_edit_file_bench.py -v -s --no-cov
+"""
+
+from __future__ import annotations
+
+import random
+
+from tools.text_editing import (
+    EditOperation,
+    apply_spans,
+    generate_diff,
+    generate_diff_from_spans,
+    normalize_whitespace_for_matching,
+    plan_edits,
+)
+
+from .conftest import time_sync
+
+TARGET_BYTES = 1_000_000
+EDITS = 50
+ITERATIONS = 5
+
+
+def _legacy_find(content: str, search_text: str) -> int:
+    """The pre-index find_text_with_flexible_whitespace."""
+    idx = content.find(search_text)
+    if idx != -1:
+        return idx
+    normalized_content = normalize_whitespace_for_matching(content)
+    idx = normalized_content.find(normalize_whitespace_for_matching(search_text))
+    if idx != -1:
+        char_count = 0
+        for i, char in enumerate(content):
+            if char_count == idx:
+                return i
+            if not char.isspace() or char == "\n":
+                char_count += 1
+    return -1
+
+
+def _legacy_edit(content: str, edits: list[EditOperation]) -> tuple[str, str]:
+    current = content
+    for edit in edits:
+        idx = _legacy_find(current, edit.oldText)
+        if idx != -1:
+            current = current[:idx] + edit.newText + current[idx + len(edit.oldText) :]
+    return current, generate_diff(content, current, "bench.py")
+
+
+def _batch_edit(content: str, edits: list[EditOperation]) -> tuple[str, str]:
+    spans = plan_edits(content, edits)
+    assert spans is not None
+    return apply_spans(content, spans), generate_diff_from_spans(content, spans, "bench.py")
+
+
+def _source(seed: int) -> list[str]:
+    """About 1MB of indented, code-like lines, each unique."""
+    rng = random.Random(seed)
+    lines: list[str] = []
+    size = 0
+    while size < TARGET_BYTES:
+        n = len(lines)
+        indent = "    " * rng.randint(0, 3)
+        line = f"{indent}value_{n} = compute(arg_{n},  {rng.randint(0, 999)})  # step {n}"
+        lines.append(line)
+        size += len(line) + 1
+    return lines
+
+
+def _edits(lines: list[str], seed: int, flexible: bool) -> list[EditOperation]:
+    """Edits on spread-out lines; flexible ones collapse the double space and drop the indent."""
+    rng = random.Random(seed)
+    targets = sorted(rng.sample(range(len(lines)), EDITS))
+    edits = []
+    for n in targets:
+        old = " ".join(lines[n].split()) if flexible else lines[n]
+        edits.append(EditOperation(oldText=old, newText=f"value_{n} = compute(arg_{n}, 0)  # edited"))
+    return edits
+
+
+def _compare(flexible: bool) -> None:
+    lines = _source(7)
+    content = "\n".join(lines) + "\n"
+    edits = _edits(lines, 11, flexible)
+
+    legacy_result = _legacy_edit(content, edits)
+    batch_result = _batch_edit(content, edits)
+    if not flexible:
+        # The legacy flexible path mis-mapped match positions and replaced
+        # len(oldText) characters, so only exact edits produce the same file
+        assert batch_result == legacy_result
+    else:
+        assert all(edit.newText in batch_result[0] for edit in edits)
+
+    kind = "flexible" if flexible else "exact"
+    legacy = time_sync(f"legacy {kind}", lambda: _legacy_edit(content, edits), ITERATIONS)
+    batch = time_sync(f"batch  {kind}", lambda: _batch_edit(content, edits), ITERATIONS)
+    print(f"\n{len(content) / 1e6:.2f}MB, {EDITS} edits")
+    print(legacy.report())
+    print(batch.report())
+    print(f"speedup: {legacy.p50_ms / batch.p50_ms:.1f}x")
+
+
+def test_exact_edits_1mb() -> None:
+    _compare(flexible=False)
+
+
+def test_flexible_edits_1mb() -> None:
+    _compare(flexible=True)
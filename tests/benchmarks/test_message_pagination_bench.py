@@ -0,0 +1,84 @@
+"""Benchmark: OFFSET vs keyset pagination over a long session's messages.
+
+Pages through one large session both ways and reports per-page latency at
+increasing depth. OFFSET pages re-scan every skipped row; keyset pages
+(fetch_message_page) are bounded index scans on idx_messages_session_keyset.
+
+Run with:
+    BENCH_DATABASE_URL=postgresql://... pytest tests/benchmarks/test_message_pagination_bench.py -v -s --no-cov
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import asyncpg
+import pytest
+
+from api.services.message_utils import MESSAGE_COLUMNS, decode_message_cursor, fetch_message_page
+
+from .conftest import time_async
+
+SESSION_MESSAGES = 50000
+PAGE_SIZE = 100
+DEPTHS = (0, 10000, 25000, 49000)
+ITERATIONS = 20
+
+
+@pytest.mark.asyncio
+async def test_offset_vs_keyset_page_latency(bench_pool: asyncpg.Pool) -> None:
+    session_uuid = uuid4()
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    async with bench_pool.acquire() as conn:
+        await conn.execute("CREATE TABLE messages (LIKE public.messages INCLUDING ALL)")
+        await conn.executemany(
+            "INSERT INTO messages (session_id, role, content, created_at) VALUES ($1, 'user', $2, $3)",
+            [(session_uuid, f"message {i}", base + timedelta(seconds=i)) for i in range(SESSION_MESSAGES)],
+        )
+        await conn.execute("ANALYZE messages")
+
+        # Cursor positions at each depth (counted from the newest message)
+        cursors = {}
+        for depth in DEPTHS:
+            if depth == 0:
+                cursors[depth] = None
+                continue
+            row = await conn.fetchrow(
+                "SELECT created_at, id FROM messages WHERE session_id = $1"
+                " ORDER BY created_at DESC, id DESC OFFSET $2 LIMIT 1",
+                session_uuid,
+                depth - 1,
+            )
+            cursors[depth] = (row["created_at"], row["id"])
+
+        for depth in DEPTHS:
+
+            async def offset_page(depth: int = depth) -> object:
+                return await conn.fetch(
+                    f"SELECT {MESSAGE_COLUMNS} FROM messages WHERE session_id = $1"
+                    " ORDER BY created_at DESC LIMIT $2 OFFSET $3",
+                    session_uuid,
+                    PAGE_SIZE,
+                    depth,
+                )
+
+            async def keyset_page(depth: int = depth) -> object:
+                return await fetch_message_page(conn, session_uuid, PAGE_SIZE, cursors[depth])
+
+            offset = await time_async(f"offset depth={depth:>6}", offset_page, ITERATIONS)
+            keyset = await time_async(f"keyset depth={depth:>6}", keyset_page, ITERATIONS)
+            print(offset.report())
+            print(keyset.report())
+
+        # Walking the whole session by cursor visits every message exactly once
+        seen = 0
+        before = None
+        while True:
+            page, next_cursor = await fetch_message_page(conn, session_uuid, PAGE_SIZE * 10, before)
+            seen += len(page)
+            if next_cursor is None:
+                break
+            before = decode_message_cursor(next_cursor)
+
+    assert seen == SESSION_MESSAGES
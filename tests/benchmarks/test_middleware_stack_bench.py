@@ -0,0 +1,240 @@
+"""Benchmark: per-request overhead of the api/main.py middleware stack.
+
+Compares the previous ``BaseHTTPMiddleware`` implementations (replicated
+below) with the current pure ASGI middleware, each wrapped around a trivial
+endpoint in the same order as api/main.py:
+
+    RateLimit -> RequestSizeLimit -> SecurityHeaders -> CORS -> RequestContext -> endpoint
+
+Every ``BaseHTTPMiddleware`` layer runs the downstream app in a separate task
+and re-streams the response body through a memory channel; the ASGI versions
+only wrap ``send``. Requests go through httpx's in-process ASGI transport, so
+no sockets are involved and the difference is middleware overhead alone.
+
+Run with:
+    pytest tests/benchmarks/test_middleware_stack_bench.py -v -s --no-cov
+"""
+
+from __future__ import annotations
+
+import re
+import time
+
+from collections.abc import Iterator
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from fastapi import FastAPI, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.responses import JSONResponse
+
+from api.middleware.rate_limiter import (
+    RATE_LIMIT_TIERS,
+    GCRARateLimiter,
+    RateLimitMiddleware,
+    _get_client_identifier,
+    _get_tier_for_path,
+)
+from api.middleware.request_context import (
+    RequestContext,
+    RequestContextMiddleware,
+    clear_request_context,
+    generate_request_id,
+    get_request_id,
+    set_request_context,
+)
+from api.middleware.request_limits import RequestSizeLimitMiddleware, _is_upload_path
+from api.middleware.security_headers import SecurityHeadersMiddleware
+from utils.metrics import request_duration_seconds
+
+from .conftest import Timing, time_async
+
+REQUESTS = 3000
+CLIENTS = 1000
+MAX_BODY_SIZE = 1024 * 1024
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024
+
+
+class LegacyRequestContextMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        request_id = request.headers.get("X-Request-ID") or generate_request_id()
+        client_ip = request.headers.get("X-Forwarded-For")
+        if client_ip:
+            client_ip = client_ip.split(",")[0].strip()
+        elif request.client:
+            client_ip = request.client.host
+        session_id = None
+        path = request.url.path
+        if (match := re.search(r"/api/v\d+/sessions/([^/]+)", path)) or (match := re.search(r"/ws/chat/([^/]+)", path)):
+            session_id = match.group(1)
+        context = RequestContext(
+            request_id=request_id, path=path, method=request.method, client_ip=client_ip, session_id=session_id
+        )
+        set_request_context(context)
+        try:
+            response = await call_next(request)
+            response.headers["X-Request-ID"] = request_id
+            response.headers["X-Response-Time"] = f"{context.elapsed_ms:.2f}ms"
+            request_duration_seconds.labels(
+                method=request.method, path=request.url.path, status=response.status_code
+            ).observe(context.elapsed_ms / 1000)
+            return response
+        finally:
+            clear_request_context()
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        response = await call_next(request)
+        response.headers["Content-Security-Policy"] = "default-src 'none'; frame-ancestors 'none'"
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        response.headers["X-XSS-Protection"] = "0"
+        response.headers["Permissions-Policy"] = (
+            "accelerometer=(), camera=(), geolocation=(), gyroscope=(), "
+            "magnetometer=(), microphone=(), payment=(), usb=()"
+        )
+        return response
+
+
+class LegacyRequestSizeLimitMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        if request.method in ("GET", "HEAD", "OPTIONS", "DELETE"):
+            return await call_next(request)
+        if request.headers.get("upgrade", "").lower() == "websocket":
+            return await call_next(request)
+        max_size = MAX_UPLOAD_SIZE if _is_upload_path(request.url.path) else MAX_BODY_SIZE
+        content_length = request.headers.get("content-length")
+        if content_length and int(content_length) > max_size:
+            return JSONResponse(status_code=413, content={"error": "request_too_large", "max_size": max_size})
+        return await call_next(request)
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app: object, rate_limiter: GCRARateLimiter) -> None:
+        super().__init__(app)  # type: ignore[arg-type]
+        self._rate_limiter = rate_limiter
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        if request.headers.get("upgrade", "").lower() == "websocket":
+            return await call_next(request)
+        tier = _get_tier_for_path(request.url.path)
+        identifier = _get_client_identifier(request)
+        config = RATE_LIMIT_TIERS.get(tier, RATE_LIMIT_TIERS["api"])
+        if config.shed_when is not None and config.shed_when():
+            return JSONResponse(status_code=503, content={"error": "overloaded"})
+        allowed, headers = await self._rate_limiter.is_allowed(identifier, tier)
+        if not allowed:
+            return JSONResponse(status_code=429, content={"error": "rate_limit_exceeded"})
+        result = await call_next(request)
+        for header, value in headers.items():
+            result.headers[header] = str(value)
+        return result
+
+
+def _build_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/sessions/{session_id}")
+    async def get_session(session_id: str) -> dict[str, str | None]:
+        return {"id": session_id, "request_id": get_request_id()}
+
+    @app.post("/api/v1/sessions")
+    async def create_session(request: Request) -> dict[str, int]:
+        return {"received": len(await request.body())}
+
+    # Registration order of api/main.py (last added runs first)
+    limiter = GCRARateLimiter()
+    app.add_middleware(LegacyRequestContextMiddleware if legacy else RequestContextMiddleware)
+    app.add_middleware(
+        CORSMiddleware, allow_origins=["http://localhost:5173"], allow_methods=["*"], allow_headers=["*"]
+    )
+    if legacy:
+        app.add_middleware(LegacySecurityHeadersMiddleware)
+        app.add_middleware(LegacyRequestSizeLimitMiddleware)
+        app.add_middleware(LegacyRateLimitMiddleware, rate_limiter=limiter)
+    else:
+        app.add_middleware(SecurityHeadersMiddleware, enable_hsts=False)
+        app.add_middleware(RequestSizeLimitMiddleware)
+        app.add_middleware(RateLimitMiddleware, rate_limiter=limiter)
+    return app
+
+
+@pytest.fixture(autouse=True)
+def middleware_settings() -> Iterator[None]:
+    settings = SimpleNamespace(
+        rate_limit_enabled=True, max_request_body_size=MAX_BODY_SIZE, max_upload_size=MAX_UPLOAD_SIZE
+    )
+    with (
+        patch("api.middleware.rate_limiter.get_settings", return_value=settings),
+        patch("api.middleware.request_limits.get_settings", return_value=settings),
+    ):
+        yield
+
+
+def _client(app: FastAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+
+async def _run(label: str, app: FastAPI, method: str) -> Timing:
+    """Time requests spread over CLIENTS forwarded IPs (stays under the rate limit)."""
+    counter = iter(range(REQUESTS * 2))
+    body = b'{"title": "benchmark"}' * 20
+
+    async with _client(app) as client:
+
+        async def one() -> None:
+            i = next(counter)
+            headers = {"X-Forwarded-For": f"10.0.{i % CLIENTS // 256}.{i % 256}", "Origin": "http://localhost:5173"}
+            if method == "GET":
+                response = await client.get(f"/api/v1/sessions/s{i}", headers=headers)
+            else:
+                response = await client.post("/api/v1/sessions", content=body, headers=headers)
+            assert response.status_code == 200
+
+        await time_async("warmup", one, 200)
+        return await time_async(label, one, REQUESTS)
+
+
+async def _throughput(app: FastAPI) -> float:
+    """Requests per second in a tight loop (no per-call timing overhead)."""
+    async with _client(app) as client:
+        start = time.perf_counter()
+        for i in range(REQUESTS):
+            await client.get(
+                f"/api/v1/sessions/s{i}", headers={"X-Forwarded-For": f"10.1.{i % CLIENTS // 256}.{i % 256}"}
+            )
+        return REQUESTS / (time.perf_counter() - start)
+
+
+@pytest.mark.asyncio
+async def test_base_http_vs_asgi_middleware_stack() -> None:
+    for method in ("GET", "POST"):
+        legacy = await _run(f"BaseHTTPMiddleware stack {method}", _build_app(legacy=True), method)
+        current = await _run(f"pure ASGI stack {method}", _build_app(legacy=False), method)
+        print(legacy.report())
+        print(current.report())
+        assert current.p50_ms < legacy.p50_ms
+
+    legacy_rate = await _throughput(_build_app(legacy=True))
+    current_rate = await _throughput(_build_app(legacy=False))
+    print(f"throughput: BaseHTTPMiddleware {legacy_rate:,.0f} req/s, pure ASGI {current_rate:,.0f} req/s")
+
+
+@pytest.mark.asyncio
+async def test_asgi_stack_response_headers() -> None:
+    """The ASGI stack still emits every header the old stack did."""
+    legacy_app, current_app = _build_app(legacy=True), _build_app(legacy=False)
+    headers = {"Origin": "http://localhost:5173", "X-Request-ID": "req_fixed"}
+    async with _client(legacy_app) as legacy_client, _client(current_app) as current_client:
+        legacy = await legacy_client.get("/api/v1/sessions/s1", headers=headers)
+        current = await current_client.get("/api/v1/sessions/s1", headers=headers)
+
+    assert current.json() == legacy.json() == {"id": "s1", "request_id": "req_fixed"}
+    volatile = {"x-response-time", "content-length", "date"}
+    assert {k for k in legacy.headers if k not in volatile} == {k for k in current.headers if k not in volatile}
@@ -0,0 +1,179 @@
+"""Microbenchmark: text JSON/vector handling vs binary asyncpg codecs.
+
+Compares the data layer before and after connection-level codecs on two hot
+paths:
+
+- llm_context read: PostgresSession.get_items for a long session
+  (stdlib json.loads per row vs orjson)
+- chunk insert: ContextService.insert_chunk
+  (text vector literal + json.dumps metadata vs binary vector/jsonb codecs)
+
+The "text" side runs on a plain connection without codecs, reproducing the old
+code path. A serialization-only comparison runs without a database.
+
+Run with:
+    BENCH_DATABASE_URL=postgresql://... pytest tests/benchmarks/test_pg_codecs_bench.py -v -s --no-cov
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+
+from typing import Any
+from uuid import uuid4
+
+import asyncpg
+import orjson
+import pytest
+
+from api.services.context_service import ContextService
+from api.services.postgres_session import PostgresSession
+
+from .conftest import BENCH_DATABASE_URL, BENCH_SCHEMA, Timing, time_async, time_sync
+
+HISTORY_ITEMS = 400
+READ_ITERATIONS = 30
+INSERTS = 200
+DIM = 1536
+
+
+def _sdk_items(rng: random.Random) -> list[dict[str, Any]]:
+    """Synthetic Agents SDK items: messages, function calls and their outputs."""
+    items: list[dict[str, Any]] = []
+    for i in range(HISTORY_ITEMS):
+        kind = i % 4
+        if kind == 0:
+            items.append({"role": "user", "content": f"question {i} " + "lorem ipsum " * rng.randint(5, 40)})
+        elif kind == 1:
+            items.append(
+                {
+                    "type": "function_call",
+                    "call_id": f"call_{i}",
+                    "name": "read_file",
+                    "arguments": json.dumps({"file_path": f"input/doc_{i}.md", "head": 200}),
+                }
+            )
+        elif kind == 2:
+            items.append(
+                {
+                    "type": "function_call_output",
+                    "call_id": f"call_{i - 1}",
+                    "output": "file line\n" * rng.randint(20, 200),
+                }
+            )
+        else:
+            items.append(
+                {
+                    "type": "message",
+                    "role": "assistant",
+                    "content": [{"type": "output_text", "text": "answer " * rng.randint(20, 120)}],
+                }
+            )
+    return items
+
+
+def test_item_serialization_json_vs_orjson() -> None:
+    """Serialize + parse cost for one session history, no database."""
+    items = _sdk_items(random.Random(3))
+    texts = [json.dumps(item) for item in items]
+
+    stdlib = time_sync("stdlib json dumps+loads", lambda: [json.loads(json.dumps(i)) for i in items], 50)
+    fast = time_sync("orjson dumps+loads", lambda: [orjson.loads(orjson.dumps(i).decode()) for i in items], 50)
+    print(stdlib.report())
+    print(fast.report())
+    print(f"history: {len(items)} items, {sum(map(len, texts)) / 1024:.0f}KB")
+
+    assert fast.p50_ms < stdlib.p50_ms
+
+
+async def _text_connection() -> asyncpg.Connection:
+    """Connection without type codecs (the pre-codec data layer)."""
+    return await asyncpg.connect(BENCH_DATABASE_URL, server_settings={"search_path": f"{BENCH_SCHEMA}, public"})
+
+
+@pytest.mark.asyncio
+async def test_llm_context_read_path(bench_pool: asyncpg.Pool) -> None:
+    session_uuid = uuid4()
+    items = _sdk_items(random.Random(5))
+    async with bench_pool.acquire() as conn:
+        await conn.execute("CREATE TABLE llm_context (LIKE public.llm_context INCLUDING ALL)")
+
+    session = PostgresSession("chat_bench", session_uuid, bench_pool)
+    await session.add_items(items)
+
+    raw = await _text_connection()
+    try:
+
+        async def legacy_get_items() -> list[dict[str, Any]]:
+            rows = await raw.fetch(
+                "SELECT content FROM llm_context WHERE session_id = $1 ORDER BY seq ASC", session_uuid
+            )
+            return [json.loads(row["content"]) for row in rows]
+
+        legacy = await time_async("llm_context read (json)", legacy_get_items, READ_ITERATIONS)
+        current = await time_async("llm_context read (orjson)", session.get_items, READ_ITERATIONS)
+    finally:
+        await raw.close()
+
+    print(legacy.report())
+    print(current.report())
+    assert await session.get_items() == items
+
+
+@pytest.mark.asyncio
+async def test_chunk_insert_path(bench_pool: asyncpg.Pool) -> None:
+    rng = random.Random(9)
+    project_id = uuid4()
+    embeddings = [[rng.uniform(-1, 1) for _ in range(DIM)] for _ in range(INSERTS)]
+    metadata = {"session_id": str(uuid4()), "title": "Benchmark session", "total_chunks": 4}
+    async with bench_pool.acquire() as conn:
+        await conn.execute("CREATE TABLE context_chunks (LIKE public.context_chunks INCLUDING ALL)")
+
+    raw = await _text_connection()
+    try:
+        samples = []
+        for i, embedding in enumerate(embeddings):
+            start = time.perf_counter()
+            await raw.fetchrow(
+                """
+                INSERT INTO context_chunks (
+                    project_id, source_type, source_id, chunk_index,
+                    content, content_hash, embedding, token_count, metadata
+                )
+                VALUES ($1, 'message', $2, 0, $3, $4, $5::vector, 10, $6::jsonb)
+                ON CONFLICT (project_id, source_type, content_hash) DO NOTHING
+                RETURNING id
+                """,
+                project_id,
+                uuid4(),
+                f"chunk {i}",
+                f"text-{i}",
+                "[" + ",".join(str(x) for x in embedding) + "]",
+                json.dumps(metadata),
+            )
+            samples.append(time.perf_counter() - start)
+        legacy = Timing("chunk insert (text)", samples)
+    finally:
+        await raw.close()
+
+    service = ContextService(bench_pool)
+    samples = []
+    for i, embedding in enumerate(embeddings):
+        start = time.perf_counter()
+        await service.insert_chunk(
+            project_id, "message", uuid4(), 0, f"chunk {i}", f"binary-{i}", embedding, 10, metadata
+        )
+        samples.append(time.perf_counter() - start)
+    current = Timing("chunk insert (binary codecs)", samples)
+
+    print(legacy.report())
+    print(current.report())
+
+    async with bench_pool.acquire() as conn:
+        rows = await conn.fetch(
+            "SELECT content_hash, embedding, metadata FROM context_chunks WHERE content_hash LIKE 'binary-%'"
+        )
+    assert len(rows) == INSERTS
+    assert all(row["metadata"] == metadata for row in rows)
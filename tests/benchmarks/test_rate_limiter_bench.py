@@ -0,0 +1,146 @@
+"""Microbenchmark: sliding-window timestamp lists vs GCRA rate limiting.
+
+Drives 10k distinct clients through the api tier (120 rpm). The legacy
+limiter kept a list of up to 120 timestamps per client, rebuilt it on every
+request and serialized all clients on one asyncio.Lock; GCRA keeps one float
+per client in sharded dicts.
+
+The shared Postgres backend is measured separately (needs a database).
+
+Run with:
+    pytest tests/benchmarks/test_rate_limiter_bench.py -v -s --no-cov
+    BENCH_DATABASE_URL=postgresql://... pytest tests/benchmarks/test_rate_limiter_bench.py -v -s --no-cov
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+import time
+
+import asyncpg
+import pytest
+
+from api.middleware.rate_limiter import RATE_LIMIT_TIERS, GCRARateLimiter, PostgresRateLimitBackend
+
+from .conftest import Timing
+
+CLIENTS = 10000
+REQUESTS = 200000
+WINDOW = 60.0
+
+
+class LegacySlidingWindowLimiter:
+    """The pre-GCRA algorithm: per-client timestamp list under one global lock."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, list[float]] = {}
+        self._lock = asyncio.Lock()
+
+    async def is_allowed(self, identifier: str, tier: str) -> tuple[bool, dict[str, int]]:
+        limit = RATE_LIMIT_TIERS[tier].requests_per_minute
+        now = time.monotonic()
+        async with self._lock:
+            timestamps = self._entries.get(identifier)
+            if timestamps is None:
+                self._entries[identifier] = [now]
+                return True, self._headers(limit, 1)
+            cutoff = now - WINDOW
+            timestamps = [ts for ts in timestamps if ts > cutoff]
+            self._entries[identifier] = timestamps
+            if len(timestamps) >= limit:
+                return False, self._headers(limit, len(timestamps))
+            timestamps.append(now)
+            return True, self._headers(limit, len(timestamps))
+
+    @staticmethod
+    def _headers(limit: int, count: int) -> dict[str, int]:
+        return {
+            "X-RateLimit-Limit": limit,
+            "X-RateLimit-Remaining": max(0, limit - count),
+            "X-RateLimit-Reset": int(WINDOW),
+        }
+
+
+def _traffic(seed: int) -> list[str]:
+    """Skewed traffic: a few hot clients, a long tail of occasional ones."""
+    rng = random.Random(seed)
+    clients = [f"ip:10.{i // 65536}.{i // 256 % 256}.{i % 256}" for i in range(CLIENTS)]
+    weights = [1.0 / (rank + 1) for rank in range(CLIENTS)]
+    return rng.choices(clients, weights=weights, k=REQUESTS)
+
+
+async def _run(label: str, check: object, traffic: list[str]) -> Timing:
+    samples = []
+    for identifier in traffic:
+        start = time.perf_counter()
+        await check(identifier, "api")  # type: ignore[operator]
+        samples.append(time.perf_counter() - start)
+    return Timing(label, samples)
+
+
+async def _throughput(check: object, traffic: list[str]) -> float:
+    """Checks per second in a tight loop (no per-call timing overhead)."""
+    start = time.perf_counter()
+    for identifier in traffic:
+        await check(identifier, "api")  # type: ignore[operator]
+    return len(traffic) / (time.perf_counter() - start)
+
+
+def _state_bytes(limiter: object) -> int:
+    if isinstance(limiter, LegacySlidingWindowLimiter):
+        return sum(sys.getsizeof(ts) + 24 * len(ts) for ts in limiter._entries.values())
+    assert isinstance(limiter, GCRARateLimiter)
+    return sum(sys.getsizeof(shard) for shard in limiter.local._shards) + 24 * len(limiter.local)
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_vs_gcra_10k_clients() -> None:
+    traffic = _traffic(11)
+
+    legacy = LegacySlidingWindowLimiter()
+    current = GCRARateLimiter()
+    legacy_timing = await _run("sliding window", legacy.is_allowed, traffic)
+    gcra_timing = await _run("gcra (local)", current.is_allowed, traffic)
+    print(legacy_timing.report(), f"state={_state_bytes(legacy) / 1024:.0f}KB")
+    print(gcra_timing.report(), f"state={_state_bytes(current) / 1024:.0f}KB")
+
+    legacy_rate = await _throughput(LegacySlidingWindowLimiter().is_allowed, traffic)
+    gcra_rate = await _throughput(GCRARateLimiter().is_allowed, traffic)
+    print(f"throughput: sliding window {legacy_rate:,.0f}/s, gcra {gcra_rate:,.0f}/s")
+
+    assert len(current.local) <= CLIENTS
+    assert gcra_rate > legacy_rate
+
+
+@pytest.mark.asyncio
+async def test_concurrent_clients_gcra() -> None:
+    """Many concurrent request handlers checking limits at once."""
+    traffic = _traffic(13)
+    limiter = GCRARateLimiter()
+
+    async def worker(chunk: list[str]) -> None:
+        for identifier in chunk:
+            await limiter.is_allowed(identifier, "api")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(traffic[i::100]) for i in range(100)))
+    elapsed = time.perf_counter() - start
+    print(f"gcra 100 concurrent workers: {REQUESTS / elapsed:,.0f} checks/s")
+
+
+@pytest.mark.asyncio
+async def test_postgres_backend(bench_pool: asyncpg.Pool) -> None:
+    async with bench_pool.acquire() as conn:
+        await conn.execute("CREATE UNLOGGED TABLE rate_limits (LIKE public.rate_limits INCLUDING ALL)")
+
+    limiter = GCRARateLimiter(backend=PostgresRateLimitBackend(bench_pool))
+    traffic = _traffic(17)[:20000]
+    timing = await _run("gcra (postgres)", limiter.is_allowed, traffic)
+    print(timing.report())
+
+    async with bench_pool.acquire() as conn:
+        rows = await conn.fetchval("SELECT count(*) FROM rate_limits")
+    assert 0 < rows <= CLIENTS
+    assert limiter.stats()["backend_errors"] == 0
@@ -205,13 +205,22 @@ describe("Session List Handlers", () => {
       loadedCount: 1, // Only 1 loaded
       messageCount: 5, // Total 5
       hasMore: true,
+      nextCursor: "cursor-1",
     });
 
-    // Mock loadMoreMessages
+    // Mock loadMoreMessages: each page is older than the previous one
     sessionService.loadMoreMessages = vi
       .fn()
-      .mockResolvedValueOnce({ success: true, messages: [{ content: "msg1" }, { content: "msg2" }] }) // Chunk 1
-      .mockResolvedValueOnce({ success: true, messages: [{ content: "msg3" }, { content: "msg4" }] }); // Chunk 2 (completes it)
+      .mockResolvedValueOnce({
+        success: true,
+        messages: [{ content: "msg3" }, { content: "msg4" }],
+        nextCursor: "cursor-2",
+      }) // Chunk 1
+      .mockResolvedValueOnce({
+        success: true,
+        messages: [{ content: "msg1" }, { content: "msg2" }],
+        nextCursor: null,
+      }); // Chunk 2 (completes it)
 
     const { item } = createSessionItem("pagination-session");
     item.dispatchEvent(new Event("click", { bubbles: true }));
@@ -226,7 +235,9 @@ describe("Session List Handlers", () => {
     await new Promise((resolve) => setTimeout(resolve, 10));
 
     // Check calls
-    expect(sessionService.loadMoreMessages).toHaveBeenCalled();
+    expect(sessionService.loadMoreMessages).toHaveBeenCalledWith("pagination-session", "cursor-1", 100);
+    expect(sessionService.loadMoreMessages).toHaveBeenCalledWith("pagination-session", "cursor-2", 100);
+    expect(sessionService.loadMoreMessages).toHaveBeenCalledTimes(2);
     expect(window.components.chatContainer.prependMessages).toHaveBeenCalled();
   });
 });
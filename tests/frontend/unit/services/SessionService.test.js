@@ -333,16 +333,27 @@ describe("SessionService", () => {
           { role: "user", content: "Hello" },
           { role: "assistant", content: "Hi" },
         ],
+        next_cursor: "older-cursor",
       });
 
-      const result = await sessionService.loadMoreMessages("session-1", 100, 50);
+      const result = await sessionService.loadMoreMessages("session-1", "cursor", 50);
 
       expect(result.success).toBe(true);
       expect(result.messages).toHaveLength(2);
+      expect(result.nextCursor).toBe("older-cursor");
+    });
+
+    it("should return null nextCursor on the oldest page", async () => {
+      mockIPC.setResponse("session-command", { messages: [{ role: "user", content: "First" }] });
+
+      const result = await sessionService.loadMoreMessages("session-1", "cursor", 50);
+
+      expect(result.success).toBe(true);
+      expect(result.nextCursor).toBeNull();
     });
 
     it("should require session ID", async () => {
-      const result = await sessionService.loadMoreMessages(null, 0);
+      const result = await sessionService.loadMoreMessages(null, "cursor");
 
       expect(result.success).toBe(false);
       expect(result.error).toContain("session ID");
@@ -351,7 +362,7 @@ describe("SessionService", () => {
     it("should handle backend errors", async () => {
       mockIPC.setResponse("session-command", { error: "Load failed" });
 
-      const result = await sessionService.loadMoreMessages("session-1", 0);
+      const result = await sessionService.loadMoreMessages("session-1", "cursor");
 
       expect(result.success).toBe(false);
       expect(result.error).toBe("Load failed");